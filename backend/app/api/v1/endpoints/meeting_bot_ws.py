@@ -3,15 +3,22 @@ WebSocket: /ws/audio/{meeting_id} accepts PCM from bot; process_audio → STT 
 /ws/meeting/{meeting_id}/live: frontend subscribes for transcript updates.
 """
 import asyncio
+import json
 import logging
-from typing import Dict, Set
+from typing import Awaitable, Callable, Dict, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
 
+from app.attendance import apply_participant_events
+from app.attendance.attendance_writer import attendance_writer
+from app.audio.frame_protocol import FrameSequencer, decode_frame
 from app.core.config import settings
 from app.core.security import decode_access_token
+from app.services.live_summary import live_summarizer
+from app.stt.scheduler import stt_scheduler
+from app.stt.segment_writer import segment_writer
 from app.stt.stt_pipeline import STTPipeline
 
 router = APIRouter()
@@ -24,65 +31,324 @@ async def _safe_stt_tick(meeting_id: str, pipeline: "STTPipeline") -> None:
         logger.exception("STT process_buffer failed meeting_id=%s", meeting_id)
 
 
+class MeetingAudioConsumer:
+    """
+    One long-lived consumer per meeting, fed by a bounded frame queue.
+
+    The WebSocket handler only enqueues; the consumer drains every pending frame into the
+    pipeline buffer (merging bursts) and keeps at most one STT tick in flight. When the queue
+    is full the oldest frame is dropped and counted, so memory stays bounded under load.
+    """
+
+    def __init__(self, meeting_id: str, pipeline: STTPipeline, max_frames: int = None):
+        self.meeting_id = meeting_id
+        self.pipeline = pipeline
+        self.max_frames = max(
+            1, int(max_frames or getattr(settings, "STT_AUDIO_QUEUE_MAX_FRAMES", 256))
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_frames)
+        self._tick: Optional[asyncio.Task] = None
+        self.received_frames = 0
+        self.dropped_frames = 0
+        self.merged_batches = 0
+        self._task = asyncio.create_task(self._run())
+
+    def feed(self, data: bytes, capture_ts: Optional[float] = None) -> None:
+        self.received_frames += 1
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_frames += 1
+            if self.dropped_frames == 1 or self.dropped_frames % 100 == 0:
+                logger.warning(
+                    "Audio queue full meeting_id=%s; dropped %d frame(s) so far",
+                    self.meeting_id, self.dropped_frames,
+                )
+        self._queue.put_nowait((data, capture_ts))
+
+    async def _run(self) -> None:
+        while True:
+            frame, capture_ts = await self._queue.get()
+            self.pipeline.process_audio(frame, capture_ts)
+            if not self._queue.empty():
+                self.merged_batches += 1
+                while not self._queue.empty():
+                    self.pipeline.process_audio(*self._queue.get_nowait())
+            if self._tick is None or self._tick.done():
+                self._tick = asyncio.create_task(_safe_stt_tick(self.meeting_id, self.pipeline))
+
+    def stop(self) -> None:
+        """Stop consuming; an in-flight STT tick is left to finish and persist its text."""
+        if not self._task.done():
+            self._task.cancel()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop consuming and wait (bounded) for the in-flight STT tick."""
+        self.stop()
+        if self._tick is not None and not self._tick.done():
+            await asyncio.wait({self._tick}, timeout=timeout)
+
+    def get_stats(self) -> dict:
+        return {
+            "queued_frames": self._queue.qsize(),
+            "max_frames": self.max_frames,
+            "received_frames": self.received_frames,
+            "dropped_frames": self.dropped_frames,
+            "merged_batches": self.merged_batches,
+        }
+
+
+# 1013 "Try Again Later": the frontend reconnects and reloads the persisted transcript.
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class LiveSubscriber:
+    """
+    One frontend socket with its own bounded outbound queue and sender task.
+
+    ``offer`` never awaits, so a broadcast costs one ``put_nowait`` per subscriber. A subscriber
+    whose queue is full, or whose single send exceeds the timeout, is closed with a reason.
+    """
+
+    def __init__(
+        self,
+        meeting_id: str,
+        ws: WebSocket,
+        max_queue: int = None,
+        send_timeout: float = None,
+        on_closed: Optional[Callable[["LiveSubscriber"], None]] = None,
+    ):
+        self.meeting_id = meeting_id
+        self.ws = ws
+        self.max_queue = max(1, int(max_queue or getattr(settings, "LIVE_WS_SEND_QUEUE_MAX", 64)))
+        self.send_timeout = float(
+            send_timeout if send_timeout is not None else getattr(settings, "LIVE_WS_SEND_TIMEOUT_SECONDS", 10.0)
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        self._on_closed = on_closed
+        self.closed = False
+        self.sent = 0
+        self._closing: Optional[asyncio.Task] = None  # pending close frame (held: the loop keeps tasks weakly)
+        self._task = asyncio.create_task(self._run())
+
+    def offer(self, payload: str) -> bool:
+        """Queue an already-serialized message; False if the subscriber is closed or too far behind."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._close(f"slow consumer: {self.max_queue} messages behind")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                payload = await self._queue.get()
+                try:
+                    await asyncio.wait_for(self.ws.send_text(payload), timeout=self.send_timeout)
+                except asyncio.TimeoutError:
+                    self._close(f"slow consumer: send took over {self.send_timeout:.0f}s")
+                    return
+                except Exception:
+                    self._close(None)  # socket already gone
+                    return
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+
+    def _close(self, reason: Optional[str]) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is not asyncio.current_task() and not self._task.done():
+            self._task.cancel()
+        if self._on_closed is not None:
+            self._on_closed(self)
+        if reason:
+            logger.warning("Disconnecting live subscriber meeting_id=%s: %s", self.meeting_id, reason)
+            self._closing = asyncio.create_task(self._send_close(reason))
+
+    async def _send_close(self, reason: str) -> None:
+        try:
+            await self.ws.close(code=SLOW_CONSUMER_CLOSE_CODE, reason=reason)
+        except Exception:
+            logger.debug("Live subscriber close failed meeting_id=%s", self.meeting_id, exc_info=True)
+
+    def stop(self) -> None:
+        """Drop the subscriber without closing the socket (client already disconnected)."""
+        self._on_closed = None
+        self.closed = True
+        if not self._task.done():
+            self._task.cancel()
+        if self._closing is not None and not self._closing.done():
+            self._closing.cancel()
+
+    async def wait_closed(self) -> None:
+        """Let a pending close frame go out (at most ``send_timeout``), then drop it."""
+        if self._closing is None or self._closing.done():
+            return
+        await asyncio.wait({self._closing}, timeout=self.send_timeout)
+        if not self._closing.done():
+            self._closing.cancel()
+
+
 class WebSocketManager:
     """Per-meeting AudioProcessor, STTPipeline; broadcast transcript to frontend subscribers."""
 
     def __init__(self):
         self._pipelines: Dict[str, STTPipeline] = {}
-        self._subscribers: Dict[str, Set[WebSocket]] = {}
+        self._consumers: Dict[str, MeetingAudioConsumer] = {}
+        self._sequencers: Dict[str, FrameSequencer] = {}
+        self._subscribers: Dict[str, Dict[WebSocket, LiveSubscriber]] = {}
+        # Meeting workers publish captions to the API instead of to local subscribers.
+        self._publish: Optional[Callable[[str, str], Awaitable[None]]] = None
+        # Meetings someone is watching live get transcription slots first.
+        stt_scheduler.set_priority_resolver(self.has_subscribers)
+
+    def has_subscribers(self, meeting_id: str) -> bool:
+        return bool(self._subscribers.get(meeting_id))
+
+    def set_transcript_publisher(self, publish: Optional[Callable[[str, str], Awaitable[None]]]) -> None:
+        """``publish(meeting_id, text)`` replaces local fan-out (meeting worker); None restores it."""
+        self._publish = publish
 
     def ensure_pipeline(self, meeting_id: str) -> None:
         if meeting_id in self._pipelines:
             return
         logger.info("Audio pipeline created for meeting %s", meeting_id)
         async def push(mid: str, text: str):
-            await self.broadcast_transcript(mid, text)
+            if self._publish is not None:
+                await self._publish(mid, text)
+            else:
+                await self.broadcast_transcript(mid, text)
         self._pipelines[meeting_id] = STTPipeline(
             meeting_id,
             push_callback=push,
         )
+        live_summarizer.start(meeting_id)
+
+    def sequencer(self, meeting_id: str) -> FrameSequencer:
+        """Per-meeting frame ordering state; kept across bot reconnects so replays are de-duplicated."""
+        seq = self._sequencers.get(meeting_id)
+        if seq is None:
+            seq = self._sequencers[meeting_id] = FrameSequencer(
+                reorder_window=int(getattr(settings, "AUDIO_WS_REORDER_WINDOW", 8)),
+                max_wait=float(getattr(settings, "AUDIO_WS_REORDER_WAIT_SECONDS", 1.0)),
+            )
+        return seq
 
-    async def process_audio(self, meeting_id: str, data: bytes) -> None:
-        """Process PCM from bot: processor → pipeline buffer → maybe transcribe and broadcast."""
+    async def process_audio(self, meeting_id: str, data: bytes, capture_ts: Optional[float] = None) -> None:
+        """Queue PCM from bot for the meeting's consumer (pipeline buffer → maybe transcribe and broadcast)."""
         self.ensure_pipeline(meeting_id)
-        pipeline = self._pipelines[meeting_id]
         if not data:
             return
-        # Feed raw PCM directly into STT buffer. This avoids hard-dependence on
-        # upstream frame gating and keeps transcription alive even when VAD tuning changes.
-        pipeline.process_audio(data)
-        asyncio.create_task(_safe_stt_tick(meeting_id, pipeline))
+        # Raw PCM goes straight to the STT buffer (no upstream frame gating), so transcription
+        # stays alive even when VAD tuning changes.
+        consumer = self._consumers.get(meeting_id)
+        if consumer is None:
+            consumer = MeetingAudioConsumer(meeting_id, self._pipelines[meeting_id])
+            self._consumers[meeting_id] = consumer
+        consumer.feed(data, capture_ts)
+
+    def get_stats(self, meeting_id: str) -> Optional[dict]:
+        """Pipeline + audio queue counters for one meeting (None if no pipeline on this instance)."""
+        pipeline = self._pipelines.get(meeting_id)
+        if pipeline is None:
+            return None
+        consumer = self._consumers.get(meeting_id)
+        sequencer = self._sequencers.get(meeting_id)
+        return {
+            "pipeline": pipeline.get_stats(),
+            "audio_queue": consumer.get_stats() if consumer else None,
+            "stream": sequencer.get_stats() if sequencer else None,
+            "pending_segments": segment_writer.pending_count(meeting_id),
+        }
+
+    def subscribe(self, meeting_id: str, ws: WebSocket) -> LiveSubscriber:
+        subs = self._subscribers.setdefault(meeting_id, {})
+        previous = subs.pop(ws, None)
+        if previous is not None:
+            previous.stop()
+        sub = LiveSubscriber(meeting_id, ws, on_closed=self._forget)
+        subs[ws] = sub
+        return sub
 
-    def subscribe(self, meeting_id: str, ws: WebSocket) -> None:
-        if meeting_id not in self._subscribers:
-            self._subscribers[meeting_id] = set()
-        self._subscribers[meeting_id].add(ws)
+    def _forget(self, sub: LiveSubscriber) -> None:
+        subs = self._subscribers.get(sub.meeting_id)
+        if subs and subs.get(sub.ws) is sub:
+            del subs[sub.ws]
+            if not subs:
+                self._subscribers.pop(sub.meeting_id, None)
 
     def unsubscribe(self, meeting_id: str, ws: WebSocket) -> None:
-        if meeting_id in self._subscribers:
-            self._subscribers[meeting_id].discard(ws)
+        subs = self._subscribers.get(meeting_id)
+        sub = subs.pop(ws, None) if subs else None
+        if sub is not None:
+            sub.stop()
+        if subs is not None and not subs:
+            self._subscribers.pop(meeting_id, None)
 
     async def broadcast_transcript(self, meeting_id: str, text: str) -> None:
-        dead = set()
-        for ws in self._subscribers.get(meeting_id) or set():
+        """Serialize once and hand the frame to every subscriber's queue; never waits on a socket."""
+        subs = self._subscribers.get(meeting_id)
+        if not subs:
+            return
+        payload = json.dumps({"type": "transcript", "text": text}, separators=(",", ":"), ensure_ascii=False)
+        for sub in list(subs.values()):
+            sub.offer(payload)
+
+    async def close_meeting(self, meeting_id: str, timeout: float = 15.0) -> None:
+        """Meeting stop: finish the in-flight chunk, flush buffered segments, drop per-meeting state."""
+        consumer = self._consumers.get(meeting_id)
+        if consumer:
+            await consumer.drain(timeout)
+        pipeline = self._pipelines.get(meeting_id)
+        if pipeline is not None:
             try:
-                await ws.send_json({"type": "transcript", "text": text})
+                await asyncio.wait_for(pipeline.finish(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Final speech segment not transcribed in time meeting_id=%s", meeting_id)
             except Exception:
-                dead.add(ws)
-        for ws in dead:
-            self.unsubscribe(meeting_id, ws)
+                logger.exception("Final speech segment failed meeting_id=%s", meeting_id)
+        self.remove_meeting(meeting_id)
+        await segment_writer.flush(meeting_id)
+        await attendance_writer.flush(meeting_id)
 
     def remove_meeting(self, meeting_id: str) -> None:
+        consumer = self._consumers.pop(meeting_id, None)
+        if consumer:
+            consumer.stop()
         self._pipelines.pop(meeting_id, None)
-        self._subscribers.pop(meeting_id, None)
+        self._sequencers.pop(meeting_id, None)
+        live_summarizer.stop(meeting_id)
+        for sub in (self._subscribers.pop(meeting_id, None) or {}).values():
+            sub.stop()
 
 
 ws_manager = WebSocketManager()
 
 
+async def _handle_control(meeting_id: str, text: str) -> None:
+    """JSON text frame from the bot; ``participants`` carries join/leave events from the page listener."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return
+    if not isinstance(message, dict):
+        return
+    if message.get("type") == "participants" and isinstance(message.get("events"), list):
+        try:
+            await apply_participant_events(meeting_id, message["events"])
+        except Exception:
+            logger.exception("Participant events failed meeting_id=%s", meeting_id)
+
+
 @router.websocket("/audio/{meeting_id}")
 async def websocket_audio(websocket: WebSocket, meeting_id: str):
-    """Bot sends raw PCM here. We process and STT; transcript is broadcast to /ws/meeting/{id}/live."""
+    """Bot sends PCM here (bare or framed, see app.audio.frame_protocol). We process and STT;
+    transcript is broadcast to /ws/meeting/{id}/live. JSON text frames are control messages
+    (participant join/leave events)."""
     expected = (getattr(settings, "MEETING_AUDIO_WS_SECRET", None) or "").strip()
     if expected:
         got = (websocket.query_params.get("ws_secret") or "").strip()
@@ -90,7 +356,11 @@ async def websocket_audio(websocket: WebSocket, meeting_id: str):
             await websocket.close(code=1008)
             return
     await websocket.accept()
-    logger.info("Bot audio WebSocket connected for meeting_id=%s", meeting_id)
+    framed = websocket.query_params.get("framing") == "1"
+    logger.info("Bot audio WebSocket connected for meeting_id=%s framed=%s", meeting_id, framed)
+    if framed:
+        await _receive_framed_audio(websocket, meeting_id)
+        return
     rx_count = 0
     try:
         while True:
@@ -99,6 +369,8 @@ async def websocket_audio(websocket: WebSocket, meeting_id: str):
                 break
             data = message.get("bytes")
             if not data:
+                if message.get("text"):
+                    await _handle_control(meeting_id, message["text"])
                 continue
             rx_count += 1
             if rx_count == 1 or rx_count % 500 == 0:
@@ -115,6 +387,52 @@ async def websocket_audio(websocket: WebSocket, meeting_id: str):
         logger.exception("Bot audio WebSocket error for meeting_id=%s: %s", meeting_id, e)
 
 
+async def _receive_framed_audio(websocket: WebSocket, meeting_id: str) -> None:
+    """Sequenced frames: reorder/de-duplicate, feed the pipeline with capture times, ack periodically."""
+    sequencer = ws_manager.sequencer(meeting_id)
+    ack_interval = float(getattr(settings, "AUDIO_WS_ACK_INTERVAL_SECONDS", 1.0))
+    last_ack_at = 0.0
+    acked = None
+    rate_warned = False
+    loop = asyncio.get_running_loop()
+    try:
+        await websocket.send_text(json.dumps({"type": "hello", "next_seq": sequencer.next_seq}))
+        while True:
+            message = await websocket.receive()
+            if message.get("type") == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            if not data:
+                if message.get("text"):
+                    await _handle_control(meeting_id, message["text"])
+                continue
+            try:
+                frame = decode_frame(data)
+            except ValueError as e:
+                sequencer.malformed += 1
+                if sequencer.malformed == 1 or sequencer.malformed % 100 == 0:
+                    logger.warning("Bad audio frame meeting_id=%s: %s", meeting_id, e)
+                continue
+            if frame.count and frame.sample_rate != settings.AUDIO_SAMPLE_RATE and not rate_warned:
+                rate_warned = True
+                logger.warning(
+                    "Bot audio at %d Hz but AUDIO_SAMPLE_RATE=%d meeting_id=%s",
+                    frame.sample_rate, settings.AUDIO_SAMPLE_RATE, meeting_id,
+                )
+            for ready in sequencer.push(frame):
+                await ws_manager.process_audio(meeting_id, ready.payload, ready.capture_ts)
+            now = loop.time()
+            heartbeat = frame.count == 0
+            if sequencer.next_seq != acked and (heartbeat or now - last_ack_at >= ack_interval):
+                acked = sequencer.next_seq
+                last_ack_at = now
+                await websocket.send_text(json.dumps({"type": "ack", "seq": acked}))
+    except WebSocketDisconnect:
+        logger.debug("Bot audio WebSocket disconnected for meeting_id=%s", meeting_id)
+    except Exception as e:
+        logger.exception("Bot audio WebSocket error for meeting_id=%s: %s", meeting_id, e)
+
+
 @router.websocket("/meeting/{meeting_id}/live")
 async def websocket_meeting_live(websocket: WebSocket, meeting_id: str):
     """Frontend connects here to receive live transcript messages."""
@@ -125,9 +443,12 @@ async def websocket_meeting_live(websocket: WebSocket, meeting_id: str):
             await websocket.close(code=1008)
             return
     await websocket.accept()
-    ws_manager.subscribe(meeting_id, websocket)
+    sub = ws_manager.subscribe(meeting_id, websocket)
     try:
         while True:
             await websocket.receive_text()
-    except WebSocketDisconnect:
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # RuntimeError: receive after we closed a slow consumer
+    finally:
         ws_manager.unsubscribe(meeting_id, websocket)
+        await sub.wait_closed()
@@ -4,15 +4,18 @@ Meeting bot API: start/stop meeting, participant join/leave, get meeting (transc
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, status
 from bson import ObjectId
 
 from app.core.config import settings
 from app.core.database import get_database
 from app.core.dependencies import get_current_active_user, verify_project_membership
 from app.models.user import User
-from app.attendance import AttendanceTracker
+from app.attendance import tracker_for
+from app.attendance.attendance_writer import attendance_writer
+from app.bot.meeting_jobs import MeetingWorkerUnavailable, worker_secret
 from app.api.v1.endpoints.meeting_bot_ws import ws_manager
+from app.stt.segment_writer import segment_writer
 from app.services.meetings_ops import run_meeting_intelligence
 from app.services.kanban_agentic_automation import rebuild_kanban_from_meeting_history
 from app.services.meeting_context_qa import answer_meeting_question, _build_transcript_text
@@ -59,8 +62,7 @@ async def meeting_bot_status(
     return {
         "meeting_id": meeting_id,
         "bot_available": True,
-        "bot_running": _bot_manager.is_bot_running(meeting_id),
-        "bot_audio_streaming": _bot_manager.is_bot_audio_streaming(meeting_id),
+        **(await _bot_manager.describe(meeting_id)),
     }
 
 
@@ -113,7 +115,7 @@ async def participant_join(meeting_id: str, payload: dict):
     pid = (payload.get("participant_id") or payload.get("id") or "unknown").strip()
     name = (payload.get("name") or payload.get("display_name") or pid).strip()
     role = payload.get("meeting_role")
-    tracker = AttendanceTracker(meeting_id)
+    tracker = tracker_for(meeting_id)
     await tracker.record_join(pid, name, role)
     return {"message": "ok", "participant_id": pid}
 
@@ -130,11 +132,27 @@ async def participant_leave(meeting_id: str, payload: dict):
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     pid = (payload.get("participant_id") or payload.get("id") or "unknown").strip()
-    tracker = AttendanceTracker(meeting_id)
+    tracker = tracker_for(meeting_id)
     await tracker.record_leave(pid)
     return {"message": "ok", "participant_id": pid}
 
 
+@router.post("/{meeting_id}/live/publish", status_code=status.HTTP_200_OK)
+async def publish_live_transcript(
+    meeting_id: str,
+    payload: dict,
+    x_meeting_worker_secret: Optional[str] = Header(None),
+):
+    """Meeting worker: fan a caption out to this API's live subscribers (worker secret when configured)."""
+    expected = worker_secret()
+    if expected and (x_meeting_worker_secret or "").strip() != expected:
+        raise HTTPException(status_code=403, detail="Invalid meeting worker secret")
+    text = (payload.get("text") or "").strip()
+    if text:
+        await ws_manager.broadcast_transcript(meeting_id, text)
+    return {"message": "ok", "subscribers": ws_manager.has_subscribers(meeting_id)}
+
+
 @router.get("", status_code=status.HTTP_200_OK)
 async def list_meetings(
     project_id: Optional[str] = None,
@@ -195,8 +213,32 @@ async def get_meeting(
 
     segments = await db.transcript_segments.find({"meeting_id": meeting_id}).sort("timestamp", 1).to_list(length=5000)
     transcripts = await db.transcripts.find({"meeting_id": meeting_id}).sort("timestamp", 1).to_list(length=5000)
+    if not transcripts:
+        # Live/browser text is stored once, in transcript_segments; ``transcripts`` is legacy.
+        transcripts = segments
     attendance = await db.attendance_records.find({"meeting_id": meeting_id}).sort("join_time", 1).to_list(length=500)
     summary_doc = await db.summaries.find_one({"meeting_id": meeting_id}, sort=[("created_at", -1)])
+    summary = None
+    if summary_doc:
+        summary = {
+            "summary_text": summary_doc.get("summary_text"),
+            "key_points": summary_doc.get("key_points"),
+            "decisions": summary_doc.get("decisions"),
+            "meeting_signals": summary_doc.get("meeting_signals"),
+        }
+    elif meeting.get("status") == "live":
+        # No final summary yet: serve the rolling checkpoint (live_summary) as a draft.
+        checkpoint = await db.summary_checkpoints.find_one({"meeting_id": meeting_id})
+        if checkpoint and checkpoint.get("summary"):
+            draft = checkpoint["summary"]
+            summary = {
+                "summary_text": draft.get("overview"),
+                "key_points": draft.get("key_points"),
+                "decisions": draft.get("decisions"),
+                "meeting_signals": None,
+                "live": True,
+                "updated_at": checkpoint.get("updated_at"),
+            }
     action_docs = await db.action_items.find({"meeting_id": meeting_id}).sort("created_at", 1).to_list(length=200)
 
     unique_participants = len({a.get("participant_id") for a in attendance if a.get("participant_id")})
@@ -208,8 +250,9 @@ async def get_meeting(
     except (TypeError, AttributeError):
         pass
 
-    bot_running = bool(_bot_manager and _bot_manager.is_bot_running(meeting_id))
-    bot_audio_streaming = bool(_bot_manager and _bot_manager.is_bot_audio_streaming(meeting_id))
+    bot_state = await _bot_manager.describe(meeting_id) if _bot_manager else {}
+    bot_running = bool(bot_state.get("bot_running"))
+    bot_audio_streaming = bool(bot_state.get("bot_audio_streaming"))
 
     return {
         "meeting": _doc_to_meeting(meeting),
@@ -228,12 +271,7 @@ async def get_meeting(
             }
             for a in attendance
         ],
-        "summary": {
-            "summary_text": summary_doc.get("summary_text") if summary_doc else None,
-            "key_points": summary_doc.get("key_points") if summary_doc else None,
-            "decisions": summary_doc.get("decisions") if summary_doc else None,
-            "meeting_signals": summary_doc.get("meeting_signals") if summary_doc else None,
-        } if summary_doc else None,
+        "summary": summary,
         "action_items": [{"text": a.get("text")} for a in action_docs],
         "total_participants": unique_participants,
         "total_duration": total_duration,
@@ -269,7 +307,7 @@ async def append_browser_transcript_segments(
     body: dict = Body(...),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Save Web Speech lines to transcript_segments + transcripts (same shape as STT pipeline)."""
+    """Save Web Speech lines to transcript_segments (same shape as STT pipeline)."""
     db = await get_database()
     await _meeting_for_transcript_append(db, meeting_id, current_user)
 
@@ -296,26 +334,17 @@ async def append_browser_transcript_segments(
         return {"inserted": 0, "meeting_id": meeting_id}
 
     base = _meeting_now()
-    inserted = 0
-    for i, t in enumerate(texts):
-        ts = base + timedelta(milliseconds=i + 1)
-        await db.transcript_segments.insert_one(
-            {
-                "meeting_id": meeting_id,
-                "text": t,
-                "timestamp": ts,
-                "source": "browser_webspeech",
-            }
-        )
-        await db.transcripts.insert_one(
-            {
-                "meeting_id": meeting_id,
-                "text": t,
-                "timestamp": ts,
-            }
-        )
-        inserted += 1
-    return {"inserted": inserted, "meeting_id": meeting_id}
+    docs = [
+        {
+            "meeting_id": meeting_id,
+            "text": t,
+            "timestamp": base + timedelta(milliseconds=i + 1),
+            "source": "browser_webspeech",
+        }
+        for i, t in enumerate(texts)
+    ]
+    await db.transcript_segments.insert_many(docs)
+    return {"inserted": len(docs), "meeting_id": meeting_id}
 
 
 @router.post("/{meeting_id}/ask", status_code=status.HTTP_200_OK)
@@ -360,7 +389,7 @@ async def ask_about_meeting(
             rag_snippet = ""
 
     try:
-        answer = answer_meeting_question(
+        answer = await answer_meeting_question(
             meeting_title=(meeting.get("title") or "") or "",
             transcript_text=transcript_text,
             summary_text=summary_text,
@@ -396,7 +425,7 @@ async def pause_bot_system_audio(
     return {
         "message": "Bot system audio paused",
         "meeting_id": meeting_id,
-        "bot_audio_streaming": _bot_manager.is_bot_audio_streaming(meeting_id),
+        "bot_audio_streaming": (await _bot_manager.describe(meeting_id))["bot_audio_streaming"],
     }
 
 
@@ -419,7 +448,7 @@ async def resume_bot_system_audio(
     return {
         "message": "Bot system audio resumed",
         "meeting_id": meeting_id,
-        "bot_audio_streaming": _bot_manager.is_bot_audio_streaming(meeting_id),
+        "bot_audio_streaming": (await _bot_manager.describe(meeting_id))["bot_audio_streaming"],
     }
 
 
@@ -435,6 +464,11 @@ async def start_meeting(
         oid = ObjectId(meeting_id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid meeting ID")
+    if _bot_manager:
+        try:
+            await _bot_manager.admit(meeting_id)
+        except MeetingWorkerUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
     meeting = await db.meetings.find_one({"_id": oid})
     if not meeting:
         await db.meetings.insert_one({
@@ -475,7 +509,7 @@ async def stop_meeting(
     project_id = (meeting or {}).get("project_id") if meeting else None
     if _bot_manager:
         await _bot_manager.stop_bot(meeting_id)
-    ws_manager.remove_meeting(meeting_id)
+    await ws_manager.close_meeting(meeting_id)
     await db.meetings.update_one(
         {"_id": oid},
         {"$set": {"status": "ended", "ended_at": _meeting_now()}},
@@ -490,7 +524,7 @@ async def generate_summary(
     body: Optional[dict] = Body(None),
     current_user: User = Depends(get_current_active_user),
 ):
-    """On-demand summary and action items (single LLM call)."""
+    """On-demand summary and action items (map-reduce; unchanged transcript windows come from the cache)."""
     lang = (body or {}).get("language", "en")
     db = await get_database()
     try:
@@ -530,10 +564,14 @@ async def delete_meeting(
     if meeting.get("status") == "live" and _bot_manager:
         await _bot_manager.stop_bot(meeting_id)
     ws_manager.remove_meeting(meeting_id)
+    segment_writer.discard(meeting_id)
+    attendance_writer.discard(meeting_id)
     await db.transcript_segments.delete_many({"meeting_id": meeting_id})
     await db.transcripts.delete_many({"meeting_id": meeting_id})
     await db.attendance_records.delete_many({"meeting_id": meeting_id})
     await db.summaries.delete_many({"meeting_id": meeting_id})
+    await db.summary_checkpoints.delete_many({"meeting_id": meeting_id})
+    await db.transcript_rag_shards.delete_one({"_id": meeting_id})
     await db.action_items.delete_many({"meeting_id": meeting_id})
     await db.meetings.delete_one({"_id": oid})
     if meeting.get("project_id"):
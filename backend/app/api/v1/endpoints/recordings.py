@@ -1,4 +1,6 @@
-"""API for uploaded meeting recordings: upload, process (Groq transcribe/summarize/extract), list."""
+"""API for uploaded meeting recordings: upload, process in the background (chunked Whisper
+transcription, map-reduce summary, action items), poll status, list."""
+import os
 from datetime import datetime
 from typing import List, Optional
 
@@ -7,17 +9,34 @@ from bson import ObjectId
 
 from app.core.database import get_database
 from app.core.dependencies import get_current_user, get_user_from_token, verify_project_membership
-from app.models.recording import MeetingRecording, RecordingSummary
+from app.models.recording import MeetingRecording, RecordingStatus, RecordingSummary
 from app.models.user import User
-from app.services.groq_processing import transcribe_and_analyze
+from app.services.recording_processing import UploadTooLarge, expire_if_stale, spool_upload, start_recording_job
 
 router = APIRouter()
 
-# Max file size for Groq Whisper (25 MB free tier)
-MAX_UPLOAD_BYTES = 25 * 1024 * 1024
 
+def _recording_out(rec: dict) -> MeetingRecording:
+    summary = rec.get("summary")
+    return MeetingRecording(
+        id=str(rec["_id"]),
+        user_id=rec["user_id"],
+        project_id=rec["project_id"],
+        title=rec["title"],
+        file_name=rec["file_name"],
+        status=rec["status"],
+        progress=rec.get("progress"),
+        error=rec.get("error"),
+        transcription=rec.get("transcription"),
+        summary=RecordingSummary(**summary) if isinstance(summary, dict) else None,
+        summary_dict=summary if isinstance(summary, dict) else None,
+        action_items=rec.get("action_items") or [],
+        created_at=rec["created_at"],
+        updated_at=rec["updated_at"],
+    )
 
-@router.post("/upload", response_model=MeetingRecording, status_code=status.HTTP_201_CREATED)
+
+@router.post("/upload", response_model=MeetingRecording, status_code=status.HTTP_202_ACCEPTED)
 async def upload_recording(
     request: Request,
     file: UploadFile = File(...),
@@ -25,7 +44,8 @@ async def upload_recording(
     title: Optional[str] = Form(""),
     access_token: Optional[str] = Form(None),
 ):
-    """Upload a meeting recording; transcribe via Groq, summarize and extract action items; store and return."""
+    """Upload a meeting recording. The file is spooled to disk and processed in the background
+    (chunked transcription, summary, action items); poll ``GET /recordings/{id}/status``."""
     token = request.headers.get("Authorization")
     if token and token.startswith("Bearer "):
         token = token[7:].strip()
@@ -40,6 +60,11 @@ async def upload_recording(
     file_name = file.filename or "recording"
     display_title = (title or file_name).strip() or file_name
 
+    try:
+        path, size = await spool_upload(file.file, file_name)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
     db = await get_database()
     now = datetime.utcnow()
     doc = {
@@ -47,73 +72,23 @@ async def upload_recording(
         "project_id": project_id,
         "title": display_title,
         "file_name": file_name,
+        "file_size": size,
         "status": "processing",
+        "progress": {"stage": "queued", "percent": 0, "updated_at": now},
+        "error": None,
         "transcription": None,
         "summary": None,
         "action_items": [],
         "created_at": now,
         "updated_at": now,
     }
-    result = await db.recordings.insert_one(doc)
-    rec_id = str(result.inserted_id)
-
-    # Read file and process with Groq (transcribe + summarize + action items)
     try:
-        body = await file.read()
-        if len(body) > MAX_UPLOAD_BYTES:
-            await db.recordings.update_one(
-                {"_id": ObjectId(rec_id)},
-                {"$set": {"status": "failed", "updated_at": datetime.utcnow()}},
-            )
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size is {MAX_UPLOAD_BYTES // (1024*1024)} MB for transcription.",
-            )
-        transcription, summary_dict, action_items = transcribe_and_analyze(body, file_name)
-    except ValueError as e:
-        await db.recordings.update_one(
-            {"_id": ObjectId(rec_id)},
-            {"$set": {"status": "failed", "updated_at": datetime.utcnow()}},
-        )
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
-    except Exception as e:
-        await db.recordings.update_one(
-            {"_id": ObjectId(rec_id)},
-            {"$set": {"status": "failed", "updated_at": datetime.utcnow()}},
-        )
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Processing failed: {getattr(e, 'message', str(e))}",
-        )
-
-    await db.recordings.update_one(
-        {"_id": ObjectId(rec_id)},
-        {
-            "$set": {
-                "status": "completed",
-                "transcription": transcription,
-                "summary": summary_dict,
-                "action_items": action_items,
-                "updated_at": datetime.utcnow(),
-            }
-        },
-    )
-
-    summary_obj = RecordingSummary(**summary_dict) if summary_dict else None
-    return MeetingRecording(
-        id=rec_id,
-        user_id=doc["user_id"],
-        project_id=doc["project_id"],
-        title=doc["title"],
-        file_name=doc["file_name"],
-        status="completed",
-        transcription=transcription,
-        summary=summary_obj,
-        summary_dict=summary_dict,
-        action_items=action_items,
-        created_at=doc["created_at"],
-        updated_at=datetime.utcnow(),
-    )
+        result = await db.recordings.insert_one(doc)
+    except Exception:
+        os.unlink(path)
+        raise
+    start_recording_job(str(result.inserted_id), path, file_name, size)
+    return _recording_out(doc)
 
 
 @router.get("", response_model=List[MeetingRecording])
@@ -130,28 +105,7 @@ async def list_recordings(
 
     cursor = db.recordings.find(query).sort("created_at", -1)
     items = await cursor.to_list(length=100)
-    out = []
-    for m in items:
-        sid = str(m["_id"])
-        summary = m.get("summary")
-        summary_obj = RecordingSummary(**summary) if isinstance(summary, dict) else None
-        out.append(
-            MeetingRecording(
-                id=sid,
-                user_id=m["user_id"],
-                project_id=m["project_id"],
-                title=m["title"],
-                file_name=m["file_name"],
-                status=m["status"],
-                transcription=m.get("transcription"),
-                summary=summary_obj,
-                summary_dict=summary if isinstance(summary, dict) else None,
-                action_items=m.get("action_items") or [],
-                created_at=m["created_at"],
-                updated_at=m["updated_at"],
-            )
-        )
-    return out
+    return [_recording_out(await expire_if_stale(m)) for m in items]
 
 
 @router.get("/{recording_id}", response_model=MeetingRecording)
@@ -170,19 +124,26 @@ async def get_recording(
     if rec["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     await verify_project_membership(rec["project_id"], current_user)
-    summary = rec.get("summary")
-    summary_obj = RecordingSummary(**summary) if isinstance(summary, dict) else None
-    return MeetingRecording(
-        id=str(rec["_id"]),
-        user_id=rec["user_id"],
-        project_id=rec["project_id"],
-        title=rec["title"],
-        file_name=rec["file_name"],
-        status=rec["status"],
-        transcription=rec.get("transcription"),
-        summary=summary_obj,
-        summary_dict=summary if isinstance(summary, dict) else None,
-        action_items=rec.get("action_items") or [],
-        created_at=rec["created_at"],
-        updated_at=rec["updated_at"],
-    )
+    return _recording_out(await expire_if_stale(rec))
+
+
+@router.get("/{recording_id}/status", response_model=RecordingStatus)
+async def get_recording_status(
+    recording_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Processing progress for an uploaded recording (cheap to poll: no transcript in the response)."""
+    db = await get_database()
+    try:
+        rec = await db.recordings.find_one(
+            {"_id": ObjectId(recording_id)},
+            {"user_id": 1, "status": 1, "progress": 1, "error": 1, "updated_at": 1},
+        )
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid recording ID")
+    if not rec:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    if rec["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    rec = await expire_if_stale(rec)
+    return RecordingStatus(id=recording_id, status=rec["status"], progress=rec.get("progress"), error=rec.get("error"))
@@ -2,6 +2,8 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import auth, projects, tasks, recordings, meeting_bot_ws, meetings_bot, github_webhook
 
 from app.bot.bot_manager import bot_manager
+from app.bot.meeting_jobs import QueuedBotManager
+from app.core.config import settings
 
 api_router = APIRouter()
 
@@ -13,5 +15,8 @@ api_router.include_router(meeting_bot_ws.router, prefix="/ws", tags=["meeting-bo
 api_router.include_router(meetings_bot.router, prefix="/meetings", tags=["meetings"])
 api_router.include_router(github_webhook.router, prefix="/webhooks", tags=["webhooks"])
 
-# Wire bot manager into meeting routes (start/stop)
-meetings_bot.set_bot_manager(bot_manager)
+# Wire bot manager into meeting routes (start/stop); queue mode hands meetings to run_meeting_worker.py
+if (getattr(settings, "MEETING_WORKER_MODE", "inline") or "inline").lower().strip() == "queue":
+    meetings_bot.set_bot_manager(QueuedBotManager())
+else:
+    meetings_bot.set_bot_manager(bot_manager)
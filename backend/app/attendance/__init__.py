@@ -1,3 +1,3 @@
-from .attendance_tracker import AttendanceTracker
+from .attendance_tracker import AttendanceTracker, apply_participant_events, forget_tracker, tracker_for
 
-__all__ = ["AttendanceTracker"]
+__all__ = ["AttendanceTracker", "apply_participant_events", "forget_tracker", "tracker_for"]
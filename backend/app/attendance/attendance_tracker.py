@@ -1,17 +1,24 @@
 """
-Record join/leave for meeting participants. Persists to attendance_records.
+Record join/leave for meeting participants. Persists to attendance_records via the batched
+``attendance_writer`` (one Mongo write per flush instead of one per event).
 """
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
-from app.core.database import get_database
+from app.attendance.attendance_writer import attendance_writer
+
+# Join/leave events per control frame we act on (the rest of an oversized frame is ignored).
+MAX_EVENTS_PER_FRAME = 200
+
+_trackers: Dict[str, "AttendanceTracker"] = {}
 
 
 class AttendanceTracker:
-    """record_join / record_leave; stores in attendance_records."""
+    """record_join / record_leave; queued to attendance_records."""
 
-    def __init__(self, meeting_id: str):
+    def __init__(self, meeting_id: str, writer=None):
         self.meeting_id = meeting_id
+        self.writer = writer or attendance_writer
         self._recent_joins: dict = {}
 
     async def record_join(
@@ -19,37 +26,67 @@ class AttendanceTracker:
         participant_id: str,
         participant_name: str,
         meeting_role: Optional[str] = None,
+        at: Optional[datetime] = None,
     ) -> None:
-        """Insert join record (join_time, no leave_time). Avoid duplicate within 5 min."""
-        db = await get_database()
-        now = datetime.utcnow()
+        """Queue join record (join_time, no leave_time). Avoid duplicate within 5 min."""
+        now = at or datetime.utcnow()
         key = (participant_id, participant_name)
         last = self._recent_joins.get(key)
         if last and (now - last).total_seconds() < 300:
             return
         self._recent_joins[key] = now
-        await db.attendance_records.insert_one({
-            "meeting_id": self.meeting_id,
-            "participant_id": participant_id,
-            "participant_name": participant_name,
-            "join_time": now,
-            "leave_time": None,
-            "duration_seconds": None,
-            "meeting_role": meeting_role,
-        })
-
-    async def record_leave(self, participant_id: str) -> None:
-        """Set leave_time and duration_seconds on latest open record."""
-        db = await get_database()
-        now = datetime.utcnow()
-        rec = await db.attendance_records.find_one(
-            {"meeting_id": self.meeting_id, "participant_id": participant_id, "leave_time": None},
-            sort=[("join_time", -1)],
-        )
-        if rec:
-            join_time = rec.get("join_time") or now
-            duration = (now - join_time).total_seconds()
-            await db.attendance_records.update_one(
-                {"_id": rec["_id"]},
-                {"$set": {"leave_time": now, "duration_seconds": duration}},
-            )
+        self.writer.join(self.meeting_id, participant_id, participant_name, meeting_role, at=now)
+
+    async def record_leave(self, participant_id: str, at: Optional[datetime] = None) -> None:
+        """Queue leave_time / duration_seconds for the participant's open record."""
+        for key in [k for k in self._recent_joins if k[0] == participant_id]:
+            del self._recent_joins[key]
+        self.writer.leave(self.meeting_id, participant_id, at=at or datetime.utcnow())
+
+
+def tracker_for(meeting_id: str) -> AttendanceTracker:
+    """Shared tracker per meeting, so join de-duplication spans the bot, the WebSocket and the REST hooks."""
+    tracker = _trackers.get(meeting_id)
+    if tracker is None:
+        tracker = _trackers[meeting_id] = AttendanceTracker(meeting_id)
+    return tracker
+
+
+def forget_tracker(meeting_id: str) -> None:
+    _trackers.pop(meeting_id, None)
+
+
+def _event_time(ts) -> Optional[datetime]:
+    """Browser epoch seconds → UTC datetime; None (use now) when missing or more than an hour off."""
+    try:
+        ts = float(ts)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.utcnow()
+    at = datetime.utcfromtimestamp(ts) if ts > 0 else None
+    if at is None or abs((now - at).total_seconds()) > 3600:
+        return None
+    return at
+
+
+async def apply_participant_events(meeting_id: str, events: Iterable[dict]) -> int:
+    """Record ``{"event": "join"|"leave", "participant_id", "name", "ts"}`` events; returns how many were used."""
+    tracker = tracker_for(meeting_id)
+    applied = 0
+    for event in list(events)[:MAX_EVENTS_PER_FRAME]:
+        if not isinstance(event, dict):
+            continue
+        pid = str(event.get("participant_id") or "").strip()
+        if not pid:
+            continue
+        at = _event_time(event.get("ts"))
+        kind = event.get("event")
+        if kind == "join":
+            name = str(event.get("name") or "Participant").strip()[:200]
+            await tracker.record_join(pid, name, event.get("meeting_role"), at=at)
+        elif kind == "leave":
+            await tracker.record_leave(pid, at=at)
+        else:
+            continue
+        applied += 1
+    return applied
@@ -0,0 +1,228 @@
+"""
+Write-behind persistence for attendance_records.
+
+``AttendanceTracker`` queues join / leave operations here instead of doing a Mongo round-trip per
+event. Operations are buffered per meeting and flushed every ``ATTENDANCE_FLUSH_SECONDS``, at
+``ATTENDANCE_FLUSH_SIZE`` operations, or when the meeting stops. A flush resolves joins and leaves
+that fall in the same batch in memory, closes records already in Mongo with one ``bulk_write`` and
+inserts the new ones with one ``insert_many``. Join documents get their ``_id`` when queued, and a
+leave only matches still-open records, so retrying a batch that partially landed is harmless.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateMany
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
+
+from app.core.config import settings
+from app.core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+_DUPLICATE_KEY = 11000
+
+
+class _PendingAttendance:
+    __slots__ = ("ops", "oldest_at")
+
+    def __init__(self):
+        # ("join", doc) or ("leave", participant_id, leave_time), in arrival order.
+        self.ops: List[tuple] = []
+        self.oldest_at = 0.0
+
+
+def resolve_batch(ops: List[tuple]) -> Tuple[List[dict], List[Tuple[str, datetime]]]:
+    """Fold a batch into (join documents to insert, leaves that close records already in Mongo)."""
+    docs: List[dict] = []
+    open_in_batch: Dict[str, dict] = {}
+    leaves: List[Tuple[str, datetime]] = []
+    for op in ops:
+        if op[0] == "join":
+            doc = dict(op[1])
+            docs.append(doc)
+            open_in_batch[doc["participant_id"]] = doc
+            continue
+        _, participant_id, at = op
+        doc = open_in_batch.pop(participant_id, None)
+        if doc is None:
+            leaves.append((participant_id, at))
+        else:
+            doc["leave_time"] = at
+            doc["duration_seconds"] = max(0.0, (at - doc["join_time"]).total_seconds())
+    return docs, leaves
+
+
+class AttendanceWriter:
+    """Per-meeting buffers of join / leave operations flushed to ``attendance_records`` in batches."""
+
+    def __init__(self, flush_size: int = None, flush_seconds: float = None, max_retries: int = None):
+        self.flush_size = max(1, int(flush_size or getattr(settings, "ATTENDANCE_FLUSH_SIZE", 50)))
+        self.flush_seconds = float(
+            flush_seconds if flush_seconds is not None else getattr(settings, "ATTENDANCE_FLUSH_SECONDS", 2.0)
+        )
+        self.max_retries = max(
+            0, int(max_retries if max_retries is not None else getattr(settings, "ATTENDANCE_WRITE_RETRIES", 3))
+        )
+        self._pending: Dict[str, _PendingAttendance] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._size_flush: Dict[str, asyncio.Task] = {}
+        self.events = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def join(
+        self,
+        meeting_id: str,
+        participant_id: str,
+        participant_name: str,
+        meeting_role: Optional[str] = None,
+        at: Optional[datetime] = None,
+    ) -> None:
+        self._add(meeting_id, ("join", {
+            "_id": ObjectId(),
+            "meeting_id": meeting_id,
+            "participant_id": participant_id,
+            "participant_name": participant_name,
+            "join_time": at or datetime.utcnow(),
+            "leave_time": None,
+            "duration_seconds": None,
+            "meeting_role": meeting_role,
+        }))
+
+    def leave(self, meeting_id: str, participant_id: str, at: Optional[datetime] = None) -> None:
+        self._add(meeting_id, ("leave", participant_id, at or datetime.utcnow()))
+
+    def _add(self, meeting_id: str, op: tuple) -> None:
+        pending = self._pending.get(meeting_id)
+        if pending is None:
+            pending = self._pending[meeting_id] = _PendingAttendance()
+        if not pending.ops:
+            pending.oldest_at = time.monotonic()
+        pending.ops.append(op)
+        self.events += 1
+        self._ensure_flusher()
+        scheduled = self._size_flush.get(meeting_id)
+        if len(pending.ops) >= self.flush_size and (scheduled is None or scheduled.done()):
+            self._size_flush[meeting_id] = asyncio.create_task(self.flush(meeting_id))
+
+    def pending_count(self, meeting_id: str = None) -> int:
+        if meeting_id is not None:
+            pending = self._pending.get(meeting_id)
+            return len(pending.ops) if pending else 0
+        return sum(len(p.ops) for p in self._pending.values())
+
+    def discard(self, meeting_id: str) -> None:
+        """Forget unwritten operations (meeting deleted)."""
+        self._pending.pop(meeting_id, None)
+        self._size_flush.pop(meeting_id, None)
+
+    async def flush(self, meeting_id: str) -> int:
+        """Write everything pending for one meeting; returns operations applied."""
+        lock = self._locks.setdefault(meeting_id, asyncio.Lock())
+        async with lock:
+            pending = self._pending.get(meeting_id)
+            if not pending or not pending.ops:
+                return 0
+            batch = pending.ops
+            pending.ops = []
+            if not await self._write_with_retry(meeting_id, batch):
+                pending.ops = batch + pending.ops
+                pending.oldest_at = time.monotonic()
+                self.failed_batches += 1
+                return 0
+            if not pending.ops:
+                self._pending.pop(meeting_id, None)
+                self._size_flush.pop(meeting_id, None)
+            else:
+                pending.oldest_at = time.monotonic()
+            self.batches += 1
+            return len(batch)
+
+    async def flush_all(self) -> int:
+        total = 0
+        for meeting_id in list(self._pending):
+            total += await self.flush(meeting_id)
+        return total
+
+    async def _write_with_retry(self, meeting_id: str, batch: List[tuple]) -> bool:
+        docs, leaves = resolve_batch(batch)
+        # Leaves first: a participant who left and rejoined inside this batch keeps the new record open.
+        updates = [
+            UpdateMany(
+                {"meeting_id": meeting_id, "participant_id": pid, "leave_time": None},
+                [{"$set": {
+                    "leave_time": at,
+                    "duration_seconds": {"$divide": [{"$subtract": [at, {"$ifNull": ["$join_time", at]}]}, 1000]},
+                }}],
+            )
+            for pid, at in leaves
+        ]
+        delay = 0.2
+        for attempt in range(self.max_retries + 1):
+            try:
+                db = await get_database()
+                if updates:
+                    await db.attendance_records.bulk_write(updates, ordered=True)
+                    updates = []
+                if docs:
+                    try:
+                        await db.attendance_records.insert_many(docs, ordered=False)
+                    except BulkWriteError as e:
+                        errors = (e.details or {}).get("writeErrors") or []
+                        if not errors or any(err.get("code") != _DUPLICATE_KEY for err in errors):
+                            raise
+                return True
+            except (ConnectionFailure, OperationFailure) as e:
+                logger.warning(
+                    "Attendance write failed meeting_id=%s (attempt %d/%d): %s",
+                    meeting_id, attempt + 1, self.max_retries + 1, e,
+                )
+            except Exception:
+                logger.exception("Attendance write failed meeting_id=%s", meeting_id)
+                return False
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+        return False
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        interval = max(0.1, self.flush_seconds / 2)
+        while self._pending:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for meeting_id, pending in list(self._pending.items()):
+                if pending.ops and now - pending.oldest_at >= self.flush_seconds:
+                    try:
+                        await self.flush(meeting_id)
+                    except Exception:
+                        logger.exception("Attendance flush failed meeting_id=%s", meeting_id)
+
+    async def close(self) -> None:
+        """Flush everything and stop the background flusher (shutdown)."""
+        await self.flush_all()
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": self.pending_count(),
+            "events": self.events,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+        }
+
+
+attendance_writer = AttendanceWriter()
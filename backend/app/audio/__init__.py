@@ -1,5 +1,14 @@
-from .audio_processor import AudioProcessor
-from .signal_utils import apply_noise_gate, pcm16_rms, pcm16_rms_db
+from .audio_processor import AudioProcessor, SpeechSegment
+from .signal_utils import PCMStats, analyze_pcm16, apply_noise_gate, pcm16_rms, pcm16_rms_db
 from .system_audio_capture import SystemAudioCapture
 
-__all__ = ["AudioProcessor", "SystemAudioCapture", "pcm16_rms", "pcm16_rms_db", "apply_noise_gate"]
+__all__ = [
+    "AudioProcessor",
+    "SpeechSegment",
+    "SystemAudioCapture",
+    "PCMStats",
+    "analyze_pcm16",
+    "pcm16_rms",
+    "pcm16_rms_db",
+    "apply_noise_gate",
+]
@@ -5,16 +5,31 @@ Advanced audio processor with multi-layer speech detection:
   3. WebRTC VAD — neural-net voice activity detection
   4. Speech confirmation buffer — require N consecutive speech frames before emitting
   5. Debug metrics logging — energy level, VAD decision, skip reason
+
+``segment_speech`` is the streaming variant used by STT_SEGMENTATION=vad: it classifies every
+VAD sub-window and returns whole utterances cut on speech boundaries, padded on both sides.
 """
 import logging
-from typing import Optional, List
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, List
 
-from app.audio.signal_utils import apply_noise_gate, pcm16_rms, pcm16_rms_db
+from app.audio.signal_utils import SILENCE_DB, analyze_pcm16
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class SpeechSegment:
+    """One padded utterance; ``start``/``end`` are byte offsets in the stream fed to ``segment_speech``."""
+
+    pcm: bytes
+    start: int
+    end: int
+    speech_ms: int
+
+
 # ---------------------------------------------------------------------------
 # Main AudioProcessor
 # ---------------------------------------------------------------------------
@@ -73,6 +88,34 @@ class AudioProcessor:
         self._skipped_energy: int = 0
         self._skipped_vad: int = 0
 
+        # Streaming utterance segmentation (segment_speech)
+        self.vad_frame_ms = int(getattr(settings, "VAD_FRAME_MS", 20))
+        if self.vad_frame_ms not in (10, 20, 30):
+            self.vad_frame_ms = 20
+        self._window_bytes = int(self.sample_rate * self.vad_frame_ms / 1000) * 2
+        ms = self.vad_frame_ms
+        self._confirm_windows = max(1, int(getattr(settings, "VAD_SEGMENT_CONFIRM_MS", 120)) // ms)
+        self._end_silence_windows = max(1, int(getattr(settings, "VAD_SEGMENT_END_SILENCE_MS", 600)) // ms)
+        self._pad_windows = min(
+            self._end_silence_windows, max(0, int(getattr(settings, "VAD_SEGMENT_PAD_MS", 300)) // ms)
+        )
+        self._min_speech_windows = max(1, int(getattr(settings, "VAD_SEGMENT_MIN_SPEECH_MS", 250)) // ms)
+        self._max_segment_bytes = max(
+            self._window_bytes,
+            int(float(getattr(settings, "VAD_SEGMENT_MAX_SECONDS", 15.0)) * self.sample_rate) * 2,
+        )
+        self._seg_carry = bytearray()
+        self._seg_pos = 0  # stream offset of the first byte in _seg_carry
+        self._preroll: Deque[bytes] = deque(maxlen=self._pad_windows + self._confirm_windows)
+        self._speech_run = 0
+        self._utterance: Optional[bytearray] = None
+        self._utterance_start = 0
+        self._utterance_speech = 0
+        self._trailing_silence = 0
+        self.seg_windows = 0
+        self.seg_speech_windows = 0
+        self.seg_dropped_short = 0
+
         # WebRTC VAD
         self._vad = None
         if use_vad:
@@ -102,12 +145,14 @@ class AudioProcessor:
         self._total_frames += 1
         self._frames_since_log += 1
 
-        # ── Step 1: Noise gate ──
-        frame = apply_noise_gate(frame, self.noise_gate_threshold_rms)
+        # ── Step 1: Noise gate (one vectorized pass gives RMS + dBFS) ──
+        stats = analyze_pcm16(frame, spectral=False)
+        rms, rms_db = stats.rms, stats.rms_db
+        if rms < self.noise_gate_threshold_rms:
+            frame = bytes(len(frame))
+            rms, rms_db = 0.0, SILENCE_DB
 
         # ── Step 2: Energy gating ──
-        rms = pcm16_rms(frame)
-        rms_db = pcm16_rms_db(frame)
         is_energetic = rms >= self.energy_threshold_rms
 
         if not is_energetic:
@@ -171,6 +216,88 @@ class AudioProcessor:
         """Return any remaining buffered audio."""
         return self._flush_buffer()
 
+    def segment_speech(self, pcm: bytes) -> List[SpeechSegment]:
+        """
+        Feed PCM16 (any length) and return the utterances it completed. Every ``VAD_FRAME_MS``
+        sub-window is classified; an utterance opens after ``VAD_SEGMENT_CONFIRM_MS`` of speech
+        (with ``VAD_SEGMENT_PAD_MS`` of pre-roll) and closes after ``VAD_SEGMENT_END_SILENCE_MS`` of
+        silence, keeping ``VAD_SEGMENT_PAD_MS`` of it as tail padding.
+        """
+        self._seg_carry += pcm
+        n = self._window_bytes
+        out: List[SpeechSegment] = []
+        pos = 0
+        while len(self._seg_carry) - pos >= n:
+            window = bytes(self._seg_carry[pos:pos + n])
+            segment = self._segment_window(window, self._seg_pos + pos)
+            if segment is not None:
+                out.append(segment)
+            pos += n
+        if pos:
+            del self._seg_carry[:pos]
+            self._seg_pos += pos
+        return out
+
+    def flush_speech(self) -> Optional[SpeechSegment]:
+        """Close the utterance in progress (end of stream)."""
+        if self._utterance is None:
+            return None
+        return self._close_utterance(len(self._utterance))
+
+    def _is_speech_window(self, window: bytes) -> bool:
+        if analyze_pcm16(window, spectral=False).rms < self.energy_threshold_rms:
+            return False
+        if self.use_vad and self._vad:
+            try:
+                return self._vad.is_speech(window, self.sample_rate)
+            except Exception:
+                return True
+        return True
+
+    def _segment_window(self, window: bytes, offset: int) -> Optional[SpeechSegment]:
+        speech = self._is_speech_window(window)
+        self.seg_windows += 1
+        if speech:
+            self.seg_speech_windows += 1
+        if self._utterance is None:
+            self._preroll.append(window)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self._confirm_windows:
+                self._utterance = bytearray(b"".join(self._preroll))
+                self._utterance_start = offset + len(window) - len(self._utterance)
+                self._utterance_speech = self._speech_run
+                self._trailing_silence = 0
+                self._preroll.clear()
+                self._speech_run = 0
+            return None
+        self._utterance += window
+        if speech:
+            self._utterance_speech += 1
+            self._trailing_silence = 0
+        else:
+            self._trailing_silence += 1
+        if self._trailing_silence >= self._end_silence_windows:
+            keep = len(self._utterance) - (self._trailing_silence - self._pad_windows) * len(window)
+            return self._close_utterance(keep)
+        if len(self._utterance) >= self._max_segment_bytes:
+            # Long monologue: cut here and keep going without waiting for a pause.
+            segment = self._close_utterance(len(self._utterance))
+            self._utterance = bytearray()
+            self._utterance_start = offset + len(window)
+            self._utterance_speech = 0
+            self._trailing_silence = 0
+            return segment
+        return None
+
+    def _close_utterance(self, keep: int) -> Optional[SpeechSegment]:
+        pcm = bytes(self._utterance[:keep])
+        start, speech = self._utterance_start, self._utterance_speech
+        self._utterance = None
+        if speech < self._min_speech_windows or not pcm:
+            self.seg_dropped_short += 1
+            return None
+        return SpeechSegment(pcm=pcm, start=start, end=start + len(pcm), speech_ms=speech * self.vad_frame_ms)
+
     def get_stats(self) -> dict:
         """Return debug statistics."""
         return {
@@ -186,16 +313,20 @@ class AudioProcessor:
     # -----------------------------------------------------------------------
 
     def _check_vad(self, frame: bytes) -> bool:
-        """Run WebRTC VAD on the frame. Handles frame-size requirements."""
+        """Run WebRTC VAD on every sub-window of the frame; speech when at least half of them are."""
         # WebRTC VAD needs exact 10/20/30 ms frames at 8/16/32 kHz
-        frame_ms = 20
-        frame_bytes = int(self.sample_rate * frame_ms / 1000) * 2  # 640 for 16kHz/20ms
+        frame_bytes = self._window_bytes  # 640 for 16kHz/20ms
         if len(frame) < frame_bytes:
             return True  # too short to check, assume speech
+        speech = total = 0
         try:
-            return self._vad.is_speech(frame[:frame_bytes], self.sample_rate)
+            for start in range(0, len(frame) - frame_bytes + 1, frame_bytes):
+                total += 1
+                if self._vad.is_speech(frame[start:start + frame_bytes], self.sample_rate):
+                    speech += 1
         except Exception:
             return True  # on error, assume speech to avoid dropping real audio
+        return speech * 2 >= total
 
     def _flush_buffer(self) -> Optional[bytes]:
         if not self._buffer:
@@ -0,0 +1,219 @@
+"""
+Framed bot → API audio protocol for ``/ws/audio/{meeting_id}?framing=1``.
+
+Binary frame (little-endian), followed by the PCM payload of ``count`` capture blocks::
+
+    magic "MA" | version u8 | codec u8 | sample_rate u32 | seq u32 | count u16 | capture_us u64
+
+``seq`` numbers capture blocks (not frames): a frame covers ``[seq, seq + count)`` and
+``capture_us`` is the wall-clock capture time (µs since epoch) of its first sample. A frame with
+``count == 0`` is a heartbeat. The server answers with JSON text messages: ``{"type": "hello",
+"next_seq": n}`` on connect (``null`` when it has no state) and ``{"type": "ack", "seq": n}`` meaning
+every block below ``n`` was received; the bot keeps unacknowledged frames and resends them after a
+reconnect.
+
+Connections without ``framing=1`` keep the legacy protocol (bare PCM, empty heartbeats).
+"""
+import struct
+import time
+from collections import deque, namedtuple
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"MA"
+VERSION = 1
+CODEC_PCM16 = 0
+
+_HEADER = struct.Struct("<2sBBIIHQ")
+HEADER_SIZE = _HEADER.size
+
+AudioFrame = namedtuple("AudioFrame", "seq count sample_rate codec capture_ts payload")
+
+
+def encode_frame(
+    seq: int,
+    count: int,
+    payload: bytes,
+    capture_ts: float,
+    sample_rate: int,
+    codec: int = CODEC_PCM16,
+) -> bytes:
+    """Build one binary frame; ``capture_ts`` is ``time.time()`` of the first sample."""
+    header = _HEADER.pack(
+        MAGIC, VERSION, codec, sample_rate, seq & 0xFFFFFFFF, count, int(capture_ts * 1_000_000)
+    )
+    return header + payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Parse a binary frame; raises ValueError when it is not one."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"audio frame too short ({len(data)} bytes)")
+    magic, version, codec, sample_rate, seq, count, capture_us = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an audio frame (bad magic/version)")
+    if codec != CODEC_PCM16:
+        raise ValueError(f"unsupported audio codec flag {codec}")
+    return AudioFrame(seq, count, sample_rate, codec, capture_us / 1_000_000, memoryview(data)[HEADER_SIZE:])
+
+
+class FrameSender:
+    """
+    Bot-side numbering and resend buffer.
+
+    ``build`` batches capture blocks ``(pcm, capture_ts)`` into one frame and keeps it until the
+    server acknowledges it; ``resume`` returns what to resend after a reconnect. At most
+    ``max_unacked`` frames are kept (oldest evicted), bounding memory during long outages.
+    """
+
+    def __init__(self, sample_rate: int, max_unacked: int = 256, codec: int = CODEC_PCM16):
+        self.sample_rate = sample_rate
+        self.codec = codec
+        self.next_seq = 0
+        self._unacked: Deque[Tuple[int, int, bytes]] = deque()
+        self.max_unacked = max(1, int(max_unacked))
+        self.frames_sent = 0
+        self.resent = 0
+        self.evicted = 0
+
+    def build(self, blocks: Sequence[Tuple[bytes, float]]) -> bytes:
+        seq = self.next_seq
+        frame = encode_frame(
+            seq, len(blocks), b"".join(b for b, _ in blocks), blocks[0][1], self.sample_rate, self.codec
+        )
+        self.next_seq += len(blocks)
+        self._unacked.append((seq, self.next_seq, frame))
+        if len(self._unacked) > self.max_unacked:
+            self._unacked.popleft()
+            self.evicted += 1
+        self.frames_sent += 1
+        return frame
+
+    def heartbeat(self) -> bytes:
+        return encode_frame(self.next_seq, 0, b"", time.time(), self.sample_rate, self.codec)
+
+    def ack(self, seq: int) -> None:
+        """Server has every block below ``seq``."""
+        while self._unacked and self._unacked[0][1] <= seq:
+            self._unacked.popleft()
+
+    def resume(self, server_next_seq: Optional[int]) -> List[bytes]:
+        """Frames to resend after the server's hello (``None``: server has no state, resend all)."""
+        if server_next_seq is not None:
+            if server_next_seq > self.next_seq:
+                # Server saw more of this meeting than we did (bot restarted): continue after it.
+                self.next_seq = server_next_seq
+                self._unacked.clear()
+                return []
+            self.ack(server_next_seq)
+        frames = [frame for _, _, frame in self._unacked]
+        self.resent += len(frames)
+        return frames
+
+    @property
+    def unacked(self) -> int:
+        return len(self._unacked)
+
+
+class FrameSequencer:
+    """
+    Server-side ordering for one meeting's stream; survives bot reconnects.
+
+    ``push`` returns frames ready to process, in sequence order. Replayed or duplicate frames are
+    dropped, early frames wait in a small reorder buffer, and a hole that is still open after
+    ``reorder_window`` buffered frames or ``max_wait`` seconds is skipped and counted as a gap.
+    """
+
+    def __init__(self, reorder_window: int = 8, max_wait: float = 1.0):
+        self.reorder_window = max(0, int(reorder_window))
+        self.max_wait = float(max_wait)
+        self.next_seq: Optional[int] = None
+        self._pending: Dict[int, AudioFrame] = {}
+        self._waiting_since = 0.0
+        self.frames = 0
+        self.blocks = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.gaps = 0
+        self.gap_blocks = 0
+        self.malformed = 0
+
+    def push(self, frame: AudioFrame, now: float = None) -> List[AudioFrame]:
+        now = time.monotonic() if now is None else now
+        if frame.count <= 0:
+            return self._release_stale(now)
+        if self.next_seq is None:
+            self.next_seq = frame.seq
+        if frame.seq + frame.count <= self.next_seq or frame.seq in self._pending:
+            self.duplicates += 1
+            return self._release_stale(now)
+        if frame.seq > self.next_seq:
+            if not self._pending:
+                self._waiting_since = now
+            self._pending[frame.seq] = frame
+            return self._release_stale(now)
+        ready = [self._trim(frame)]
+        self._accept(ready[0])
+        ready.extend(self._drain())
+        return ready
+
+    def _trim(self, frame: AudioFrame) -> AudioFrame:
+        """Drop the already-received head of a frame that overlaps ``next_seq``."""
+        skip = self.next_seq - frame.seq
+        if skip <= 0:
+            return frame
+        block_bytes = len(frame.payload) // frame.count
+        block_seconds = block_bytes / 2 / frame.sample_rate if frame.sample_rate else 0.0
+        return frame._replace(
+            seq=self.next_seq,
+            count=frame.count - skip,
+            capture_ts=frame.capture_ts + skip * block_seconds,
+            payload=frame.payload[skip * block_bytes:],
+        )
+
+    def _accept(self, frame: AudioFrame) -> None:
+        self.next_seq = frame.seq + frame.count
+        self.frames += 1
+        self.blocks += frame.count
+
+    def _drain(self) -> List[AudioFrame]:
+        ready = []
+        while self._pending:
+            head = min(self._pending)
+            if head > self.next_seq:
+                break
+            frame = self._pending.pop(head)
+            if frame.seq + frame.count <= self.next_seq:
+                self.duplicates += 1
+                continue
+            frame = self._trim(frame)
+            self.reordered += 1
+            self._accept(frame)
+            ready.append(frame)
+        return ready
+
+    def _release_stale(self, now: float) -> List[AudioFrame]:
+        if not self._pending:
+            return []
+        if len(self._pending) <= self.reorder_window and now - self._waiting_since < self.max_wait:
+            return []
+        head = min(self._pending)
+        self.gaps += 1
+        self.gap_blocks += head - self.next_seq
+        self.next_seq = head
+        ready = self._drain()
+        if self._pending:
+            self._waiting_since = now
+        return ready
+
+    def get_stats(self) -> dict:
+        return {
+            "next_seq": self.next_seq,
+            "frames": self.frames,
+            "blocks": self.blocks,
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "gaps": self.gaps,
+            "gap_blocks": self.gap_blocks,
+            "malformed": self.malformed,
+            "buffered": len(self._pending),
+        }
@@ -0,0 +1,109 @@
+"""
+Fixed-capacity PCM ring buffer that hands out zero-copy ``memoryview`` windows.
+
+Storage is mirrored (every byte is written at ``i`` and ``i + capacity``), so any window of up
+to ``capacity`` bytes is contiguous and can be returned without copying. Writes cost two memcpy
+of the incoming frame; reads, trims and push-backs only move integer cursors.
+
+Windows stay valid until later writes wrap over them — copy (e.g. into a WAV payload) before
+awaiting anything that lets new audio arrive.
+"""
+from typing import Optional
+
+
+class PCMRingBuffer:
+    """Append PCM frames; read overlapping windows; rewind the read cursor after failures."""
+
+    def __init__(self, capacity_bytes: int, overlap_bytes: int = 0, sample_width: int = 2):
+        self.sample_width = max(1, int(sample_width))
+        self.capacity = self._align(max(int(capacity_bytes), self.sample_width))
+        self.overlap_bytes = self._align(max(0, int(overlap_bytes)))
+        self._storage = bytearray(self.capacity * 2)
+        self._view = memoryview(self._storage)
+        # Absolute stream positions (bytes ever written / consumed); data at p is intact
+        # while p >= _write_pos - capacity.
+        self._write_pos = 0
+        self._read_pos = 0
+        self.dropped_bytes = 0
+
+    def _align(self, n: int) -> int:
+        return n - (n % self.sample_width)
+
+    def __len__(self) -> int:
+        return self._write_pos - self._read_pos
+
+    @property
+    def read_position(self) -> int:
+        """Absolute stream offset of the first unread byte."""
+        return self._read_pos
+
+    @property
+    def write_position(self) -> int:
+        """Absolute stream offset just past the last written byte."""
+        return self._write_pos
+
+    def write(self, data) -> None:
+        """Append bytes-like data; when full, the oldest unread audio is dropped (and counted)."""
+        mv = memoryview(data).cast("B")
+        n = len(mv)
+        if not n:
+            return
+        cap = self.capacity
+        if n > cap:
+            skipped = n - cap
+            mv = mv[skipped:]
+            self._write_pos += skipped
+            n = cap
+        pos = self._write_pos % cap
+        first = min(n, cap - pos)
+        self._storage[pos:pos + first] = mv[:first]
+        self._storage[pos + cap:pos + cap + first] = mv[:first]
+        rest = n - first
+        if rest:
+            self._storage[0:rest] = mv[first:]
+            self._storage[cap:cap + rest] = mv[first:]
+        self._write_pos += n
+        oldest = self._write_pos - cap
+        if self._read_pos < oldest:
+            self.dropped_bytes += oldest - self._read_pos
+            self._read_pos = oldest
+
+    def peek(self, nbytes: int) -> memoryview:
+        """Zero-copy view of up to ``nbytes`` unread bytes (cursor unchanged)."""
+        n = self._align(min(max(0, int(nbytes)), len(self)))
+        start = self._read_pos % self.capacity
+        return self._view[start:start + n]
+
+    def consume(self, nbytes: int) -> int:
+        """Advance the read cursor; returns bytes actually consumed."""
+        n = self._align(min(max(0, int(nbytes)), len(self)))
+        self._read_pos += n
+        return n
+
+    def next_window(self, size_bytes: int) -> Optional[memoryview]:
+        """
+        Return the next ``size_bytes`` window, or None if not enough audio is buffered.
+        The cursor advances by ``size_bytes - overlap_bytes`` so the tail is re-read next time.
+        """
+        size = self._align(int(size_bytes))
+        if size <= 0 or len(self) < size:
+            return None
+        window = self.peek(size)
+        self.consume(max(0, size - self.overlap_bytes))
+        return window
+
+    def rewind_to(self, position: int) -> int:
+        """
+        Move the read cursor back to an absolute stream ``position`` ("push back" already-read
+        audio without copying). Clamped to what is still in storage; never moves forward.
+        Returns the number of bytes restored.
+        """
+        target = max(int(position), self._write_pos - self.capacity, 0)
+        if target >= self._read_pos:
+            return 0
+        restored = self._align(self._read_pos - target)
+        self._read_pos -= restored
+        return restored
+
+    def clear(self) -> None:
+        self._read_pos = self._write_pos
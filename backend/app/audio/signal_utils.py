@@ -1,41 +1,115 @@
+"""
+PCM16-LE mono signal metrics backed by NumPy.
+
+``analyze_pcm16`` views the buffer in place (``np.frombuffer``) and returns every metric the
+STT pipeline and AudioProcessor need in one call; the single-metric helpers are thin wrappers.
+"""
 import math
-import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+# dBFS reported for (near) digital silence
+SILENCE_DB = -96.0
+
+
+@dataclass(frozen=True)
+class PCMStats:
+    """Signal metrics for one PCM16 buffer."""
+
+    samples: int
+    rms: float
+    rms_db: float
+    peak: int
+    zcr: float
+    spectral_flatness: float
+
+
+SILENT_STATS = PCMStats(samples=0, rms=0.0, rms_db=SILENCE_DB, peak=0, zcr=0.0, spectral_flatness=0.0)
+
+
+def pcm16_view(pcm_bytes) -> np.ndarray:
+    """Zero-copy int16 view over PCM16-LE bytes (bytes, bytearray or memoryview); odd tail byte ignored."""
+    return np.frombuffer(pcm_bytes, dtype="<i2", count=len(pcm_bytes) // 2)
+
+
+def _rms_to_db(rms: float) -> float:
+    if rms < 1.0:
+        return SILENCE_DB
+    return 20.0 * math.log10(rms / 32767.0)
+
+
+def _spectral_flatness(samples: np.ndarray) -> float:
+    """
+    Wiener entropy of the power spectrum (geometric / arithmetic mean, DC bin excluded).
+    White noise is close to 1.0; voiced speech and tones sit well below 0.3.
+    """
+    if samples.size < 4:
+        return 0.0
+    power = np.abs(np.fft.rfft(samples))[1:] ** 2
+    mean_power = float(power.mean())
+    if mean_power <= 0.0:
+        return 0.0
+    geo_mean = float(np.exp(np.log(power + 1e-12).mean()))
+    return min(1.0, geo_mean / mean_power)
+
+
+def analyze_pcm16(pcm_bytes, spectral: bool = True) -> PCMStats:
+    """
+    Compute RMS, dBFS, peak, zero-crossing rate and (optionally) spectral flatness.
+
+    Pass ``spectral=False`` on short per-frame paths where the FFT is not needed.
+    """
+    x = pcm16_view(pcm_bytes)
+    n = int(x.size)
+    if n == 0:
+        return SILENT_STATS
+    f = x.astype(np.float64)
+    rms = math.sqrt(float(f.dot(f)) / n)
+    peak = max(int(x.max()), -int(x.min()))
+    if n > 1:
+        signs = x >= 0
+        zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / (n - 1)
+    else:
+        zcr = 0.0
+    flatness = _spectral_flatness(f) if spectral and rms > 0.0 else 0.0
+    return PCMStats(
+        samples=n,
+        rms=rms,
+        rms_db=_rms_to_db(rms),
+        peak=peak,
+        zcr=zcr,
+        spectral_flatness=flatness,
+    )
 
 
 def pcm16_rms(pcm_bytes: bytes) -> float:
     """Calculate RMS energy of PCM16-LE mono audio bytes."""
-    if len(pcm_bytes) < 2:
-        return 0.0
-    n = len(pcm_bytes) // 2
-    total = 0.0
-    for i in range(0, len(pcm_bytes) - 1, 2):
-        sample = struct.unpack_from("<h", pcm_bytes, i)[0]
-        total += sample * sample
-    return (total / n) ** 0.5 if n else 0.0
+    return analyze_pcm16(pcm_bytes, spectral=False).rms
 
 
 def pcm16_rms_db(pcm_bytes: bytes) -> float:
     """RMS energy in dBFS (0 dBFS = full-scale 32767)."""
-    rms = pcm16_rms(pcm_bytes)
-    if rms < 1.0:
-        return -96.0
-    return 20.0 * math.log10(rms / 32767.0)
+    return _rms_to_db(pcm16_rms(pcm_bytes))
 
 
 def pcm16_peak(pcm_bytes: bytes) -> int:
     """Peak absolute sample value for PCM16 mono audio bytes."""
-    if len(pcm_bytes) < 2:
-        return 0
-    peak = 0
-    for i in range(0, len(pcm_bytes) - 1, 2):
-        sample = abs(struct.unpack_from("<h", pcm_bytes, i)[0])
-        if sample > peak:
-            peak = sample
-    return peak
+    return analyze_pcm16(pcm_bytes, spectral=False).peak
+
+
+def pcm16_zero_crossing_rate(pcm_bytes: bytes) -> float:
+    """
+    Fraction of sign changes between consecutive samples.
+    Pure noise has ZCR ~0.5; speech is typically 0.02–0.20.
+    """
+    if len(pcm_bytes) < 4:
+        return 0.0
+    return analyze_pcm16(pcm_bytes, spectral=False).zcr
 
 
 def apply_noise_gate(frame: bytes, threshold_rms: float) -> bytes:
     """Hard-gate a frame to zero when overall RMS is below threshold."""
     if pcm16_rms(frame) < threshold_rms:
-        return b"\x00" * len(frame)
+        return bytes(len(frame))
     return frame
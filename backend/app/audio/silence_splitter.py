@@ -0,0 +1,197 @@
+"""
+Streaming silence-based splitting of long recordings into transcription chunks.
+
+``SilenceSplitter`` is fed PCM16-LE mono in blocks of any size and emits ``AudioChunk``s of about
+``target_seconds``. A chunk is cut in the middle of the first pause (``min_silence_ms`` of frames
+below ``silence_db`` dBFS) once the target length is reached. With no pause before
+``max_seconds`` it is cut at the quietest frame. Frame levels are computed once per frame, and only
+the chunk being assembled is buffered, so memory stays constant however long the recording is.
+
+``iter_pcm16_file`` decodes a file to 16 kHz mono PCM blocks: ffmpeg when it is on PATH (any
+container Whisper accepts, video included), otherwise ``soundfile`` (WAV, FLAC, Ogg, MP3).
+"""
+import math
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from app.audio.signal_utils import SILENCE_DB, pcm16_view
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start_seconds: float
+    pcm: bytes
+    sample_rate: int
+    peak_db: float  # loudest frame; chunks that never rise above the silence floor can be skipped
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+
+def _frame_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    frames = samples[: samples.size - samples.size % frame].reshape(-1, frame).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    with np.errstate(divide="ignore"):
+        db = 20.0 * np.log10(rms / 32767.0)
+    return np.where(rms < 1.0, SILENCE_DB, db)
+
+
+class SilenceSplitter:
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        target_seconds: float = 60.0,
+        max_seconds: float = 120.0,
+        min_silence_ms: int = 400,
+        silence_db: float = -40.0,
+        frame_ms: int = 30,
+    ):
+        self.sample_rate = sample_rate
+        self.silence_db = silence_db
+        self._frame = max(1, sample_rate * frame_ms // 1000)
+        self._target_frames = max(1, int(target_seconds * 1000 / frame_ms))
+        self._max_frames = max(self._target_frames, int(max_seconds * 1000 / frame_ms))
+        self._min_silence = max(1, int(math.ceil(min_silence_ms / frame_ms)))
+        self._buf = bytearray()
+        self._levels = np.empty(0, dtype=np.float32)  # dBFS per complete frame in _buf
+        self._scan = 0  # next frame index to examine for a pause
+        self._run = 0  # silent frames in a row ending at _scan
+        self._start_sample = 0
+        self._index = 0
+
+    def feed(self, pcm: bytes) -> List[AudioChunk]:
+        """Append audio; returns the chunks completed by it (possibly none)."""
+        done_bytes = len(self._levels) * self._frame * 2
+        self._buf += pcm
+        complete = (len(self._buf) - done_bytes) // (self._frame * 2) * self._frame
+        if complete:
+            fresh = pcm16_view(bytes(self._buf[done_bytes: done_bytes + complete * 2]))
+            self._levels = np.concatenate([self._levels, _frame_db(fresh, self._frame)])
+        chunks = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                return chunks
+            chunks.append(self._emit(cut))
+
+    def flush(self) -> Optional[AudioChunk]:
+        """End of input: the remaining audio as the last chunk (None when empty)."""
+        if len(self._buf) < 2:
+            return None
+        return self._emit(None)
+
+    def _find_cut(self) -> Optional[int]:
+        levels = self._levels
+        if len(levels) < self._target_frames:
+            return None
+        # Pause tracking includes the frames just before the target, so a pause straddling it counts.
+        if self._scan == 0:
+            self._scan = max(0, self._target_frames - self._min_silence)
+        end = min(len(levels), self._max_frames)
+        while self._scan < end:
+            self._run = self._run + 1 if levels[self._scan] < self.silence_db else 0
+            self._scan += 1
+            if self._run >= self._min_silence and self._scan >= self._target_frames:
+                return self._scan - self._run // 2
+        if len(levels) >= self._max_frames:
+            lo = self._target_frames
+            return lo + int(np.argmin(levels[lo: self._max_frames]))
+        return None
+
+    def _emit(self, cut_frame: Optional[int]) -> AudioChunk:
+        cut = len(self._buf) if cut_frame is None else cut_frame * self._frame * 2
+        pcm = bytes(self._buf[:cut])
+        levels = self._levels[:cut_frame] if cut_frame is not None else self._levels
+        del self._buf[:cut]
+        self._levels = self._levels[cut_frame:] if cut_frame is not None else np.empty(0, dtype=np.float32)
+        self._scan = 0
+        self._run = 0
+        if cut_frame is None and len(pcm) % (self._frame * 2):
+            tail = pcm16_view(pcm[len(levels) * self._frame * 2:])
+            levels = np.concatenate([levels, _frame_db(tail, tail.size)]) if tail.size else levels
+        chunk = AudioChunk(
+            index=self._index,
+            start_seconds=self._start_sample / self.sample_rate,
+            pcm=pcm,
+            sample_rate=self.sample_rate,
+            peak_db=float(levels.max()) if len(levels) else SILENCE_DB,
+        )
+        self._index += 1
+        self._start_sample += len(pcm) // 2
+        return chunk
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+def probe_duration(path: str) -> Optional[float]:
+    """Duration in seconds when it can be read cheaply (ffprobe or soundfile), else None."""
+    if shutil.which("ffprobe"):
+        try:
+            out = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+                capture_output=True, text=True, timeout=30,
+            )
+            return float(out.stdout.strip())
+        except (subprocess.SubprocessError, ValueError):
+            pass
+    try:
+        import soundfile as sf
+
+        info = sf.info(path)
+        return info.frames / float(info.samplerate) if info.samplerate else None
+    except Exception:
+        return None
+
+
+def iter_pcm16_file(path: str, sample_rate: int = 16000, block_seconds: float = 1.0) -> Iterator[bytes]:
+    """Decode ``path`` to PCM16-LE mono at ``sample_rate``, ``block_seconds`` at a time (blocking; run in a thread)."""
+    block_bytes = max(2, int(sample_rate * block_seconds) * 2)
+    if ffmpeg_available():
+        # stderr goes to a file, not a pipe: nobody drains it while stdout streams, and a noisy or
+        # corrupt input would otherwise fill the pipe and stall ffmpeg (and this thread) for good.
+        with tempfile.TemporaryFile() as errors:
+            proc = subprocess.Popen(
+                ["ffmpeg", "-nostdin", "-v", "error", "-i", path, "-vn", "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-"],
+                stdout=subprocess.PIPE,
+                stderr=errors,
+            )
+            try:
+                while True:
+                    block = proc.stdout.read(block_bytes)
+                    if not block:
+                        break
+                    yield block
+                if proc.wait() != 0:
+                    errors.seek(0)
+                    raise ValueError(f"ffmpeg could not decode the file: {errors.read(300).decode(errors='replace')}")
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+        return
+    import soundfile as sf
+
+    try:
+        f = sf.SoundFile(path)
+    except Exception as e:
+        raise ValueError(f"Unsupported audio format without ffmpeg ({e})") from e
+    with f:
+        rate = f.samplerate
+        frames = max(1, int(rate * block_seconds))
+        for block in f.blocks(blocksize=frames, dtype="float32", always_2d=True):
+            mono = block.mean(axis=1)
+            if rate != sample_rate and mono.size:
+                # Linear resampling is plenty for speech going to Whisper (it resamples again anyway).
+                n_out = max(1, int(round(mono.size * sample_rate / rate)))
+                mono = np.interp(np.linspace(0, mono.size - 1, n_out), np.arange(mono.size), mono)
+            yield (np.clip(mono, -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
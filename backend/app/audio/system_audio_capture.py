@@ -1,13 +1,16 @@
 """
 Captures system audio (e.g. Stereo Mix on Windows) or default input (mic) as PCM16, 16 kHz mono.
-Uses sounddevice (optional). Puts chunks in asyncio queue; get_audio_chunk() is awaited by the bot.
+Uses sounddevice (optional). The PortAudio callback converts each block with one NumPy clip-and-cast and
+hands it to the event loop with call_soon_threadsafe; get_audio_chunk() is awaited by the bot.
 When AUDIO_INPUT_DEVICE is set, uses that device (by name or index) so the bot captures system
 audio for transcription with Groq instead of the microphone.
 """
 import asyncio
 import logging
-import struct
-from typing import Optional, Union
+import time
+from typing import Optional, Tuple, Union
+
+import numpy as np
 
 from app.core.config import settings
 
@@ -16,7 +19,7 @@ logger = logging.getLogger(__name__)
 try:
     import sounddevice as sd
     SOUNDDEVICE_AVAILABLE = True
-except ImportError:
+except (ImportError, OSError):  # OSError: PortAudio library missing
     SOUNDDEVICE_AVAILABLE = False
     sd = None
 
@@ -64,26 +67,62 @@ class SystemAudioCapture:
         self.channels = channels or settings.AUDIO_CHANNELS
         self.chunk_size = chunk_size or settings.AUDIO_CHUNK_SIZE
         self.device = device
-        self._queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self.max_blocks = max(1, int(getattr(settings, "AUDIO_CAPTURE_QUEUE_MAX_BLOCKS", 256)))
+        # (pcm16 bytes, wall-clock capture time of the block's first sample)
+        self._queue: asyncio.Queue[Tuple[bytes, float]] = asyncio.Queue(maxsize=self.max_blocks)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._stream = None
         self._running = False
+        self.captured_blocks = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.dropped_blocks = 0
+        self._status_events = 0
 
     def _callback(self, indata, frames, time_info, status):
+        """PortAudio thread: keep it short — one vectorized conversion, then hand off to the loop."""
         if not self._running:
             return
+        capture_ts = time.time() - frames / float(self.sample_rate)
         if status:
-            logger.warning("Audio capture status: %s", status)
-        # indata is float32; convert to int16 PCM in small frames
-        buf = []
-        for x in indata.flatten():
-            s = max(-1, min(1, x))
-            buf.append(struct.pack("<h", int(s * 32767)))
-        self._queue.put_nowait(b"".join(buf))
+            if getattr(status, "input_overflow", False):
+                self.input_overflows += 1
+            if getattr(status, "input_underflow", False):
+                self.input_underflows += 1
+        pcm = (np.clip(indata, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            if status:
+                loop.call_soon_threadsafe(self._log_status, str(status))
+            loop.call_soon_threadsafe(self._enqueue, pcm, capture_ts)
+        except RuntimeError:
+            pass  # loop closed while the stream was stopping
+
+    def _enqueue(self, pcm: bytes, capture_ts: float) -> None:
+        """Event-loop side of the hand-off; drops the oldest block when the consumer falls behind."""
+        self.captured_blocks += 1
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_blocks += 1
+            if self.dropped_blocks == 1 or self.dropped_blocks % 100 == 0:
+                logger.warning("Audio capture queue full; dropped %d block(s) so far", self.dropped_blocks)
+        self._queue.put_nowait((pcm, capture_ts))
+
+    def _log_status(self, status: str) -> None:
+        self._status_events += 1
+        if self._status_events == 1 or self._status_events % 50 == 0:
+            logger.warning(
+                "Audio capture status: %s (overflows=%d underflows=%d)",
+                status, self.input_overflows, self.input_underflows,
+            )
 
     def start(self) -> None:
-        """Start capture stream (blocking sounddevice). Call from thread or ensure non-blocking."""
+        """Start capture stream (non-blocking sounddevice). Call from the event loop that consumes the chunks."""
         if not SOUNDDEVICE_AVAILABLE:
             raise RuntimeError("sounddevice is not installed. pip install sounddevice")
+        self._loop = asyncio.get_event_loop()
         self._running = True
         # Use instance device, then AUDIO_INPUT_DEVICE (system/loopback), then default input
         device_cfg = self.device if self.device is not None else getattr(settings, "AUDIO_INPUT_DEVICE", None)
@@ -126,6 +165,16 @@ class SystemAudioCapture:
                     continue
             raise RuntimeError(f"Audio capture start failed: {e}") from e
 
+    def get_stats(self) -> dict:
+        return {
+            "captured_blocks": self.captured_blocks,
+            "queued_blocks": self._queue.qsize(),
+            "max_blocks": self.max_blocks,
+            "dropped_blocks": self.dropped_blocks,
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+        }
+
     def stop(self) -> None:
         self._running = False
         if self._stream:
@@ -138,8 +187,13 @@ class SystemAudioCapture:
 
     async def get_audio_chunk(self) -> bytes:
         """Await next PCM chunk. Used by bot in a loop to send to WebSocket."""
+        chunk, _capture_ts = await self._queue.get()
+        return chunk
+
+    async def get_audio_block(self) -> Tuple[bytes, float]:
+        """Await next PCM chunk with its capture time (epoch seconds of the first sample)."""
         return await self._queue.get()
 
-    def put_chunk(self, chunk: bytes) -> None:
-        """For testing or alternate source: inject a chunk."""
-        self._queue.put_nowait(chunk)
+    def put_chunk(self, chunk: bytes, capture_ts: Optional[float] = None) -> None:
+        """For testing or alternate source: inject a chunk (call from the event loop thread)."""
+        self._enqueue(chunk, time.time() if capture_ts is None else capture_ts)
@@ -2,7 +2,10 @@
 Abstract base for meeting bots: join, stream audio to backend WebSocket, leave.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+# ``sink(pcm, capture_ts)``: PCM16 for one capture batch and the wall-clock time of its first sample.
+AudioSink = Callable[[bytes, float], Awaitable[None]]
 
 
 class BaseBot(ABC):
@@ -18,11 +21,28 @@ class BaseBot(ABC):
         """Connect to callback_url (ws://.../ws/audio/{meeting_id}), send PCM chunks in a loop."""
         pass
 
+    async def pump_audio(self, sink: AudioSink) -> bool:
+        """Optional: capture audio and await ``sink`` per batch until stopped (meeting-worker mode).
+        False when the bot cannot feed an in-process pipeline."""
+        return False
+
     @abstractmethod
     async def leave_meeting(self) -> None:
         """Leave the meeting and cleanup."""
         pass
 
+    def get_stream_stats(self) -> dict:
+        """Optional: counters for the audio stream (bot-status diagnostics). Default empty."""
+        return {}
+
+    async def poll_participant_events(self) -> Optional[List[dict]]:
+        """Optional: join/leave events since the last call; None when the platform has no event listener."""
+        return None
+
+    async def send_control(self, message: dict) -> bool:
+        """Optional: send a JSON control frame on the audio WebSocket. False when not connected."""
+        return False
+
     def get_participants(self) -> List[Tuple[str, str]]:
         """Optional: return list of (participant_id, display_name) for attendance sync. Default empty."""
         return []
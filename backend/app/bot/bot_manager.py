@@ -1,14 +1,19 @@
 """
 Start/stop bot per meeting; run audio stream and participant monitoring.
+
+In the API process (``MEETING_WORKER_MODE=inline``) bots stream audio to the API's own audio
+WebSocket. A meeting worker (``run_meeting_worker.py``) uses ``BotManager(in_process_audio=True)``
+so capture feeds its local pipelines directly.
 """
 import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from urllib.parse import urlencode
 
 from app.core.config import settings
+from app.bot.base_bot import AudioSink
 from app.bot.jitsi_meet_bot import JitsiMeetBot
-from app.attendance import AttendanceTracker
+from app.attendance import AttendanceTracker, apply_participant_events, forget_tracker, tracker_for
 from app.api.v1.endpoints.meeting_bot_ws import ws_manager
 
 logger = logging.getLogger(__name__)
@@ -39,47 +44,90 @@ async def _safe_audio_stream(meeting_id: str, bot: JitsiMeetBot, callback_url: s
         logger.exception("Audio stream failed for meeting_id=%s (callback_url=%s): %s", meeting_id, callback_url, e)
 
 
-async def _monitor_participants(meeting_id: str, bot: JitsiMeetBot, interval: float = 10.0) -> None:
-    """Periodically sync participant list to attendance (join/leave)."""
-    seen = set()
+async def _safe_audio_pump(meeting_id: str, bot: JitsiMeetBot, sink: AudioSink) -> None:
+    """Run bot.pump_audio into an in-process pipeline (meeting worker)."""
+    try:
+        if not await bot.pump_audio(sink):
+            logger.error("Bot %s cannot feed an in-process pipeline meeting_id=%s", type(bot).__name__, meeting_id)
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.exception("Audio capture failed for meeting_id=%s: %s", meeting_id, e)
+
+
+def _snapshot_events(seen: Dict[str, str], participants) -> List[dict]:
+    """Diff a participant snapshot against ``seen`` (id → name) into join/leave events; updates ``seen``."""
+    current = {str(pid): name for pid, name in participants}
+    events = [
+        {"event": "join", "participant_id": pid, "name": name}
+        for pid, name in current.items()
+        if pid not in seen
+    ]
+    events += [{"event": "leave", "participant_id": pid} for pid in seen if pid not in current]
+    seen.clear()
+    seen.update(current)
+    return events
+
+
+async def _monitor_participants(meeting_id: str, bot: JitsiMeetBot) -> None:
+    """Forward join/leave events from the injected listener: as control frames on the bot's audio
+    WebSocket, or straight to attendance when it is not connected (paused, in-process audio).
+    Until the listener has attached, fall back to a participant snapshot every
+    PARTICIPANT_SNAPSHOT_INTERVAL_SECONDS; every WebDriver call runs in an executor."""
+    event_interval = float(getattr(settings, "PARTICIPANT_EVENT_INTERVAL_SECONDS", 1.0))
+    snapshot_interval = float(getattr(settings, "PARTICIPANT_SNAPSHOT_INTERVAL_SECONDS", 10.0))
+    loop = asyncio.get_running_loop()
+    seen: Dict[str, str] = {}
+    next_snapshot = 0.0
     while meeting_id in _bots and _bots[meeting_id] is bot:
         try:
-            participants = bot.get_participants()
-            tracker = _trackers.get(meeting_id)
-            if tracker:
-                for pid, name in participants:
-                    key = (pid, name)
-                    if key not in seen:
-                        seen.add(key)
-                        await tracker.record_join(pid, name, None)
-            participants_set = set((p[0], p[1]) for p in participants)
-            for key in list(seen):
-                if key not in participants_set:
-                    seen.discard(key)
-                    if tracker:
-                        await tracker.record_leave(key[0])
+            events = await bot.poll_participant_events()
+            if events is not None and seen:
+                # Listener attached after snapshot fallback: it reports who is present now as joins.
+                present = {e.get("participant_id") for e in events if e.get("event") == "join"}
+                events = [{"event": "leave", "participant_id": pid} for pid in seen if pid not in present] + events
+                seen.clear()
+            if events is None and loop.time() >= next_snapshot:
+                next_snapshot = loop.time() + snapshot_interval
+                participants = await loop.run_in_executor(None, bot.get_participants)
+                events = _snapshot_events(seen, participants)
+            if events and not await bot.send_control({"type": "participants", "events": events}):
+                await apply_participant_events(meeting_id, events)
         except Exception:
-            pass
-        await asyncio.sleep(interval)
+            logger.exception("Participant sync failed meeting_id=%s", meeting_id)
+        await asyncio.sleep(event_interval)
 
 
 class BotManager:
     """Start/stop meeting bot; audio stream and attendance."""
 
+    def __init__(self, in_process_audio: bool = False):
+        self.in_process_audio = in_process_audio
+
+    def _audio_task(self, meeting_id: str, bot: JitsiMeetBot) -> asyncio.Task:
+        if self.in_process_audio:
+            async def sink(pcm: bytes, capture_ts: float) -> None:
+                await ws_manager.process_audio(meeting_id, pcm, capture_ts)
+
+            return asyncio.create_task(_safe_audio_pump(meeting_id, bot, sink))
+        return asyncio.create_task(_safe_audio_stream(meeting_id, bot, _audio_callback_url(meeting_id)))
+
+    async def admit(self, meeting_id: str) -> None:
+        """Inline bots have no admission limit (the queued manager raises when workers are full)."""
+        return None
+
     async def start_bot(self, meeting_id: str, meeting_url: str) -> None:
         async with _lock:
             if meeting_id in _bots:
                 return
-            callback_url = _audio_callback_url(meeting_id)
             bot = JitsiMeetBot(meeting_id)
             _bots[meeting_id] = bot
-            tracker = AttendanceTracker(meeting_id)
+            tracker = tracker_for(meeting_id)
             _trackers[meeting_id] = tracker
             await tracker.record_join("bot", "Meeting Assistant", "bot")
         await bot.join_meeting(meeting_url)
         ws_manager.ensure_pipeline(meeting_id)
-        t = asyncio.create_task(_safe_audio_stream(meeting_id, bot, callback_url))
-        _tasks[meeting_id] = t
+        _tasks[meeting_id] = self._audio_task(meeting_id, bot)
         asyncio.create_task(_monitor_participants(meeting_id, bot))
 
     async def stop_bot(self, meeting_id: str) -> None:
@@ -95,12 +143,30 @@ class BotManager:
                 pass
         if tracker:
             await tracker.record_leave("bot")
+            forget_tracker(meeting_id)
         if bot:
             await bot.leave_meeting()
 
     def is_bot_running(self, meeting_id: str) -> bool:
         return meeting_id in _bots
 
+    def active_meetings(self) -> list:
+        return list(_bots)
+
+    async def describe(self, meeting_id: str) -> dict:
+        """Bot + STT state for bot-status / meeting detail."""
+        return {
+            "bot_running": self.is_bot_running(meeting_id),
+            "bot_audio_streaming": self.is_bot_audio_streaming(meeting_id),
+            "bot_stream": self.get_bot_stream_stats(meeting_id),
+            "stt": ws_manager.get_stats(meeting_id),
+        }
+
+    def get_bot_stream_stats(self, meeting_id: str) -> Optional[dict]:
+        """Bot-side audio stream counters (None when no bot on this instance)."""
+        bot = _bots.get(meeting_id)
+        return bot.get_stream_stats() if bot else None
+
     def is_bot_audio_streaming(self, meeting_id: str) -> bool:
         t = _tasks.get(meeting_id)
         return t is not None and not t.done()
@@ -130,9 +196,8 @@ class BotManager:
             if existing is not None and not existing.done():
                 return
             bot = _bots[meeting_id]
-            callback_url = _audio_callback_url(meeting_id)
         ws_manager.ensure_pipeline(meeting_id)
-        new_task = asyncio.create_task(_safe_audio_stream(meeting_id, bot, callback_url))
+        new_task = self._audio_task(meeting_id, bot)
         cancelled_dup = False
         async with _lock:
             cur = _tasks.get(meeting_id)
@@ -1,14 +1,15 @@
 """
-Jitsi Meet bot: Selenium + Chrome opens meeting URL, injects participant JS, streams system audio to backend.
+Jitsi Meet bot: Selenium + Chrome opens meeting URL, injects a participant listener, streams system audio to backend.
 """
 import asyncio
 import json
 import threading
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
+from app.audio.frame_protocol import FrameSender
 from app.audio.system_audio_capture import SystemAudioCapture
 from app.core.config import settings
-from app.bot.base_bot import BaseBot
+from app.bot.base_bot import AudioSink, BaseBot
 
 try:
     from selenium import webdriver
@@ -28,9 +29,46 @@ try:
 except ImportError:
     HAS_WDM = False
 
+# Attaches to the Jitsi conference as soon as it exists (retrying every second until then) and queues
+# join/leave events in ``window.__mmAttendance``; the bot drains the queue and forwards the events.
+# Participants already present when it attaches are reported as joins.
+_PARTICIPANT_LISTENER_JS = """
+(function() {
+    if (window.__mmAttendance) return;
+    var state = window.__mmAttendance = { events: [], present: {}, attached: false };
+    function ident(p) { return String(p.getId ? p.getId() : p.id); }
+    function label(p) { return (p.getDisplayName && p.getDisplayName()) || p.displayName || 'Participant'; }
+    function push(kind, id, name) {
+        if ((kind === 'join') === Boolean(state.present[id])) return;
+        if (kind === 'join') state.present[id] = true; else delete state.present[id];
+        state.events.push({ event: kind, participant_id: id, name: name, ts: Date.now() / 1000 });
+        if (state.events.length > 1000) state.events.splice(0, state.events.length - 1000);
+    }
+    function attach() {
+        var room = window.APP && window.APP.conference && window.APP.conference._room;
+        if (!room) return false;
+        (room.getParticipants ? room.getParticipants() : []).forEach(function(p) { push('join', ident(p), label(p)); });
+        var ev = (window.JitsiMeetJS && window.JitsiMeetJS.events && window.JitsiMeetJS.events.conference) || {};
+        room.on(ev.USER_JOINED || 'conference.userJoined', function(id, user) { push('join', String(id), user ? label(user) : 'Participant'); });
+        room.on(ev.USER_LEFT || 'conference.userLeft', function(id) { push('leave', String(id), null); });
+        state.attached = true;
+        return true;
+    }
+    if (!attach()) {
+        var timer = setInterval(function() { if (attach()) clearInterval(timer); }, 1000);
+    }
+})();
+"""
+
+_DRAIN_PARTICIPANT_EVENTS_JS = """
+var state = window.__mmAttendance;
+if (!state || !state.attached) return null;
+return state.events.splice(0, state.events.length);
+"""
+
 
 class JitsiMeetBot(BaseBot):
-    """Join Jitsi via Selenium; inject join/leave API calls; stream system audio to WebSocket."""
+    """Join Jitsi via Selenium; inject a join/leave listener; stream system audio to WebSocket."""
 
     def __init__(self, meeting_id: str, backend_url: str = None):
         self.meeting_id = meeting_id
@@ -38,6 +76,9 @@ class JitsiMeetBot(BaseBot):
         self._driver = None
         self._capture: SystemAudioCapture = None
         self._running = False
+        self._sender: FrameSender = None
+        self._ws = None
+        self._driver_lock = threading.Lock()
 
     async def join_meeting(self, meeting_url: str) -> bool:
         if not SELENIUM_AVAILABLE:
@@ -68,32 +109,8 @@ class JitsiMeetBot(BaseBot):
                 join_btn.click()
             except Exception:
                 pass
-        # Inject JS to call backend on participant join/leave
-        api_base = self.backend_url + "/api/v1/meetings/" + self.meeting_id
-        inject = f"""
-        (function() {{
-            var meetingId = "{self.meeting_id}";
-            var joinUrl = "{api_base}/participants/join";
-            var leaveUrl = "{api_base}/participants/leave";
-            function post(url, body) {{
-                fetch(url, {{ method: 'POST', headers: {{ 'Content-Type': 'application/json' }}, body: JSON.stringify(body) }}).catch(function() {{}});
-            }}
-            if (window.APP && window.APP.conference && window.APP.conference._room) {{
-                var room = window.APP.conference._room;
-                room.on('participantJoined', function(p) {{
-                    var id = p.getId ? p.getId() : p.id;
-                    var name = (p.getDisplayName && p.getDisplayName()) || (p.displayName || 'Participant');
-                    post(joinUrl, {{ participant_id: id, name: name }});
-                }});
-                room.on('participantLeft', function(p) {{
-                    var id = p.getId ? p.getId() : p.id;
-                    post(leaveUrl, {{ participant_id: id }});
-                }});
-            }}
-        }})();
-        """
         try:
-            self._driver.execute_script(inject)
+            self._driver.execute_script(_PARTICIPANT_LISTENER_JS)
         except Exception:
             pass
         return True
@@ -112,45 +129,81 @@ class JitsiMeetBot(BaseBot):
         """Sync stop for use from BotManager pause path; safe if already stopped."""
         self._cleanup_audio_capture_resources()
 
-    async def start_audio_stream(self, callback_url: str) -> None:
-        """Run capture in thread; in async loop send chunks over WebSocket.
-        Uses AUDIO_INPUT_DEVICE when set (e.g. 'Stereo Mix') so bot captures system audio
-        for Groq transcription instead of the microphone."""
+    def _start_capture(self) -> None:
         import logging
-        import websockets
 
-        log = logging.getLogger(__name__)
         device = getattr(settings, "AUDIO_INPUT_DEVICE", None)
         self._capture = SystemAudioCapture(device=device)
         try:
             self._capture.start()
         except Exception as e:
-            log.exception("Audio capture start failed: %s", e)
+            logging.getLogger(__name__).exception("Audio capture start failed: %s", e)
             self._cleanup_audio_capture_resources()
             raise RuntimeError(f"Audio capture start failed: {e}") from e
         self._running = True
+
+    async def pump_audio(self, sink: AudioSink) -> bool:
+        """Meeting-worker mode: hand capture batches straight to an in-process pipeline (no WebSocket hop)."""
+        self._start_capture()
+        batch_blocks = max(1, int(getattr(settings, "AUDIO_WS_BATCH_BLOCKS", 4)))
+        batch_wait = batch_blocks * self._capture.chunk_size / float(self._capture.sample_rate)
+        try:
+            while self._running:
+                blocks = await self._next_audio_batch(batch_blocks, batch_wait)
+                if blocks:
+                    await sink(b"".join(pcm for pcm, _ in blocks), blocks[0][1])
+        finally:
+            self._cleanup_audio_capture_resources()
+        return True
+
+    async def start_audio_stream(self, callback_url: str) -> None:
+        """Run capture in thread; in async loop send chunks over WebSocket.
+        Uses AUDIO_INPUT_DEVICE when set (e.g. 'Stereo Mix') so bot captures system audio
+        for Groq transcription instead of the microphone."""
+        import logging
+        import websockets
+
+        log = logging.getLogger(__name__)
+        self._start_capture()
+        # Framed protocol (app.audio.frame_protocol): sequence numbers survive reconnects, so
+        # the server de-duplicates replays and we resend whatever it has not acknowledged.
+        self._sender = FrameSender(
+            self._capture.sample_rate,
+            max_unacked=int(getattr(settings, "AUDIO_WS_RESEND_MAX_FRAMES", 256)),
+        )
+        batch_blocks = max(1, int(getattr(settings, "AUDIO_WS_BATCH_BLOCKS", 4)))
+        batch_wait = batch_blocks * self._capture.chunk_size / float(self._capture.sample_rate)
+        url = callback_url + ("&" if "?" in callback_url else "?") + "framing=1"
         try:
             # Continuous non-blocking loop: reconnect on failures, keep sending audio frames.
             while self._running:
                 try:
-                    async with websockets.connect(callback_url) as ws:
+                    async with websockets.connect(url) as ws:
                         log.info("Bot connected to audio callback %s", callback_url)
-                        chunk_count = 0
-                        while self._running:
-                            try:
-                                # Small timeout so we can detect stalled capture and keep WS alive.
-                                chunk = await asyncio.wait_for(
-                                    self._capture.get_audio_chunk(), timeout=5.0
-                                )
-                            except asyncio.TimeoutError:
-                                # Heartbeat to keep connection open even if capture is briefly silent.
-                                await ws.send(b"")
-                                continue
-                            if chunk:
-                                await ws.send(chunk)
-                                chunk_count += 1
-                                if chunk_count == 1:
-                                    log.debug("First audio chunk sent for meeting %s", self.meeting_id)
+                        try:
+                            hello = json.loads(await asyncio.wait_for(ws.recv(), timeout=10.0))
+                        except (asyncio.TimeoutError, ValueError):
+                            hello = {}
+                        resend = self._sender.resume(hello.get("next_seq"))
+                        if resend:
+                            log.info("Resending %d unacknowledged audio frame(s) for meeting %s", len(resend), self.meeting_id)
+                        for frame in resend:
+                            await ws.send(frame)
+                        acks = asyncio.create_task(self._read_acks(ws))
+                        self._ws = ws
+                        try:
+                            while self._running:
+                                blocks = await self._next_audio_batch(batch_blocks, batch_wait)
+                                if not blocks:
+                                    # Heartbeat to keep connection open even if capture is briefly silent.
+                                    await ws.send(self._sender.heartbeat())
+                                    continue
+                                await ws.send(self._sender.build(blocks))
+                                if self._sender.frames_sent == 1:
+                                    log.debug("First audio frame sent for meeting %s", self.meeting_id)
+                        finally:
+                            self._ws = None
+                            acks.cancel()
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
@@ -159,9 +212,87 @@ class JitsiMeetBot(BaseBot):
         finally:
             self._cleanup_audio_capture_resources()
 
+    async def _next_audio_batch(self, max_blocks: int, max_wait: float) -> List[Tuple[bytes, float]]:
+        """Up to ``max_blocks`` capture blocks, waiting at most ``max_wait`` after the first one.
+        Empty list when capture has been silent for 5s (caller sends a heartbeat)."""
+        try:
+            # Small timeout so we can detect stalled capture and keep WS alive.
+            blocks = [await asyncio.wait_for(self._capture.get_audio_block(), timeout=5.0)]
+        except asyncio.TimeoutError:
+            return []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while len(blocks) < max_blocks:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                blocks.append(await asyncio.wait_for(self._capture.get_audio_block(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return [(pcm, ts) for pcm, ts in blocks if pcm]
+
+    async def _read_acks(self, ws) -> None:
+        try:
+            async for message in ws:
+                if not isinstance(message, str):
+                    continue
+                try:
+                    data = json.loads(message)
+                except ValueError:
+                    continue
+                if data.get("type") == "ack" and isinstance(data.get("seq"), int):
+                    self._sender.ack(data["seq"])
+        except Exception:
+            pass  # connection closed; the send loop reconnects
+
+    def get_stream_stats(self) -> dict:
+        """Bot side of the framed audio stream (bot-status ``bot_stream``)."""
+        stats = {"capture": self._capture.get_stats() if self._capture else None}
+        sender = self._sender
+        if sender is not None:
+            stats.update({
+                "next_seq": sender.next_seq,
+                "frames_sent": sender.frames_sent,
+                "unacked_frames": sender.unacked,
+                "resent_frames": sender.resent,
+                "evicted_frames": sender.evicted,
+            })
+        return stats
+
+    def _drain_participant_events_sync(self) -> Optional[List[dict]]:
+        if not self._driver:
+            return None
+        with self._driver_lock:
+            try:
+                return self._driver.execute_script(_DRAIN_PARTICIPANT_EVENTS_JS)
+            except Exception:
+                return None
+
+    async def poll_participant_events(self) -> Optional[List[dict]]:
+        """Join/leave events queued by the injected listener since the last call (WebDriver call runs in
+        an executor). None while the listener is not attached, e.g. before the conference has started."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._drain_participant_events_sync)
+
+    async def send_control(self, message: dict) -> bool:
+        """Send a JSON control frame on the audio WebSocket; False when not connected (caller applies it locally)."""
+        ws = self._ws
+        if ws is None:
+            return False
+        try:
+            await ws.send(json.dumps(message, separators=(",", ":")))
+            return True
+        except Exception:
+            return False
+
     def get_participants(self) -> List[Tuple[str, str]]:
         if not self._driver:
             return []
+        with self._driver_lock:
+            return self._get_participants_locked()
+
+    def _get_participants_locked(self) -> List[Tuple[str, str]]:
         try:
             result = self._driver.execute_script("""
                 if (window.APP && window.APP.conference && window.APP.conference._room) {
@@ -0,0 +1,291 @@
+"""
+Mongo-backed meeting job queue for out-of-process meeting workers (``MEETING_WORKER_MODE=queue``).
+
+- ``meeting_jobs``: one active job per meeting, ``queued`` → ``running`` → ``stopping`` → ``done``
+  (or ``failed``). Active jobs carry ``active: true`` (unique per meeting); workers claim them with
+  an atomic ``find_one_and_update`` and refresh ``heartbeat_at`` while they own them.
+- ``meeting_workers``: one heartbeat document per worker (capacity, active meetings).
+
+The API enqueues and stops jobs and applies admission control (``QueuedBotManager``); workers
+(``app.bot.meeting_worker``) run the bots and STT pipelines. A job whose worker stops
+heartbeating for ``MEETING_WORKER_STALE_SECONDS`` is requeued, up to ``MEETING_WORKER_MAX_ATTEMPTS``.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+STOPPING = "stopping"
+DONE = "done"
+FAILED = "failed"
+
+
+class MeetingWorkerUnavailable(RuntimeError):
+    """No live meeting worker, or every worker is at capacity (API answers 503)."""
+
+
+def worker_secret() -> str:
+    """Shared secret for worker → API calls (falls back to the bot audio WebSocket secret)."""
+    return (
+        (getattr(settings, "MEETING_WORKER_SECRET", None) or "").strip()
+        or (getattr(settings, "MEETING_AUDIO_WS_SECRET", None) or "").strip()
+    )
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+class MeetingJobQueue:
+    """Job and worker documents; every method is a few small Mongo operations."""
+
+    def __init__(self, stale_seconds: float = None, max_attempts: int = None):
+        self.stale_seconds = float(
+            stale_seconds if stale_seconds is not None else getattr(settings, "MEETING_WORKER_STALE_SECONDS", 30.0)
+        )
+        self.max_attempts = max(1, int(max_attempts or getattr(settings, "MEETING_WORKER_MAX_ATTEMPTS", 3)))
+
+    def _stale_before(self) -> datetime:
+        return _now() - timedelta(seconds=self.stale_seconds)
+
+    # ── API side ──
+
+    async def get_active(self, meeting_id: str) -> Optional[dict]:
+        db = await get_database()
+        return await db.meeting_jobs.find_one({"meeting_id": meeting_id, "active": True})
+
+    async def enqueue(self, meeting_id: str, meeting_url: str) -> dict:
+        """Queue a start job; returns the existing active job when the meeting already has one."""
+        db = await get_database()
+        existing = await db.meeting_jobs.find_one({"meeting_id": meeting_id, "active": True})
+        if existing:
+            return existing
+        doc = {
+            "_id": ObjectId(),
+            "meeting_id": meeting_id,
+            "meeting_url": meeting_url,
+            "status": QUEUED,
+            "active": True,
+            "audio_paused": False,
+            "worker_id": None,
+            "attempts": 0,
+            "created_at": _now(),
+            "heartbeat_at": None,
+        }
+        try:
+            await db.meeting_jobs.insert_one(doc)
+        except DuplicateKeyError:
+            return await db.meeting_jobs.find_one({"meeting_id": meeting_id, "active": True})
+        return doc
+
+    async def capacity(self) -> dict:
+        """Live workers, their total capacity and active jobs (queued jobs count against capacity)."""
+        db = await get_database()
+        workers = await db.meeting_workers.find(
+            {"heartbeat_at": {"$gte": self._stale_before()}}, {"capacity": 1}
+        ).to_list(length=1000)
+        total = sum(int(w.get("capacity") or 0) for w in workers)
+        active = await db.meeting_jobs.count_documents({"active": True})
+        return {"workers": len(workers), "capacity": total, "active_jobs": active, "free": total - active}
+
+    async def admit(self, meeting_id: str) -> None:
+        """Raise MeetingWorkerUnavailable unless a worker can take one more meeting."""
+        if await self.get_active(meeting_id):
+            return
+        cap = await self.capacity()
+        if cap["workers"] == 0:
+            raise MeetingWorkerUnavailable("No meeting worker is running")
+        if cap["free"] <= 0:
+            raise MeetingWorkerUnavailable(
+                f"All meeting workers are full ({cap['active_jobs']}/{cap['capacity']} meetings)"
+            )
+
+    async def request_stop(self, meeting_id: str) -> Optional[dict]:
+        """Cancel a queued job outright, or ask the owning worker to stop. Returns the job (None if none)."""
+        db = await get_database()
+        cancelled = await db.meeting_jobs.find_one_and_update(
+            {"meeting_id": meeting_id, "active": True, "status": QUEUED},
+            {"$set": {"status": DONE, "finished_at": _now()}, "$unset": {"active": ""}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if cancelled:
+            return cancelled
+        return await db.meeting_jobs.find_one_and_update(
+            {"meeting_id": meeting_id, "active": True},
+            {"$set": {"status": STOPPING, "stop_requested_at": _now()}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def wait_finished(self, job_id, timeout: float, interval: float = 0.5) -> Optional[dict]:
+        """Poll until the worker has flushed and released the job; None on timeout."""
+        db = await get_database()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            job = await db.meeting_jobs.find_one({"_id": job_id})
+            if job is None or job.get("status") in (DONE, FAILED):
+                return job
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(interval)
+
+    async def set_audio_paused(self, meeting_id: str, paused: bool) -> bool:
+        db = await get_database()
+        result = await db.meeting_jobs.update_one(
+            {"meeting_id": meeting_id, "active": True, "status": {"$in": [QUEUED, RUNNING]}},
+            {"$set": {"audio_paused": bool(paused)}},
+        )
+        return result.matched_count > 0
+
+    # ── Worker side ──
+
+    async def claim(self, worker_id: str) -> Optional[dict]:
+        db = await get_database()
+        now = _now()
+        return await db.meeting_jobs.find_one_and_update(
+            {"status": QUEUED, "active": True},
+            {
+                "$set": {"status": RUNNING, "worker_id": worker_id, "claimed_at": now, "heartbeat_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def assigned(self, worker_id: str) -> List[dict]:
+        db = await get_database()
+        return await db.meeting_jobs.find({"worker_id": worker_id, "active": True}).to_list(length=1000)
+
+    async def heartbeat(self, worker_id: str, capacity: int, stats: dict, info: dict = None) -> None:
+        """Refresh the worker document, the heartbeat of every job it owns and their diagnostics."""
+        db = await get_database()
+        now = _now()
+        await db.meeting_workers.update_one(
+            {"_id": worker_id},
+            {
+                "$set": {
+                    "capacity": capacity,
+                    "meetings": sorted(stats),
+                    "active": len(stats),
+                    "heartbeat_at": now,
+                    **(info or {}),
+                },
+                "$setOnInsert": {"started_at": now},
+            },
+            upsert=True,
+        )
+        await db.meeting_jobs.update_many(
+            {"worker_id": worker_id, "active": True}, {"$set": {"heartbeat_at": now}}
+        )
+        if stats:
+            await db.meeting_jobs.bulk_write(
+                [
+                    UpdateOne({"meeting_id": mid, "worker_id": worker_id, "active": True}, {"$set": {"stats": s}})
+                    for mid, s in stats.items()
+                ],
+                ordered=False,
+            )
+
+    async def finish(self, job_id, status: str = DONE, error: str = None) -> None:
+        db = await get_database()
+        patch = {"status": status, "finished_at": _now()}
+        if error:
+            patch["error"] = error[:500]
+        await db.meeting_jobs.update_one({"_id": job_id}, {"$set": patch, "$unset": {"active": ""}})
+
+    async def release(self, job: dict) -> bool:
+        """Worker shutdown: hand a running job back to the queue (another worker rejoins the meeting)."""
+        db = await get_database()
+        result = await db.meeting_jobs.update_one(
+            {"_id": job["_id"], "worker_id": job.get("worker_id"), "status": RUNNING},
+            {"$set": {"status": QUEUED, "worker_id": None}},
+        )
+        return result.modified_count > 0
+
+    async def requeue_stale(self) -> int:
+        """Jobs whose worker stopped heartbeating: requeue, or fail after too many attempts."""
+        db = await get_database()
+        stale = {"active": True, "heartbeat_at": {"$lt": self._stale_before()}}
+        stopped = await db.meeting_jobs.update_many(
+            {**stale, "status": STOPPING},
+            {"$set": {"status": DONE, "finished_at": _now(), "error": "worker lost"}, "$unset": {"active": ""}},
+        )
+        failed = await db.meeting_jobs.update_many(
+            {**stale, "status": RUNNING, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {"status": FAILED, "finished_at": _now(), "error": "worker lost"}, "$unset": {"active": ""}},
+        )
+        requeued = await db.meeting_jobs.update_many(
+            {**stale, "status": RUNNING},
+            {"$set": {"status": QUEUED, "worker_id": None}},
+        )
+        if stopped.modified_count or failed.modified_count or requeued.modified_count:
+            logger.warning(
+                "Stale meeting jobs: requeued=%d failed=%d closed=%d",
+                requeued.modified_count, failed.modified_count, stopped.modified_count,
+            )
+        return requeued.modified_count
+
+    async def remove_worker(self, worker_id: str) -> None:
+        db = await get_database()
+        await db.meeting_workers.delete_one({"_id": worker_id})
+
+
+class QueuedBotManager:
+    """API-side stand-in for BotManager when bots and STT run in meeting workers."""
+
+    def __init__(self, queue: MeetingJobQueue = None):
+        self.queue = queue or MeetingJobQueue()
+
+    async def admit(self, meeting_id: str) -> None:
+        await self.queue.admit(meeting_id)
+
+    async def start_bot(self, meeting_id: str, meeting_url: str) -> None:
+        job = await self.queue.enqueue(meeting_id, meeting_url)
+        logger.info("Meeting %s queued for a meeting worker (job %s)", meeting_id, job["_id"])
+
+    async def stop_bot(self, meeting_id: str) -> None:
+        """Ask the worker to stop and wait until it has flushed the transcript (summary runs next)."""
+        job = await self.queue.request_stop(meeting_id)
+        if job is None or job.get("status") in (DONE, FAILED):
+            return
+        timeout = float(getattr(settings, "MEETING_WORKER_STOP_TIMEOUT_SECONDS", 30.0))
+        if await self.queue.wait_finished(job["_id"], timeout) is None:
+            logger.warning("Meeting worker did not confirm stop within %.0fs meeting_id=%s", timeout, meeting_id)
+
+    async def pause_bot_audio(self, meeting_id: str) -> None:
+        if not await self.queue.set_audio_paused(meeting_id, True):
+            raise ValueError("no_bot_for_meeting")
+
+    async def resume_bot_audio(self, meeting_id: str) -> None:
+        if not await self.queue.set_audio_paused(meeting_id, False):
+            raise ValueError("no_bot_for_meeting")
+
+    async def describe(self, meeting_id: str) -> dict:
+        job = await self.queue.get_active(meeting_id)
+        if job is None:
+            return {"bot_running": False, "bot_audio_streaming": False, "bot_stream": None, "stt": None}
+        stats = job.get("stats") or {}
+        running = job.get("status") in (RUNNING, STOPPING)
+        return {
+            "bot_running": running,
+            "bot_audio_streaming": running and not job.get("audio_paused") and bool(stats.get("bot_audio_streaming")),
+            "bot_stream": stats.get("bot_stream"),
+            "stt": stats.get("stt"),
+            "worker": {
+                "job_status": job.get("status"),
+                "worker_id": job.get("worker_id"),
+                "attempts": job.get("attempts"),
+                "heartbeat_at": job.get("heartbeat_at"),
+            },
+        }
@@ -0,0 +1,196 @@
+"""
+Meeting worker process (``run_meeting_worker.py``): claims meeting jobs and owns their bots and STT.
+
+Each claimed meeting runs ``JitsiMeetBot`` with capture feeding this process's ``STTPipeline``
+directly; segments are written to Mongo from here and captions are POSTed to the API
+(``/meetings/{id}/live/publish``) so its live subscribers get them. The worker never holds more
+than ``MEETING_WORKER_CAPACITY`` meetings, heartbeats every ``MEETING_WORKER_HEARTBEAT_SECONDS``
+(with per-meeting diagnostics for bot-status) and polls for stop / pause requests every
+``MEETING_WORKER_POLL_SECONDS``.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Dict
+
+import httpx
+
+from app.api.v1.endpoints.meeting_bot_ws import ws_manager
+from app.bot.bot_manager import BotManager
+from app.bot.meeting_jobs import FAILED, STOPPING, MeetingJobQueue, worker_secret
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptPublisher:
+    """Sends accepted captions to the API for fan-out; failures are logged, the segment is still persisted."""
+
+    def __init__(self, base_url: str = None):
+        base = (base_url or settings.BACKEND_URL or f"http://localhost:{settings.PORT}").rstrip("/")
+        headers = {}
+        secret = worker_secret()
+        if secret:
+            headers["X-Meeting-Worker-Secret"] = secret
+        self._http = httpx.AsyncClient(base_url=base + "/api/v1/meetings", headers=headers, timeout=5.0)
+        self.published = 0
+        self.failed = 0
+
+    async def publish(self, meeting_id: str, text: str) -> None:
+        try:
+            response = await self._http.post(f"/{meeting_id}/live/publish", json={"text": text})
+            response.raise_for_status()
+            self.published += 1
+        except httpx.HTTPError as e:
+            self.failed += 1
+            if self.failed == 1 or self.failed % 50 == 0:
+                logger.warning("Publishing caption to API failed meeting_id=%s (%d failures): %s", meeting_id, self.failed, e)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+class MeetingWorker:
+    def __init__(
+        self,
+        capacity: int = None,
+        worker_id: str = None,
+        queue: MeetingJobQueue = None,
+        bots: BotManager = None,
+        publisher: TranscriptPublisher = None,
+    ):
+        self.capacity = max(1, int(capacity or getattr(settings, "MEETING_WORKER_CAPACITY", 4)))
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.queue = queue or MeetingJobQueue()
+        self.bots = bots or BotManager(in_process_audio=True)
+        self.publisher = publisher
+        self.heartbeat_seconds = float(getattr(settings, "MEETING_WORKER_HEARTBEAT_SECONDS", 5.0))
+        self.poll_seconds = float(getattr(settings, "MEETING_WORKER_POLL_SECONDS", 1.0))
+        self._jobs: Dict[str, dict] = {}
+        self._paused: Dict[str, bool] = {}
+        self._starting: Dict[str, asyncio.Task] = {}
+        self._shutdown = asyncio.Event()
+
+    def request_shutdown(self) -> None:
+        self._shutdown.set()
+
+    async def run(self) -> None:
+        if self.publisher is None:
+            self.publisher = TranscriptPublisher()
+        ws_manager.set_transcript_publisher(self.publisher.publish)
+        logger.info("Meeting worker %s started (capacity %d)", self.worker_id, self.capacity)
+        loop = asyncio.get_running_loop()
+        last_heartbeat = None
+        try:
+            while not self._shutdown.is_set():
+                if last_heartbeat is None or loop.time() - last_heartbeat >= self.heartbeat_seconds:
+                    await self._guarded(self._heartbeat())
+                    await self._guarded(self.queue.requeue_stale())
+                    last_heartbeat = loop.time()
+                await self._guarded(self.tick())
+                try:
+                    await asyncio.wait_for(self._shutdown.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._drain()
+
+    async def _guarded(self, coro) -> None:
+        try:
+            await coro
+        except Exception:
+            logger.exception("Meeting worker %s loop step failed", self.worker_id)
+
+    async def tick(self) -> None:
+        """Apply stop / pause requests for owned jobs, then claim new ones up to capacity."""
+        assigned = {job["meeting_id"]: job for job in await self.queue.assigned(self.worker_id)}
+        for meeting_id in list(self._jobs):
+            job = assigned.get(meeting_id)
+            if job is None:
+                # Requeued elsewhere (we missed heartbeats): let go without touching the job.
+                logger.warning("Meeting worker %s lost meeting %s", self.worker_id, meeting_id)
+                await self._stop_meeting(meeting_id, finish=False)
+            elif job.get("status") == STOPPING:
+                await self._stop_meeting(meeting_id)
+            elif meeting_id not in self._starting and bool(job.get("audio_paused")) != self._paused.get(meeting_id, False):
+                await self._set_paused(meeting_id, bool(job.get("audio_paused")))
+        while len(self._jobs) < self.capacity and not self._shutdown.is_set():
+            job = await self.queue.claim(self.worker_id)
+            if job is None:
+                break
+            meeting_id = job["meeting_id"]
+            self._jobs[meeting_id] = job
+            self._starting[meeting_id] = asyncio.create_task(self._start_meeting(job))
+
+    async def _start_meeting(self, job: dict) -> None:
+        meeting_id = job["meeting_id"]
+        logger.info("Meeting worker %s starting meeting %s (attempt %s)", self.worker_id, meeting_id, job.get("attempts"))
+        try:
+            await self.bots.start_bot(meeting_id, job["meeting_url"])
+            if job.get("audio_paused"):
+                await self._set_paused(meeting_id, True)
+        except Exception as e:
+            logger.exception("Meeting %s failed to start on worker %s", meeting_id, self.worker_id)
+            self._jobs.pop(meeting_id, None)
+            await self._guarded(self.bots.stop_bot(meeting_id))
+            ws_manager.remove_meeting(meeting_id)
+            await self.queue.finish(job["_id"], FAILED, error=f"{type(e).__name__}: {e}")
+        finally:
+            self._starting.pop(meeting_id, None)
+
+    async def _set_paused(self, meeting_id: str, paused: bool) -> None:
+        try:
+            if paused:
+                await self.bots.pause_bot_audio(meeting_id)
+            else:
+                await self.bots.resume_bot_audio(meeting_id)
+            self._paused[meeting_id] = paused
+        except ValueError:
+            pass
+
+    async def _stop_meeting(self, meeting_id: str, finish: bool = True, release: bool = False) -> None:
+        """Leave the meeting, transcribe the tail and flush segments, then update the job."""
+        starting = self._starting.get(meeting_id)
+        if starting is not None:
+            await asyncio.gather(starting, return_exceptions=True)
+        job = self._jobs.pop(meeting_id, None)
+        self._paused.pop(meeting_id, None)
+        if job is None:
+            return
+        await self._guarded(self.bots.stop_bot(meeting_id))
+        await self._guarded(ws_manager.close_meeting(meeting_id))
+        if release and await self.queue.release(job):
+            pass
+        elif finish:
+            # Also reached on shutdown when the job was no longer running (stop requested meanwhile).
+            await self.queue.finish(job["_id"])
+        logger.info("Meeting worker %s stopped meeting %s", self.worker_id, meeting_id)
+
+    def _meeting_stats(self) -> dict:
+        return {
+            meeting_id: {
+                "bot_audio_streaming": self.bots.is_bot_audio_streaming(meeting_id),
+                "bot_stream": self.bots.get_bot_stream_stats(meeting_id),
+                "stt": ws_manager.get_stats(meeting_id),
+            }
+            for meeting_id in self._jobs
+        }
+
+    async def _heartbeat(self) -> None:
+        info = {"host": socket.gethostname(), "pid": os.getpid()}
+        if self.publisher is not None:
+            info["captions_published"] = self.publisher.published
+            info["captions_failed"] = self.publisher.failed
+        await self.queue.heartbeat(self.worker_id, self.capacity, self._meeting_stats(), info)
+
+    async def _drain(self) -> None:
+        """Shutdown: flush every meeting; running ones go back to the queue for another worker."""
+        for meeting_id in list(self._jobs):
+            await self._guarded(self._stop_meeting(meeting_id, release=True))
+        await self._guarded(self.queue.remove_worker(self.worker_id))
+        ws_manager.set_transcript_publisher(None)
+        if self.publisher is not None:
+            await self.publisher.aclose()
+        logger.info("Meeting worker %s stopped", self.worker_id)
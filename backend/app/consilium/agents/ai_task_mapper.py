@@ -21,16 +21,13 @@ import json
 import logging
 import os
 import re
-import urllib.request
-import urllib.error
 from typing import Any, Dict, List
 
 from app.consilium.services.kanban_service import task_identity as _task_identity
+from app.llm import llm_gateway
  
 _log = logging.getLogger(__name__)
 
-_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
-_GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 _MAX_TOKENS = 512
 _TIMEOUT_SECONDS = 12
 _STOPWORDS = {
@@ -60,7 +57,7 @@ _STOPWORDS = {
 }
  
 # ──────────────────────────────────────────────────────────────────
-# Internal HTTP helper (no extra deps beyond stdlib)
+# Provider selection and calls
 # ──────────────────────────────────────────────────────────────────
  
 def _provider() -> str:
@@ -76,15 +73,21 @@ def _provider() -> str:
     raise EnvironmentError("No LLM key set. Use OPENROUTER_API_KEY, GEMINI_API_KEY, or GROQ_API_KEY")
 
 
-def _json_post(url: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(payload).encode("utf-8"),
-        headers=headers,
-        method="POST",
+def _chat(provider: str, key: str, model: str, system: str, user: str) -> str:
+    """One completion through the shared gateway (pooled, retried, cached for re-delivered events)."""
+    result = llm_gateway.chat_sync(
+        provider,
+        [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+        model=model,
+        temperature=0.1,
+        max_tokens=_MAX_TOKENS,
+        keys=[key],
+        timeout=_TIMEOUT_SECONDS,
     )
-    with urllib.request.urlopen(req, timeout=_TIMEOUT_SECONDS) as resp:
-        return json.loads(resp.read())
+    return (result.text or "").strip()
 
 
 def _call_openrouter(system: str, user: str) -> str:
@@ -92,24 +95,7 @@ def _call_openrouter(system: str, user: str) -> str:
     if not key:
         raise EnvironmentError("OPENROUTER_API_KEY not set")
     model = os.environ.get("OPENROUTER_MODEL", "openai/gpt-4o-mini")
-    body = _json_post(
-        _OPENROUTER_URL,
-        {
-            "model": model,
-            "max_tokens": _MAX_TOKENS,
-            "temperature": 0.1,
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-        },
-        {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {key}",
-        },
-    )
-    choices = body.get("choices") or []
-    content = (((choices[0] if choices else {}).get("message") or {}).get("content") or "").strip()
+    content = _chat("openrouter", key, model, system, user)
     if not content:
         raise ValueError("No text from OpenRouter response")
     return content
@@ -120,24 +106,7 @@ def _call_groq(system: str, user: str) -> str:
     if not key:
         raise EnvironmentError("GROQ_API_KEY not set")
     model = os.environ.get("GROQ_MODEL", "llama-3.3-70b-versatile")
-    body = _json_post(
-        _GROQ_URL,
-        {
-            "model": model,
-            "max_tokens": _MAX_TOKENS,
-            "temperature": 0.1,
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-        },
-        {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {key}",
-        },
-    )
-    choices = body.get("choices") or []
-    content = (((choices[0] if choices else {}).get("message") or {}).get("content") or "").strip()
+    content = _chat("groq", key, model, system, user)
     if not content:
         raise ValueError("No text from Groq response")
     return content
@@ -148,19 +117,7 @@ def _call_gemini(system: str, user: str) -> str:
     if not key:
         raise EnvironmentError("GEMINI_API_KEY not set")
     model = os.environ.get("GEMINI_MODEL", "gemini-1.5-flash")
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
-    body = _json_post(
-        url,
-        {
-            "system_instruction": {"parts": [{"text": system}]},
-            "contents": [{"role": "user", "parts": [{"text": user}]}],
-            "generationConfig": {"temperature": 0.1, "maxOutputTokens": _MAX_TOKENS},
-        },
-        {"Content-Type": "application/json"},
-    )
-    candidates = body.get("candidates") or []
-    parts = (((candidates[0] if candidates else {}).get("content") or {}).get("parts") or [])
-    text = "".join(str(p.get("text") or "") for p in parts).strip()
+    text = _chat("gemini", key, model, system, user)
     if not text:
         raise ValueError("No text from Gemini response")
     return text
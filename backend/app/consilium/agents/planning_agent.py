@@ -7,9 +7,8 @@ from collections import OrderedDict
 from datetime import date, timedelta
 from typing import Any, Dict, List, TypedDict
 
-import httpx
-
 from app.core.config import settings
+from app.llm import llm_gateway, provider_keys
 from app.consilium.services.planning_validation import (
     break_cycles_greedy,
     build_edges_from_dependencies,
@@ -25,28 +24,16 @@ class PlanningState(TypedDict, total=False):
 
 
 GEMINI_MODEL = "gemini-2.5-flash"
-GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 REQUEST_TIMEOUT = 90.0
 MIN_PLANNER_TASKS = 0
 MAX_PLANNER_TASKS = 2
 
 
-def _get_api_key() -> str:
-    api_key = settings.GEMINI_API_KEY or settings.PLANNING_AGENT_KEY
-    if not api_key:
+def _get_api_keys() -> List[str]:
+    keys = provider_keys("gemini", settings.GEMINI_API_KEY, settings.PLANNING_AGENT_KEY)
+    if not keys:
         raise RuntimeError("GEMINI_API_KEY or PLANNING_AGENT_KEY is not set")
-    return api_key
-
-
-def _extract_gemini_text(data: Dict[str, Any]) -> str:
-    candidates = data.get("candidates") or []
-    if not candidates:
-        return ""
-    first = candidates[0] if isinstance(candidates[0], dict) else {}
-    content = first.get("content") if isinstance(first.get("content"), dict) else {}
-    parts = content.get("parts") if isinstance(content.get("parts"), list) else []
-    text_chunks = [str(p.get("text") or "") for p in parts if isinstance(p, dict)]
-    return "\n".join(x for x in text_chunks if x).strip()
+    return keys
 
 
 def _norm_title(title: str) -> str:
@@ -699,7 +686,7 @@ def run_planning_agent(
     historical_title_norms: set[str] | None = None,
     history_meta: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
-    api_key = _get_api_key()
+    api_keys = _get_api_keys()
 
     # -----------------------------------------------------------------------
     # ROOT CAUSE FIX 6: Clean the PRD BEFORE building the LLM prompt
@@ -814,26 +801,20 @@ MANDATORY RULES:
     if history_context:
         user_parts.append(history_context)
 
-    payload = {
-        "system_instruction": {"parts": [{"text": system_prompt}]},
-        "contents": [{"parts": [{"text": "\n\n".join(user_parts)}]}],
-        "generationConfig": {
-            "temperature": 0.2,
-            "maxOutputTokens": 8192,
-        },
-    }
-    url = f"{GEMINI_BASE_URL}/{GEMINI_MODEL}:generateContent"
-    text = ""
     try:
-        with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-            response = client.post(
-                f"{url}?key={api_key}",
-                headers={"Content-Type": "application/json"},
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            text = _extract_gemini_text(data)
+        # Same PRD, team and history → same plan, served from the LLM response cache.
+        text = llm_gateway.chat_sync(
+            "gemini",
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "\n\n".join(user_parts)},
+            ],
+            model=GEMINI_MODEL,
+            temperature=0.2,
+            max_tokens=8192,
+            keys=api_keys,
+            timeout=REQUEST_TIMEOUT,
+        ).text
     except Exception:
         text = ""
 
@@ -4,10 +4,10 @@ import json
 import re
 from typing import Any, Dict, TypedDict, List
 
-from groq import Groq
 from langgraph.graph import END, StateGraph
 
 from app.core.config import settings
+from app.llm import llm_gateway
 from app.consilium.services.requirements_research import (
     extract_competitor_pricing,
     fetch_page,
@@ -43,14 +43,14 @@ def _requirement_api_keys() -> List[str]:
     return deduped
 
 
-def _get_clients() -> list[Groq]:
+def _get_keys() -> list[str]:
     keys = _requirement_api_keys()
     if not keys:
         raise RuntimeError(
             "Set GROQ_REQUIREMENTS_API_KEY_PRIMARY or GROQ_REQUIREMENTS_API_KEY_SECONDARY "
             "or GROQ_REQUIREMENTS_API_KEY or GROQ_API_KEY in backend/.env for PRD generation"
         )
-    return [Groq(api_key=key) for key in keys]
+    return keys
 
 
 def _requirements_model() -> str:
@@ -58,6 +58,8 @@ def _requirements_model() -> str:
 
 
 def _is_retriable_provider_error(exc: Exception) -> bool:
+    if getattr(exc, "retriable", False) or getattr(exc, "status", None) == 413:
+        return True
     name = exc.__class__.__name__.lower()
     text = str(exc).lower()
     if "ratelimit" in name or "rate limit" in text or "429" in text:
@@ -331,7 +333,7 @@ def _quality_issues(part: Dict[str, Any], pass_name: str, seed_text: str) -> lis
 
 
 def _call_with_quality_gate(
-    clients: list[Groq],
+    keys: list[str],
     *,
     system: str,
     user: str,
@@ -342,7 +344,8 @@ def _call_with_quality_gate(
     current_user = user
     all_issues: list[str] = []
     while attempt <= max_attempts:
-        result = _call(clients, system, current_user)
+        # Retries must re-sample: a cached completion would be the output the gate just rejected.
+        result = _call(keys, system, current_user, cache=attempt == 1)
         issues = _quality_issues(result, pass_name, user)
         if not issues:
             if all_issues:
@@ -417,11 +420,11 @@ def _try_parse(text: str) -> Dict[str, Any] | None:
     return None
 
 
-def _repair_json(client: Groq, broken_text: str) -> Dict[str, Any]:
+def _repair_json(keys: list[str], broken_text: str) -> Dict[str, Any]:
     """Ask the model to fix its own malformed JSON output."""
-    resp = client.chat.completions.create(
-        model=_requirements_model(),
-        messages=[
+    resp = llm_gateway.chat_sync(
+        "groq",
+        [
             {
                 "role": "user",
                 "content": (
@@ -431,49 +434,46 @@ def _repair_json(client: Groq, broken_text: str) -> Dict[str, Any]:
                 ),
             }
         ],
+        model=_requirements_model(),
         temperature=0.0,
         max_tokens=8192,
+        keys=keys,
     )
-    raw = resp.choices[0].message.content or ""
-    if isinstance(raw, list):
-        raw = "".join(p.get("text", "") for p in raw if isinstance(p, dict))
-    result = _try_parse(raw)
+    result = _try_parse(resp.text)
     return result if result is not None else {"raw": broken_text, "repair_failed": True}
 
 
-def _call(clients: list[Groq], system: str, user: str) -> Dict[str, Any]:
-    """Try primary/secondary Groq clients with token fallback and JSON repair."""
+def _call(keys: list[str], system: str, user: str, cache: bool = True) -> Dict[str, Any]:
+    """Primary/secondary keys rotate in the gateway; here, token-budget fallback and JSON repair."""
     last_exc: Exception | None = None
     model = _requirements_model()
     token_budgets = (8192, 6144, 4096, 3072)
-    for client in clients:
-        for budget in token_budgets:
-            try:
-                resp = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user},
-                    ],
-                    temperature=0.2,
-                    max_tokens=budget,
-                )
-                raw = resp.choices[0].message.content or ""
-                if isinstance(raw, list):
-                    raw = "".join(p.get("text", "") for p in raw if isinstance(p, dict))
-
-                result = _try_parse(raw)
-                if result is None:
-                    result = _repair_json(client, raw)
-                return result
-            except Exception as exc:
-                last_exc = exc
-                if _is_retriable_provider_error(exc):
-                    continue
-                raise
+    for budget in token_budgets:
+        try:
+            resp = llm_gateway.chat_sync(
+                "groq",
+                [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user},
+                ],
+                model=model,
+                temperature=0.2,
+                max_tokens=budget,
+                keys=keys,
+                cache=cache,
+            )
+            result = _try_parse(resp.text)
+            if result is None:
+                result = _repair_json(keys, resp.text)
+            return result
+        except Exception as exc:
+            last_exc = exc
+            if _is_retriable_provider_error(exc):
+                continue
+            raise
     if last_exc:
         raise last_exc
-    raise RuntimeError("All Groq clients failed for requirements generation")
+    raise RuntimeError("All Groq keys failed for requirements generation")
 
 
 def _split_competitors(raw: str | None) -> list[str]:
@@ -546,7 +546,7 @@ def _build_competitor_evidence(state: RequirementsState) -> tuple[list[Dict[str,
 
 
 def _generate_prd_node(state: RequirementsState) -> RequirementsState:
-    clients = _get_clients()
+    keys = _get_keys()
     competitor_evidence, research_warnings = _build_competitor_evidence(state)
     state = {
         **state,
@@ -557,7 +557,7 @@ def _generate_prd_node(state: RequirementsState) -> RequirementsState:
 
     # --- Pass A: narrative sections ---
     part_a = _call_with_quality_gate(
-        clients,
+        keys,
         system=_SYSTEM_A,
         user=user_prompt,
         pass_name="A",
@@ -572,7 +572,7 @@ def _generate_prd_node(state: RequirementsState) -> RequirementsState:
         + "\n".join(f"- {f}" for f in (part_a.get("features") or [])[:10])
     )
     part_b = _call_with_quality_gate(
-        clients,
+        keys,
         system=_SYSTEM_B,
         user=tech_context,
         pass_name="B",
@@ -6,10 +6,8 @@ import json
 import logging
 from typing import Any, Dict, List
 
-import httpx
-from groq import Groq, GroqError
-
 from app.core.config import settings
+from app.llm import LLMError, llm_gateway, provider_keys
 from .monitoring_agent import _stable_hash, append_activity_once, decide_next_action
 from .state import agent_log
 from app.consilium.services.notification_service import create_notification, trim_activity_log, trim_notifications
@@ -22,16 +20,16 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _get_client() -> Groq:
-    api_key = (
-        settings.RISK_AGENT_KEY
-        or settings.GROQ_PLANNING_API_KEY
-        or settings.GROQ_REQUIREMENTS_API_KEY
-        or settings.GROQ_API_KEY
+def _risk_keys() -> List[str]:
+    keys = provider_keys(
+        "groq",
+        settings.RISK_AGENT_KEY,
+        settings.GROQ_PLANNING_API_KEY,
+        settings.GROQ_REQUIREMENTS_API_KEY,
     )
-    if not api_key:
+    if not keys:
         raise RuntimeError("No risk-agent API key configured")
-    return Groq(api_key=api_key)
+    return keys
 
 
 def _risk_key(risk: Dict[str, Any]) -> str:
@@ -141,77 +139,68 @@ Respond with JSON only:
     new_risks: List[Dict[str, Any]] | None = None
     text: str | None = None
 
-    for attempt in range(2):
-        attempt_t0 = time.perf_counter()
-        t0_llm: float | None = None
-        try:
-            client = _get_client()
-            t0_llm = time.perf_counter()
-            resp = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=800,
-            )
-            latency_ms = int((time.perf_counter() - t0_llm) * 1000)
-            logger.info(
-                "risk_analysis_latency",
-                extra={
-                    "event": "risk_analysis_latency",
-                    "workspace_id": workspace_id,
-                    "latency_ms": latency_ms,
-                },
-            )
-            content = resp.choices[0].message.content or "{}"
-            text = "".join(part.get("text", "") for part in content if isinstance(part, dict)) if isinstance(content, list) else str(content)
-            break
-        except RuntimeError as exc:
-            latency_ms = int((time.perf_counter() - attempt_t0) * 1000)
-            logger.info(
-                "risk_analysis_latency",
-                extra={
-                    "event": "risk_analysis_latency",
-                    "workspace_id": workspace_id,
-                    "latency_ms": latency_ms,
-                },
-            )
-            logger.warning(
-                "risk_analysis_fallback workspace_id=%s reason=%s",
-                workspace_id,
-                str(exc),
-            )
-            if not tasks and not pull_requests:
-                return list(existing_risks)
-            new_risks = _default_risks()
-            break
-        except (GroqError, httpx.HTTPError, TimeoutError) as exc:
-            latency_ms = int((time.perf_counter() - t0_llm) * 1000) if t0_llm is not None else int((time.perf_counter() - attempt_t0) * 1000)
-            logger.info(
-                "risk_analysis_latency",
-                extra={
-                    "event": "risk_analysis_latency",
-                    "workspace_id": workspace_id,
-                    "latency_ms": latency_ms,
-                },
-            )
-            if attempt == 0:
-                continue
-            short_msg = str(exc).strip()
-            if len(short_msg) > 300:
-                short_msg = short_msg[:297] + "..."
-            logger.warning(
-                "risk_analysis_provider_error",
-                extra={
-                    "event": "risk_analysis_provider_error",
-                    "workspace_id": workspace_id,
-                    "error_type": type(exc).__name__,
-                    "message": short_msg,
-                },
-            )
-            if not tasks and not pull_requests:
-                return list(existing_risks)
-            new_risks = _default_risks()
-            break
+    # Retries, backoff and key rotation happen in the gateway; one call here.
+    attempt_t0 = time.perf_counter()
+    try:
+        result = llm_gateway.chat_sync(
+            "groq",
+            [{"role": "user", "content": prompt}],
+            model="llama-3.3-70b-versatile",
+            temperature=0.2,
+            max_tokens=800,
+            keys=_risk_keys(),
+        )
+        logger.info(
+            "risk_analysis_latency",
+            extra={
+                "event": "risk_analysis_latency",
+                "workspace_id": workspace_id,
+                "latency_ms": result.latency_ms,
+            },
+        )
+        text = result.text or "{}"
+    except LLMError as exc:
+        logger.info(
+            "risk_analysis_latency",
+            extra={
+                "event": "risk_analysis_latency",
+                "workspace_id": workspace_id,
+                "latency_ms": int((time.perf_counter() - attempt_t0) * 1000),
+            },
+        )
+        short_msg = str(exc).strip()
+        if len(short_msg) > 300:
+            short_msg = short_msg[:297] + "..."
+        logger.warning(
+            "risk_analysis_provider_error",
+            extra={
+                "event": "risk_analysis_provider_error",
+                "workspace_id": workspace_id,
+                "error_type": type(exc).__name__,
+                "status": exc.status,
+                "message": short_msg,
+            },
+        )
+        if not tasks and not pull_requests:
+            return list(existing_risks)
+        new_risks = _default_risks()
+    except RuntimeError as exc:
+        logger.info(
+            "risk_analysis_latency",
+            extra={
+                "event": "risk_analysis_latency",
+                "workspace_id": workspace_id,
+                "latency_ms": int((time.perf_counter() - attempt_t0) * 1000),
+            },
+        )
+        logger.warning(
+            "risk_analysis_fallback workspace_id=%s reason=%s",
+            workspace_id,
+            str(exc),
+        )
+        if not tasks and not pull_requests:
+            return list(existing_risks)
+        new_risks = _default_risks()
 
     if new_risks is None and text is not None:
         try:
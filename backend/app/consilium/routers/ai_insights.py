@@ -1,15 +1,14 @@
 """AI project insights: Gemini-powered Q&A over workspace data."""
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
+from app.llm import ChatResult, LLMError, llm_gateway
 from app.consilium.database import get_db
 from app.consilium.dependencies import ensure_workspace_member, get_current_user
 
@@ -25,7 +24,6 @@ GEMINI_MODELS = [
     "gemini-2.5-flash-lite",  # Fastest, budget-friendly
 ]
 
-GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 REQUEST_TIMEOUT = 60.0
 
 
@@ -95,56 +93,40 @@ def _build_prompt(context: str, question: str) -> str:
     )
 
 
-def _parse_error_response(resp: httpx.Response) -> str:
-    """Extract user-friendly error message from Gemini error response."""
-    try:
-        data = resp.json()
-        err = data.get("error", {})
-        msg = err.get("message", resp.text)
-        code = err.get("code", 0)
-        status = err.get("status", "")
-        if "not found" in msg.lower() or "not supported" in msg.lower():
-            return f"Model unavailable: {msg}"
-        if code == 429 or status == "RESOURCE_EXHAUSTED":
-            return "Rate limit exceeded. Please try again in a moment."
-        if code >= 500 or "INTERNAL" in status:
-            return "Gemini service is temporarily unavailable. Please try again."
-        return msg or resp.text
-    except Exception:
-        return resp.text or "Unknown error"
-
-
-def _parse_success_response(data: dict) -> tuple[str | None, str | None]:
+def _friendly_error(exc: LLMError) -> str:
+    """User-facing message for a Gemini call that failed after the gateway's retries."""
+    msg = str(exc)
+    if exc.status is None and "timed out" in msg:
+        return "Request timed out. Please try again."
+    if exc.status is None:
+        return f"Network error: {msg}"
+    if "not found" in msg.lower() or "not supported" in msg.lower():
+        return f"Model unavailable: {msg}"
+    if exc.status == 429:
+        return "Rate limit exceeded. Please try again in a moment."
+    if exc.status >= 500:
+        return "Gemini service is temporarily unavailable. Please try again."
+    return msg
+
+
+def _parse_success_response(result: ChatResult) -> tuple[str | None, str | None]:
     """
-    Parse Gemini generateContent success response.
+    Check a Gemini completion.
     Returns (answer_text, error_message). One will be None.
     """
-    candidates = data.get("candidates") or []
-    if not candidates:
-        # No candidates: may be blocked by safety or empty
-        prompt_feedback = data.get("promptFeedback", {})
-        block_reason = prompt_feedback.get("blockReason") or "No candidates returned."
-        return None, f"Response blocked or empty: {block_reason}"
-
-    first = candidates[0]
-    finish = first.get("finishReason", "")
+    finish = result.finish_reason or ""
     if finish and finish.upper() != "STOP":
+        if not result.text:
+            # No candidates (or no text): blocked by safety or empty
+            return None, f"Response blocked or empty: {finish}"
         # SAFETY, RECITATION, etc.
         return None, f"Response ended: {finish}"
-
-    content = first.get("content", {})
-    parts = content.get("parts") or []
-    if not parts:
-        return None, "No text in response."
-
-    text = parts[0].get("text", "").strip()
-    if not text:
+    if not result.text:
         return None, "Empty response text."
-    return text, None
+    return result.text, None
 
 
 async def _call_gemini_single(
-    client: httpx.AsyncClient,
     model: str,
     prompt: str,
     api_key: str,
@@ -152,49 +134,29 @@ async def _call_gemini_single(
     """
     Call one Gemini model. Returns (answer, error). One will be None.
     """
-    url = f"{GEMINI_BASE_URL}/{model}:generateContent"
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0.2,
-            "maxOutputTokens": 2048,
-        },
-    }
-
     try:
-        resp = await client.post(
-            f"{url}?key={api_key}",
-            headers={"Content-Type": "application/json"},
-            json=payload,
-        )
-    except httpx.TimeoutException:
-        return None, "Request timed out. Please try again."
-    except httpx.RequestError as e:
-        logger.warning("Gemini request failed for model=%s: %s", model, e)
-        return None, f"Network error: {e!s}"
-
-    if resp.status_code != 200:
-        err_msg = _parse_error_response(resp)
-        logger.warning(
-            "Gemini API error model=%s status=%s: %s",
-            model,
-            resp.status_code,
-            err_msg,
+        result = await llm_gateway.chat(
+            "gemini",
+            [{"role": "user", "content": prompt}],
+            model=model,
+            temperature=0.2,
+            max_tokens=2048,
+            keys=[api_key],
+            timeout=REQUEST_TIMEOUT,
         )
+    except LLMError as e:
+        err_msg = _friendly_error(e)
+        logger.warning("Gemini API error model=%s status=%s: %s", model, e.status, err_msg)
         return None, err_msg
 
-    try:
-        data = resp.json()
-    except json.JSONDecodeError as e:
-        return None, f"Invalid response: {e!s}"
-
-    return _parse_success_response(data)
+    return _parse_success_response(result)
 
 
 async def _call_gemini(context: str, question: str) -> str:
     """
     Call Gemini API with primary model and fallbacks.
     All API key and model logic is server-side; key is never exposed.
+    Same workspace state and question → cached answer, via the gateway's response cache.
     """
     api_key = getattr(settings, "GEMINI_API_KEY", None) or ""
     if not api_key:
@@ -205,17 +167,15 @@ async def _call_gemini(context: str, question: str) -> str:
 
     prompt = _build_prompt(context, question)
     last_error: str = "No response from any model."
-
-    async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-        for model in GEMINI_MODELS:
-            answer, error = await _call_gemini_single(client, model, prompt, api_key)
-            if answer:
-                if model != GEMINI_MODELS[0]:
-                    logger.info("Used fallback model: %s", model)
-                return answer
-            if error:
-                last_error = error
-                logger.debug("Model %s failed: %s", model, error)
+    for model in GEMINI_MODELS:
+        answer, error = await _call_gemini_single(model, prompt, api_key)
+        if answer:
+            if model != GEMINI_MODELS[0]:
+                logger.info("Used fallback model: %s", model)
+            return answer
+        if error:
+            last_error = error
+            logger.debug("Model %s failed: %s", model, error)
 
     return f"Unable to get AI insight: {last_error}"
 
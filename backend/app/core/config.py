@@ -58,6 +58,7 @@ class Settings(BaseSettings):
     GROQ_PLANNING_API_KEY: str = ""
     # Google Gemini (planning graph / monitoring). https://aistudio.google.com/apikey
     GEMINI_API_KEY: str = ""
+    OPENROUTER_API_KEY: str = ""
     # Optional aliases (same values as above if you prefer one key per agent)
     PLANNING_AGENT_KEY: str = ""
     MONITORING_AGENT_KEY: str = ""
@@ -71,6 +72,22 @@ class Settings(BaseSettings):
     TASK_AUTOMATION_EXTRACT_MAX_TOKENS: int = 3072
     TASK_AUTOMATION_BOARD_SYNC_MAX_TOKENS: int = 2048
 
+    # Shared chat-completion cache (app.llm): deterministic requests only; in-process LRU + llm_cache collection.
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.2
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_MAX_MB: float = 64.0
+    LLM_CACHE_TTL_HOURS: float = 168.0
+    LLM_CACHE_MAX_DOCUMENTS: int = 20000
+    # LLM gateway (app.llm): pooled HTTP clients, per-provider concurrency caps, retries with jittered backoff.
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    LLM_GROQ_CONCURRENCY: int = 8
+    LLM_GEMINI_CONCURRENCY: int = 4
+    LLM_OPENROUTER_CONCURRENCY: int = 4
+
     # Kanban: retrieve small transcript context via embeddings + FAISS (set false to use legacy char chunks)
     KANBAN_RAG_ENABLED: bool = True
     KANBAN_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
@@ -86,6 +103,15 @@ class Settings(BaseSettings):
     # Board-sync RAG: retrieve from latest meeting only
     KANBAN_RAG_BOARD_SYNC_ENABLED: bool = True
     KANBAN_RAG_BOARD_MAX_TRANSCRIPT_CHARS: int = 10000
+    # Embedding worker pool: model preloaded at startup; concurrent encodes merged into micro-batches
+    EMBEDDING_PRELOAD: bool = True
+    EMBEDDING_WORKERS: int = 1
+    EMBEDDING_MAX_BATCH: int = 64
+    EMBEDDING_BATCH_WAIT_MS: float = 5.0
+    # Persistent chunk-embedding cache (sha256 of model + text -> float16 row); empty dir = system temp dir
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = ""
+    EMBEDDING_CACHE_MAX_MB: float = 256.0
     # When true, meeting /ask can pull project-wide transcript RAG context (requires embeddings + FAISS).
     TRANSCRIPT_RAG_FOR_QA_ENABLED: bool = False
     # When true, workspace copilot snapshot may include a project-wide RAG snippet (same deps as QA).
@@ -96,6 +122,15 @@ class Settings(BaseSettings):
     TRANSCRIPT_RAG_QA_MAX_CONTEXT_CHARS: int = 8000
     # Optional cache directory for serialized project transcript indexes (empty = no disk cache).
     TRANSCRIPT_RAG_CACHE_DIR: str = ""
+    # Index type: auto (flat below TRANSCRIPT_RAG_ANN_MIN_CHUNKS, TRANSCRIPT_RAG_ANN_INDEX above) | flat | hnsw | ivfpq
+    # | a faiss index_factory string. Flat/HNSW vectors are stored as TRANSCRIPT_RAG_VECTOR_DTYPE (float16 | float32).
+    TRANSCRIPT_RAG_INDEX_TYPE: str = "auto"
+    TRANSCRIPT_RAG_ANN_MIN_CHUNKS: int = 20000
+    TRANSCRIPT_RAG_ANN_INDEX: str = "hnsw"
+    TRANSCRIPT_RAG_VECTOR_DTYPE: str = "float16"
+    TRANSCRIPT_RAG_HNSW_M: int = 32
+    TRANSCRIPT_RAG_HNSW_EF_SEARCH: int = 64
+    TRANSCRIPT_RAG_IVF_NPROBE: int = 16
 
     # LangGraph Mongo checkpoints (optional TTL in seconds on checkpoint collections).
     LANGGRAPH_CHECKPOINT_TTL_SECONDS: Optional[int] = None
@@ -146,15 +181,42 @@ class Settings(BaseSettings):
     # If set, bot audio WS must include ?ws_secret=<value>. Live transcript WS may require ?access_token=<jwt>.
     MEETING_AUDIO_WS_SECRET: str = ""
     MEETING_LIVE_WS_REQUIRE_AUTH: bool = False
+    # inline: bots + STT run in the API process. queue: the API enqueues meeting jobs in Mongo and
+    # run_meeting_worker.py processes claim them (admission control rejects starts when workers are full).
+    MEETING_WORKER_MODE: str = "inline"
+    # Meetings one worker process runs at once.
+    MEETING_WORKER_CAPACITY: int = 4
+    MEETING_WORKER_HEARTBEAT_SECONDS: float = 5.0
+    # How often a worker checks for new jobs and stop / pause requests.
+    MEETING_WORKER_POLL_SECONDS: float = 1.0
+    # A job whose worker missed heartbeats this long is requeued (failed after MAX_ATTEMPTS claims).
+    MEETING_WORKER_STALE_SECONDS: float = 30.0
+    MEETING_WORKER_MAX_ATTEMPTS: int = 3
+    # Meeting stop waits this long for the worker to flush the transcript before running the summary.
+    MEETING_WORKER_STOP_TIMEOUT_SECONDS: float = 30.0
+    # Workers send X-Meeting-Worker-Secret when publishing captions (defaults to MEETING_AUDIO_WS_SECRET).
+    MEETING_WORKER_SECRET: str = ""
 
     # Audio capture & STT (must match what bot sends)
     AUDIO_SAMPLE_RATE: int = 16000
     AUDIO_CHANNELS: int = 1
     AUDIO_CHUNK_SIZE: int = 1024
+    # Capture blocks buffered between the PortAudio callback and the bot sender (oldest dropped when full).
+    AUDIO_CAPTURE_QUEUE_MAX_BLOCKS: int = 256
+    # Framed bot audio (/ws/audio?framing=1): capture blocks per frame, frames kept for resend until acked,
+    # server reorder window (frames / seconds before a hole is skipped as a gap) and ack interval.
+    AUDIO_WS_BATCH_BLOCKS: int = 4
+    AUDIO_WS_RESEND_MAX_FRAMES: int = 256
+    AUDIO_WS_REORDER_WINDOW: int = 8
+    AUDIO_WS_REORDER_WAIT_SECONDS: float = 1.0
+    AUDIO_WS_ACK_INTERVAL_SECONDS: float = 1.0
     # Input device for bot: system audio (e.g. "Stereo Mix" on Windows) not microphone.
     # Set to device name substring (e.g. "Stereo Mix", "What U Hear") or device index (e.g. "2").
     # Leave unset to use default input device (usually mic).
     AUDIO_INPUT_DEVICE: Optional[Union[int, str]] = None
+    # fixed (default): send STT_BUFFER_SECONDS windows on a cadence | vad: send only padded speech utterances
+    # cut on VAD boundaries (see VAD_SEGMENT_*); fewer Whisper calls in meetings with long silences.
+    STT_SEGMENTATION: str = "fixed"
     # STT buffer seconds before calling Whisper (smaller = faster first transcript, more API calls)
     STT_BUFFER_SECONDS: float = 5.0
     # Minimum seconds between Whisper API calls (pacing / rate limits)
@@ -163,15 +225,66 @@ class Settings(BaseSettings):
     STT_ACCURACY_MODE: bool = True
     # Default Whisper model for streaming chunks.
     STT_TRANSCRIBE_MODEL: str = "whisper-large-v3"
-    # groq (default) | faster_whisper — local path requires optional ``pip install faster-whisper``.
+    # groq (default) | faster_whisper — local path requires optional ``pip install "faster-whisper>=1.1"``.
     STT_BACKEND: str = "groq"
     STT_FASTER_WHISPER_MODEL: str = "base"
+    # Local Whisper worker pool: processes (0 = one in-process thread) and CPU threads per worker.
+    STT_LOCAL_WORKERS: int = 2
+    STT_LOCAL_CPU_THREADS: int = 4
+    STT_LOCAL_DEVICE: str = "cpu"
+    STT_LOCAL_COMPUTE_TYPE: str = "int8"
+    STT_LOCAL_BEAM_SIZE: int = 1
+    # Chunks from all meetings are batched: up to N per inference, waiting at most this long for more.
+    STT_LOCAL_MAX_BATCH: int = 8
+    STT_LOCAL_BATCH_WAIT_MS: float = 50.0
+    # Spawn workers and load + warm the model at API startup instead of on the first chunk.
+    STT_LOCAL_PRELOAD: bool = True
+    # Shared async transcription client (one pooled HTTP client per backend + key for all meetings)
+    STT_HTTP_MAX_CONNECTIONS: int = 20
+    STT_HTTP_KEEPALIVE_SECONDS: float = 60.0
+    STT_HTTP_TIMEOUT_SECONDS: float = 30.0
+    # HTTP/2 is used only when the optional ``h2`` package is installed.
+    STT_HTTP2: bool = True
+    # SDK-level retries; the pipeline already requeues audio and backs off on 429.
+    STT_HTTP_MAX_RETRIES: int = 0
+    # Override the Whisper API base URL (proxy or local stub); empty = provider default.
+    STT_API_BASE_URL: str = ""
+    # Shared STT scheduler: global cap on in-flight Whisper calls across all meetings.
+    STT_MAX_CONCURRENT_CALLS: int = 8
+    # Proactive per-key pacing (requests/minute, 0 = only provider rate-limit headers / 429s pause a key).
+    STT_RATE_LIMIT_RPM: float = 0.0
+    STT_RATE_LIMIT_BURST: int = 4
+    # Meetings with live subscribers are served first; others are promoted after waiting this long.
+    STT_PRIORITY_MAX_WAIT_SECONDS: float = 10.0
     # Extra domain terms to bias Whisper toward correct spelling/pronunciation.
     STT_CONTEXT_HINTS: str = "WebSocket, analytics, Vikram, project scope, testing"
     # Number of previous accepted transcript segments to pass as prompt context.
     STT_PROMPT_HISTORY_LINES: int = 6
     # Overlap retained between chunks to avoid losing words at chunk boundaries.
     STT_OVERLAP_SECONDS: float = 2.0
+    # Capacity of the per-meeting STT ring buffer; oldest audio is dropped when a backlog exceeds it.
+    STT_RING_BUFFER_SECONDS: float = 60.0
+    # Per-meeting bounded queue between the audio WebSocket and its STT consumer (frames; oldest dropped when full).
+    STT_AUDIO_QUEUE_MAX_FRAMES: int = 256
+    # Upload codec for Whisper chunks: "flac" (lossless, needs soundfile), "opus" (lossy, smallest, more CPU) or "wav".
+    STT_AUDIO_CODEC: str = "flac"
+    # Write-behind transcript_segments: flush per meeting at N segments or after N seconds (and on stop).
+    STT_SEGMENT_FLUSH_SIZE: int = 10
+    STT_SEGMENT_FLUSH_SECONDS: float = 2.0
+    STT_SEGMENT_WRITE_RETRIES: int = 4
+    STT_SEGMENT_MAX_PENDING: int = 2000
+    # Participant attendance: the bot drains the page's join/leave listener every N seconds (forwarded as
+    # audio-WebSocket control frames); until the listener attaches, a participant snapshot every N seconds.
+    PARTICIPANT_EVENT_INTERVAL_SECONDS: float = 1.0
+    PARTICIPANT_SNAPSHOT_INTERVAL_SECONDS: float = 10.0
+    # Write-behind attendance_records: flush per meeting at N join/leave events or after N seconds (and on stop).
+    ATTENDANCE_FLUSH_SIZE: int = 50
+    ATTENDANCE_FLUSH_SECONDS: float = 2.0
+    ATTENDANCE_WRITE_RETRIES: int = 3
+    # Live transcript fan-out: per-subscriber outbound queue (messages) and per-send timeout; a subscriber
+    # that falls behind either limit is disconnected so it cannot hold up captions for other viewers.
+    LIVE_WS_SEND_QUEUE_MAX: int = 64
+    LIVE_WS_SEND_TIMEOUT_SECONDS: float = 10.0
     # Skip sending chunks with RMS below this to reduce "Thank you" hallucinations on silence (set 0 to disable)
     STT_SILENCE_RMS_THRESHOLD: float = 80.0
 
@@ -185,6 +298,16 @@ class Settings(BaseSettings):
     VAD_SPEECH_CONFIRM_FRAMES: int = 3
     # WebRTC VAD aggressiveness: 0 (least aggressive, more false positives) to 3 (most aggressive, may clip speech)
     VAD_AGGRESSIVENESS: int = 2
+    # WebRTC VAD sub-window (10, 20 or 30 ms); every sub-window of a frame is checked.
+    VAD_FRAME_MS: int = 20
+    # STT_SEGMENTATION=vad: an utterance starts after CONFIRM ms of speech, ends after END_SILENCE ms of
+    # silence, is padded by PAD ms on both sides, dropped if it holds less than MIN_SPEECH ms of speech,
+    # and force-cut at MAX_SECONDS.
+    VAD_SEGMENT_CONFIRM_MS: int = 120
+    VAD_SEGMENT_END_SILENCE_MS: int = 600
+    VAD_SEGMENT_PAD_MS: int = 300
+    VAD_SEGMENT_MIN_SPEECH_MS: int = 250
+    VAD_SEGMENT_MAX_SECONDS: float = 15.0
 
     # ── STT pre-transcription audio quality checks ──
     # Minimum dBFS level for a chunk to be sent to Whisper (-45 dBFS is very quiet)
@@ -193,6 +316,31 @@ class Settings(BaseSettings):
     STT_MAX_ZCR: float = 0.52
     # Minimum peak sample amplitude in a chunk (out of 32767)
     STT_MIN_PEAK: int = 40
+    # Maximum spectral flatness (0–1); white noise is near 1, speech well below 0.3 (0 = check disabled)
+    STT_MAX_SPECTRAL_FLATNESS: float = 0.0
+
+    # Uploaded recordings: spooled to disk (empty = system temp dir), processed in the background.
+    RECORDINGS_SPOOL_DIR: str = ""
+    RECORDING_MAX_UPLOAD_MB: float = 2048.0
+    # Chunks are cut at the first pause (RECORDING_SILENCE_DB dBFS) after CHUNK_SECONDS, at the latest at MAX.
+    RECORDING_CHUNK_SECONDS: float = 60.0
+    RECORDING_CHUNK_MAX_SECONDS: float = 120.0
+    RECORDING_SILENCE_DB: float = -40.0
+    # Chunks transcribed at once per recording (through the shared STT scheduler) and retries per chunk.
+    RECORDING_TRANSCRIBE_CONCURRENCY: int = 4
+    RECORDING_TRANSCRIBE_RETRIES: int = 3
+    # A processing recording whose progress has not moved for this long (API restarted) is marked failed.
+    RECORDING_STALE_SECONDS: float = 600.0
+    # Map-reduce summaries: transcript window size per map call and map calls in flight.
+    SUMMARY_WINDOW_CHARS: int = 12000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    # Window notes / summaries cached by content hash (in-process LRU + summary_cache collection).
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 1024
+    SUMMARY_CACHE_TTL_DAYS: float = 30.0
+    # Rolling summary of live meetings (summary_checkpoints); the stop-time pass then maps only the tail.
+    LIVE_SUMMARY_ENABLED: bool = True
+    LIVE_SUMMARY_INTERVAL_SECONDS: float = 180.0
 
     @field_validator(
         "GROQ_API_KEY",
@@ -201,6 +349,7 @@ class Settings(BaseSettings):
         "GROQ_REQUIREMENTS_API_KEY_SECONDARY",
         "GROQ_PLANNING_API_KEY",
         "GEMINI_API_KEY",
+        "OPENROUTER_API_KEY",
         "PLANNING_AGENT_KEY",
         "MONITORING_AGENT_KEY",
         "RISK_AGENT_KEY",
@@ -70,6 +70,30 @@ async def create_indexes():
     await ensure_index(database.action_items, "meeting_id")
     await ensure_index(database.meeting_signals, "project_id")
     await ensure_index(database.meeting_signals, [("project_id", 1), ("processed", 1), ("created_at", -1)])
+    # Meeting worker queue: one active job per meeting; claim order; per-worker lookups.
+    await ensure_index(
+        database.meeting_jobs,
+        "meeting_id",
+        unique=True,
+        partialFilterExpression={"active": {"$eq": True}},
+        name="meeting_id_active_unique",
+    )
+    await ensure_index(database.meeting_jobs, [("status", 1), ("created_at", 1)])
+    await ensure_index(database.meeting_jobs, [("worker_id", 1), ("active", 1)])
+    await ensure_index(database.meeting_workers, "heartbeat_at")
+    await ensure_index(database.summary_checkpoints, "meeting_id", unique=True)
+    # Shared LLM response cache (documents keyed by request hash); TTL + pruning by created_at.
+    await ensure_index(
+        database.llm_cache,
+        "created_at",
+        expireAfterSeconds=int(float(getattr(settings, "LLM_CACHE_TTL_HOURS", 168.0)) * 3600),
+    )
+    # Map-reduce summary cache (documents keyed by content hash); expire old entries.
+    await ensure_index(
+        database.summary_cache,
+        "created_at",
+        expireAfterSeconds=int(float(getattr(settings, "SUMMARY_CACHE_TTL_DAYS", 30.0)) * 86400),
+    )
 
     # Tasks collection indexes
     await ensure_index(database.tasks, "project_id")
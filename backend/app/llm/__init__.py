@@ -0,0 +1,13 @@
+from .gateway import ChatResult, LLMError, LLMGateway, llm_gateway, provider_keys
+from .response_cache import LLMResponseCache, bypass, llm_cache
+
+__all__ = [
+    "ChatResult",
+    "LLMError",
+    "LLMGateway",
+    "LLMResponseCache",
+    "bypass",
+    "llm_cache",
+    "llm_gateway",
+    "provider_keys",
+]
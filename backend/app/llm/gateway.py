@@ -0,0 +1,479 @@
+"""
+One async gateway for chat completions on Groq, OpenRouter and Gemini.
+
+Every LLM call in the backend goes through ``llm_gateway``:
+
+- Requests run on a dedicated event loop in a background thread that owns one pooled keep-alive
+  ``httpx.AsyncClient`` per provider. Async code awaits ``chat(...)``; sync code (LangGraph nodes,
+  helpers already running in threads) calls ``chat_sync(...)``. Both share connections and limits.
+- At most ``LLM_<PROVIDER>_CONCURRENCY`` requests per provider are in flight; the rest queue.
+- 429 / 5xx / timeouts move on to the next key in ``keys`` (primary → secondary → default), then
+  are retried on the last key up to ``LLM_MAX_RETRIES`` times with full-jitter exponential backoff
+  (``Retry-After`` is honoured). 401/403 drop the key and try the next one.
+- A 400 on a request with ``response_format`` is retried once without it, the fallback the call
+  sites used to implement one by one.
+- Deterministic requests are answered from ``llm_cache`` when the same request was seen before.
+- Each call logs an ``llm_call`` record (provider, model, latency, tokens, attempts, cached) and
+  ``get_stats()`` aggregates them per provider.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Coroutine, Deque, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import settings
+from app.llm.response_cache import llm_cache
+
+logger = logging.getLogger(__name__)
+
+_ENDPOINTS = {
+    "groq": "https://api.groq.com/openai/v1/chat/completions",
+    "openrouter": "https://openrouter.ai/api/v1/chat/completions",
+    "gemini": "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent",
+}
+_DEFAULT_CONCURRENCY = {"groq": 8, "openrouter": 4, "gemini": 4}
+_RETRIABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+_AUTH_STATUS = frozenset({401, 403})
+
+
+@dataclass
+class ChatResult:
+    text: str
+    provider: str
+    model: str
+    finish_reason: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    latency_ms: float = 0.0
+    attempts: int = 0
+    cached: bool = False
+
+
+class LLMError(RuntimeError):
+    """A provider call that failed after the gateway's retries / key rotation."""
+
+    def __init__(
+        self,
+        message: str,
+        provider: str,
+        status: Optional[int] = None,
+        retriable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+        self.retriable = retriable
+        self.retry_after = retry_after
+
+
+def provider_keys(provider: str, *preferred: Optional[str]) -> List[str]:
+    """Non-empty keys in rotation order: ``preferred`` first, then the provider's default key."""
+    defaults = {
+        "groq": settings.GROQ_API_KEY,
+        "gemini": settings.GEMINI_API_KEY,
+        "openrouter": settings.OPENROUTER_API_KEY,
+    }
+    keys: List[str] = []
+    for key in (*preferred, defaults.get(provider, "")):
+        key = (key or "").strip()
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _openai_payload(model: str, messages: Sequence[dict], temperature: float, max_tokens: int, response_format: Optional[dict]) -> dict:
+    payload = {"model": model, "messages": list(messages), "temperature": temperature, "max_tokens": max_tokens}
+    if response_format:
+        payload["response_format"] = response_format
+    return payload
+
+
+def _gemini_payload(messages: Sequence[dict], temperature: float, max_tokens: int, response_format: Optional[dict]) -> dict:
+    system = "\n\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+    contents = [
+        {"role": "model" if m.get("role") == "assistant" else "user", "parts": [{"text": str(m.get("content") or "")}]}
+        for m in messages
+        if m.get("role") != "system"
+    ]
+    config: Dict[str, Any] = {"temperature": temperature, "maxOutputTokens": max_tokens}
+    if (response_format or {}).get("type") == "json_object":
+        config["responseMimeType"] = "application/json"
+    payload: Dict[str, Any] = {"contents": contents, "generationConfig": config}
+    if system:
+        payload["system_instruction"] = {"parts": [{"text": system}]}
+    return payload
+
+
+def _parse_openai(data: dict) -> tuple:
+    choices = data.get("choices") or []
+    choice = choices[0] if choices else {}
+    content = (choice.get("message") or {}).get("content") or ""
+    if isinstance(content, list):
+        content = "".join(str(p.get("text") or "") for p in content if isinstance(p, dict))
+    usage = data.get("usage") or {}
+    return str(content).strip(), choice.get("finish_reason"), usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+
+def _parse_gemini(data: dict) -> tuple:
+    usage = data.get("usageMetadata") or {}
+    candidates = data.get("candidates") or []
+    if not candidates:
+        reason = (data.get("promptFeedback") or {}).get("blockReason") or "NO_CANDIDATES"
+        return "", reason, usage.get("promptTokenCount"), None
+    first = candidates[0]
+    parts = (first.get("content") or {}).get("parts") or []
+    text = "".join(str(p.get("text") or "") for p in parts if isinstance(p, dict))
+    return text.strip(), first.get("finishReason"), usage.get("promptTokenCount"), usage.get("candidatesTokenCount")
+
+
+def _error_from_response(provider: str, resp: httpx.Response) -> LLMError:
+    try:
+        err = resp.json().get("error") or {}
+        message = err.get("message") if isinstance(err, dict) else str(err)
+    except Exception:
+        message = None
+    retry_after = None
+    try:
+        retry_after = float(resp.headers.get("retry-after")) if resp.headers.get("retry-after") else None
+    except ValueError:
+        pass
+    return LLMError(
+        f"{provider} HTTP {resp.status_code}: {(message or resp.text or '')[:300]}",
+        provider,
+        status=resp.status_code,
+        retriable=resp.status_code in _RETRIABLE_STATUS,
+        retry_after=retry_after,
+    )
+
+
+class _ProviderStats:
+    __slots__ = ("requests", "cache_hits", "errors", "retries", "key_rotations", "rate_limited",
+                 "prompt_tokens", "completion_tokens", "latencies_ms")
+
+    def __init__(self):
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.retries = 0
+        self.key_rotations = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies_ms: Deque[float] = collections.deque(maxlen=512)
+
+    def snapshot(self) -> dict:
+        lat = sorted(self.latencies_ms)
+
+        def pct(q: float) -> Optional[float]:
+            return round(lat[min(len(lat) - 1, int(q * len(lat)))], 1) if lat else None
+
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "retries": self.retries,
+            "key_rotations": self.key_rotations,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_p50_ms": pct(0.50),
+            "latency_p95_ms": pct(0.95),
+        }
+
+
+class LLMGateway:
+    """Pooled, rate-capped, retrying chat completions; see the module docstring."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, _ProviderStats] = collections.defaultdict(_ProviderStats)
+
+    # -- gateway loop ---------------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="llm-gateway", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    @staticmethod
+    def _concurrency(provider: str) -> int:
+        return max(1, int(getattr(settings, f"LLM_{provider.upper()}_CONCURRENCY", _DEFAULT_CONCURRENCY.get(provider, 4))))
+
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        client = self._clients.get(provider)
+        if client is None:
+            from app.stt.transcription_client import _http2_available
+
+            timeout = float(getattr(settings, "LLM_TIMEOUT_SECONDS", 60.0))
+            conns = self._concurrency(provider)
+            client = self._clients[provider] = httpx.AsyncClient(
+                http2=self._transport is None and _http2_available(),
+                timeout=httpx.Timeout(timeout, connect=min(10.0, timeout)),
+                limits=httpx.Limits(max_connections=conns, max_keepalive_connections=conns, keepalive_expiry=60.0),
+                transport=self._transport,
+            )
+        return client
+
+    def _limit(self, provider: str) -> asyncio.Semaphore:
+        sem = self._limits.get(provider)
+        if sem is None:
+            sem = self._limits[provider] = asyncio.Semaphore(self._concurrency(provider))
+        return sem
+
+    # -- public API -----------------------------------------------------------------------------
+
+    async def chat(
+        self,
+        provider: str,
+        messages: Sequence[dict],
+        *,
+        model: str,
+        temperature: float = 0.2,
+        max_tokens: int = 1024,
+        response_format: Optional[dict] = None,
+        keys: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+        cache: bool = True,
+    ) -> ChatResult:
+        """One chat completion; raises ``LLMError`` when every key and retry failed."""
+        # Cache policy is read here: the caller's context (``bypass()``) does not reach the gateway loop.
+        use_cache = llm_cache.cacheable(temperature, cache)
+        coro = self._chat(provider, list(messages), model, temperature, max_tokens, response_format, keys, timeout, use_cache)
+        return await asyncio.wrap_future(self._submit(coro))
+
+    def chat_sync(self, provider: str, messages: Sequence[dict], **kwargs: Any) -> ChatResult:
+        """Blocking ``chat`` for sync code; run it in a worker thread when called from async code."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("chat_sync called on the LLM gateway loop; await chat() instead")
+        use_cache = llm_cache.cacheable(kwargs.get("temperature", 0.2), kwargs.pop("cache", True))
+        coro = self._chat(
+            provider,
+            list(messages),
+            kwargs["model"],
+            kwargs.get("temperature", 0.2),
+            kwargs.get("max_tokens", 1024),
+            kwargs.get("response_format"),
+            kwargs.get("keys"),
+            kwargs.get("timeout"),
+            use_cache,
+        )
+        return self._submit(coro).result()
+
+    async def close(self) -> None:
+        """Close pooled connections and stop the gateway loop (API / worker shutdown)."""
+        loop, thread = self._loop, self._thread
+        if loop is None or loop.is_closed():
+            return
+        try:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close_clients(), loop))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                await asyncio.to_thread(thread.join, 5.0)
+            with self._lock:
+                if not loop.is_running():
+                    loop.close()
+                self._loop = None
+                self._thread = None
+
+    async def _close_clients(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._limits.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.debug("LLM client close failed", exc_info=True)
+
+    def get_stats(self) -> dict:
+        return {provider: stats.snapshot() for provider, stats in self._stats.items()}
+
+    # -- request path (gateway loop) ------------------------------------------------------------
+
+    async def _chat(
+        self,
+        provider: str,
+        messages: List[dict],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict],
+        keys: Optional[Sequence[str]],
+        timeout: Optional[float],
+        use_cache: bool,
+    ) -> ChatResult:
+        if provider not in _ENDPOINTS:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+        stats = self._stats[provider]
+        params = {"temperature": temperature, "max_tokens": max_tokens, "response_format": response_format}
+        cache_key = llm_cache.key(provider, model, messages, params) if use_cache else None
+        if cache_key is None:
+            llm_cache._count(provider, "bypassed")
+        else:
+            hit = await llm_cache.aget(cache_key, provider)
+            if hit:
+                stats.cache_hits += 1
+                return ChatResult(provider=provider, model=model, cached=True, **hit)
+
+        keys = list(keys) if keys is not None else provider_keys(provider)
+        t0 = time.perf_counter()
+        try:
+            try:
+                data, attempts = await self._complete(provider, model, messages, temperature, max_tokens, response_format, keys, timeout)
+            except LLMError as e:
+                if not response_format or e.status != 400:
+                    raise
+                logger.warning("%s rejected response_format (%s); retrying without it", provider, e)
+                data, attempts = await self._complete(provider, model, messages, temperature, max_tokens, None, keys, timeout)
+        except LLMError:
+            stats.errors += 1
+            raise
+        latency_ms = (time.perf_counter() - t0) * 1000
+        text, finish_reason, prompt_tokens, completion_tokens = (
+            _parse_gemini(data) if provider == "gemini" else _parse_openai(data)
+        )
+        stats.requests += 1
+        stats.latencies_ms.append(latency_ms)
+        stats.prompt_tokens += int(prompt_tokens or 0)
+        stats.completion_tokens += int(completion_tokens or 0)
+        logger.info(
+            "llm_call provider=%s model=%s latency_ms=%.0f prompt_tokens=%s completion_tokens=%s attempts=%d",
+            provider, model, latency_ms, prompt_tokens, completion_tokens, attempts,
+            extra={
+                "event": "llm_call",
+                "provider": provider,
+                "model": model,
+                "latency_ms": round(latency_ms, 1),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "attempts": attempts,
+                "cached": False,
+            },
+        )
+        result = ChatResult(
+            text=text,
+            provider=provider,
+            model=model,
+            finish_reason=finish_reason,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+            attempts=attempts,
+        )
+        if cache_key is not None and text and finish_reason != "length":  # truncated output is not reusable
+            await llm_cache.aput(
+                cache_key,
+                {"text": text, "finish_reason": finish_reason, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+                provider,
+                model,
+            )
+        return result
+
+    async def _send(self, provider: str, model: str, payload: dict, key: str, timeout: Optional[float]) -> httpx.Response:
+        if provider == "gemini":
+            url = _ENDPOINTS["gemini"].format(model=model)
+            headers = {"x-goog-api-key": key}
+        else:
+            url = _ENDPOINTS[provider]
+            headers = {"Authorization": f"Bearer {key}"}
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        async with self._limit(provider):
+            return await self._client(provider).post(url, json=payload, headers=headers, **kwargs)
+
+    async def _complete(
+        self,
+        provider: str,
+        model: str,
+        messages: List[dict],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[dict],
+        keys: List[str],
+        timeout: Optional[float],
+    ) -> tuple:
+        if not keys:
+            raise LLMError(f"No API key configured for {provider}", provider)
+        payload = (
+            _gemini_payload(messages, temperature, max_tokens, response_format)
+            if provider == "gemini"
+            else _openai_payload(model, messages, temperature, max_tokens, response_format)
+        )
+        stats = self._stats[provider]
+        keys = list(keys)
+        index = 0
+        retries_left = max(0, int(getattr(settings, "LLM_MAX_RETRIES", 3)))
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                resp = await self._send(provider, model, payload, keys[index], timeout)
+            except httpx.TimeoutException:
+                error = LLMError(f"{provider} request timed out", provider, retriable=True)
+            except httpx.TransportError as e:
+                error = LLMError(f"{provider} connection error: {e}", provider, retriable=True)
+            else:
+                if resp.status_code < 300:
+                    return resp.json(), attempt
+                error = _error_from_response(provider, resp)
+                if resp.status_code == 429:
+                    stats.rate_limited += 1
+            if error.status in _AUTH_STATUS and index + 1 < len(keys):
+                logger.warning("%s key #%d rejected (%s); trying the next key", provider, index + 1, error.status)
+                index += 1
+                stats.key_rotations += 1
+                continue
+            if not error.retriable:
+                raise error
+            if index + 1 < len(keys):
+                logger.warning("%s key #%d: %s; rotating to the next key", provider, index + 1, error)
+                index += 1
+                stats.key_rotations += 1
+                continue
+            if retries_left <= 0:
+                raise error
+            retries_left -= 1
+            stats.retries += 1
+            await asyncio.sleep(self._backoff(attempt, error.retry_after))
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[float]) -> float:
+        base = float(getattr(settings, "LLM_RETRY_BASE_SECONDS", 0.5))
+        cap = float(getattr(settings, "LLM_RETRY_MAX_SECONDS", 8.0))
+        delay = random.uniform(0.0, min(cap, base * (2 ** (attempt - 1))))
+        if retry_after is not None:
+            delay = max(delay, min(float(retry_after), 30.0))
+        return delay
+
+
+llm_gateway = LLMGateway()
@@ -0,0 +1,232 @@
+"""
+Content-addressed cache for chat completions.
+
+The key is a SHA-256 over provider, model, messages and decoding parameters (canonical JSON), so
+the same prompt sent again by any agent is served without an API call. Lookups go to an
+in-process LRU bounded by ``LLM_CACHE_MAX_ENTRIES`` / ``LLM_CACHE_MAX_MB`` first, then to the
+``llm_cache`` collection. That collection expires entries after ``LLM_CACHE_TTL_HOURS`` (TTL index)
+and is pruned to the newest ``LLM_CACHE_MAX_DOCUMENTS``.
+
+Only deterministic requests are cached: temperature at most ``LLM_CACHE_MAX_TEMPERATURE``.
+Conversational or deliberately varied calls opt out with ``bypass()`` (a context manager that
+follows ``asyncio.to_thread``) or ``cache=False``. ``llm_gateway`` consults the cache for every
+completion. The store is read through pymongo (the motor client's delegate), so ``get`` / ``put``
+work from any thread or loop; ``aget`` / ``aput`` run them off the event loop. The cache is best
+effort: store errors are counted and treated as misses.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.database import db
+
+logger = logging.getLogger(__name__)
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+# Request fields that do not change the completion.
+_TRANSPORT_FIELDS = frozenset({"stream", "timeout", "extra_headers", "extra_query", "user"})
+
+
+@contextlib.contextmanager
+def bypass() -> Iterator[None]:
+    """Send every completion in this block to the provider, without reading or filling the cache."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class LLMResponseCache:
+    """Process-wide LRU in front of the ``llm_cache`` collection; see the module docstring."""
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, use_store: bool = True):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._use_store = use_store
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stored": 0,
+            "evicted": 0,
+            "store_errors": 0,
+        }
+        self.by_provider: Dict[str, Dict[str, int]] = {}
+
+    # -- policy -------------------------------------------------------------------------------
+
+    @staticmethod
+    def key(provider: str, model: str, messages: Any, params: Optional[dict] = None) -> str:
+        params = {k: v for k, v in (params or {}).items() if k not in _TRANSPORT_FIELDS and v is not None}
+        blob = json.dumps(
+            {"provider": provider, "model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def cacheable(self, temperature: Optional[float], cache: bool = True) -> bool:
+        """False when disabled, bypassed, or sampling is not near-deterministic (unset = provider default)."""
+        if not cache or _bypass.get() or not getattr(settings, "LLM_CACHE_ENABLED", True):
+            return False
+        if temperature is None:
+            return False
+        return float(temperature) <= float(getattr(settings, "LLM_CACHE_MAX_TEMPERATURE", 0.2))
+
+    def _count(self, provider: str, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+            row = self.by_provider.setdefault(provider, {"hits": 0, "misses": 0, "bypassed": 0})
+            bucket = "hits" if outcome.endswith("_hits") else outcome
+            if bucket in row:
+                row[bucket] += 1
+
+    # -- memory tier --------------------------------------------------------------------------
+
+    def _limits(self) -> tuple:
+        entries = self._max_entries if self._max_entries is not None else getattr(settings, "LLM_CACHE_MAX_ENTRIES", 2048)
+        max_bytes = self._max_bytes if self._max_bytes is not None else int(
+            float(getattr(settings, "LLM_CACHE_MAX_MB", 64.0)) * 1024 * 1024
+        )
+        return max(0, int(entries)), max(0, int(max_bytes))
+
+    def _remember(self, key: str, value: Any) -> None:
+        size = len(json.dumps(value, default=str))
+        max_entries, max_bytes = self._limits()
+        if size > max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > max_entries or self._bytes > max_bytes):
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._bytes -= dropped
+                self.stats["evicted"] += 1
+
+    def _recall(self, key: str) -> Optional[Any]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+            return hit[0]
+
+    # -- store tier ---------------------------------------------------------------------------
+
+    def _collection(self):
+        """pymongo collection behind the motor client, or None before init_db (tests, scripts)."""
+        if not self._use_store or db.client is None:
+            return None
+        return db.client.delegate[settings.MONGODB_DB_NAME].llm_cache
+
+    def _store_doc(self, key: str, provider: str, model: str, value: Any) -> dict:
+        return {"_id": key, "provider": provider, "model": model, "value": value, "created_at": datetime.utcnow()}
+
+    def _prune_due(self) -> bool:
+        with self._lock:
+            self._puts += 1
+            return self._puts % 200 == 0
+
+    def _prune(self, coll) -> None:
+        """Size-based eviction: keep the newest ``LLM_CACHE_MAX_DOCUMENTS`` documents."""
+        limit = int(getattr(settings, "LLM_CACHE_MAX_DOCUMENTS", 20000))
+        excess = coll.estimated_document_count() - limit
+        if excess <= 0:
+            return
+        oldest = list(coll.find({}, {"created_at": 1}).sort("created_at", 1).skip(excess).limit(1))
+        if oldest:
+            result = coll.delete_many({"created_at": {"$lt": oldest[0]["created_at"]}})
+            logger.info("LLM cache pruned %d document(s) over LLM_CACHE_MAX_DOCUMENTS=%d", result.deleted_count, limit)
+
+    # -- sync API -----------------------------------------------------------------------------
+
+    def get(self, key: str, provider: str = "") -> Optional[Any]:
+        value = self._recall(key)
+        if value is not None:
+            self._count(provider, "memory_hits")
+            return copy.deepcopy(value)
+        coll = self._collection()
+        if coll is not None:
+            try:
+                doc = coll.find_one({"_id": key}, {"value": 1})
+            except Exception as e:
+                self._count(provider, "store_errors")
+                logger.debug("LLM cache lookup failed: %s", e)
+                doc = None
+            if doc and doc.get("value") is not None:
+                self._remember(key, doc["value"])
+                self._count(provider, "store_hits")
+                return copy.deepcopy(doc["value"])
+        self._count(provider, "misses")
+        return None
+
+    def put(self, key: str, value: Any, provider: str = "", model: str = "") -> None:
+        self._remember(key, copy.deepcopy(value))
+        with self._lock:
+            self.stats["stored"] += 1
+        coll = self._collection()
+        if coll is None:
+            return
+        try:
+            coll.replace_one({"_id": key}, self._store_doc(key, provider, model, value), upsert=True)
+            if self._prune_due():
+                self._prune(coll)
+        except Exception as e:
+            self._count(provider, "store_errors")
+            logger.warning("LLM cache write failed (kept in memory only): %s", e)
+
+    # -- async API ----------------------------------------------------------------------------
+
+    async def aget(self, key: str, provider: str = "") -> Optional[Any]:
+        if self._recall(key) is None and self._collection() is not None:
+            return await asyncio.to_thread(self.get, key, provider)
+        return self.get(key, provider)
+
+    async def aput(self, key: str, value: Any, provider: str = "", model: str = "") -> None:
+        if self._collection() is not None:
+            await asyncio.to_thread(self.put, key, value, provider, model)
+        else:
+            self.put(key, value, provider, model)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["store_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "by_provider": {k: dict(v) for k, v in self.by_provider.items()},
+            }
+
+
+llm_cache = LLMResponseCache()
@@ -109,6 +109,26 @@ async def startup_event():
         print("[WARN] GROQ_API_KEY missing in backend/.env - live transcription disabled. Get a key at https://console.groq.com")
     await init_db()
 
+    if (getattr(settings, "STT_BACKEND", "groq") or "").lower().strip() == "faster_whisper" and getattr(
+        settings, "STT_LOCAL_PRELOAD", True
+    ):
+        from app.stt.transcription_client import get_transcription_client
+
+        try:
+            await get_transcription_client("faster_whisper").start()
+            print("[OK] Local Whisper worker pool ready")
+        except Exception as e:
+            print("[WARN] Local Whisper preload failed (will retry on first chunk):", e)
+
+    if getattr(settings, "KANBAN_RAG_ENABLED", True) and getattr(settings, "EMBEDDING_PRELOAD", True):
+        from app.services.transcript_rag.embeddings import embedding_pool
+
+        try:
+            await embedding_pool.start(preload=True)
+            print("[OK] Transcript RAG embedding pool ready")
+        except Exception as e:
+            print("[WARN] Embedding model preload failed (will load on first use):", e)
+
     global _stale_sweep_bg_task
     bg_h = int(getattr(settings, "STALE_TASK_BACKGROUND_INTERVAL_HOURS", 0) or 0)
     if bg_h > 0:
@@ -141,6 +161,20 @@ async def shutdown_event():
             await _consilium_monitor_task
         except asyncio.CancelledError:
             pass
+    from app.attendance.attendance_writer import attendance_writer
+    from app.llm import llm_gateway
+    from app.services.live_summary import live_summarizer
+    from app.services.recording_processing import cancel_recording_jobs
+    from app.stt.segment_writer import segment_writer
+    from app.services.transcript_rag.embeddings import embedding_pool
+    from app.stt.transcription_client import close_transcription_clients
+    await live_summarizer.close()
+    await segment_writer.close()
+    await attendance_writer.close()
+    await cancel_recording_jobs()
+    await close_transcription_clients()
+    await llm_gateway.close()
+    await embedding_pool.close()
     from app.core.database import close_db
     await close_db()
 
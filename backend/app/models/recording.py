@@ -24,6 +24,8 @@ class MeetingRecording(MeetingRecordingBase):
     user_id: str
     file_name: str
     status: str  # "processing" | "completed" | "failed"
+    progress: Optional[dict] = None  # stage, percent, chunks_done / chunks_total while processing
+    error: Optional[str] = None
     transcription: Optional[str] = None
     summary: Optional[RecordingSummary] = None
     summary_dict: Optional[dict] = None  # raw dict for API response
@@ -33,3 +35,10 @@ class MeetingRecording(MeetingRecordingBase):
 
     class Config:
         from_attributes = True
+
+
+class RecordingStatus(BaseModel):
+    id: str
+    status: str
+    progress: Optional[dict] = None
+    error: Optional[str] = None
@@ -1,6 +1,7 @@
 """
 Groq Whisper for uploaded files; LLM analysis reuses meeting_intelligence.summarize_and_extract (single call).
 """
+import asyncio
 from typing import Tuple
 
 from app.core.config import settings
@@ -37,10 +38,10 @@ def transcribe_audio(file_content: bytes, filename: str) -> str:
     return str(transcription)
 
 
-def transcribe_and_analyze(file_content: bytes, filename: str) -> Tuple[str, dict, list]:
+async def transcribe_and_analyze(file_content: bytes, filename: str) -> Tuple[str, dict, list]:
     """Whisper once, then one LLM pass for summary + action items."""
-    transcription = transcribe_audio(file_content, filename)
+    transcription = await asyncio.to_thread(transcribe_audio, file_content, filename)
     if not transcription or not transcription.strip():
         transcription = "(No speech detected in the recording.)"
-    summary_dict, action_items = summarize_and_extract(transcription)
+    summary_dict, action_items = await summarize_and_extract(transcription)
     return transcription, summary_dict, action_items
@@ -13,6 +13,7 @@ Flow:
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -21,11 +22,11 @@ from datetime import date, datetime, timedelta, timezone
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Tuple
 
-from groq import Groq
 from bson import ObjectId
 
 from app.core.config import settings
 from app.core.database import get_database
+from app.llm import llm_gateway
 from app.services.task_key import ensure_task_key_persisted
 
 logger = logging.getLogger(__name__)
@@ -510,12 +511,6 @@ def _meeting_assignment_timestamp(m: dict) -> datetime:
     return m.get("ended_at") or m.get("started_at") or datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def _get_groq_client() -> Groq:
-    if not settings.GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY is not set")
-    return Groq(api_key=settings.GROQ_API_KEY)
-
-
 def _merge_transcript_description(old: Optional[str], new_ev: str) -> str:
     """Merge verbatim evidence snippets on ExtractedTask only (not persisted to Mongo description)."""
     o = (old or "").strip()
@@ -577,7 +572,7 @@ def _parse_board_sync_response(raw: str) -> dict:
     return {"task_updates": [], "informal_action_items": []}
 
 
-def _groq_sync_board_with_latest_transcript(
+async def _groq_sync_board_with_latest_transcript(
     latest_transcript: str,
     reference_date: date,
     latest_meeting_id: str,
@@ -635,28 +630,21 @@ If nothing changes, return {"task_updates":[],"informal_action_items":[]}."""
     provider = (settings.TASK_AUTOMATION_PROVIDER or "groq").strip().lower()
     if provider != "groq":
         logger.warning("Unsupported TASK_AUTOMATION_PROVIDER=%s, fallback to groq", provider)
-    client = _get_groq_client()
-    create_kwargs = dict(
-        model=settings.TASK_AUTOMATION_MODEL,
-        messages=[
+    result = await llm_gateway.chat(
+        "groq",
+        [
             {"role": "system", "content": sys_prompt},
             {"role": "user", "content": user_content},
         ],
+        model=settings.TASK_AUTOMATION_MODEL,
         temperature=0.1,
         max_tokens=_kanban_board_sync_max_tokens(),
         response_format={"type": "json_object"},
     )
-    try:
-        resp = client.chat.completions.create(**create_kwargs)
-    except Exception as e:
-        logger.warning("Board sync JSON mode failed (%s); retrying without response_format", e)
-        create_kwargs.pop("response_format", None)
-        resp = client.chat.completions.create(**create_kwargs)
-    raw = resp.choices[0].message.content or "{}"
-    return _parse_board_sync_response(raw)
+    return _parse_board_sync_response(result.text or "{}")
 
 
-def _extract_tasks_with_llm(
+async def _extract_tasks_with_llm(
     chunk_text: str,
     meeting_catalog_text: str,
     latest_meeting_id: str,
@@ -718,30 +706,24 @@ confidence: how explicit the commitment is (0.0–1.0)."""
     provider = (settings.TASK_AUTOMATION_PROVIDER or "groq").strip().lower()
     if provider != "groq":
         logger.warning("Unsupported TASK_AUTOMATION_PROVIDER=%s, fallback to groq", provider)
-    client = _get_groq_client()
     user_blob = (
         f"Meeting catalog:\n{meeting_catalog_text}\n\n"
         f"Per-meeting reference dates:\n{catalog_dates}\n\n"
         f"Latest meeting_id: {latest_meeting_id}\n\n"
         f"=== Transcript excerpt(s) for task extraction ===\n{chunk_text}"
     )
-    create_kwargs = dict(
-        model=settings.TASK_AUTOMATION_MODEL,
-        messages=[
+    result = await llm_gateway.chat(
+        "groq",
+        [
             {"role": "system", "content": schema_prompt},
             {"role": "user", "content": user_blob},
         ],
+        model=settings.TASK_AUTOMATION_MODEL,
         temperature=0.1,
         max_tokens=_kanban_extract_max_tokens(),
         response_format={"type": "json_object"},
     )
-    try:
-        resp = client.chat.completions.create(**create_kwargs)
-    except Exception as e:
-        logger.warning("Task extract JSON mode unsupported or failed (%s); retrying without", e)
-        create_kwargs.pop("response_format", None)
-        resp = client.chat.completions.create(**create_kwargs)
-    raw = resp.choices[0].message.content or '{"tasks":[]}'
+    raw = result.text or '{"tasks":[]}'
     rows = _extract_json_list(raw)
     out: List[ExtractedTask] = []
     for r in rows:
@@ -949,11 +931,12 @@ async def rebuild_kanban_from_meeting_history(
                     retrieve_context_for_kanban,
                 )
 
-                idx = TranscriptRAGIndex.from_meeting_texts(
-                    meeting_cleaned_by_id, ordinal_by_meeting_id
+                # Embedding + FAISS work stays off the event loop (shared embedding pool).
+                idx = await asyncio.to_thread(
+                    TranscriptRAGIndex.from_meeting_texts, meeting_cleaned_by_id, ordinal_by_meeting_id
                 )
                 if idx is not None:
-                    ctx, best_sc = retrieve_context_for_kanban(idx, latest_meeting_id)
+                    ctx, best_sc = await asyncio.to_thread(retrieve_context_for_kanban, idx, latest_meeting_id)
                     min_sim = float(getattr(settings, "KANBAN_RAG_MIN_SIMILARITY", 0.22) or 0.0)
                     tail_n = int(getattr(settings, "KANBAN_RAG_FALLBACK_TAIL_CHARS", 8000) or 8000)
                     tail = build_fallback_tail(latest_meeting_cleaned, tail_n)
@@ -984,7 +967,7 @@ async def rebuild_kanban_from_meeting_history(
             for sc in subchunks:
                 try:
                     extracted_agg.extend(
-                        _extract_tasks_with_llm(
+                        await _extract_tasks_with_llm(
                             sc,
                             meeting_catalog_text,
                             latest_meeting_id,
@@ -1122,8 +1105,8 @@ async def rebuild_kanban_from_meeting_history(
             try:
                 from app.services.kanban_transcript_rag import retrieve_board_sync_context
 
-                rag_ctx, rag_sc = retrieve_board_sync_context(
-                    latest_meeting_id, latest_meeting_cleaned
+                rag_ctx, rag_sc = await asyncio.to_thread(
+                    retrieve_board_sync_context, latest_meeting_id, latest_meeting_cleaned
                 )
                 min_sim = float(getattr(settings, "KANBAN_RAG_MIN_SIMILARITY", 0.22) or 0.0)
                 if (rag_ctx or "").strip() and rag_sc >= min_sim and len((rag_ctx or "").strip()) > 200:
@@ -1133,7 +1116,7 @@ async def rebuild_kanban_from_meeting_history(
         if len(lt_send) > 120_000:
             lt_send = lt_send[:120_000]
         try:
-            board_sync_result = _groq_sync_board_with_latest_transcript(
+            board_sync_result = await _groq_sync_board_with_latest_transcript(
                 lt_send,
                 meeting_ref_dates[latest_meeting_id],
                 latest_meeting_id,
@@ -0,0 +1,132 @@
+"""
+Rolling summary while a meeting is live, so the post-meeting pass only has the tail left.
+
+Every ``LIVE_SUMMARY_INTERVAL_SECONDS`` the meeting's new ``transcript_segments`` are folded into
+its running transcript, which is cleaned and summarized exactly as ``analyze_meeting_transcript``
+will do at stop. Windows are cut greedily from the start, so each checkpoint maps only the windows
+that changed (usually the last one) and fills ``summary_cache`` with the rest. The running summary
+(overview, key points, decisions, candidate action items) is saved to ``summary_checkpoints`` and
+served as a draft by the meeting detail endpoint until the final summary exists. At stop the final pass finds every closed window cached and maps only the delta, then reduces.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.services.meeting_intelligence import _combine_segments
+from app.services.meeting_summarizer import summarize_transcript
+from app.services.transcription_cleaning import clean_transcription_text
+
+logger = logging.getLogger(__name__)
+
+
+class _RunningTranscript:
+    __slots__ = ("segments", "through", "summarized")
+
+    def __init__(self):
+        self.segments: List[dict] = []
+        self.through: Optional[datetime] = None  # timestamp of the newest segment folded in
+        self.summarized = 0  # segment count at the last checkpoint
+
+
+class LiveSummarizer:
+    """One checkpoint loop per live meeting on this process (started with its audio pipeline)."""
+
+    def __init__(self, interval_seconds: float = None):
+        self._interval = interval_seconds
+        self._state: Dict[str, _RunningTranscript] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.checkpoints = 0
+        self.failed_checkpoints = 0
+
+    @property
+    def interval_seconds(self) -> float:
+        if self._interval is not None:
+            return float(self._interval)
+        return max(10.0, float(getattr(settings, "LIVE_SUMMARY_INTERVAL_SECONDS", 180.0)))
+
+    def start(self, meeting_id: str) -> None:
+        if not getattr(settings, "LIVE_SUMMARY_ENABLED", True):
+            return
+        task = self._tasks.get(meeting_id)
+        if task is not None and not task.done():
+            return
+        self._state.setdefault(meeting_id, _RunningTranscript())
+        self._tasks[meeting_id] = asyncio.create_task(self._loop(meeting_id))
+
+    def stop(self, meeting_id: str) -> None:
+        """Meeting ended on this process: cancel the loop (a checkpoint in flight is abandoned)."""
+        task = self._tasks.pop(meeting_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+        self._state.pop(meeting_id, None)
+
+    async def close(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for meeting_id in list(self._tasks):
+            self.stop(meeting_id)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self, meeting_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.checkpoint(meeting_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failed_checkpoints += 1
+                logger.exception("Live summary checkpoint failed meeting_id=%s", meeting_id)
+
+    async def _fold_new_segments(self, meeting_id: str, state: _RunningTranscript) -> int:
+        db = await get_database()
+        query: dict = {"meeting_id": meeting_id}
+        if state.through is not None:
+            query["timestamp"] = {"$gt": state.through}
+        cursor = db.transcript_segments.find(query, {"text": 1, "timestamp": 1}).sort("timestamp", 1)
+        fresh = await cursor.to_list(length=10_000)
+        if fresh:
+            state.segments.extend(fresh)
+            state.through = fresh[-1].get("timestamp") or state.through
+        return len(fresh)
+
+    async def checkpoint(self, meeting_id: str) -> Optional[dict]:
+        """Fold new segments in and refresh the running summary; None when nothing new was said."""
+        state = self._state.setdefault(meeting_id, _RunningTranscript())
+        await self._fold_new_segments(meeting_id, state)
+        if len(state.segments) == state.summarized:
+            return None
+        full_text = _combine_segments(state.segments)
+        cleaned_text = clean_transcription_text(full_text) or full_text
+        if not cleaned_text.strip():
+            return None
+        summary_dict, action_items = await summarize_transcript(cleaned_text)
+        state.summarized = len(state.segments)
+        checkpoint = {
+            "meeting_id": meeting_id,
+            "summary": summary_dict,
+            "action_items": action_items,
+            "segments": state.summarized,
+            "through": state.through,
+            "updated_at": datetime.utcnow(),
+        }
+        db = await get_database()
+        await db.summary_checkpoints.replace_one({"meeting_id": meeting_id}, checkpoint, upsert=True)
+        self.checkpoints += 1
+        logger.info("Live summary checkpoint meeting_id=%s segments=%d", meeting_id, state.summarized)
+        return checkpoint
+
+    def get_stats(self) -> dict:
+        return {
+            "meetings": len(self._tasks),
+            "checkpoints": self.checkpoints,
+            "failed_checkpoints": self.failed_checkpoints,
+        }
+
+
+live_summarizer = LiveSummarizer()
@@ -1,5 +1,5 @@
 """
-Answer user questions about a single meeting using transcript + summary context (Groq).
+Answer user questions about a single meeting using transcript + summary context (Groq via llm_gateway).
 """
 from __future__ import annotations
 
@@ -7,7 +7,7 @@ import logging
 from typing import List, Optional
 
 from app.core.config import settings
-from app.services.meeting_intelligence import get_groq_client
+from app.llm import llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ def _build_transcript_text(segments: List[dict]) -> str:
     return " ".join(parts).strip()
 
 
-def answer_meeting_question(
+async def answer_meeting_question(
     meeting_title: str,
     transcript_text: str,
     summary_text: Optional[str],
@@ -62,19 +62,19 @@ Do not invent participants, decisions, or tasks. Keep answers clear and short un
 
     user_msg = f"Context:\n{context_blob}\n\nQuestion: {question.strip()}"
 
-    client = get_groq_client()
     model = settings.TASK_AUTOMATION_MODEL or "llama-3.3-70b-versatile"
     try:
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
+        result = await llm_gateway.chat(
+            "groq",
+            [
                 {"role": "system", "content": sys_msg},
                 {"role": "user", "content": user_msg},
             ],
+            model=model,
             temperature=0.2,
             max_tokens=1024,
         )
-        return (resp.choices[0].message.content or "").strip() or "No response from assistant."
+        return result.text or "No response from assistant."
     except Exception as e:
         logger.exception("meeting_context_qa failed: %s", e)
         raise
@@ -1,6 +1,8 @@
 """
-Single Groq LLM pass: transcript → summary + action items. Persist to MongoDB.
-File uploads still use app.services.groq_processing.transcribe_audio + this module's summarize_and_extract.
+Groq LLM pass: transcript → summary + action items. Persist to MongoDB.
+Meetings are summarized through app.services.meeting_summarizer (map-reduce over cached windows);
+summarize_and_extract is the single-call path it uses for short transcripts. Completions go
+through app.llm.llm_gateway.
 """
 from __future__ import annotations
 
@@ -14,6 +16,7 @@ from groq import Groq
 
 from app.core.config import settings
 from app.core.database import get_database
+from app.llm import llm_gateway
 from app.services.transcription_cleaning import clean_transcription_text
 
 logger = logging.getLogger(__name__)
@@ -21,7 +24,11 @@ logger = logging.getLogger(__name__)
 MAX_TRANSCRIPT_CHARS = 120_000
 
 
+SUMMARY_MODEL = "llama-3.3-70b-versatile"
+
+
 def get_groq_client() -> Groq:
+    """Sync Groq SDK client for Whisper file uploads; chat completions go through llm_gateway."""
     if not settings.GROQ_API_KEY:
         raise ValueError("GROQ_API_KEY is not set")
     return Groq(api_key=settings.GROQ_API_KEY)
@@ -101,7 +108,7 @@ def _safe_score(value: Any, default: float) -> float:
         return default
 
 
-def _repair_summary_json_with_llm(client: Groq, broken_output: str) -> dict:
+async def _repair_summary_json_with_llm(broken_output: str) -> dict:
     """Second pass: convert model output into strict JSON with the expected keys."""
     repair_sys = """You fix malformed model output. The user message contains text that was meant to be one JSON object with keys:
 overview (string), key_points (array of strings), decisions (array of strings), action_items (array of strings), meeting_signals (object).
@@ -112,34 +119,21 @@ Rules:
 - All string values must use double quotes. Escape internal double quotes as \\".
 - Keep meeting_signals as an object with: confidence_score, toxicity_score, dominant_emotion, emotion_scores.
 - Copy faithfully from the broken text; do not invent meeting content."""
-    resp = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
+    result = await llm_gateway.chat(
+        "groq",
+        [
             {"role": "system", "content": repair_sys},
             {"role": "user", "content": f"Broken output to fix:\n\n{broken_output[:100_000]}"},
         ],
+        model=SUMMARY_MODEL,
         temperature=0.0,
         max_tokens=8192,
         response_format={"type": "json_object"},
     )
-    fixed = (resp.choices[0].message.content or "{}").strip()
-    return _parse_model_json(fixed)
+    return _parse_model_json(result.text or "{}")
 
 
-def summarize_and_extract(transcript: str) -> Tuple[dict, List[str]]:
-    """
-    One chat completion: overview, key_points, decisions, action_items.
-    Returns (summary_dict, action_items_strings).
-    """
-    text_in = (transcript or "").strip()
-    if not text_in:
-        return (
-            {"overview": "", "key_points": [], "decisions": []},
-            [],
-        )
-
-    client = get_groq_client()
-    prompt = """You are a precise meeting assistant. Read the full transcript. You MUST respond with one JSON object only (no markdown, no ``` fences).
+_SUMMARY_PROMPT = """You are a precise meeting assistant. Read the full transcript. You MUST respond with one JSON object only (no markdown, no ``` fences).
 
 Required shape (example structure only — replace values from the transcript):
 {"overview":"<single JSON string: 3-6 paragraphs of narrative summary; use \\n between paragraphs inside this string>","key_points":["..."],"decisions":["..."],"action_items":["..."],"meeting_signals":{"confidence_score":0.0,"toxicity_score":0.0,"dominant_emotion":"neutral","emotion_scores":{"positive":0.0,"neutral":0.0,"negative":0.0}}}
@@ -156,26 +150,26 @@ Field rules:
   - emotion_scores: object with positive/neutral/negative floats from 0.0..1.0.
 
 Stay faithful to the transcript. Valid JSON only."""
-    create_kwargs = dict(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"Transcript:\n\n{text_in[:MAX_TRANSCRIPT_CHARS]}"},
+
+
+async def _summary_completion(user_content: str, cache: bool = True) -> dict:
+    """One json_object chat completion with the summary prompt; falls back to a repair pass on bad JSON.
+    ``cache=False`` when the caller keeps its own result cache (meeting_summarizer)."""
+    result = await llm_gateway.chat(
+        "groq",
+        [
+            {"role": "system", "content": _SUMMARY_PROMPT},
+            {"role": "user", "content": user_content},
         ],
+        model=SUMMARY_MODEL,
         temperature=0.2,
         max_tokens=8192,
         response_format={"type": "json_object"},
+        cache=cache,
     )
+    raw = result.text or "{}"
     try:
-        response = client.chat.completions.create(**create_kwargs)
-    except Exception as e:
-        logger.warning("Groq call without response_format failed or unsupported: %s — retrying without json_object", e)
-        create_kwargs.pop("response_format", None)
-        response = client.chat.completions.create(**create_kwargs)
-
-    raw = (response.choices[0].message.content or "{}").strip()
-    try:
-        data = _parse_model_json(raw)
+        return _parse_model_json(raw)
     except json.JSONDecodeError as e:
         logger.warning(
             "summarize_and_extract primary parse failed: %s — running JSON repair pass. raw_prefix=%r",
@@ -183,7 +177,7 @@ Stay faithful to the transcript. Valid JSON only."""
             raw[:240],
         )
         try:
-            data = _repair_summary_json_with_llm(client, raw)
+            return await _repair_summary_json_with_llm(raw)
         except Exception as e2:
             logger.exception(
                 "Groq summarize repair failed: %s (original: %s) raw_prefix=%r",
@@ -193,6 +187,9 @@ Stay faithful to the transcript. Valid JSON only."""
             )
             raise e2 from e
 
+
+def _summary_from_model(data: dict) -> Tuple[dict, List[str]]:
+    """Normalize the model's JSON into (summary_dict, action_items_strings)."""
     overview = data.get("overview") or ""
     key_points = data.get("key_points")
     decisions = data.get("decisions")
@@ -225,6 +222,22 @@ Stay faithful to the transcript. Valid JSON only."""
     return summary_dict, action_items
 
 
+async def summarize_and_extract(transcript: str, cache: bool = True) -> Tuple[dict, List[str]]:
+    """
+    One chat completion: overview, key_points, decisions, action_items.
+    Returns (summary_dict, action_items_strings).
+    """
+    text_in = (transcript or "").strip()
+    if not text_in:
+        return (
+            {"overview": "", "key_points": [], "decisions": []},
+            [],
+        )
+
+    data = await _summary_completion(f"Transcript:\n\n{text_in[:MAX_TRANSCRIPT_CHARS]}", cache=cache)
+    return _summary_from_model(data)
+
+
 def _combine_segments(segments: List[dict]) -> str:
     parts = []
     for s in sorted(segments, key=lambda x: x.get("timestamp") or ""):
@@ -237,7 +250,7 @@ async def analyze_meeting_transcript(
     language: str = "en",
 ) -> Optional[dict[str, Any]]:
     """
-    Load transcript_segments for meeting_id, call Groq once, write summaries + action_items.
+    Load transcript_segments for meeting_id, summarize (map-reduce, cached windows), write summaries + action_items.
     Returns a small result dict on success, None if no transcript or on failure after logging.
     """
     db = await get_database()
@@ -257,8 +270,10 @@ async def analyze_meeting_transcript(
         # If cleaning strips everything, fall back to original to avoid losing the meeting.
         cleaned_text = full_text
 
+    from app.services.meeting_summarizer import summarize_transcript  # imports this module
+
     try:
-        summary_dict, action_items = summarize_and_extract(cleaned_text)
+        summary_dict, action_items = await summarize_transcript(cleaned_text)
     except Exception as e:
         logger.exception("Meeting intelligence failed for meeting_id=%s: %s", meeting_id, e)
         return None
@@ -0,0 +1,273 @@
+"""
+Map-reduce summaries for transcripts longer than one completion can take.
+
+The transcript is cut into windows of about ``SUMMARY_WINDOW_CHARS`` on paragraph / line
+boundaries. Each window is condensed into section notes (map, ``SUMMARY_MAP_CONCURRENCY`` calls at
+once), then one call turns the notes into the usual summary shape (reduce, same prompt and
+normalization as ``meeting_intelligence.summarize_and_extract``). Short transcripts skip the map
+stage and cost a single call as before.
+
+Window notes and final summaries are cached by a hash of model, prompt and input text
+(``SummaryCache``: in-process LRU over the ``summary_cache`` collection); these calls skip the
+gateway's ``llm_cache`` so each result is stored once. Windows are cut greedily
+from the start, so a transcript that only grew keeps its earlier windows byte for byte: regenerating
+costs the changed last window(s) plus the reduce, and nothing at all when the text is unchanged.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.database import get_database
+from app.llm import llm_gateway
+from app.services.meeting_intelligence import (
+    SUMMARY_MODEL as _MODEL,
+    _SUMMARY_PROMPT,
+    _parse_model_json,
+    _summary_completion,
+    _summary_from_model,
+    summarize_and_extract,
+)
+
+logger = logging.getLogger(__name__)
+
+_MAP_PROMPT = """You condense one section of a longer meeting transcript into notes for a later summary. Respond with one JSON object only (no markdown, no ``` fences):
+{"summary":"<3-6 sentences on what was discussed in this section>","key_points":["..."],"decisions":["..."],"action_items":["..."],"tone":"positive|neutral|negative|mixed"}
+
+Rules:
+- Only use what is in this section; do not guess what came before or after.
+- "decisions": agreements reached in this section; [] if none.
+- "action_items": concrete next steps stated in this section; keep owners/dates only when said.
+- Keep names and technical terms exactly as written. Valid JSON only."""
+
+_SENTENCE_BREAK = re.compile(r"\n+|(?<=[.!?])\s+")
+
+
+class SummaryCache:
+    """Summary results by content hash: a bounded in-process LRU in front of the ``summary_cache``
+    collection (TTL ``SUMMARY_CACHE_TTL_DAYS``). Best effort: Mongo errors count as misses."""
+
+    def __init__(self, max_entries: int = None):
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(kind: str, *parts: str) -> str:
+        digest = hashlib.sha256(kind.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(getattr(settings, "SUMMARY_CACHE_ENABLED", True))
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled():
+            return None
+        value = self._entries.get(key)
+        if value is None:
+            try:
+                db = await get_database()
+                doc = await db.summary_cache.find_one({"_id": key}, {"value": 1})
+            except Exception as e:
+                logger.debug("Summary cache lookup failed: %s", e)
+                doc = None
+            value = (doc or {}).get("value")
+            if value is None:
+                self.misses += 1
+                return None
+        self._remember(key, value)
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    async def put(self, key: str, kind: str, value: Any) -> None:
+        if not self.enabled():
+            return
+        self._remember(key, copy.deepcopy(value))
+        try:
+            db = await get_database()
+            await db.summary_cache.replace_one(
+                {"_id": key},
+                {"_id": key, "kind": kind, "value": value, "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning("Summary cache write failed (%s kept in memory only): %s", kind, e)
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        limit = self._max_entries if self._max_entries is not None else getattr(settings, "SUMMARY_CACHE_MAX_ENTRIES", 1024)
+        while len(self._entries) > max(0, int(limit)):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+summary_cache = SummaryCache()
+
+
+def _window_chars() -> int:
+    return max(2000, int(getattr(settings, "SUMMARY_WINDOW_CHARS", 12_000)))
+
+
+def split_windows(parts: Sequence[str], window_chars: int = None) -> List[str]:
+    """Group consecutive transcript parts (chunks, paragraphs or lines) into windows of at most
+    ``window_chars``; a single oversized part is cut on line, then word boundaries."""
+    limit = window_chars or _window_chars()
+    windows: List[str] = []
+    current: List[str] = []
+    size = 0
+    for part in parts:
+        part = (part or "").strip()
+        if not part:
+            continue
+        for piece in _cut(part, limit):
+            if current and size + len(piece) + 1 > limit:
+                windows.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 1
+    if current:
+        windows.append("\n".join(current))
+    return windows
+
+
+def _cut(text: str, limit: int) -> List[str]:
+    if len(text) <= limit:
+        return [text]
+    pieces: List[str] = []
+    buf = ""
+    for line in text.splitlines() or [text]:
+        while len(line) > limit:
+            cut = line.rfind(" ", 0, limit)
+            cut = cut if cut > limit // 2 else limit
+            if buf:
+                pieces.append(buf)
+                buf = ""
+            pieces.append(line[:cut].strip())
+            line = line[cut:].strip()
+        if buf and len(buf) + len(line) + 1 > limit:
+            pieces.append(buf)
+            buf = ""
+        buf = f"{buf}\n{line}" if buf else line
+    if buf:
+        pieces.append(buf)
+    return [p for p in pieces if p]
+
+
+async def summarize_window(window: str) -> dict:
+    """Map step: section notes for one window.
+
+    The window's position is left out of the request so its notes stay valid (and cached) as the
+    transcript grows around it; the reduce step numbers the sections."""
+    result = await llm_gateway.chat(
+        "groq",
+        [
+            {"role": "system", "content": _MAP_PROMPT},
+            {"role": "user", "content": f"Transcript section:\n\n{window}"},
+        ],
+        model=_MODEL,
+        temperature=0.2,
+        max_tokens=2048,
+        response_format={"type": "json_object"},
+        cache=False,  # cached per window in summary_cache
+    )
+    raw = result.text or "{}"
+    try:
+        data = _parse_model_json(raw)
+    except json.JSONDecodeError:
+        logger.warning("Section notes were not valid JSON; keeping them as plain text")
+        data = {"summary": raw[:4000]}
+    return data if isinstance(data, dict) else {"summary": str(data)}
+
+
+def _notes_text(notes: Sequence[dict]) -> str:
+    blocks = []
+    for i, note in enumerate(notes):
+        lines = [f"## Section {i + 1} of {len(notes)}", str(note.get("summary") or "").strip()]
+        for label, key in (("Key points", "key_points"), ("Decisions", "decisions"), ("Action items", "action_items")):
+            items = [str(x).strip() for x in (note.get(key) or []) if str(x).strip()] if isinstance(note.get(key), list) else []
+            if items:
+                lines.append(f"{label}:")
+                lines.extend(f"- {item}" for item in items)
+        if note.get("tone"):
+            lines.append(f"Tone: {note['tone']}")
+        blocks.append("\n".join(line for line in lines if line))
+    return "\n\n".join(blocks)
+
+
+async def reduce_window_summaries(notes: Sequence[dict]) -> Tuple[dict, List[str]]:
+    """Reduce step: one completion over the ordered section notes → (summary_dict, action_items)."""
+    return await _reduce_notes_text(_notes_text(notes))
+
+
+async def _reduce_notes_text(notes_text: str) -> Tuple[dict, List[str]]:
+    data = await _summary_completion(
+        "The transcript was too long to read at once. These are notes on its consecutive sections, "
+        "in order; treat them as the full transcript.\n\n" + notes_text,
+        cache=False,
+    )
+    return _summary_from_model(data)
+
+
+async def _cached_summary(
+    kind: str, source: str, compute: Callable[[str], Awaitable[Tuple[dict, List[str]]]]
+) -> Tuple[dict, List[str]]:
+    key = SummaryCache.key(kind, _MODEL, _SUMMARY_PROMPT, source)
+    cached = await summary_cache.get(key)
+    if cached is not None:
+        return cached["summary"], cached["action_items"]
+    summary_dict, action_items = await compute(source)
+    await summary_cache.put(key, kind, {"summary": summary_dict, "action_items": action_items})
+    return summary_dict, action_items
+
+
+async def summarize_windows(windows: Sequence[str], concurrency: int = None) -> Tuple[dict, List[str]]:
+    """Summarize pre-split windows: one call for a single window, else concurrent map then reduce.
+    Windows and reduce inputs seen before are served from ``summary_cache``."""
+    windows = [w for w in windows if (w or "").strip()]
+    if not windows:
+        return {"overview": "", "key_points": [], "decisions": []}, []
+    if len(windows) == 1:
+        return await _cached_summary("transcript", windows[0], lambda text: summarize_and_extract(text, cache=False))
+    limit = asyncio.Semaphore(max(1, int(concurrency or getattr(settings, "SUMMARY_MAP_CONCURRENCY", 4))))
+    fresh = 0
+
+    async def _map(window: str) -> dict:
+        nonlocal fresh
+        key = SummaryCache.key("window", _MODEL, _MAP_PROMPT, window)
+        notes = await summary_cache.get(key)
+        if notes is not None:
+            return notes
+        async with limit:
+            notes = await summarize_window(window)
+        fresh += 1
+        await summary_cache.put(key, "window", notes)
+        return notes
+
+    notes = await asyncio.gather(*(_map(w) for w in windows))
+    logger.info("Map-reduce summary: %d windows (%d summarized, %d cached), reducing", len(windows), fresh, len(windows) - fresh)
+    return await _cached_summary("notes", _notes_text(notes), _reduce_notes_text)
+
+
+async def summarize_transcript(transcript: str) -> Tuple[dict, List[str]]:
+    """Async summary of a transcript of any length. Windows are cut on line / sentence boundaries, so
+    text appended later only changes the last window."""
+    return await summarize_windows(split_windows(_SENTENCE_BREAK.split(transcript or "")))
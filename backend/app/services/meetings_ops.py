@@ -4,9 +4,11 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
+from app.core.config import settings
 from app.core.database import get_database
 from app.services.meeting_intelligence import analyze_meeting_transcript
 from app.services.kanban_agentic_automation import rebuild_kanban_from_meeting_history
+from app.services.transcript_rag.shards import build_meeting_shard
 from app.services.transcript_task_reconciliation import reconcile_project_tasks
 from app.consilium.services.meeting_signals import (
     build_meeting_signal_v1_from_intel,
@@ -35,6 +37,12 @@ async def run_meeting_intelligence(
             await insert_meeting_signal(db, sig)
         except Exception:
             logger.exception("insert_meeting_signal failed meeting_id=%s project_id=%s", meeting_id, project_id)
+    if project_id and getattr(settings, "KANBAN_RAG_ENABLED", True):
+        # Embed the finished meeting once; project indexes then only merge its shard.
+        try:
+            await build_meeting_shard(await get_database(), meeting_id)
+        except Exception as e:
+            logger.warning("Transcript RAG shard build failed meeting_id=%s: %s", meeting_id, e)
     if sync_kanban and project_id:
         try:
             await rebuild_kanban_from_meeting_history(project_id, trigger_meeting_id=meeting_id)
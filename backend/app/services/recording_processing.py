@@ -0,0 +1,404 @@
+"""
+Background processing of uploaded recordings (``POST /recordings/upload``).
+
+The upload is copied to ``RECORDINGS_SPOOL_DIR`` in blocks and the endpoint returns at once with the
+recording id; ``start_recording_job`` then processes the file in the API process:
+
+1. Decode in a thread (``iter_pcm16_file``) and split on pauses (``SilenceSplitter``). Chunks pass
+   through a queue bounded by the worker count, so only a few are in memory however long the file is.
+2. ``RECORDING_TRANSCRIBE_CONCURRENCY`` workers transcribe chunks through the shared STT scheduler
+   (same per-key rate limits as live meetings, which keep priority).
+3. Chunk transcripts are stitched in order with absolute timestamps and summarized map-reduce
+   (``meeting_summarizer``), the windows following chunk boundaries.
+
+Progress (stage, decoded seconds, chunks done / total, percent) is kept on the recording document
+and served by ``GET /recordings/{id}/status``. A job whose progress stops moving for
+``RECORDING_STALE_SECONDS`` (API restarted mid-job) is reported as failed.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.audio.silence_splitter import AudioChunk, SilenceSplitter, iter_pcm16_file, probe_duration
+from app.core.config import settings
+from app.core.database import get_database
+from app.services.meeting_summarizer import split_windows, summarize_windows
+from app.stt.audio_encoder import get_audio_encoder, pcm_to_wav
+from app.stt.scheduler import key_fingerprint, stt_scheduler
+from app.stt.transcription_client import get_transcription_client
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Whole-file Whisper upload limit, used when the format cannot be decoded locally (no ffmpeg).
+WHOLE_FILE_MAX_BYTES = 25 * 1024 * 1024
+NO_SPEECH = "(No speech detected in the recording.)"
+
+_jobs: Dict[str, asyncio.Task] = {}
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def spool_dir() -> str:
+    path = (getattr(settings, "RECORDINGS_SPOOL_DIR", "") or "").strip() or os.path.join(
+        tempfile.gettempdir(), "meeting-monitor-recordings"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _copy_limited(src: BinaryIO, dst: BinaryIO, max_bytes: int) -> int:
+    total = 0
+    while True:
+        block = src.read(1024 * 1024)
+        if not block:
+            return total
+        total += len(block)
+        if total > max_bytes:
+            raise UploadTooLarge(f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.")
+        dst.write(block)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def spool_upload(src: BinaryIO, file_name: str, max_bytes: int = None) -> Tuple[str, int]:
+    """Copy an upload stream to the spool dir in 1 MiB blocks (in a thread). Returns (path, size)."""
+    limit = int(max_bytes or float(getattr(settings, "RECORDING_MAX_UPLOAD_MB", 2048)) * 1024 * 1024)
+    ext = os.path.splitext(file_name or "")[1][:10]
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=ext, dir=spool_dir())
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            size = await asyncio.to_thread(_copy_limited, src, dst, limit)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, size
+
+
+def _format_ts(seconds: float) -> str:
+    seconds = int(max(0.0, seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _segment_value(segment, key: str, default=None):
+    if isinstance(segment, dict):
+        return segment.get(key, default)
+    return getattr(segment, key, default)
+
+
+def _response_text_and_segments(response) -> Tuple[str, list]:
+    if response is None:
+        return "", []
+    if isinstance(response, dict):
+        return str(response.get("text") or "").strip(), response.get("segments") or []
+    dump = getattr(response, "model_dump", None)
+    if callable(dump):
+        data = dump()
+        if isinstance(data, dict):
+            return str(data.get("text") or "").strip(), data.get("segments") or []
+    return str(getattr(response, "text", "") or "").strip(), getattr(response, "segments", None) or []
+
+
+def stitch_chunk(chunk_start: float, text: str, segments: list) -> List[str]:
+    """Transcript lines for one chunk: one per Whisper segment at its absolute time, or one per chunk."""
+    lines = []
+    for seg in segments or []:
+        seg_text = str(_segment_value(seg, "text", "") or "").strip()
+        if not seg_text or float(_segment_value(seg, "no_speech_prob", 0.0) or 0.0) > 0.9:
+            continue
+        lines.append(f"[{_format_ts(chunk_start + float(_segment_value(seg, 'start', 0.0) or 0.0))}] {seg_text}")
+    if not lines and text:
+        lines.append(f"[{_format_ts(chunk_start)}] {text}")
+    return lines
+
+
+class _Progress:
+    """Job progress; mutated from the decode thread and workers, saved by ``save``."""
+
+    def __init__(self, recording_id: str, duration: Optional[float], chunk_seconds: float = 60.0):
+        self.recording_id = recording_id
+        self.chunk_seconds = max(1.0, chunk_seconds)
+        self.stage = "transcribing"
+        self.duration_seconds = duration
+        self.decoded_seconds = 0.0
+        self.chunks_total: Optional[int] = None  # known once decoding has finished
+        self.chunks_found = 0
+        self.chunks_done = 0
+        self.chunks_failed = 0
+        self._saved_at = 0.0
+
+    def as_dict(self) -> dict:
+        if self.stage == "summarizing":
+            percent = 95
+        else:
+            total = self.chunks_total
+            if total is None and self.duration_seconds:
+                total = max(self.chunks_found, math.ceil(self.duration_seconds / self.chunk_seconds))
+            # Transcription is the long part; the last 10% cover the summary.
+            percent = int(90 * self.chunks_done / total) if total else None
+        return {
+            "stage": self.stage,
+            "percent": percent,
+            "duration_seconds": self.duration_seconds,
+            "decoded_seconds": round(self.decoded_seconds, 1),
+            "chunks_total": self.chunks_total,
+            "chunks_done": self.chunks_done,
+            "chunks_failed": self.chunks_failed,
+            "updated_at": datetime.utcnow(),
+        }
+
+    async def save(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._saved_at < 1.0:
+            return
+        self._saved_at = now
+        db = await get_database()
+        await db.recordings.update_one(
+            {"_id": ObjectId(self.recording_id)},
+            {"$set": {"progress": self.as_dict(), "updated_at": datetime.utcnow()}},
+        )
+
+
+async def _transcribe_chunk(chunk: AudioChunk, lane: str) -> Tuple[str, list]:
+    """One Whisper call for a chunk through the shared scheduler; retried on rate limits and errors."""
+    backend = str(getattr(settings, "STT_BACKEND", "groq") or "groq").lower().strip()
+    retries = max(0, int(getattr(settings, "RECORDING_TRANSCRIBE_RETRIES", 3)))
+    if backend == "faster_whisper":
+        key_id = "local:faster_whisper"
+        client = get_transcription_client(backend)
+        wav = pcm_to_wav(chunk.pcm, chunk.sample_rate)
+
+        def call():
+            return client.transcribe(wav)
+    else:
+        if not settings.GROQ_API_KEY:
+            raise ValueError("GROQ_API_KEY is not set")
+        key_id = "groq:" + key_fingerprint(settings.GROQ_API_KEY)
+        client = get_transcription_client(backend, settings.GROQ_API_KEY)
+        encoded = await asyncio.to_thread(get_audio_encoder().encode, chunk.pcm, chunk.sample_rate)
+        hints = str(getattr(settings, "STT_CONTEXT_HINTS", "") or "").strip()
+        prompt = (
+            "Transcribe this meeting very accurately. Preserve technical terms and names exactly when possible. "
+            f"Important terms and names: {hints}"
+        ) if hints else None
+        model = "whisper-large-v3" if bool(getattr(settings, "STT_ACCURACY_MODE", True)) else "whisper-large-v3-turbo"
+        limiter = stt_scheduler.limiter(key_id)
+
+        def call():
+            return client.transcribe(
+                encoded.data,
+                model=model,
+                prompt=prompt,
+                on_headers=limiter.observe_headers,
+                filename=encoded.filename,
+                content_type=encoded.content_type,
+            )
+
+    delay = 2.0
+    for attempt in range(retries + 1):
+        try:
+            return _response_text_and_segments(await stt_scheduler.submit(lane, key_id, call))
+        except Exception as e:
+            if getattr(e, "status_code", None) == 401 or attempt == retries:
+                raise
+            # A 429 already paused the key in the scheduler; the next submit waits for it.
+            logger.warning("Recording chunk %d failed (attempt %d/%d): %s", chunk.index, attempt + 1, retries + 1, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+async def _transcribe_file(recording_id: str, path: str, progress: _Progress) -> List[Tuple[float, List[str]]]:
+    """Decode → split → transcribe with bounded concurrency. Returns [(chunk_start, lines)] in order."""
+    concurrency = max(1, int(getattr(settings, "RECORDING_TRANSCRIBE_CONCURRENCY", 4)))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    loop = asyncio.get_running_loop()
+    stop = threading.Event()
+    results: Dict[int, Tuple[float, List[str]]] = {}
+    errors: List[BaseException] = []
+
+    def put(item) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                future.result(timeout=0.5)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+
+    def produce() -> None:
+        splitter = SilenceSplitter(
+            SAMPLE_RATE,
+            target_seconds=float(getattr(settings, "RECORDING_CHUNK_SECONDS", 60.0)),
+            max_seconds=float(getattr(settings, "RECORDING_CHUNK_MAX_SECONDS", 120.0)),
+            silence_db=float(getattr(settings, "RECORDING_SILENCE_DB", -40.0)),
+        )
+        for block in iter_pcm16_file(path, SAMPLE_RATE):
+            if stop.is_set():
+                return
+            progress.decoded_seconds += len(block) / 2 / SAMPLE_RATE
+            for chunk in splitter.feed(block):
+                progress.chunks_found += 1
+                if not put(chunk):
+                    return
+        tail = splitter.flush()
+        if tail is not None:
+            progress.chunks_found += 1
+            put(tail)
+        progress.chunks_total = progress.chunks_found
+
+    async def work(lane: int) -> None:
+        lane_id = f"recording:{recording_id}:{lane}"
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            if chunk.peak_db < float(getattr(settings, "RECORDING_SILENCE_DB", -40.0)):
+                results[chunk.index] = (chunk.start_seconds, [])  # nothing above the silence floor
+            else:
+                try:
+                    text, segments = await _transcribe_chunk(chunk, lane_id)
+                    results[chunk.index] = (chunk.start_seconds, stitch_chunk(chunk.start_seconds, text, segments))
+                except Exception as e:
+                    if getattr(e, "status_code", None) == 401:
+                        errors.append(e)
+                        stop.set()
+                        return
+                    logger.exception("Recording %s chunk %d failed", recording_id, chunk.index)
+                    progress.chunks_failed += 1
+                    errors.append(e)
+                    results[chunk.index] = (chunk.start_seconds, [f"[{_format_ts(chunk.start_seconds)}] (transcription failed for this part)"])
+            progress.chunks_done += 1
+            await progress.save()
+
+    workers = [asyncio.create_task(work(i)) for i in range(concurrency)]
+    try:
+        await asyncio.to_thread(produce)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if stop.is_set():
+            for w in workers:
+                w.cancel()
+        else:
+            for _ in workers:
+                await queue.put(None)
+        await asyncio.gather(*workers, return_exceptions=True)
+    if stop.is_set() and errors:
+        raise errors[-1]
+    if errors and progress.chunks_failed == len(results):
+        raise errors[-1]
+    return [results[i] for i in sorted(results)]
+
+
+async def process_recording(recording_id: str, path: str, file_name: str, size: int) -> None:
+    """Full job; always ends with status completed or failed and removes the spooled file."""
+    db = await get_database()
+    oid = ObjectId(recording_id)
+    progress = _Progress(
+        recording_id,
+        await asyncio.to_thread(probe_duration, path),
+        float(getattr(settings, "RECORDING_CHUNK_SECONDS", 60.0)),
+    )
+    transcription = None
+    try:
+        await progress.save(force=True)
+        try:
+            chunks = await _transcribe_file(recording_id, path, progress)
+        except ValueError:
+            if size > WHOLE_FILE_MAX_BYTES or progress.decoded_seconds > 0:
+                raise
+            # Container we cannot decode here (e.g. M4A/MP4 without ffmpeg): send the file whole, as before.
+            from app.services.groq_processing import transcribe_audio
+
+            body = await asyncio.to_thread(_read_file, path)
+            text = await asyncio.to_thread(transcribe_audio, body, file_name)
+            chunks = [(0.0, [text.strip()] if text and text.strip() else [])]
+        lines = [line for _, chunk_lines in chunks for line in chunk_lines]
+        transcription = "\n".join(lines) if lines else NO_SPEECH
+        progress.stage = "summarizing"
+        await db.recordings.update_one(
+            {"_id": oid},
+            {"$set": {"transcription": transcription, "progress": progress.as_dict(), "updated_at": datetime.utcnow()}},
+        )
+        # Windows follow chunk boundaries, so each map call sees whole chunks.
+        windows = split_windows(["\n".join(chunk_lines) for _, chunk_lines in chunks]) if lines else [transcription]
+        summary_dict, action_items = await summarize_windows(windows)
+        progress.stage = "completed"
+        await db.recordings.update_one(
+            {"_id": oid},
+            {"$set": {
+                "status": "completed",
+                "summary": summary_dict,
+                "action_items": action_items,
+                "progress": {**progress.as_dict(), "percent": 100},
+                "updated_at": datetime.utcnow(),
+            }},
+        )
+        logger.info("Recording %s processed: %d chunk(s), %d failed", recording_id, len(chunks), progress.chunks_failed)
+    except asyncio.CancelledError:
+        await _fail(recording_id, "Processing was cancelled", progress)
+        raise
+    except Exception as e:
+        logger.exception("Recording %s processing failed", recording_id)
+        stage = "Summary" if transcription is not None else "Transcription"
+        await _fail(recording_id, f"{stage} failed: {getattr(e, 'message', str(e))}"[:500], progress)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+async def _fail(recording_id: str, error: str, progress: _Progress) -> None:
+    progress.stage = "failed"
+    db = await get_database()
+    await db.recordings.update_one(
+        {"_id": ObjectId(recording_id)},
+        {"$set": {"status": "failed", "error": error, "progress": progress.as_dict(), "updated_at": datetime.utcnow()}},
+    )
+
+
+def start_recording_job(recording_id: str, path: str, file_name: str, size: int) -> asyncio.Task:
+    task = asyncio.create_task(process_recording(recording_id, path, file_name, size))
+    _jobs[recording_id] = task
+    task.add_done_callback(lambda _t: _jobs.pop(recording_id, None))
+    return task
+
+
+async def expire_if_stale(rec: dict) -> dict:
+    """A processing recording with no live job here and no progress for RECORDING_STALE_SECONDS is failed."""
+    if rec.get("status") != "processing" or str(rec["_id"]) in _jobs:
+        return rec
+    stale = timedelta(seconds=float(getattr(settings, "RECORDING_STALE_SECONDS", 600)))
+    updated = (rec.get("progress") or {}).get("updated_at") or rec.get("updated_at")
+    if not updated or datetime.utcnow() - updated < stale:
+        return rec
+    db = await get_database()
+    patch = {"status": "failed", "error": "Processing was interrupted (server restarted)", "updated_at": datetime.utcnow()}
+    await db.recordings.update_one({"_id": rec["_id"], "status": "processing"}, {"$set": patch})
+    return {**rec, **patch}
+
+
+async def cancel_recording_jobs() -> None:
+    """API shutdown: stop running jobs (they are marked failed)."""
+    tasks = list(_jobs.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,16 +4,21 @@ from app.services.transcript_rag.core import (
     DEFAULT_RETRIEVAL_QUERIES,
     TranscriptRAGIndex,
     build_fallback_tail,
+    encode_queries,
     retrieve_board_sync_context,
     retrieve_context_for_kanban,
     retrieve_context_for_user_query,
 )
+from app.services.transcript_rag.embeddings import EmbeddingPool, embedding_pool
 
 __all__ = [
     "BOARD_SYNC_QUERIES",
     "DEFAULT_RETRIEVAL_QUERIES",
+    "EmbeddingPool",
     "TranscriptRAGIndex",
     "build_fallback_tail",
+    "embedding_pool",
+    "encode_queries",
     "retrieve_board_sync_context",
     "retrieve_context_for_kanban",
     "retrieve_context_for_user_query",
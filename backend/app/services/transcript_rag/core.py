@@ -2,26 +2,37 @@
 Embeddings + FAISS retrieval over meeting transcripts (Kanban, Q&A, copilot).
 
 Does not import kanban_agentic_automation (avoid circular imports).
+
+On-disk layout (``save_disk``): ``index.faiss`` (loaded memory-mapped, see ``index_factory``) plus
+chunk metadata that is never parsed up front: ``chunks.bin`` (UTF-8 chunk texts back to back),
+``chunks.idx.npy`` (offset / length / meeting / ordinal per chunk, memory-mapped) and
+``meetings.json`` (the meeting ids). A chunk is decoded only when retrieval returns it.
 """
 from __future__ import annotations
 
 import json
 import logging
+import mmap
+import os
 import re
+import shutil
+import tempfile
+import threading
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from app.core.config import settings
+from app.services.transcript_rag.embedding_store import embed_chunks
+from app.services.transcript_rag.embeddings import _model_name, embedding_pool
+from app.services.transcript_rag.index_factory import build_index, read_index
 from app.services.transcription_cleaning import clean_transcription_text
 
 logger = logging.getLogger(__name__)
 
-_st_model = None
-
 DEFAULT_RETRIEVAL_QUERIES: Tuple[str, ...] = (
     "task assigned ownership someone will handle who is responsible commit accept yes sure deadline",
     "working on in progress currently doing actively implementation",
@@ -47,29 +58,34 @@ def _clean_transcript_for_rag(text: str) -> str:
     return clean_transcription_text(t)
 
 
-def _get_sentence_model():
-    global _st_model
-    if _st_model is None:
-        try:
-            from sentence_transformers import SentenceTransformer
-        except ImportError as e:
-            raise RuntimeError(
-                "sentence-transformers is required for Kanban RAG. pip install sentence-transformers faiss-cpu"
-            ) from e
-        name = (getattr(settings, "KANBAN_EMBEDDING_MODEL", None) or "all-MiniLM-L6-v2").strip()
-        logger.info("Loading embedding model %s (Kanban RAG)", name)
-        _st_model = SentenceTransformer(name)
-    return _st_model
+def _encode_texts(texts: Sequence[str]) -> np.ndarray:
+    """Embeddings via the shared micro-batching pool (call from a worker thread, not the event loop)."""
+    return embedding_pool.embed_sync(texts)
 
 
-def _encode_texts(texts: Sequence[str]) -> np.ndarray:
-    model = _get_sentence_model()
-    emb = model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
-    if emb.dtype != np.float32:
-        emb = emb.astype(np.float32)
-    norms = np.linalg.norm(emb, axis=1, keepdims=True)
-    norms = np.maximum(norms, 1e-12)
-    return emb / norms
+# (model, query) -> vector. Retrieval query sets are constants (or settings), so they are encoded once.
+_query_vectors: Dict[Tuple[str, str], np.ndarray] = {}
+_query_lock = threading.Lock()
+
+
+def encode_queries(queries: Sequence[str], cache: bool = True) -> np.ndarray:
+    """
+    (len(queries), dim) query matrix from at most one model call.
+    ``cache`` keeps the vectors for the process lifetime; pass False for free-form user questions.
+    """
+    queries = list(queries)
+    if not cache:
+        return _encode_texts(queries)
+    model = _model_name()
+    with _query_lock:
+        missing = list(dict.fromkeys(q for q in queries if (model, q) not in _query_vectors))
+    if missing:
+        vectors = _encode_texts(missing)
+        with _query_lock:
+            for q, v in zip(missing, vectors):
+                _query_vectors[(model, q)] = v
+    with _query_lock:
+        return np.ascontiguousarray(np.stack([_query_vectors[(model, q)] for q in queries]), dtype=np.float32)
 
 
 @dataclass
@@ -80,6 +96,60 @@ class _Chunk:
     display: str  # header + text for LLM
 
 
+def _meeting_header(meeting_id: str, ordinal: int) -> str:
+    return f"=== Meeting meeting_id={meeting_id} ordinal={ordinal} ===\n"
+
+
+_CHUNK_INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4"), ("meeting", "<u4"), ("ordinal", "<i4")])
+
+
+class _ChunkTable(Sequence):
+    """Read-only chunk list over the binary metadata files; chunks are decoded on access."""
+
+    def __init__(self, dirpath: Path):
+        self._rows = np.load(dirpath / "chunks.idx.npy", mmap_mode="r")
+        self._meeting_ids: List[str] = json.loads((dirpath / "meetings.json").read_text(encoding="utf-8"))
+        with open(dirpath / "chunks.bin", "rb") as fh:
+            size = fh.seek(0, 2)
+            self._blob: Union[bytes, mmap.mmap] = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return int(self._rows.shape[0])
+
+    def _chunk(self, i: int) -> _Chunk:
+        offset, length, meeting, ordinal = self._rows[i].tolist()
+        text = self._blob[offset : offset + length].decode("utf-8")
+        mid = self._meeting_ids[meeting]
+        return _Chunk(meeting_id=mid, ordinal=ordinal, text=text, display=_meeting_header(mid, ordinal) + text)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._chunk(j) for j in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._chunk(i)
+
+    def __iter__(self) -> Iterator[_Chunk]:
+        return (self._chunk(i) for i in range(len(self)))
+
+
+def _write_chunk_table(dirpath: Path, chunks: Sequence[_Chunk]) -> None:
+    meeting_codes: Dict[str, int] = {}
+    rows = np.zeros(len(chunks), dtype=_CHUNK_INDEX_DTYPE)
+    offset = 0
+    with open(dirpath / "chunks.bin", "wb") as fh:
+        for i, c in enumerate(chunks):
+            data = c.text.encode("utf-8")
+            fh.write(data)
+            rows[i] = (offset, len(data), meeting_codes.setdefault(c.meeting_id, len(meeting_codes)), c.ordinal)
+            offset += len(data)
+    np.save(dirpath / "chunks.idx.npy", rows)
+    (dirpath / "meetings.json").write_text(json.dumps(list(meeting_codes)), encoding="utf-8")
+
+
 def _word_chunks(
     meeting_id: str,
     ordinal: int,
@@ -98,26 +168,22 @@ def _word_chunks(
         if not piece:
             break
         raw = " ".join(piece)
-        header = f"=== Meeting meeting_id={meeting_id} ordinal={ordinal} ===\n"
+        header = _meeting_header(meeting_id, ordinal)
         out.append(_Chunk(meeting_id=meeting_id, ordinal=ordinal, text=raw, display=header + raw))
         i += step
     return out
 
 
 class TranscriptRAGIndex:
-    """In-memory FAISS index over transcript chunks."""
+    """FAISS index over transcript chunks (index type from ``index_factory``)."""
 
     def __init__(
         self,
-        chunks: List[_Chunk],
+        chunks: Sequence[_Chunk],
         vectors: np.ndarray,
     ):
-        import faiss
-
         self.chunks = chunks
-        dim = vectors.shape[1]
-        self._index = faiss.IndexFlatIP(dim)
-        self._index.add(vectors)
+        self._index = build_index(vectors)
 
     @classmethod
     def from_meeting_texts(
@@ -141,51 +207,130 @@ class TranscriptRAGIndex:
             return None
 
         texts = [c.text for c in all_chunks]
-        vecs = _encode_texts(texts)
+        vecs = embed_chunks(texts)  # only chunks not seen before are encoded
         return cls(all_chunks, vecs)
 
+    @classmethod
+    def from_shards(
+        cls,
+        shards: Sequence,
+        ordinal_by_meeting_id: Dict[str, int],
+    ) -> Optional["TranscriptRAGIndex"]:
+        """Merge per-meeting shards (``meeting_id``, chunk ``texts``, ``vectors``) without re-encoding."""
+        all_chunks: List[_Chunk] = []
+        blocks: List[np.ndarray] = []
+        for shard in shards:
+            if not shard.texts:
+                continue
+            ord_ = int(ordinal_by_meeting_id.get(shard.meeting_id, 0))
+            header = _meeting_header(shard.meeting_id, ord_)
+            all_chunks.extend(
+                _Chunk(meeting_id=shard.meeting_id, ordinal=ord_, text=t, display=header + t) for t in shard.texts
+            )
+            blocks.append(shard.vectors)
+        if not all_chunks:
+            return None
+        return cls(all_chunks, np.ascontiguousarray(np.vstack(blocks), dtype=np.float32))
+
     def search(
         self,
         query: str,
         k: int,
     ) -> List[Tuple[int, float]]:
         """Returns list of (chunk_index, inner_product ~ cosine)."""
-        q = _encode_texts([query])
-        scores, idxs = self._index.search(q, min(k, len(self.chunks)))
-        row_scores = scores[0]
-        row_idx = idxs[0]
-        out: List[Tuple[int, float]] = []
-        for j, i in enumerate(row_idx):
-            if i < 0:
+        scores, idxs = self.search_many([query], k, cache=False)
+        return [(int(i), float(sc)) for i, sc in zip(idxs[0], scores[0]) if i >= 0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        k: int,
+        cache: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """One batched FAISS search for a query set: (scores, chunk_indexes), each (len(queries), k); -1 = no hit."""
+        q = encode_queries(queries, cache=cache)
+        return self._index.search(q, min(k, len(self.chunks)))
+
+    def _rank_hits(
+        self,
+        scores: np.ndarray,
+        idxs: np.ndarray,
+        latest_meeting_id: str,
+        boost: float,
+        min_sim: float,
+    ) -> Tuple[np.ndarray, float]:
+        """Chunk indexes by best boosted score across queries (deduped, min_sim applied) + best raw score."""
+        scores, idxs = scores.ravel(), idxs.ravel()
+        hit = idxs >= 0
+        best_seen = max(0.0, float(scores[hit].max())) if hit.any() else 0.0
+        keep = hit & (scores >= min_sim)
+        scores, idxs = scores[keep], idxs[keep]
+        if not idxs.size:
+            return idxs, best_seen
+        latest = np.fromiter(
+            (self.chunks[i].meeting_id == latest_meeting_id for i in idxs), dtype=bool, count=idxs.size
+        )
+        adj = scores * np.where(latest, boost, 1.0)
+        order = np.argsort(-adj, kind="stable")
+        # np.unique keeps the first (= best) occurrence of each chunk; re-sort those by score.
+        uniq, first = np.unique(idxs[order], return_index=True)
+        return uniq[np.argsort(first, kind="stable")], best_seen
+
+    def _join_context(self, ordered: Sequence[int], max_chars: int) -> str:
+        parts: List[str] = []
+        total = 0
+        for idx in ordered:
+            block = self.chunks[int(idx)].display.strip()
+            if not block:
                 continue
-            out.append((int(i), float(row_scores[j])))
-        return out
+            sep_len = 2 if parts else 0
+            if total + sep_len + len(block) > max_chars:
+                remain = max_chars - total - sep_len
+                if remain > 200:
+                    parts.append(block[:remain] + "…")
+                break
+            if parts:
+                parts.append("\n\n")
+            parts.append(block)
+            total += sep_len + len(block)
+        return "".join(parts)
 
     def save_disk(self, dirpath: str) -> None:
-        """Persist FAISS index + chunk metadata for cache reload."""
+        """
+        Persist FAISS index + binary chunk metadata for cache reload.
+
+        Readers memory-map these files, so they are never rewritten in place: everything is written
+        to a sibling temp dir that is renamed into place. An existing ``dirpath`` (e.g. written by a
+        concurrent cache miss) is left as is.
+        """
         import faiss
 
         p = Path(dirpath)
-        p.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(self._index, str(p / "index.faiss"))
-        data = [
-            {"meeting_id": c.meeting_id, "ordinal": c.ordinal, "text": c.text, "display": c.display}
-            for c in self.chunks
-        ]
-        (p / "chunks.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        if p.exists():
+            return
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{p.name}.", dir=p.parent))
+        try:
+            faiss.write_index(self._index, str(tmp / "index.faiss"))
+            _write_chunk_table(tmp, self.chunks)
+            try:
+                os.replace(tmp, p)
+            except OSError:
+                if not p.exists():
+                    raise
+                logger.debug("Transcript RAG cache %s written concurrently; keeping that copy", p)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
 
     @classmethod
     def load_from_disk(cls, dirpath: str) -> Optional["TranscriptRAGIndex"]:
-        import faiss
-
         p = Path(dirpath)
-        fp, jc = p / "index.faiss", p / "chunks.json"
-        if not fp.is_file() or not jc.is_file():
+        fp = p / "index.faiss"
+        if not fp.is_file() or not all((p / n).is_file() for n in ("chunks.bin", "chunks.idx.npy", "meetings.json")):
             return None
         try:
-            chunks_data = json.loads(jc.read_text(encoding="utf-8"))
-            chunks = [_Chunk(**d) for d in chunks_data]
-            index = faiss.read_index(str(fp))
+            chunks = _ChunkTable(p)
+            index = read_index(str(fp))
         except Exception as e:
             logger.warning("Transcript RAG cache read failed: %s", e)
             return None
@@ -213,6 +358,7 @@ def retrieve_context_for_kanban(
 ) -> Tuple[str, float]:
     """
     Multi-query retrieval, dedupe, latest-meeting boost, char cap.
+    The query set is encoded once per process and searched in one batched FAISS call.
     Returns (context_string, best_raw_score).
     """
     top_k = max(1, int(getattr(settings, "KANBAN_RAG_TOP_K", 5) or 5))
@@ -221,40 +367,13 @@ def retrieve_context_for_kanban(
     min_sim = float(getattr(settings, "KANBAN_RAG_MIN_SIMILARITY", 0.22) or 0.0)
 
     qs = tuple(queries) if queries is not None else _parse_queries()
-    best_seen = 0.0
-    scored: Dict[int, float] = {}
-
-    for q in qs:
-        for idx, sc in index.search(q, top_k):
-            best_seen = max(best_seen, sc)
-            if sc < min_sim:
-                continue
-            adj = sc * (boost if index.chunks[idx].meeting_id == latest_meeting_id else 1.0)
-            if idx not in scored or adj > scored[idx]:
-                scored[idx] = adj
-
-    if not scored:
+    if not qs:
+        return "", 0.0
+    scores, idxs = index.search_many(qs, top_k)
+    ordered, best_seen = index._rank_hits(scores, idxs, latest_meeting_id, boost, min_sim)
+    if not ordered.size:
         return "", best_seen
-
-    ordered = sorted(scored.items(), key=lambda x: -x[1])
-    parts: List[str] = []
-    total = 0
-    for idx, _ in ordered:
-        block = index.chunks[idx].display.strip()
-        if not block:
-            continue
-        sep_len = 2 if parts else 0
-        if total + sep_len + len(block) > max_chars:
-            remain = max_chars - total - sep_len
-            if remain > 200:
-                parts.append(block[:remain] + "…")
-            break
-        if parts:
-            parts.append("\n\n")
-        parts.append(block)
-        total += sep_len + len(block)
-
-    return "".join(parts), best_seen
+    return index._join_context(ordered, max_chars), best_seen
 
 
 def retrieve_board_sync_context(
@@ -300,32 +419,8 @@ def retrieve_context_for_user_query(
     q = (query or "").strip()
     if not q:
         return "", 0.0
-    best_seen = 0.0
-    scored: Dict[int, float] = {}
-    for idx, sc in index.search(q, top_k):
-        best_seen = max(best_seen, sc)
-        if sc < min_sim:
-            continue
-        adj = sc * (boost if index.chunks[idx].meeting_id == latest_meeting_id else 1.0)
-        if idx not in scored or adj > scored[idx]:
-            scored[idx] = adj
-    if not scored:
+    scores, idxs = index.search_many([q], top_k, cache=False)
+    ordered, best_seen = index._rank_hits(scores, idxs, latest_meeting_id, boost, min_sim)
+    if not ordered.size:
         return "", best_seen
-    ordered = sorted(scored.items(), key=lambda x: -x[1])
-    parts: List[str] = []
-    total = 0
-    for idx, _ in ordered:
-        block = index.chunks[idx].display.strip()
-        if not block:
-            continue
-        sep_len = 2 if parts else 0
-        if total + sep_len + len(block) > max_chars:
-            remain = max_chars - total - sep_len
-            if remain > 200:
-                parts.append(block[:remain] + "…")
-            break
-        if parts:
-            parts.append("\n\n")
-        parts.append(block)
-        total += sep_len + len(block)
-    return "".join(parts), best_seen
+    return index._join_context(ordered, max_chars), best_seen
@@ -0,0 +1,345 @@
+"""
+Persistent, content-addressed cache of chunk embeddings.
+
+The key is SHA-256 of the embedding model name plus the chunk text, so a chunk is encoded once per
+model however many indexes (project rebuilds, board-sync, shards) include it. Per model, under
+``EMBEDDING_CACHE_DIR`` (empty = system temp dir):
+
+- ``vectors.f16``: append-only float16 rows, read through a read-only memory map;
+- ``index.bin``: append-only ``(digest, row)`` records, the offset index (loaded at first use);
+- ``used.u64``: last-used time (ns) per row, rewritten in place on every hit;
+- ``meta.json``: model name and dimension.
+
+When ``vectors.f16`` grows past ``EMBEDDING_CACHE_MAX_MB`` the least recently used rows (by
+``used.u64``, so recency survives restarts) are dropped by rewriting the files (down to 80% of the
+cap). A write cut short by a crash leaves a partial row or record; it is truncated before the next
+append so later rows stay aligned. Appends and compactions hold an
+exclusive ``flock`` and reads a shared one, so the API and meeting worker can share the directory;
+another process's appends and compactions are picked up from ``index.bin``. The cache is best
+effort: I/O errors are logged and the chunk is simply encoded.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.transcript_rag.embeddings import _model_name, embedding_pool
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_RECORD = struct.Struct("<32sQ")  # sha256 digest, row number
+_COMPACT_TO = 0.8
+
+
+def _digest(model: str, text: str) -> bytes:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8", errors="ignore")).digest()
+
+
+class _ModelShelf:
+    """Files and offset index for one embedding model."""
+
+    def __init__(self, path: Path, model: str):
+        self.path = path
+        self.model = model
+        self.dim: Optional[int] = None
+        self.rows: Dict[bytes, int] = {}  # digest -> row
+        self._index_ino: Optional[int] = None
+        self._index_pos = 0
+        self._mm: Optional[np.memmap] = None
+        path.mkdir(parents=True, exist_ok=True)
+        meta = path / "meta.json"
+        if meta.is_file():
+            self.dim = int(json.loads(meta.read_text(encoding="utf-8")).get("dim") or 0) or None
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.path / "vectors.f16"
+
+    @property
+    def index_path(self) -> Path:
+        return self.path / "index.bin"
+
+    @property
+    def used_path(self) -> Path:
+        return self.path / "used.u64"
+
+    @contextlib.contextmanager
+    def locked(self, exclusive: bool) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self.path / ".lock", "a+b") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def refresh(self) -> None:
+        """Pick up records appended (or a compaction done) by this or another process."""
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            self.rows.clear()
+            self._index_ino, self._index_pos, self._mm = None, 0, None
+            return
+        if st.st_ino != self._index_ino:
+            self.rows.clear()
+            self._index_ino, self._index_pos, self._mm = st.st_ino, 0, None
+        if st.st_size > self._index_pos:
+            with open(self.index_path, "rb") as fh:
+                fh.seek(self._index_pos)
+                data = fh.read(st.st_size - self._index_pos)
+            usable = len(data) - len(data) % _RECORD.size
+            for digest, row in _RECORD.iter_unpack(data[:usable]):
+                self.rows[digest] = row
+            self._index_pos += usable
+
+    def view(self) -> Optional[np.memmap]:
+        if self.dim is None or not self.vectors_path.is_file():
+            return None
+        n = os.path.getsize(self.vectors_path) // (2 * self.dim)
+        if self._mm is None or self._mm.shape[0] < n:
+            self._mm = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(n, self.dim)) if n else None
+        return self._mm
+
+    def touch(self, rows: Sequence[int]) -> None:
+        """Stamp ``rows`` as used now. Runs under the shared lock: concurrent stamps only race to
+        write near-identical times, and compaction (exclusive) never overlaps."""
+        if not rows or not self.used_path.is_file():
+            return
+        n = os.path.getsize(self.used_path) // 8
+        rows = [r for r in rows if r < n]
+        if rows:
+            used = np.memmap(self.used_path, dtype="<u8", mode="r+", shape=(n,))
+            used[rows] = time.time_ns()
+            used.flush()
+            del used
+
+    def _stamps(self, n: int) -> np.ndarray:
+        """Last-used times for rows ``0..n-1`` (0 = never recorded, evicted first)."""
+        stamps = np.zeros(n, dtype="<u8")
+        if self.used_path.is_file():
+            data = np.fromfile(self.used_path, dtype="<u8", count=n)
+            stamps[: data.size] = data
+        return stamps
+
+    @staticmethod
+    def _truncate_to(path: Path, unit: int) -> int:
+        """Drop a partial trailing unit left by an interrupted write; returns whole units."""
+        if not path.is_file():
+            return 0
+        size = os.path.getsize(path)
+        if size % unit:
+            with open(path, "r+b") as fh:
+                fh.truncate(size - size % unit)
+        return size // unit
+
+    def reset(self, dim: int) -> None:
+        for p in (self.vectors_path, self.index_path, self.used_path):
+            with contextlib.suppress(FileNotFoundError):
+                p.unlink()
+        self.rows.clear()
+        self._index_ino, self._index_pos, self._mm = None, 0, None
+        self.dim = dim
+        (self.path / "meta.json").write_text(json.dumps({"model": self.model, "dim": dim}), encoding="utf-8")
+
+    def append(self, digests: Sequence[bytes], vectors: np.ndarray) -> None:
+        data = np.ascontiguousarray(vectors, dtype=np.float16)
+        first = self._truncate_to(self.vectors_path, 2 * self.dim)
+        with open(self.vectors_path, "ab") as fh:
+            fh.write(data.tobytes())
+        # used.u64 has one stamp per row: cut or zero-pad it to ``first`` before adding the new rows.
+        with open(self.used_path, "a+b") as fh:
+            fh.truncate(first * 8)
+            fh.seek(0, 2)
+            fh.write(np.full(len(digests), time.time_ns(), dtype="<u8").tobytes())
+        self._truncate_to(self.index_path, _RECORD.size)
+        records = b"".join(_RECORD.pack(d, first + i) for i, d in enumerate(digests))
+        with open(self.index_path, "ab") as fh:
+            fh.write(records)
+
+    def compact(self, keep_bytes: int) -> int:
+        """Rewrite both files with the most recently used rows that fit in ``keep_bytes``; returns rows dropped."""
+        view = self.view()
+        n = view.shape[0] if view is not None else 0
+        stamps = self._stamps(n)
+        live = [(d, r) for d, r in self.rows.items() if r < n]
+        # Most recently used first (ties: newer row first), then keep what fits.
+        live.sort(key=lambda dr: (int(stamps[dr[1]]), dr[1]), reverse=True)
+        valid = live[: max(0, keep_bytes // (2 * self.dim))]
+        valid.reverse()
+        picked = [r for _, r in valid]
+        block = np.asarray(view[picked]) if valid else np.zeros((0, self.dim), dtype=np.float16)
+        tmp_vec, tmp_used, tmp_idx = (self.path / f"{p.name}.tmp" for p in (self.vectors_path, self.used_path, self.index_path))
+        tmp_vec.write_bytes(np.ascontiguousarray(block, dtype=np.float16).tobytes())
+        tmp_used.write_bytes(stamps[picked].tobytes() if valid else b"")
+        tmp_idx.write_bytes(b"".join(_RECORD.pack(d, i) for i, (d, _) in enumerate(valid)))
+        dropped = len(self.rows) - len(valid)
+        self._mm = None
+        os.replace(tmp_vec, self.vectors_path)
+        os.replace(tmp_used, self.used_path)
+        os.replace(tmp_idx, self.index_path)  # last: other processes reload on its new inode
+        self.refresh()
+        return dropped
+
+
+class EmbeddingStore:
+    """Chunk-embedding cache shared by every index build in this process; see the module docstring."""
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._shelves: Dict[str, _ModelShelf] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "compactions": 0, "errors": 0}
+
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "EMBEDDING_CACHE_ENABLED", True))
+
+    @property
+    def root(self) -> Path:
+        raw = self._root if self._root is not None else (getattr(settings, "EMBEDDING_CACHE_DIR", "") or "").strip()
+        return Path(raw or os.path.join(tempfile.gettempdir(), "meeting-monitor-embeddings"))
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return int(self._max_bytes)
+        return int(float(getattr(settings, "EMBEDDING_CACHE_MAX_MB", 256.0)) * 1024 * 1024)
+
+    def _shelf(self, model: str) -> _ModelShelf:
+        shelf = self._shelves.get(model)
+        if shelf is None:
+            name = hashlib.sha256(model.encode("utf-8")).hexdigest()[:16]
+            shelf = self._shelves[model] = _ModelShelf(self.root / name, model)
+        return shelf
+
+    def lookup(self, model: str, texts: Sequence[str]) -> Dict[int, np.ndarray]:
+        """Cached float32 rows by position in ``texts``."""
+        found: Dict[int, np.ndarray] = {}
+        with self._lock:
+            try:
+                shelf = self._shelf(model)
+                with shelf.locked(exclusive=False):
+                    shelf.refresh()
+                    view = shelf.view()
+                    hit_rows = []
+                    for i, text in enumerate(texts):
+                        row = shelf.rows.get(_digest(model, text))
+                        if row is None or view is None or row >= view.shape[0]:
+                            continue
+                        hit_rows.append(row)
+                        found[i] = np.asarray(view[row], dtype=np.float32)
+                    shelf.touch(sorted(set(hit_rows)))
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning("Embedding cache read failed: %s", e)
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(texts) - len(found)
+        return found
+
+    def add(self, model: str, texts: Sequence[str], vectors: np.ndarray) -> None:
+        if not len(texts):
+            return
+        with self._lock:
+            try:
+                shelf = self._shelf(model)
+                with shelf.locked(exclusive=True):
+                    shelf.refresh()
+                    if shelf.dim != vectors.shape[1]:
+                        shelf.reset(int(vectors.shape[1]))
+                    digests, rows, seen = [], [], set()
+                    for text, vec in zip(texts, vectors):
+                        d = _digest(model, text)
+                        if d in shelf.rows or d in seen:
+                            continue
+                        seen.add(d)
+                        digests.append(d)
+                        rows.append(vec)
+                    if digests:
+                        shelf.append(digests, np.stack(rows))
+                        self.stats["stored"] += len(digests)
+                    shelf.refresh()
+                    if shelf.vectors_path.is_file() and os.path.getsize(shelf.vectors_path) > self.max_bytes:
+                        self.stats["evicted"] += shelf.compact(int(self.max_bytes * _COMPACT_TO))
+                        self.stats["compactions"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning("Embedding cache write failed: %s", e)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            entries = sum(len(s.rows) for s in self._shelves.values())
+            size = sum(
+                os.path.getsize(s.vectors_path) for s in self._shelves.values() if s.vectors_path.is_file()
+            )
+            return {**self.stats, "entries": entries, "bytes": size}
+
+
+embedding_store = EmbeddingStore()
+
+
+def _assemble(texts: Sequence[str], found: Dict[int, np.ndarray], fresh: Dict[str, np.ndarray]) -> np.ndarray:
+    rows = [found[i] if i in found else fresh[t] for i, t in enumerate(texts)]
+    out = np.stack(rows).astype(np.float32, copy=False)
+    # float16 storage: renormalize so inner products stay cosines.
+    return out / np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+
+
+def _missing(texts: Sequence[str], found: Dict[int, np.ndarray]) -> List[str]:
+    return list(dict.fromkeys(t for i, t in enumerate(texts) if i not in found))
+
+
+def embed_chunks(texts: Sequence[str]) -> np.ndarray:
+    """Chunk embeddings through the cache; only unseen texts are encoded (call from a worker thread)."""
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    if not embedding_store.enabled():
+        return embedding_pool.embed_sync(texts)
+    model = _model_name()
+    found = embedding_store.lookup(model, texts)
+    todo = _missing(texts, found)
+    fresh: Dict[str, np.ndarray] = {}
+    if todo:
+        vectors = embedding_pool.embed_sync(todo)
+        embedding_store.add(model, todo, vectors)
+        fresh = dict(zip(todo, vectors))
+    return _assemble(texts, found, fresh)
+
+
+async def aembed_chunks(texts: Sequence[str]) -> np.ndarray:
+    """``embed_chunks`` for async code: cache I/O in a thread, encoding through the pool."""
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    if not embedding_store.enabled():
+        return await embedding_pool.embed(texts)
+    model = _model_name()
+    found = await asyncio.to_thread(embedding_store.lookup, model, texts)
+    todo = _missing(texts, found)
+    fresh: Dict[str, np.ndarray] = {}
+    if todo:
+        vectors = await embedding_pool.embed(todo)
+        await asyncio.to_thread(embedding_store.add, model, todo, vectors)
+        fresh = dict(zip(todo, vectors))
+    return _assemble(texts, found, fresh)
@@ -0,0 +1,238 @@
+"""
+Sentence-embedding worker pool for transcript RAG.
+
+- The SentenceTransformer model (``KANBAN_EMBEDDING_MODEL``) is loaded and warmed up in a worker
+  thread at API startup (``EMBEDDING_PRELOAD``), never on the event loop.
+- ``EMBEDDING_WORKERS`` threads share the model; inference releases the GIL, so the API keeps serving.
+- One request queue for the process: the dispatcher merges concurrent ``embed`` calls until
+  ``EMBEDDING_MAX_BATCH`` texts are queued or ``EMBEDDING_BATCH_WAIT_MS`` has passed since the
+  first, encodes them in one ``model.encode`` call and splits the rows back per caller.
+- Async code awaits ``embed(texts)``. Sync code running in a worker thread calls ``embed_sync``,
+  which joins the same queue. Without a running pool (scripts, tests) it encodes in-process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Set
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_st_model = None
+_model_lock = threading.Lock()
+
+
+def _model_name() -> str:
+    return (getattr(settings, "KANBAN_EMBEDDING_MODEL", None) or "all-MiniLM-L6-v2").strip()
+
+
+def _get_sentence_model():
+    global _st_model
+    with _model_lock:
+        if _st_model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise RuntimeError(
+                    "sentence-transformers is required for Kanban RAG. pip install sentence-transformers faiss-cpu"
+                ) from e
+            name = _model_name()
+            logger.info("Loading embedding model %s (Kanban RAG)", name)
+            _st_model = SentenceTransformer(name)
+    return _st_model
+
+
+def encode_now(texts: Sequence[str]) -> np.ndarray:
+    """L2-normalized float32 embeddings, computed on the calling thread."""
+    model = _get_sentence_model()
+    emb = model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+    if emb.dtype != np.float32:
+        emb = emb.astype(np.float32)
+    norms = np.linalg.norm(emb, axis=1, keepdims=True)
+    norms = np.maximum(norms, 1e-12)
+    return emb / norms
+
+
+def _preload() -> None:
+    started = time.perf_counter()
+    encode_now(["warm up"])
+    logger.info("Embedding model %s ready (%.1fs)", _model_name(), time.perf_counter() - started)
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class EmbeddingPool:
+    """Micro-batched embeddings shared by every RAG caller in this process."""
+
+    def __init__(self, workers: int = None, max_batch: int = None, batch_wait_ms: float = None):
+        self.workers = max(1, int(workers or getattr(settings, "EMBEDDING_WORKERS", 1)))
+        self.max_batch = max(1, int(max_batch or getattr(settings, "EMBEDDING_MAX_BATCH", 64)))
+        self.batch_wait = float(
+            batch_wait_ms if batch_wait_ms is not None else getattr(settings, "EMBEDDING_BATCH_WAIT_MS", 5)
+        ) / 1000.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_tasks: Set[asyncio.Task] = set()  # strong refs: the loop only holds tasks weakly
+        self._queued_texts = 0
+        self._inflight = 0
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.failed_batches = 0
+        self.max_queue_wait = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    async def start(self, preload: bool = False) -> None:
+        """Create the worker threads on the running loop; ``preload`` loads + warms the model (API startup)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            await self.close()
+        if self._executor is None:
+            self._loop = loop
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embedding")
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        if preload:
+            await loop.run_in_executor(self._executor, _preload)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop is not loop and self._loop.is_running():
+            # Another loop owns the pool (e.g. a worker's own asyncio.run): hand the request over.
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.embed(texts), self._loop))
+        if self._executor is None or self._loop is not loop:
+            await self.start()
+        future = loop.create_future()
+        self.requests += 1
+        self._queued_texts += len(texts)
+        self._queue.put_nowait(_Request(texts, future))
+        return await future
+
+    def embed_sync(self, texts: Sequence[str]) -> np.ndarray:
+        """Blocking ``embed`` for code running in a worker thread; encodes in-process without a live pool."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if not on_loop:
+                return asyncio.run_coroutine_threadsafe(self.embed(texts), loop).result()
+            logger.warning("embed_sync called on the event loop; encoding inline blocks it (use embed)")
+        texts = list(texts)
+        return encode_now(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = loop.time() + self.batch_wait
+            while size < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and self._queue.empty():
+                    break
+                try:
+                    req = await asyncio.wait_for(self._queue.get(), timeout=max(0.0, remaining))
+                except asyncio.TimeoutError:
+                    break
+                batch.append(req)
+                size += len(req.texts)
+            self._queued_texts -= size
+            batch = [r for r in batch if not r.future.done()]
+            if not batch:
+                continue
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        self.max_queue_wait = max(self.max_queue_wait, max(now - r.enqueued_at for r in batch))
+        texts = [t for r in batch for t in r.texts]
+        self._inflight += 1
+        try:
+            vectors = await loop.run_in_executor(self._executor, encode_now, texts)
+        except Exception as e:
+            self.failed_batches += 1
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_exception(e)
+            return
+        finally:
+            self._inflight -= 1
+            self._slots.release()
+        self.batches += 1
+        self.items += len(texts)
+        self.max_batch_seen = max(self.max_batch_seen, len(texts))
+        offset = 0
+        for r in batch:
+            rows = vectors[offset : offset + len(r.texts)]
+            offset += len(r.texts)
+            if not r.future.done():
+                r.future.set_result(rows)
+
+    async def close(self) -> None:
+        dispatcher, executor = self._dispatcher, self._executor
+        self._dispatcher = self._executor = self._queue = self._slots = self._loop = None
+        self._queued_texts = 0
+        if dispatcher is not None and not dispatcher.done():
+            owner = dispatcher.get_loop()
+            if owner is asyncio.get_running_loop():
+                dispatcher.cancel()
+                try:
+                    await dispatcher
+                except asyncio.CancelledError:
+                    pass
+            elif not owner.is_closed():
+                owner.call_soon_threadsafe(dispatcher.cancel)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "model": _model_name(),
+            "workers": self.workers,
+            "started": self.started,
+            "model_loaded": _st_model is not None,
+            "queued_requests": self._queue.qsize() if self._queue else 0,
+            "queued_texts": self._queued_texts,
+            "inflight_batches": self._inflight,
+            "requests": self.requests,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "max_batch_size": self.max_batch_seen,
+            "failed_batches": self.failed_batches,
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000),
+        }
+
+
+embedding_pool = EmbeddingPool()
@@ -0,0 +1,123 @@
+"""
+FAISS index selection for transcript RAG.
+
+``TRANSCRIPT_RAG_INDEX_TYPE``:
+
+- ``auto`` (default): exact ``flat`` search below ``TRANSCRIPT_RAG_ANN_MIN_CHUNKS`` chunks,
+  ``TRANSCRIPT_RAG_ANN_INDEX`` (``hnsw`` or ``ivfpq``) above;
+- ``flat``: exact inner-product search;
+- ``hnsw``: graph search (``TRANSCRIPT_RAG_HNSW_M`` links, ``TRANSCRIPT_RAG_HNSW_EF_SEARCH`` beam);
+- ``ivfpq``: inverted lists over product-quantized codes (about dim/8 bytes per chunk,
+  ``TRANSCRIPT_RAG_IVF_NPROBE`` lists probed); needs ~10k chunks to train, falls back to ``hnsw``;
+- anything else is passed to ``faiss.index_factory`` as is.
+
+Flat and HNSW keep ``TRANSCRIPT_RAG_VECTOR_DTYPE`` vectors (``float16`` halves memory and disk at
+no measurable recall cost on normalized embeddings). Saved indexes are loaded memory-mapped, so a
+cached project index is paged in on demand instead of copied into RAM.
+"""
+from __future__ import annotations
+
+import logging
+import math
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PQ_MIN_TRAIN = 256 * 39  # 8-bit PQ codebooks: 256 centroids, ~39 points each
+_TRAIN_SAMPLE = 20000  # k-means on more points barely moves the centroids, only the build time
+
+
+def index_params() -> dict:
+    """Settings that change how an index is built (part of the disk-cache fingerprint)."""
+    return {
+        "index_type": (getattr(settings, "TRANSCRIPT_RAG_INDEX_TYPE", "auto") or "auto").strip(),
+        "ann_min_chunks": int(getattr(settings, "TRANSCRIPT_RAG_ANN_MIN_CHUNKS", 20000) or 0),
+        "ann_index": (getattr(settings, "TRANSCRIPT_RAG_ANN_INDEX", "hnsw") or "hnsw").strip().lower(),
+        "vector_dtype": (getattr(settings, "TRANSCRIPT_RAG_VECTOR_DTYPE", "float16") or "float16").strip().lower(),
+        "hnsw_m": max(4, int(getattr(settings, "TRANSCRIPT_RAG_HNSW_M", 32) or 32)),
+    }
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Largest divisor of ``dim`` not above dim/8 (faiss needs dim % m == 0)."""
+    m = max(1, dim // 8)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def factory_string(n: int, dim: int, params: dict = None) -> str:
+    """``faiss.index_factory`` description for ``n`` vectors of ``dim``."""
+    p = params or index_params()
+    kind = p["index_type"].lower()
+    if kind == "auto":
+        kind = p["ann_index"] if n >= p["ann_min_chunks"] > 0 else "flat"
+    if kind == "ivfpq" and n < _PQ_MIN_TRAIN:
+        logger.info("Transcript RAG: %d chunks are too few to train IVF-PQ, using HNSW", n)
+        kind = "hnsw"
+    storage = "SQfp16" if p["vector_dtype"] == "float16" else "Flat"
+    if kind == "flat":
+        return storage
+    if kind == "hnsw":
+        return f"HNSW{p['hnsw_m']}" + (",SQfp16" if storage == "SQfp16" else "")
+    if kind == "ivfpq":
+        nlist = int(min(max(16, 4 * math.sqrt(n)), min(n, _TRAIN_SAMPLE) // 39))
+        return f"IVF{nlist},PQ{_pq_subquantizers(dim)}x8"
+    return p["index_type"]
+
+
+def tune(index) -> None:
+    """Search-time knobs (not all survive ``write_index``, so applied after every build and load)."""
+    import faiss
+
+    inner = index
+    if hasattr(faiss, "downcast_index"):
+        inner = faiss.downcast_index(index)
+    if hasattr(inner, "hnsw"):
+        inner.hnsw.efSearch = max(16, int(getattr(settings, "TRANSCRIPT_RAG_HNSW_EF_SEARCH", 64) or 64))
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except Exception:
+        ivf = None
+    if ivf is not None:
+        ivf.nprobe = min(ivf.nlist, max(1, int(getattr(settings, "TRANSCRIPT_RAG_IVF_NPROBE", 16) or 16)))
+
+
+def build_index(vectors: np.ndarray, params: dict = None):
+    """Trained, filled and tuned inner-product index over L2-normalized float32 ``vectors``."""
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    description = factory_string(n, dim, params)
+    index = faiss.index_factory(dim, description, faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        sample = vectors
+        if n > _TRAIN_SAMPLE:
+            sample = vectors[np.random.default_rng(0).choice(n, _TRAIN_SAMPLE, replace=False)]
+        index.train(sample)
+    index.add(vectors)
+    tune(index)
+    if description not in ("Flat", "SQfp16"):
+        logger.info("Transcript RAG index %s over %d chunks", description, n)
+    return index
+
+
+def read_index(path: str):
+    """Load a saved index memory-mapped (zero-copy where faiss supports it), else fully read."""
+    import faiss
+
+    flags = getattr(faiss, "IO_FLAG_MMAP_IFC", 0) or getattr(faiss, "IO_FLAG_MMAP", 0)
+    index = None
+    if flags:
+        try:
+            index = faiss.read_index(path, flags | getattr(faiss, "IO_FLAG_READ_ONLY", 0))
+        except Exception as e:
+            logger.debug("Memory-mapped read of %s failed (%s); reading into RAM", path, e)
+    if index is None:
+        index = faiss.read_index(path)
+    tune(index)
+    return index
@@ -0,0 +1,146 @@
+"""
+Per-meeting embedding shards for project transcript indexes.
+
+A finished meeting's transcript never changes, so its chunks are embedded once (when the meeting
+ends, or the first time a project index needs them) and stored in ``transcript_rag_shards`` with
+their vectors. A project index is then a merge of shard vectors: adding one meeting to a large
+project embeds only that meeting. Shards are keyed by meeting id and tagged with the embedding
+model, chunking parameters and ``ended_at``; a mismatch rebuilds the shard. Live meetings are
+embedded on demand and never persisted.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.kanban_agentic_automation import _clean_transcript
+from app.services.transcript_rag.core import _clean_transcript_for_rag, _word_chunks
+from app.services.transcript_rag.embedding_store import aembed_chunks
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MeetingShard:
+    meeting_id: str
+    texts: List[str]  # raw chunk words, in transcript order
+    vectors: np.ndarray  # (len(texts), dim) float32, L2-normalized
+
+
+def shard_params() -> dict:
+    """Everything besides the transcript that changes a shard's vectors."""
+    return {
+        "model": (getattr(settings, "KANBAN_EMBEDDING_MODEL", None) or "all-MiniLM-L6-v2").strip(),
+        "chunk_words": max(50, int(getattr(settings, "KANBAN_RAG_CHUNK_WORDS", 250) or 250)),
+        "overlap_words": max(0, int(getattr(settings, "KANBAN_RAG_CHUNK_OVERLAP_WORDS", 40) or 40)),
+    }
+
+
+def _chunk_texts(meeting_id: str, cleaned_text: str, params: dict) -> List[str]:
+    body = _clean_transcript_for_rag(cleaned_text)
+    if not body:
+        return []
+    return [c.text for c in _word_chunks(meeting_id, 0, body, params["chunk_words"], params["overlap_words"])]
+
+
+async def build_shard(meeting_id: str, cleaned_text: str, params: Optional[dict] = None) -> MeetingShard:
+    """Chunk one meeting and embed it (chunk-embedding cache, then the shared embedding pool)."""
+    texts = _chunk_texts(meeting_id, cleaned_text, params or shard_params())
+    vectors = await aembed_chunks(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+    return MeetingShard(meeting_id=meeting_id, texts=texts, vectors=vectors)
+
+
+def _shard_doc(shard: MeetingShard, meeting: dict, params: dict) -> dict:
+    dim = int(shard.vectors.shape[1]) if shard.texts else 0
+    return {
+        "_id": shard.meeting_id,
+        **params,
+        "ended_at": meeting.get("ended_at"),
+        "texts": shard.texts,
+        "dim": dim,
+        "vectors": np.ascontiguousarray(shard.vectors, dtype=np.float32).tobytes() if dim else b"",
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _shard_from_doc(doc: dict) -> MeetingShard:
+    texts = list(doc.get("texts") or [])
+    dim = int(doc.get("dim") or 0)
+    if texts and dim:
+        vectors = np.frombuffer(bytes(doc["vectors"]), dtype=np.float32).reshape(len(texts), dim)
+    else:
+        vectors = np.zeros((0, 0), dtype=np.float32)
+    return MeetingShard(meeting_id=str(doc["_id"]), texts=texts, vectors=vectors)
+
+
+def _doc_is_current(doc: dict, meeting: dict, params: dict) -> bool:
+    return all(doc.get(k) == v for k, v in params.items()) and doc.get("ended_at") == meeting.get("ended_at")
+
+
+async def _load_cleaned_texts(db, meeting_ids: Sequence[str]) -> Dict[str, str]:
+    """One ``transcript_segments`` query for all the meetings (cleaned as the Kanban pipeline does)."""
+    if not meeting_ids:
+        return {}
+    cursor = db.transcript_segments.find(
+        {"meeting_id": {"$in": list(meeting_ids)}},
+        {"meeting_id": 1, "text": 1, "timestamp": 1},
+    ).sort([("meeting_id", 1), ("timestamp", 1)])
+    lines: Dict[str, List[str]] = {mid: [] for mid in meeting_ids}
+    async for seg in cursor:
+        text = (seg.get("text") or "").strip()
+        if text:
+            lines.setdefault(str(seg.get("meeting_id")), []).append(text)
+    return {mid: _clean_transcript("\n".join(parts)) for mid, parts in lines.items()}
+
+
+async def ensure_meeting_shards(db, meetings: Sequence[dict]) -> Dict[str, MeetingShard]:
+    """
+    Shards for ``meetings`` (dicts with ``_id`` / ``ended_at``), keyed by meeting id.
+    Stored shards are reused; only missing or stale ones read segments and are embedded.
+    """
+    params = shard_params()
+    by_id = {str(m["_id"]): m for m in meetings}
+    shards: Dict[str, MeetingShard] = {}
+    if not by_id:
+        return shards
+    async for doc in db.transcript_rag_shards.find({"_id": {"$in": list(by_id)}}):
+        mid = str(doc["_id"])
+        if mid in by_id and _doc_is_current(doc, by_id[mid], params):
+            shards[mid] = _shard_from_doc(doc)
+
+    missing = [mid for mid in by_id if mid not in shards]
+    if not missing:
+        return shards
+    cleaned = await _load_cleaned_texts(db, missing)
+    # Concurrent requests, so the embedding pool packs several meetings into each batch.
+    built = await asyncio.gather(*(build_shard(mid, cleaned.get(mid, ""), params) for mid in missing))
+    for mid, shard in zip(missing, built):
+        shards[mid] = shard
+        meeting = by_id[mid]
+        if meeting.get("ended_at") is None:
+            continue  # still live: the transcript may grow
+        try:
+            await db.transcript_rag_shards.replace_one({"_id": mid}, _shard_doc(shard, meeting, params), upsert=True)
+        except Exception as e:
+            logger.warning("Transcript RAG shard write failed meeting_id=%s: %s", mid, e)
+    logger.info("Transcript RAG shards built=%d reused=%d", len(missing), len(by_id) - len(missing))
+    return shards
+
+
+async def build_meeting_shard(db, meeting_id: str) -> Optional[MeetingShard]:
+    """Embed a meeting once it has ended, so later project indexes only merge its vectors."""
+    from bson import ObjectId
+
+    try:
+        meeting = await db.meetings.find_one({"_id": ObjectId(meeting_id)}, {"ended_at": 1})
+    except Exception:
+        meeting = None
+    if not meeting:
+        return None
+    return (await ensure_meeting_shards(db, [meeting])).get(str(meeting["_id"]))
@@ -13,7 +13,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from bson import ObjectId
 
 from app.core.config import settings
-from app.services.meeting_intelligence import get_groq_client
+from app.llm import llm_gateway
 from app.services.meeting_context_qa import _build_transcript_text
 from app.services.kanban_agentic_automation import rebuild_kanban_from_meeting_history
 from app.services.task_key import ensure_task_key_persisted
@@ -232,24 +232,25 @@ Rules:
     if not settings.GROQ_API_KEY:
         return "AI copilot is unavailable (missing GROQ_API_KEY).", []
 
-    client = get_groq_client()
     model = settings.TASK_AUTOMATION_MODEL or "llama-3.3-70b-versatile"
     try:
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
+        result = await llm_gateway.chat(
+            "groq",
+            [
                 {"role": "system", "content": sys_prompt},
                 {"role": "user", "content": user_blob},
             ],
+            model=model,
             temperature=0.15,
             max_tokens=2048,
             response_format={"type": "json_object"},
+            cache=False,  # a chat turn: asking again should get a fresh answer
         )
     except Exception as e:
         logger.exception("copilot groq: %s", e)
         return f"Assistant error: {e}", []
 
-    parsed = _parse_copilot_response(resp.choices[0].message.content or "{}")
+    parsed = _parse_copilot_response(result.text or "{}")
     answer = str(parsed.get("answer") or "").strip() or "Done."
     actions = parsed.get("actions") if isinstance(parsed.get("actions"), list) else []
 
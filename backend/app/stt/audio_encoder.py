@@ -0,0 +1,133 @@
+"""
+Upload encoders for STT chunks (``STT_AUDIO_CODEC``).
+
+- ``wav``: raw PCM16 in a WAV header (no dependency, ~32 KB per second at 16 kHz).
+- ``flac``: lossless, typically 1.5–2.5x smaller on speech; decoded PCM is bit-identical.
+- ``opus``: lossy Ogg/Opus, roughly 8x smaller; costs noticeably more CPU to encode.
+
+FLAC and Opus use the optional ``soundfile`` package (bundles libsndfile). When it is missing,
+or the codec is unknown, the WAV encoder is used and a warning is logged once.
+"""
+import io
+import logging
+import wave
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_encoders: Dict[str, "AudioEncoder"] = {}
+
+
+def pcm_to_wav(pcm_bytes: bytes, sample_rate: int = 16000, channels: int = 1) -> bytes:
+    """Wrap raw PCM16 in a WAV container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm_bytes)
+    return buf.getvalue()
+
+
+@dataclass(frozen=True)
+class EncodedAudio:
+    data: bytes
+    filename: str
+    content_type: str
+    codec: str
+    raw_bytes: int
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.raw_bytes / len(self.data) if self.data else 0.0
+
+
+class AudioEncoder:
+    """PCM16 mono → upload bytes. ``lossy`` encoders are run in a worker thread by the pipeline."""
+
+    codec = "wav"
+    extension = "wav"
+    content_type = "audio/wav"
+    lossy = False
+
+    def _encode(self, pcm_bytes: bytes, sample_rate: int) -> bytes:
+        return pcm_to_wav(pcm_bytes, sample_rate)
+
+    def encode(self, pcm_bytes: bytes, sample_rate: int) -> EncodedAudio:
+        return EncodedAudio(
+            data=self._encode(pcm_bytes, sample_rate),
+            filename=f"audio.{self.extension}",
+            content_type=self.content_type,
+            codec=self.codec,
+            raw_bytes=len(pcm_bytes),
+        )
+
+
+class SoundFileEncoder(AudioEncoder):
+    """FLAC / Ogg-Opus through libsndfile."""
+
+    def __init__(self, codec: str, fmt: str, subtype: str, extension: str, content_type: str, lossy: bool):
+        import soundfile  # noqa: F401  (fail early so the factory can fall back to WAV)
+
+        self.codec = codec
+        self._format = fmt
+        self._subtype = subtype
+        self.extension = extension
+        self.content_type = content_type
+        self.lossy = lossy
+
+    def _encode(self, pcm_bytes: bytes, sample_rate: int) -> bytes:
+        import numpy as np
+        import soundfile as sf
+
+        samples = np.frombuffer(pcm_bytes, dtype="<i2", count=len(pcm_bytes) // 2)
+        buf = io.BytesIO()
+        sf.write(buf, samples, sample_rate, format=self._format, subtype=self._subtype)
+        return buf.getvalue()
+
+
+_CODECS = {
+    "flac": ("FLAC", "PCM_16", "flac", "audio/flac", False),
+    "opus": ("OGG", "OPUS", "ogg", "audio/ogg", True),
+}
+
+
+def get_audio_encoder(codec: str = None) -> AudioEncoder:
+    """Shared encoder for ``codec`` (default ``STT_AUDIO_CODEC``); WAV when unavailable."""
+    codec = (codec or getattr(settings, "STT_AUDIO_CODEC", "wav") or "wav").lower().strip()
+    encoder = _encoders.get(codec)
+    if encoder is not None:
+        return encoder
+    spec = _CODECS.get(codec)
+    if spec is None:
+        if codec != "wav":
+            logger.warning("Unknown STT_AUDIO_CODEC=%r; uploading WAV", codec)
+        encoder = AudioEncoder()
+    else:
+        try:
+            encoder = SoundFileEncoder(codec, *spec)
+        except ImportError:
+            logger.warning("STT_AUDIO_CODEC=%s needs the soundfile package (pip install soundfile); uploading WAV", codec)
+            encoder = AudioEncoder()
+    _encoders[codec] = encoder
+    return encoder
+
+
+def decode_audio(data: bytes) -> Tuple["object", int]:
+    """Decode an uploaded chunk (WAV, FLAC or Ogg) to float32 mono samples in [-1, 1] and its sample rate."""
+    import numpy as np
+
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            raw = wf.readframes(wf.getnframes())
+            rate = wf.getframerate()
+        return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0, rate
+    import soundfile as sf
+
+    samples, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=False)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples, rate
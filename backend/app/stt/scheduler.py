@@ -0,0 +1,309 @@
+"""
+Process-wide STT scheduler shared by every STTPipeline.
+
+- Per API key rate limiter: optional token bucket (``STT_RATE_LIMIT_RPM``) plus blocking driven by
+  provider headers (``x-ratelimit-remaining-requests`` / ``x-ratelimit-reset-requests`` /
+  ``retry-after``), so one 429 pauses every meeting on that key instead of each finding out alone.
+- Round-robin across meetings (FIFO of meetings that are ready), at most one call in flight per
+  meeting so chunk order is preserved.
+- Bounded global concurrency (``STT_MAX_CONCURRENT_CALLS``).
+- Meetings with live subscribers are served first; waiting too long (``STT_PRIORITY_MAX_WAIT_SECONDS``)
+  promotes any meeting so nobody starves.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse provider reset values: ``"7.66s"``, ``"2m59.56s"``, ``"120ms"`` or plain seconds."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for num, unit in _DURATION_PART.findall(text):
+        matched = True
+        n = float(num)
+        total += {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}[unit] * n
+    return total if matched else None
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    try:
+        return headers.get(name)
+    except Exception:
+        return None
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Short, log-safe identifier for an API key."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:10]
+
+
+class KeyRateLimiter:
+    """Token bucket + header-driven block window for one API key."""
+
+    def __init__(self, requests_per_minute: float = 0.0, burst: int = 1, default_backoff: float = 20.0):
+        self.rate = max(0.0, float(requests_per_minute)) / 60.0
+        self.burst = max(1, int(burst))
+        self.default_backoff = default_backoff
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.rate_limited = 0
+
+    def _refill(self, now: float) -> None:
+        if self.rate <= 0:
+            return
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the next request may start (0 = now)."""
+        now = time.monotonic() if now is None else now
+        wait = max(0.0, self.blocked_until - now)
+        if self.rate > 0:
+            self._refill(now)
+            if self._tokens < 1.0:
+                wait = max(wait, (1.0 - self._tokens) / self.rate)
+        return wait
+
+    def consume(self, now: Optional[float] = None) -> None:
+        if self.rate > 0:
+            self._refill(time.monotonic() if now is None else now)
+            self._tokens -= 1.0
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(0.0, seconds))
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Pause the key early when the provider reports no remaining requests."""
+        remaining = _header(headers, "x-ratelimit-remaining-requests")
+        if remaining is None:
+            return
+        try:
+            left = int(float(remaining))
+        except ValueError:
+            return
+        if left <= 0:
+            reset = parse_reset_seconds(_header(headers, "x-ratelimit-reset-requests"))
+            self.block_for(reset if reset is not None else self.default_backoff)
+
+    def observe_error(self, exc: BaseException) -> bool:
+        """Record a 429 (shared backoff for every meeting on this key). Returns True if rate-limited."""
+        code = _status_code(exc)
+        if code != 429 and not (code is None and "429" in str(exc)):
+            return False
+        self.rate_limited += 1
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        wait = parse_reset_seconds(_header(headers, "retry-after"))
+        if wait is None:
+            wait = parse_reset_seconds(_header(headers, "x-ratelimit-reset-requests"))
+        self.block_for(wait if wait is not None else self.default_backoff)
+        return True
+
+
+@dataclass(eq=False)
+class _Job:
+    meeting_id: str
+    key_id: str
+    granted: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class STTScheduler:
+    """Fair, rate-limit-aware admission for transcription calls across meetings."""
+
+    def __init__(self, max_concurrency: int = None, requests_per_minute: float = None):
+        self.max_concurrency = max(
+            1, int(max_concurrency or getattr(settings, "STT_MAX_CONCURRENT_CALLS", 8))
+        )
+        self.requests_per_minute = float(
+            requests_per_minute
+            if requests_per_minute is not None
+            else getattr(settings, "STT_RATE_LIMIT_RPM", 0.0)
+        )
+        self.priority_max_wait = float(getattr(settings, "STT_PRIORITY_MAX_WAIT_SECONDS", 10.0))
+        self._limiters: Dict[str, KeyRateLimiter] = {}
+        self._queues: Dict[str, Deque[_Job]] = {}
+        # Meetings with queued work and nothing in flight, in the order they became ready.
+        self._rr: Deque[str] = deque()
+        self._busy: set = set()
+        self._inflight = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._wakeup_at = 0.0
+        self._priority_fn: Callable[[str], bool] = lambda _mid: False
+        self.completed = 0
+
+    def set_priority_resolver(self, fn: Callable[[str], bool]) -> None:
+        """``fn(meeting_id)`` → True when the meeting has live subscribers (served first)."""
+        self._priority_fn = fn
+
+    def limiter(self, key_id: str) -> KeyRateLimiter:
+        lim = self._limiters.get(key_id)
+        if lim is None:
+            lim = KeyRateLimiter(
+                self.requests_per_minute,
+                burst=max(1, int(getattr(settings, "STT_RATE_LIMIT_BURST", 4))),
+            )
+            self._limiters[key_id] = lim
+        return lim
+
+    def blocked_for(self, key_id: str) -> float:
+        """Seconds the key is paused by a provider rate limit (token pacing excluded)."""
+        return max(0.0, self.limiter(key_id).blocked_until - time.monotonic())
+
+    async def submit(self, meeting_id: str, key_id: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Wait for a fair slot on ``key_id``, run ``call()``, and feed any 429 back to the key limiter."""
+        loop = asyncio.get_running_loop()
+        job = _Job(meeting_id=meeting_id, key_id=key_id, granted=loop.create_future())
+        queue = self._queues.setdefault(meeting_id, deque())
+        queue.append(job)
+        if meeting_id not in self._busy and meeting_id not in self._rr:
+            self._rr.append(meeting_id)
+        self._dispatch()
+        try:
+            await job.granted
+        except asyncio.CancelledError:
+            if job.granted.done() and not job.granted.cancelled():
+                self._release(job)
+            else:
+                self._drop(job)
+            raise
+        try:
+            return await call()
+        except Exception as e:
+            if self.limiter(key_id).observe_error(e):
+                logger.warning(
+                    "STT key %s rate-limited; pausing all meetings on it for %.0fs",
+                    key_id, self.blocked_for(key_id),
+                )
+            raise
+        finally:
+            self._release(job)
+
+    def _drop(self, job: _Job) -> None:
+        queue = self._queues.get(job.meeting_id)
+        if queue and job in queue:
+            queue.remove(job)
+        if not queue and job.meeting_id not in self._busy:
+            self._queues.pop(job.meeting_id, None)
+            if job.meeting_id in self._rr:
+                self._rr.remove(job.meeting_id)
+
+    def _release(self, job: _Job) -> None:
+        mid = job.meeting_id
+        self._inflight -= 1
+        self._busy.discard(mid)
+        self.completed += 1
+        if self._queues.get(mid):
+            self._rr.append(mid)  # back of the round
+        else:
+            self._queues.pop(mid, None)
+        self._dispatch()
+
+    def _pick(self, now: float) -> tuple:
+        """Next eligible meeting (priority tier first, round-robin within tier) and min wait."""
+        fallback = None
+        min_wait = None
+        for mid in self._rr:
+            head = self._queues[mid][0]
+            wait = self.limiter(head.key_id).delay(now)
+            if wait > 0:
+                min_wait = wait if min_wait is None else min(min_wait, wait)
+                continue
+            try:
+                boosted = self._priority_fn(mid)
+            except Exception:
+                boosted = False
+            if boosted or now - head.enqueued_at >= self.priority_max_wait:
+                return mid, min_wait
+            if fallback is None:
+                fallback = mid
+        return fallback, min_wait
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        min_wait = None
+        while self._inflight < self.max_concurrency:
+            mid, min_wait = self._pick(now)
+            if mid is None:
+                break
+            queue = self._queues[mid]
+            job = queue.popleft()
+            self._rr.remove(mid)
+            if job.granted.done():
+                if queue:
+                    self._rr.appendleft(mid)
+                else:
+                    self._queues.pop(mid, None)
+                continue
+            self.limiter(job.key_id).consume(now)
+            self._busy.add(mid)
+            self._inflight += 1
+            job.granted.set_result(None)
+        if min_wait is not None:
+            self._schedule_wakeup(now + min_wait)
+
+    def _schedule_wakeup(self, at: float) -> None:
+        """Re-run dispatch when the earliest paced/blocked key frees up."""
+        if self._wakeup is not None:
+            if self._wakeup_at <= at:
+                return
+            self._wakeup.cancel()
+
+        def _wake() -> None:
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup_at = at
+        self._wakeup = asyncio.get_running_loop().call_later(max(0.0, at - time.monotonic()), _wake)
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "inflight": self._inflight,
+            "max_concurrency": self.max_concurrency,
+            "queued": sum(len(q) for q in self._queues.values()),
+            "meetings_waiting": sum(1 for q in self._queues.values() if q),
+            "completed": self.completed,
+            "keys": {
+                kid: {
+                    "blocked_for_seconds": round(max(0.0, lim.blocked_until - now), 1),
+                    "rate_limited": lim.rate_limited,
+                }
+                for kid, lim in self._limiters.items()
+            },
+        }
+
+
+stt_scheduler = STTScheduler()
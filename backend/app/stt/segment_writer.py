@@ -0,0 +1,187 @@
+"""
+Write-behind persistence for live transcript segments.
+
+STTPipeline broadcasts accepted text first, then hands the segment document to
+``segment_writer``. Documents are buffered per meeting and written with ``insert_many`` when a
+meeting reaches ``STT_SEGMENT_FLUSH_SIZE`` segments, when its oldest pending segment is older than
+``STT_SEGMENT_FLUSH_SECONDS``, or when the meeting stops. Every document gets its ``_id`` up front,
+so a retried batch that partially landed only produces duplicate-key errors, which are ignored.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
+
+from app.core.config import settings
+from app.core.database import get_database
+
+logger = logging.getLogger(__name__)
+
+_DUPLICATE_KEY = 11000
+
+
+class _PendingSegments:
+    __slots__ = ("docs", "oldest_at")
+
+    def __init__(self):
+        self.docs: List[dict] = []
+        self.oldest_at = 0.0
+
+
+class TranscriptSegmentWriter:
+    """Per-meeting buffers flushed to ``transcript_segments`` in batches, with retry."""
+
+    def __init__(
+        self,
+        flush_size: int = None,
+        flush_seconds: float = None,
+        max_retries: int = None,
+        max_pending: int = None,
+    ):
+        self.flush_size = max(1, int(flush_size or getattr(settings, "STT_SEGMENT_FLUSH_SIZE", 10)))
+        self.flush_seconds = float(
+            flush_seconds if flush_seconds is not None else getattr(settings, "STT_SEGMENT_FLUSH_SECONDS", 2.0)
+        )
+        self.max_retries = max(
+            0, int(max_retries if max_retries is not None else getattr(settings, "STT_SEGMENT_WRITE_RETRIES", 4))
+        )
+        self.max_pending = max(
+            self.flush_size,
+            int(max_pending or getattr(settings, "STT_SEGMENT_MAX_PENDING", 2000)),
+        )
+        self._pending: Dict[str, _PendingSegments] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._size_flush: Dict[str, asyncio.Task] = {}
+        self.written = 0
+        self.failed_batches = 0
+        self.dropped = 0
+
+    def enqueue(self, meeting_id: str, doc: dict) -> None:
+        """Buffer one segment document (``meeting_id`` and ``_id`` are filled in)."""
+        doc.setdefault("_id", ObjectId())
+        doc["meeting_id"] = meeting_id
+        pending = self._pending.get(meeting_id)
+        if pending is None:
+            pending = self._pending[meeting_id] = _PendingSegments()
+        if not pending.docs:
+            pending.oldest_at = time.monotonic()
+        pending.docs.append(doc)
+        if len(pending.docs) > self.max_pending:
+            overflow = len(pending.docs) - self.max_pending
+            del pending.docs[:overflow]
+            self.dropped += overflow
+            logger.error(
+                "Transcript segment backlog full meeting_id=%s; dropped %d oldest segment(s)",
+                meeting_id, overflow,
+            )
+        self._ensure_flusher()
+        scheduled = self._size_flush.get(meeting_id)
+        if len(pending.docs) >= self.flush_size and (scheduled is None or scheduled.done()):
+            self._size_flush[meeting_id] = asyncio.create_task(self.flush(meeting_id))
+
+    def pending_count(self, meeting_id: str = None) -> int:
+        if meeting_id is not None:
+            pending = self._pending.get(meeting_id)
+            return len(pending.docs) if pending else 0
+        return sum(len(p.docs) for p in self._pending.values())
+
+    def discard(self, meeting_id: str) -> None:
+        """Forget unwritten segments (meeting deleted)."""
+        self._pending.pop(meeting_id, None)
+        self._size_flush.pop(meeting_id, None)
+
+    async def flush(self, meeting_id: str) -> int:
+        """Write everything pending for one meeting; returns documents written."""
+        lock = self._locks.setdefault(meeting_id, asyncio.Lock())
+        async with lock:
+            pending = self._pending.get(meeting_id)
+            if not pending or not pending.docs:
+                return 0
+            batch = pending.docs
+            pending.docs = []
+            ok = await self._insert_with_retry(batch)
+            if not ok:
+                # Put the batch back in front so order is kept and the next flush retries it.
+                pending.docs = batch + pending.docs
+                pending.oldest_at = time.monotonic()
+                self.failed_batches += 1
+                return 0
+            if not pending.docs:
+                self._pending.pop(meeting_id, None)
+                self._size_flush.pop(meeting_id, None)
+            else:
+                pending.oldest_at = time.monotonic()
+            self.written += len(batch)
+            return len(batch)
+
+    async def flush_all(self) -> int:
+        total = 0
+        for meeting_id in list(self._pending):
+            total += await self.flush(meeting_id)
+        return total
+
+    async def _insert_with_retry(self, batch: List[dict]) -> bool:
+        delay = 0.2
+        for attempt in range(self.max_retries + 1):
+            try:
+                db = await get_database()
+                await db.transcript_segments.insert_many(batch, ordered=False)
+                return True
+            except BulkWriteError as e:
+                errors = (e.details or {}).get("writeErrors") or []
+                if errors and all(err.get("code") == _DUPLICATE_KEY for err in errors):
+                    return True  # earlier attempt already landed these
+                logger.warning("Transcript segment batch partially failed: %s", errors[:1])
+            except (ConnectionFailure, OperationFailure) as e:
+                logger.warning(
+                    "Transcript segment write failed (attempt %d/%d): %s",
+                    attempt + 1, self.max_retries + 1, e,
+                )
+            except Exception:
+                logger.exception("Transcript segment write failed")
+                return False
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+        return False
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        interval = max(0.1, self.flush_seconds / 2)
+        while self._pending:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for meeting_id, pending in list(self._pending.items()):
+                if pending.docs and now - pending.oldest_at >= self.flush_seconds:
+                    try:
+                        await self.flush(meeting_id)
+                    except Exception:
+                        logger.exception("Transcript segment flush failed meeting_id=%s", meeting_id)
+
+    async def close(self) -> None:
+        """Flush everything and stop the background flusher (API shutdown)."""
+        await self.flush_all()
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": self.pending_count(),
+            "written": self.written,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+        }
+
+
+segment_writer = TranscriptSegmentWriter()
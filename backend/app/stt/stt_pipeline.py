@@ -1,5 +1,5 @@
 """
-Buffers ~6s audio → WAV → Groq Whisper → save to transcript_segments + transcripts; broadcast via callback.
+Buffers ~6s audio → WAV → Groq Whisper → broadcast via callback; transcript_segments written behind in batches.
 
 Enhanced with multi-layer silence/hallucination prevention:
   1. Pre-transcription RMS check with configurable threshold
@@ -10,24 +10,23 @@ Enhanced with multi-layer silence/hallucination prevention:
   6. Comprehensive debug logging of every decision
 """
 import asyncio
-import io
 import logging
-import struct
-import wave
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Callable, Awaitable, Optional
+from typing import Any, Callable, Awaitable, Deque, List, Optional, Tuple
 
-from groq import Groq
-
-from app.audio.signal_utils import pcm16_peak, pcm16_rms, pcm16_rms_db
+from app.audio.audio_processor import AudioProcessor, SpeechSegment
+from app.audio.pcm_ring_buffer import PCMRingBuffer
+from app.audio.signal_utils import analyze_pcm16
 from app.core.config import settings
-from app.core.database import get_database
+from app.stt.audio_encoder import EncodedAudio, get_audio_encoder, pcm_to_wav
+from app.stt.scheduler import key_fingerprint, stt_scheduler
+from app.stt.segment_writer import segment_writer
+from app.stt.transcription_client import get_transcription_client
 
 logger = logging.getLogger(__name__)
 
-# Lazy singleton for optional local STT (STT_BACKEND=faster_whisper)
-_fw_whisper_state: dict = {"model": None, "model_name": ""}
-
 # Whisper often hallucinates these on silence or low-quality audio
 HALLUCINATION_PHRASES = frozenset({
     "thank you", "thank you.", "thanks", "thanks.",
@@ -94,34 +93,26 @@ def _transcription_text_and_segments(transcription: Any) -> tuple[str, Any]:
     return text, segments
 
 
-def _zero_crossing_rate(pcm_bytes: bytes) -> float:
-    """
-    Fraction of sign changes between consecutive samples.
-    Pure noise has ZCR ~0.5; speech is typically 0.02–0.20.
-    """
-    if len(pcm_bytes) < 4:
-        return 0.0
-    n = len(pcm_bytes) // 2
-    crossings = 0
-    prev_sign = 0
-    for i in range(0, len(pcm_bytes) - 1, 2):
-        sample = struct.unpack_from("<h", pcm_bytes, i)[0]
-        sign = 1 if sample >= 0 else -1
-        if i > 0 and sign != prev_sign:
-            crossings += 1
-        prev_sign = sign
-    return crossings / (n - 1) if n > 1 else 0.0
+def _latency_summary(samples) -> Optional[dict]:
+    """p50/p95/last in milliseconds, or None when nothing was measured yet."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "p50": round(pick(0.5) * 1000),
+        "p95": round(pick(0.95) * 1000),
+        "last": round(samples[-1] * 1000),
+        "count": len(samples),
+    }
 
 
 def _pcm_to_wav(pcm_bytes: bytes, sample_rate: int = 16000, channels: int = 1) -> bytes:
     """Build minimal WAV from PCM16."""
-    buf = io.BytesIO()
-    with wave.open(buf, "wb") as wav:
-        wav.setnchannels(channels)
-        wav.setsampwidth(2)
-        wav.setframerate(sample_rate)
-        wav.writeframes(pcm_bytes)
-    return buf.getvalue()
+    return pcm_to_wav(pcm_bytes, sample_rate, channels)
 
 
 # ---------------------------------------------------------------------------
@@ -147,12 +138,10 @@ class STTPipeline:
         self.buffer_seconds = buffer_seconds or getattr(
             settings, "STT_BUFFER_SECONDS", 2.0
         )
-        self._buffer = bytearray()
         self._bytes_per_chunk = int(self.sample_rate * self.buffer_seconds * 2)
         self._last_transcribe_time = 0.0
         self._min_interval = float(getattr(settings, "STT_MIN_INTERVAL_SECONDS", self.buffer_seconds))
         self._lock = asyncio.Lock()
-        self._rate_limit_until = 0.0
 
         # Hallucination tracking
         self._last_texts: list[str] = []
@@ -175,60 +164,78 @@ class STTPipeline:
                 2.0 if self._accuracy_mode else 0.5,
             )
         )
+        # Fixed-capacity ring: chunks are memoryview windows, overlap is re-read, not copied.
+        overlap_seconds = min(self._overlap_seconds, self.buffer_seconds * 0.8)
+        ring_seconds = max(
+            float(getattr(settings, "STT_RING_BUFFER_SECONDS", 60.0)),
+            self.buffer_seconds * 3,
+        )
+        self._buffer = PCMRingBuffer(
+            capacity_bytes=int(self.sample_rate * ring_seconds * 2),
+            overlap_bytes=int(self.sample_rate * overlap_seconds * 2),
+        )
 
         # Configurable thresholds
         self._silence_rms_threshold = float(getattr(settings, "STT_SILENCE_RMS_THRESHOLD", 80.0))
         self._silence_db_threshold = float(getattr(settings, "STT_SILENCE_DB_THRESHOLD", -55.0))
         self._max_zcr = float(getattr(settings, "STT_MAX_ZCR", 0.52))
         self._min_peak = int(getattr(settings, "STT_MIN_PEAK", 40))
+        self._max_flatness = float(getattr(settings, "STT_MAX_SPECTRAL_FLATNESS", 0.0))
 
         # Stats
         self._total_chunks = 0
         self._skipped_silence = 0
         self._skipped_hallucination = 0
         self._transcribed = 0
-
-    async def _transcribe_faster_whisper(self, wav_bytes: bytes) -> str:
-        """Local Whisper via faster-whisper (optional dependency)."""
-
-        def _run() -> str:
-            try:
-                from faster_whisper import WhisperModel
-            except ImportError as e:
-                raise RuntimeError(
-                    "STT_BACKEND=faster_whisper requires the faster-whisper package "
-                    "(pip install faster-whisper)."
-                ) from e
-            import numpy as np
-
-            model_name = str(getattr(settings, "STT_FASTER_WHISPER_MODEL", "base") or "base")
-            if _fw_whisper_state["model"] is None or _fw_whisper_state["model_name"] != model_name:
-                _fw_whisper_state["model"] = WhisperModel(model_name, device="cpu", compute_type="int8")
-                _fw_whisper_state["model_name"] = model_name
-            model = _fw_whisper_state["model"]
-            buf = io.BytesIO(wav_bytes)
-            with wave.open(buf, "rb") as wf:
-                nframes = wf.getnframes()
-                raw = wf.readframes(nframes)
-            audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
-            segments_gen, _info = model.transcribe(audio, language="en", vad_filter=True)
-            parts = [s.text.strip() for s in segments_gen if (s.text or "").strip()]
-            return " ".join(parts).strip()
-
-        return await asyncio.to_thread(_run)
-
-    async def _requeue_chunk(self, chunk: bytes, keep_seconds: float = None) -> None:
+        self._upload_raw_bytes = 0
+        self._upload_encoded_bytes = 0
+        self._whisper_calls = 0
+        self._uploaded_bytes = 0
+        self._fed_bytes = 0
+        # (stream offset, capture epoch seconds) per framed block; enough to cover the ring buffer.
+        self._capture_marks: Deque[Tuple[int, float]] = deque(maxlen=4096)
+        self._caption_latencies: Deque[float] = deque(maxlen=200)
+
+        # STT_SEGMENTATION=vad: AudioProcessor cuts utterances; only padded speech is transcribed.
+        self._segmentation = str(getattr(settings, "STT_SEGMENTATION", "fixed") or "fixed").lower().strip()
+        self._segmenter: Optional[AudioProcessor] = None
+        if self._segmentation == "vad":
+            self._segmenter = AudioProcessor(sample_rate=self.sample_rate)
+        self._speech_segments: Deque[SpeechSegment] = deque()
+        self._speech_segment_bytes = 0
+        self._speech_segments_total = 0
+        self._speech_dropped_bytes = 0
+        self._max_merge_bytes = int(
+            float(getattr(settings, "VAD_SEGMENT_MAX_SECONDS", 15.0)) * self.sample_rate
+        ) * 2
+
+    async def _requeue_chunk(self, chunk_end: int, keep_seconds: float = None) -> None:
         """
-        Put a tail of the failed chunk back into the front of the buffer.
-        This prevents content loss when API calls fail or are rate-limited.
+        Rewind the buffer so the tail of the failed chunk (ending at stream offset ``chunk_end``)
+        is read again. This prevents content loss when API calls fail or are rate-limited.
         """
         seconds = self._overlap_seconds if keep_seconds is None else max(0.2, float(keep_seconds))
         keep_bytes = int(self.sample_rate * seconds * 2)
-        retry_tail = chunk[-keep_bytes:] if keep_bytes > 0 else b""
-        if not retry_tail:
+        if keep_bytes <= 0:
             return
         async with self._lock:
-            self._buffer = bytearray(retry_tail) + self._buffer
+            self._buffer.rewind_to(chunk_end - keep_bytes)
+
+    def _count_call(self, chunk) -> None:
+        self._whisper_calls += 1
+        self._uploaded_bytes += len(chunk)
+
+    async def _encode_chunk(self, chunk) -> EncodedAudio:
+        """Encode a PCM window for upload (``STT_AUDIO_CODEC``); lossy codecs run off the event loop."""
+        encoder = get_audio_encoder()
+        if encoder.lossy:
+            # Copy first: the ring buffer window may be overwritten while the thread runs.
+            encoded = await asyncio.to_thread(encoder.encode, bytes(chunk), self.sample_rate)
+        else:
+            encoded = encoder.encode(chunk, self.sample_rate)
+        self._upload_raw_bytes += encoded.raw_bytes
+        self._upload_encoded_bytes += len(encoded.data)
+        return encoded
 
     def _build_whisper_prompt(self) -> str:
         """
@@ -246,24 +253,59 @@ class STTPipeline:
             )
         return "\n\n".join(parts).strip()
 
-    def process_audio(self, pcm_chunk: bytes) -> None:
-        """Add PCM to buffer; does not run transcription (call process_buffer() after)."""
-        self._buffer.extend(pcm_chunk)
+    def _backend_and_key(self) -> tuple[str, str]:
+        """Configured STT backend and the scheduler key it is rate-limited under."""
+        backend = str(getattr(settings, "STT_BACKEND", "groq") or "groq").lower().strip()
+        if backend == "faster_whisper":
+            return backend, "local:faster_whisper"
+        return backend, "groq:" + key_fingerprint(settings.GROQ_API_KEY)
+
+    def process_audio(self, pcm_chunk: bytes, capture_ts: Optional[float] = None) -> None:
+        """Add PCM to buffer; does not run transcription (call process_buffer() after).
+        ``capture_ts`` (epoch seconds of the first sample, from framed bot audio) feeds caption latency."""
+        if capture_ts is not None:
+            self._capture_marks.append((self._fed_bytes, capture_ts))
+        self._fed_bytes += len(pcm_chunk)
+        if self._segmenter is not None:
+            for segment in self._segmenter.segment_speech(pcm_chunk):
+                self._queue_speech_segment(segment)
+            return
+        self._buffer.write(pcm_chunk)
+
+    def _queue_speech_segment(self, segment: SpeechSegment) -> None:
+        self._speech_segments.append(segment)
+        self._speech_segments_total += 1
+        self._speech_segment_bytes += len(segment.pcm)
+        # Same bound as the fixed-mode ring buffer: drop the oldest speech during a long backlog.
+        while self._speech_segment_bytes > self._buffer.capacity and len(self._speech_segments) > 1:
+            old = self._speech_segments.popleft()
+            self._speech_segment_bytes -= len(old.pcm)
+            self._speech_dropped_bytes += len(old.pcm)
+
+    def _capture_time_at(self, offset: int) -> Optional[float]:
+        """Capture wall-clock time of the sample at stream ``offset`` (None without framed audio)."""
+        for mark_offset, capture_ts in reversed(self._capture_marks):
+            if mark_offset <= offset:
+                return capture_ts + (offset - mark_offset) / (self.sample_rate * 2)
+        return None
 
     async def process_buffer(self) -> None:
         """
         If buffer has ~6s of audio, validate audio quality, then transcribe.
         Multiple layers of filtering prevent hallucinated transcriptions.
         """
+        if self._segmenter is not None:
+            await self._process_speech_segments()
+            return
         if len(self._buffer) < self._bytes_per_chunk:
             return
 
-        import time
         now = time.monotonic()
 
-        # Rate-limit: respect Groq 429 backoff
-        if now < self._rate_limit_until:
-            logger.debug("Groq rate-limit active, skipping transcription")
+        # Rate-limit: the shared scheduler pauses every meeting on a key after a 429
+        _backend, key_id = self._backend_and_key()
+        if stt_scheduler.blocked_for(key_id) > 0:
+            logger.debug("STT rate-limit active for key %s, skipping transcription", key_id)
             return
 
         if now - self._last_transcribe_time < self._min_interval:
@@ -273,19 +315,65 @@ class STTPipeline:
             if len(self._buffer) < self._bytes_per_chunk:
                 return
 
-            # Extract chunk with overlap for context continuity
-            chunk = bytes(self._buffer[: self._bytes_per_chunk])
-            overlap_seconds = min(self._overlap_seconds, self.buffer_seconds * 0.8)
-            overlap_bytes = int(self.sample_rate * overlap_seconds * 2)
-            trim_bytes = max(0, self._bytes_per_chunk - overlap_bytes)
-            del self._buffer[:trim_bytes]
+            # Zero-copy window; the overlap tail stays buffered for context continuity.
+            chunk_start = self._buffer.read_position
+            chunk = self._buffer.next_window(self._bytes_per_chunk)
+            if chunk is None:
+                return
+            chunk_end = chunk_start + len(chunk)
 
         self._last_transcribe_time = time.monotonic()
         self._total_chunks += 1
+        await self._transcribe_chunk(chunk, chunk_end, lambda: self._requeue_chunk(chunk_end))
+
+    async def _process_speech_segments(self) -> None:
+        """VAD mode: transcribe queued utterances in order, one call at a time."""
+        _backend, key_id = self._backend_and_key()
+        while self._speech_segments:
+            if stt_scheduler.blocked_for(key_id) > 0:
+                logger.debug("STT rate-limit active for key %s, holding speech segments", key_id)
+                return
+            async with self._lock:
+                if not self._speech_segments:
+                    return
+                batch: List[SpeechSegment] = [self._speech_segments.popleft()]
+                size = len(batch[0].pcm)
+                # Backlog (e.g. after a rate-limit pause): merge queued utterances into one call.
+                while self._speech_segments and size + len(self._speech_segments[0].pcm) <= self._max_merge_bytes:
+                    batch.append(self._speech_segments.popleft())
+                    size += len(batch[-1].pcm)
+                self._speech_segment_bytes -= size
+
+            async def requeue() -> None:
+                self._speech_segments.extendleft(reversed(batch))
+                self._speech_segment_bytes += size
+
+            self._total_chunks += 1
+            pcm = batch[0].pcm if len(batch) == 1 else b"".join(seg.pcm for seg in batch)
+            await self._transcribe_chunk(pcm, batch[-1].end, requeue)
+            if self._speech_segments and self._speech_segments[0] is batch[0]:
+                return  # requeued after a failure; retry on a later tick
+
+    async def finish(self) -> None:
+        """Meeting stop: close the utterance in progress and transcribe what is queued (VAD mode)."""
+        if self._segmenter is None:
+            return
+        segment = self._segmenter.flush_speech()
+        if segment is not None:
+            self._queue_speech_segment(segment)
+        await self._process_speech_segments()
+
+    async def _transcribe_chunk(
+        self, chunk, chunk_end: int, requeue: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Pre-checks, Whisper call and text filters for one window; ``requeue`` puts it back on failure."""
+        backend, key_id = self._backend_and_key()
+
+        # One vectorized pass over the chunk feeds every pre-check below.
+        stats = analyze_pcm16(chunk, spectral=self._max_flatness > 0)
+        rms, rms_db, peak, zcr = stats.rms, stats.rms_db, stats.peak, stats.zcr
 
         # ── Layer 1: RMS energy check ──
-        rms = pcm16_rms(chunk)
-        rms_db = pcm16_rms_db(chunk)
         if rms < self._silence_rms_threshold:
             self._skipped_silence += 1
             logger.debug(
@@ -306,7 +394,6 @@ class STTPipeline:
             return
 
         # ── Layer 3: Peak amplitude check ──
-        peak = pcm16_peak(chunk)
         if peak < self._min_peak:
             self._skipped_silence += 1
             logger.debug(
@@ -316,7 +403,6 @@ class STTPipeline:
             return
 
         # ── Layer 4: Zero-crossing rate (noise detection) ──
-        zcr = _zero_crossing_rate(chunk)
         if zcr > self._max_zcr:
             self._skipped_silence += 1
             logger.debug(
@@ -325,48 +411,61 @@ class STTPipeline:
             )
             return
 
+        # ── Layer 5: Spectral flatness (broadband noise vs tonal/speech content) ──
+        if self._max_flatness > 0 and stats.spectral_flatness > self._max_flatness:
+            self._skipped_silence += 1
+            logger.debug(
+                "⏭ SKIP chunk #%d: flatness=%.3f > max_flatness=%.3f (likely noise, not speech)",
+                self._total_chunks, stats.spectral_flatness, self._max_flatness,
+            )
+            return
+
         # ── Passed all pre-checks — send to Whisper ──
         logger.info(
             "🎙 TRANSCRIBING chunk #%d: RMS=%.0f (%.1f dBFS) peak=%d ZCR=%.3f",
             self._total_chunks, rms, rms_db, peak, zcr,
         )
 
-        wav_bytes = _pcm_to_wav(chunk, self.sample_rate)
-
-        backend = str(getattr(settings, "STT_BACKEND", "groq") or "groq").lower().strip()
-        text_clean = ""
-        segments = None
-
         if backend == "faster_whisper":
+            # Local model: nothing goes over the network, so skip the encoder stage.
+            self._count_call(chunk)
+            wav_bytes = _pcm_to_wav(chunk, self.sample_rate)
             try:
-                text_clean = (await self._transcribe_faster_whisper(wav_bytes)).strip()
+                client = get_transcription_client(backend)
+                transcription = await stt_scheduler.submit(
+                    self.meeting_id, key_id, lambda: client.transcribe(wav_bytes)
+                )
             except Exception as e:
                 logger.exception("faster-whisper transcription failed: %s", e)
-                await self._requeue_chunk(chunk)
+                await requeue()
                 return
         else:
             if not settings.GROQ_API_KEY:
                 logger.warning("STT skipped (no GROQ_API_KEY)")
                 return
 
-            try:
-                # Sync HTTP blocks the event loop; run in a thread so the audio WS keeps receiving.
-                def _call_groq():
-                    client = Groq(api_key=settings.GROQ_API_KEY)
-                    prompt = self._build_whisper_prompt()
-                    model_name = self._transcribe_model
-                    if not self._accuracy_mode and model_name == "whisper-large-v3":
-                        model_name = "whisper-large-v3-turbo"
-                    return client.audio.transcriptions.create(
-                        file=("audio.wav", wav_bytes, "audio/wav"),
-                        model=model_name,
-                        response_format="verbose_json",
-                        language="en",
-                        temperature=0.0,
-                        prompt=prompt if prompt else None,
-                    )
+            self._count_call(chunk)
+            encoded = await self._encode_chunk(chunk)
+            client = get_transcription_client(backend, settings.GROQ_API_KEY)
+            limiter = stt_scheduler.limiter(key_id)
+
+            async def _call_groq():
+                # Built once the scheduler grants the slot, so the previous chunk's text is included.
+                prompt = self._build_whisper_prompt()
+                model_name = self._transcribe_model
+                if not self._accuracy_mode and model_name == "whisper-large-v3":
+                    model_name = "whisper-large-v3-turbo"
+                return await client.transcribe(
+                    encoded.data,
+                    model=model_name,
+                    prompt=prompt or None,
+                    on_headers=limiter.observe_headers,
+                    filename=encoded.filename,
+                    content_type=encoded.content_type,
+                )
 
-                transcription = await asyncio.to_thread(_call_groq)
+            try:
+                transcription = await stt_scheduler.submit(self.meeting_id, key_id, _call_groq)
             except Exception as e:
                 err_name = type(e).__name__
                 err_str = str(e).lower()
@@ -375,21 +474,19 @@ class STTPipeline:
                         "Groq API key is invalid or expired. Set a valid GROQ_API_KEY in backend/.env "
                         "(get one at https://console.groq.com). Transcription skipped."
                     )
-                elif "429" in err_str or "rate" in err_str:
-                    backoff = 20.0
-                    self._rate_limit_until = time.monotonic() + backoff
-                    await self._requeue_chunk(chunk)
+                elif "RateLimitError" in err_name or "429" in err_str or "rate" in err_str:
+                    await requeue()
                     logger.warning(
-                        "Groq rate limit (429). Backing off %.0fs; transcription will resume.",
-                        backoff,
+                        "Groq rate limit (429). Key paused %.0fs for all meetings; transcription will resume.",
+                        stt_scheduler.blocked_for(key_id),
                     )
                 else:
                     logger.exception("Groq Whisper transcription failed: %s", e)
-                    await self._requeue_chunk(chunk)
+                    await requeue()
                 return
 
-            text, segments = _transcription_text_and_segments(transcription)
-            text_clean = text.strip()
+        text, segments = _transcription_text_and_segments(transcription)
+        text_clean = text.strip()
 
         if not text_clean:
             logger.debug("⏭ Whisper returned empty text (chunk #%d)", self._total_chunks)
@@ -473,24 +570,24 @@ class STTPipeline:
             self._transcribed, self._total_chunks, text_clean[:120],
         )
 
-        db = await get_database()
-        now_dt = datetime.utcnow()
-        await db.transcript_segments.insert_one({
+        segment = {
             "meeting_id": self.meeting_id,
             "text": text_clean,
-            "timestamp": now_dt,
+            "timestamp": datetime.utcnow(),
             "language": "en",
             "audio_rms": round(rms, 1),
             "audio_rms_db": round(rms_db, 1),
             "audio_zcr": round(zcr, 4),
-        })
-        await db.transcripts.insert_one({
-            "meeting_id": self.meeting_id,
-            "text": text_clean,
-            "timestamp": now_dt,
-        })
-        if self.push_callback:
-            await self.push_callback(self.meeting_id, text_clean)
+        }
+        # Captions go out first; the segment is persisted write-behind in batches.
+        try:
+            if self.push_callback:
+                await self.push_callback(self.meeting_id, text_clean)
+            captured_at = self._capture_time_at(chunk_end - 2)
+            if captured_at is not None:
+                self._caption_latencies.append(time.time() - captured_at)
+        finally:
+            segment_writer.enqueue(self.meeting_id, segment)
 
     def get_stats(self) -> dict:
         """Return pipeline statistics for debugging."""
@@ -500,5 +597,48 @@ class STTPipeline:
             "skipped_hallucination": self._skipped_hallucination,
             "transcribed": self._transcribed,
             "buffer_bytes": len(self._buffer),
+            "buffer_dropped_bytes": self._buffer.dropped_bytes,
+            "scheduler": stt_scheduler.get_stats(),
+            "encoder": {
+                "codec": get_audio_encoder().codec,
+                "raw_bytes": self._upload_raw_bytes,
+                "encoded_bytes": self._upload_encoded_bytes,
+                "compression_ratio": round(self._upload_raw_bytes / self._upload_encoded_bytes, 2)
+                if self._upload_encoded_bytes else None,
+            },
+            "caption_latency_ms": _latency_summary(self._caption_latencies),
+            "whisper_calls": self._whisper_calls,
+            "uploaded_seconds": round(self._uploaded_bytes / (self.sample_rate * 2), 1),
+            "segmentation": self._segmentation_stats(),
+            "local_pool": self._local_pool_stats(),
             "last_texts": self._last_texts[-3:],
         }
+
+    def _local_pool_stats(self) -> Optional[dict]:
+        backend, _key_id = self._backend_and_key()
+        if backend != "faster_whisper":
+            return None
+        pool = getattr(get_transcription_client(backend), "pool", None)
+        return pool.get_stats() if pool is not None else None
+
+    def _segmentation_stats(self) -> dict:
+        if self._segmenter is None:
+            return {"mode": "fixed"}
+        audio_seconds = self._fed_bytes / (self.sample_rate * 2)
+        uploaded_seconds = self._uploaded_bytes / (self.sample_rate * 2)
+        # What the fixed cadence would have sent for the same audio (one window per buffer - overlap).
+        step = max(0.5, self.buffer_seconds - min(self._overlap_seconds, self.buffer_seconds * 0.8))
+        fixed_calls = int(audio_seconds // step)
+        seg = self._segmenter
+        return {
+            "mode": "vad",
+            "audio_seconds": round(audio_seconds, 1),
+            "speech_ratio": round(seg.seg_speech_windows / seg.seg_windows, 3) if seg.seg_windows else None,
+            "speech_segments": self._speech_segments_total,
+            "dropped_short_segments": seg.seg_dropped_short,
+            "queued_segments": len(self._speech_segments),
+            "dropped_seconds": round(self._speech_dropped_bytes / (self.sample_rate * 2), 1),
+            "fixed_cadence_calls": fixed_calls,
+            "call_reduction_ratio": round(fixed_calls / self._whisper_calls, 2) if self._whisper_calls else None,
+            "upload_reduction_ratio": round(audio_seconds / uploaded_seconds, 2) if uploaded_seconds else None,
+        }
@@ -0,0 +1,180 @@
+"""
+Process-wide transcription clients shared by every STTPipeline.
+
+One client per (backend, api key): the Groq client owns a single pooled ``httpx.AsyncClient``
+(keep-alive, connection cap, HTTP/2 when ``h2`` is installed) so chunks reuse warm connections
+instead of paying a new pool + TLS handshake every few seconds per meeting. The local
+faster-whisper backend exposes the same ``transcribe`` coroutine on top of a batching worker pool
+(``app.stt.whisper_pool``).
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.stt.whisper_pool import LocalWhisperPool
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Tuple[str, str], "BaseTranscriptionClient"] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+HeadersCallback = Callable[[Mapping[str, str]], None]
+
+
+class BaseTranscriptionClient(ABC):
+    """
+    ``transcribe(audio_bytes, ...)`` returns the provider response (dict or SDK model); ``filename`` and
+    ``content_type`` describe the container (WAV by default, see ``app.stt.audio_encoder``).
+    ``on_headers`` receives HTTP response headers (rate-limit accounting) when the backend has any.
+    """
+
+    backend = ""
+
+    @abstractmethod
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        *,
+        model: str,
+        prompt: Optional[str] = None,
+        language: str = "en",
+        timeout: Optional[float] = None,
+        on_headers: Optional[HeadersCallback] = None,
+        filename: str = "audio.wav",
+        content_type: str = "audio/wav",
+    ) -> Any:
+        """Send one chunk to the backend and return its response."""
+        pass
+
+    async def aclose(self) -> None:
+        return None
+
+
+class GroqTranscriptionClient(BaseTranscriptionClient):
+    """Async Groq Whisper client over one pooled keep-alive HTTP client."""
+
+    backend = "groq"
+
+    def __init__(self, api_key: str):
+        from groq import AsyncGroq
+
+        self.timeout = float(getattr(settings, "STT_HTTP_TIMEOUT_SECONDS", 30.0))
+        max_conn = max(1, int(getattr(settings, "STT_HTTP_MAX_CONNECTIONS", 20)))
+        http2 = bool(getattr(settings, "STT_HTTP2", True)) and _http2_available()
+        self._http = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(self.timeout, connect=min(10.0, self.timeout)),
+            limits=httpx.Limits(
+                max_connections=max_conn,
+                max_keepalive_connections=max_conn,
+                keepalive_expiry=float(getattr(settings, "STT_HTTP_KEEPALIVE_SECONDS", 60.0)),
+            ),
+        )
+        base_url = (getattr(settings, "STT_API_BASE_URL", "") or "").strip() or None
+        # Retries stay with the caller: the pipeline requeues audio and owns 429 backoff.
+        self._client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http,
+            max_retries=max(0, int(getattr(settings, "STT_HTTP_MAX_RETRIES", 0))),
+        )
+        logger.info(
+            "Groq transcription client ready (max_connections=%d, http2=%s, timeout=%.0fs)",
+            max_conn, http2, self.timeout,
+        )
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        *,
+        model: str,
+        prompt: Optional[str] = None,
+        language: str = "en",
+        timeout: Optional[float] = None,
+        on_headers: Optional[HeadersCallback] = None,
+        filename: str = "audio.wav",
+        content_type: str = "audio/wav",
+    ) -> Any:
+        raw = await self._client.audio.transcriptions.with_raw_response.create(
+            file=(filename, audio_bytes, content_type),
+            model=model,
+            response_format="verbose_json",
+            language=language,
+            temperature=0.0,
+            prompt=prompt if prompt else None,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+        if on_headers is not None:
+            on_headers(raw.headers)
+        return await raw.parse()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+class FasterWhisperTranscriptionClient(BaseTranscriptionClient):
+    """Local Whisper via faster-whisper (optional dependency), served by a shared ``LocalWhisperPool``."""
+
+    backend = "faster_whisper"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name or "base"
+        self.pool = LocalWhisperPool(self.model_name)
+
+    async def start(self) -> None:
+        """Spawn the workers and load + warm the model (API startup)."""
+        await self.pool.start()
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        *,
+        model: str = "",
+        prompt: Optional[str] = None,
+        language: str = "en",
+        timeout: Optional[float] = None,
+        on_headers: Optional[HeadersCallback] = None,
+        filename: str = "audio.wav",
+        content_type: str = "audio/wav",
+    ) -> Any:
+        return await self.pool.transcribe(audio_bytes, language)
+
+    async def aclose(self) -> None:
+        await self.pool.close()
+
+
+def get_transcription_client(backend: str, api_key: str = "") -> BaseTranscriptionClient:
+    """Return the shared client for ``backend`` (and key); created on first use."""
+    backend = (backend or "groq").lower().strip()
+    if backend == "faster_whisper":
+        model_name = str(getattr(settings, "STT_FASTER_WHISPER_MODEL", "base") or "base")
+        key = (backend, model_name)
+        if key not in _clients:
+            _clients[key] = FasterWhisperTranscriptionClient(model_name)
+        return _clients[key]
+    key = (backend, api_key)
+    if key not in _clients:
+        _clients[key] = GroqTranscriptionClient(api_key)
+    return _clients[key]
+
+
+async def close_transcription_clients() -> None:
+    """Close pooled connections (API shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            logger.debug("Transcription client close failed", exc_info=True)
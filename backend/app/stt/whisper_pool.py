@@ -0,0 +1,317 @@
+"""
+Local Whisper (faster-whisper) worker pool for ``STT_BACKEND=faster_whisper``.
+
+- ``STT_LOCAL_WORKERS`` worker processes (``0`` = one in-process thread), each with its own
+  ``WhisperModel`` using ``STT_LOCAL_CPU_THREADS`` threads, loaded and warmed up at API startup.
+- One request queue for every meeting: the dispatcher gathers up to ``STT_LOCAL_MAX_BATCH``
+  chunks (waiting at most ``STT_LOCAL_BATCH_WAIT_MS`` after the first) and sends them to a worker
+  as one batch. The worker trims each chunk to its speech with the same Silero VAD pass as
+  ``model.transcribe(vad_filter=True)`` (silent chunks are never decoded), then decodes the speech
+  of every chunk in one call to faster-whisper's ``BatchedInferencePipeline`` (faster-whisper >= 1.1),
+  one clip per chunk. Chunks longer than 30 s, or a batch that fails, fall back to per-chunk
+  ``model.transcribe``.
+"""
+import asyncio
+import bisect
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_RATE = 16000
+_WINDOW_SAMPLES = _SAMPLE_RATE * 30  # Whisper's fixed 30 s input
+
+# Per-process model (worker processes, or the API process when STT_LOCAL_WORKERS=0).
+_model = None
+_batched = None  # BatchedInferencePipeline over _model, created on the first batch
+_beam_size = 1
+
+
+def _load_model(model_name: str, device: str, compute_type: str, cpu_threads: int):
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError as e:
+        raise RuntimeError(
+            "STT_BACKEND=faster_whisper requires the faster-whisper package "
+            "(pip install faster-whisper)."
+        ) from e
+    return WhisperModel(
+        model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=1
+    )
+
+
+def _init_worker(model_name: str, device: str, compute_type: str, cpu_threads: int, beam_size: int) -> None:
+    """Load and warm the model once per worker (first inference pays one-off allocation costs)."""
+    global _model, _beam_size
+    if _model is not None:
+        return
+    import numpy as np
+
+    started = time.perf_counter()
+    _beam_size = max(1, int(beam_size))
+    _model = _load_model(model_name, device, compute_type, cpu_threads)
+    segments, _info = _model.transcribe(np.zeros(16000, dtype=np.float32), language="en", beam_size=1)
+    list(segments)
+    logger.info(
+        "Local Whisper %s ready in pid %d (%.1fs, cpu_threads=%d)",
+        model_name, os.getpid(), time.perf_counter() - started, cpu_threads,
+    )
+
+
+def _worker_ready() -> int:
+    time.sleep(0.2)  # keep the job busy so concurrent warm-up jobs land on different workers
+    return os.getpid()
+
+
+def _transcribe_one(audio, language: str) -> dict:
+    segments_gen, _info = _model.transcribe(audio, language=language, vad_filter=True, beam_size=_beam_size)
+    parts = []
+    meta = []
+    for seg in segments_gen:
+        if (seg.text or "").strip():
+            parts.append(seg.text.strip())
+            meta.append({"no_speech_prob": seg.no_speech_prob, "avg_logprob": seg.avg_logprob})
+    return {"text": " ".join(parts).strip(), "segments": meta or None}
+
+
+def _speech(audio):
+    """The speech in ``audio`` as ``model.transcribe(vad_filter=True)`` keeps it (default VAD options)."""
+    import numpy as np
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    stamps = get_speech_timestamps(audio, VadOptions())
+    if not stamps:
+        return audio[:0]
+    return np.concatenate([audio[t["start"]:t["end"]] for t in stamps])
+
+
+def _generate_batch(audios: list, language: str) -> List[dict]:
+    """VAD-trim several ≤30 s chunks and decode their speech in one batched pipeline call."""
+    global _batched
+    import numpy as np
+    from faster_whisper import BatchedInferencePipeline
+
+    if _batched is None:
+        _batched = BatchedInferencePipeline(model=_model)
+    speech = [_speech(a) for a in audios]
+    owners = [i for i, s in enumerate(speech) if len(s)]
+    parts = {i: [] for i in owners}
+    meta = {i: [] for i in owners}
+    if owners:
+        # Speech of each chunk laid end to end; clip_timestamps (in samples) keeps them apart.
+        clips, starts, pos = [], [], 0
+        for i in owners:
+            clips.append({"start": pos, "end": pos + len(speech[i])})
+            starts.append(pos / _SAMPLE_RATE)
+            pos += len(speech[i])
+        segments, _info = _batched.transcribe(
+            np.concatenate([speech[i] for i in owners]),
+            language=language,
+            clip_timestamps=clips,
+            vad_filter=False,
+            batch_size=len(clips),
+            beam_size=_beam_size,
+            without_timestamps=True,
+        )
+        for seg in segments:
+            i = owners[max(0, bisect.bisect_right(starts, seg.start + 1e-3) - 1)]
+            if (seg.text or "").strip():
+                parts[i].append(seg.text.strip())
+                meta[i].append({"no_speech_prob": seg.no_speech_prob, "avg_logprob": seg.avg_logprob})
+    return [
+        {"text": " ".join(parts.get(i, [])).strip(), "segments": meta.get(i) or None}
+        for i in range(len(audios))
+    ]
+
+
+def _transcribe_batch(items: List[Tuple[bytes, str]]) -> List[dict]:
+    """Worker entry point: ``[(audio_bytes, language)]`` → ``[{"text", "segments"}]`` in order."""
+    from app.stt.audio_encoder import decode_audio
+
+    decoded = [(decode_audio(data)[0], language) for data, language in items]
+    results: List[Optional[dict]] = [None] * len(decoded)
+    by_language = {}
+    for i, (audio, language) in enumerate(decoded):
+        if len(audio) <= _WINDOW_SAMPLES:
+            by_language.setdefault(language, []).append(i)
+    for language, idxs in by_language.items():
+        if len(idxs) < 2:
+            continue
+        try:
+            for i, res in zip(idxs, _generate_batch([decoded[i][0] for i in idxs], language)):
+                results[i] = res
+        except Exception:
+            logger.warning("Batched local Whisper decode failed; falling back per chunk", exc_info=True)
+    for i, (audio, language) in enumerate(decoded):
+        if results[i] is None:
+            results[i] = _transcribe_one(audio, language)
+    return results
+
+
+class _Request:
+    __slots__ = ("audio", "language", "future", "enqueued_at")
+
+    def __init__(self, audio: bytes, language: str, future: asyncio.Future):
+        self.audio = audio
+        self.language = language
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class LocalWhisperPool:
+    """Batched local transcription shared by every meeting in this API process."""
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int = None,
+        cpu_threads: int = None,
+        max_batch: int = None,
+        batch_wait_ms: float = None,
+    ):
+        self.model_name = model_name or "base"
+        self.workers = max(0, int(workers if workers is not None else getattr(settings, "STT_LOCAL_WORKERS", 2)))
+        self.cpu_threads = max(1, int(cpu_threads or getattr(settings, "STT_LOCAL_CPU_THREADS", 4)))
+        self.max_batch = max(1, int(max_batch or getattr(settings, "STT_LOCAL_MAX_BATCH", 8)))
+        self.batch_wait = float(
+            batch_wait_ms if batch_wait_ms is not None else getattr(settings, "STT_LOCAL_BATCH_WAIT_MS", 50)
+        ) / 1000.0
+        self.device = str(getattr(settings, "STT_LOCAL_DEVICE", "cpu") or "cpu")
+        self.compute_type = str(getattr(settings, "STT_LOCAL_COMPUTE_TYPE", "int8") or "int8")
+        self.beam_size = max(1, int(getattr(settings, "STT_LOCAL_BEAM_SIZE", 1)))
+        self._executor: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_tasks: Set[asyncio.Task] = set()  # strong refs: the loop only holds tasks weakly
+        self._start_lock = asyncio.Lock()
+        self._inflight = 0
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.max_queue_wait = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def _init_args(self) -> tuple:
+        return (self.model_name, self.device, self.compute_type, self.cpu_threads, self.beam_size)
+
+    async def start(self) -> None:
+        """Create the workers and load + warm the model in each (idempotent)."""
+        async with self._start_lock:
+            if self._executor is not None:
+                return
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            if self.workers == 0:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-whisper")
+                warmups = [loop.run_in_executor(executor, _init_worker, *self._init_args())]
+            else:
+                # spawn: never fork a process that already runs threads and an event loop.
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=self._init_args(),
+                )
+                warmups = [loop.run_in_executor(executor, _worker_ready) for _ in range(self.workers)]
+            try:
+                await asyncio.gather(*warmups)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            self._executor = executor
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(max(1, self.workers))
+            self._dispatcher = asyncio.create_task(self._dispatch())
+            logger.info(
+                "Local Whisper pool ready: model=%s workers=%d cpu_threads=%d max_batch=%d (%.1fs)",
+                self.model_name, self.workers, self.cpu_threads, self.max_batch, time.perf_counter() - started,
+            )
+
+    async def transcribe(self, audio: bytes, language: str = "en") -> dict:
+        if self._executor is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Request(audio, language, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=max(0.0, remaining)))
+                except asyncio.TimeoutError:
+                    break
+            batch = [r for r in batch if not r.future.done()]
+            if not batch:
+                continue
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        self.max_queue_wait = max(self.max_queue_wait, max(now - r.enqueued_at for r in batch))
+        self._inflight += 1
+        try:
+            results = await loop.run_in_executor(
+                self._executor, _transcribe_batch, [(r.audio, r.language) for r in batch]
+            )
+        except Exception as e:
+            self.failed_batches += 1
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_exception(e)
+            return
+        finally:
+            self._inflight -= 1
+            self._slots.release()
+        self.batches += 1
+        self.items += len(batch)
+        for r, res in zip(batch, results):
+            if not r.future.done():
+                r.future.set_result(res)
+
+    async def close(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "workers": self.workers,
+            "cpu_threads": self.cpu_threads,
+            "started": self.started,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "inflight_batches": self._inflight,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "failed_batches": self.failed_batches,
+            "max_queue_wait_ms": round(self.max_queue_wait * 1000),
+        }
@@ -1,14 +1,63 @@
 """
-Placeholder for a future dedicated meeting-bot worker (queue + isolated process).
+Dedicated meeting worker: claims meeting-start jobs from Mongo and runs the bot, audio capture and
+STT pipeline in this process, publishing captions back to the API for fan-out.
 
-Meeting capture and STT currently run inside the main FastAPI app lifecycle; see ``docs/meeting-bot.md``.
+Used when the API runs with ``MEETING_WORKER_MODE=queue`` (see ``docs/meeting-bot.md``):
+
+    cd backend && python run_meeting_worker.py [--capacity 4]
+
+Run as many workers as needed; each takes at most ``--capacity`` meetings. SIGINT/SIGTERM flushes
+every meeting and hands running ones back to the queue for another worker.
 """
 from __future__ import annotations
 
+import argparse
+import asyncio
+import logging
+import signal
+from pathlib import Path
+
+_backend_dir = Path(__file__).resolve().parent
+_env_file = _backend_dir / ".env"
+if _env_file.exists():
+    from dotenv import load_dotenv
+    load_dotenv(_env_file, override=True)
+
+
+async def _run(capacity: int | None) -> None:
+    from app.attendance.attendance_writer import attendance_writer
+    from app.bot.meeting_worker import MeetingWorker
+    from app.core.database import close_db, init_db
+    from app.llm import llm_gateway
+    from app.services.live_summary import live_summarizer
+    from app.stt.segment_writer import segment_writer
+    from app.stt.transcription_client import close_transcription_clients
+
+    await init_db()
+    worker = MeetingWorker(capacity=capacity)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.request_shutdown)
+        except NotImplementedError:  # Windows
+            pass
+    try:
+        await worker.run()
+    finally:
+        await live_summarizer.close()
+        await segment_writer.close()
+        await attendance_writer.close()
+        await close_transcription_clients()
+        await llm_gateway.close()
+        await close_db()
+
 
 def main() -> None:
-    print("Meeting bots are started from the main API (POST /api/v1/meetings/{meeting_id}/start).")
-    print("Run the API with: cd backend && python -m uvicorn app.main:app --host 0.0.0.0 --port 8001")
+    parser = argparse.ArgumentParser(description="Meeting worker (bots + STT) for MEETING_WORKER_MODE=queue")
+    parser.add_argument("--capacity", type=int, default=None, help="meetings at once (default MEETING_WORKER_CAPACITY)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_run(args.capacity))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+Upload size, encode CPU and estimated uplink time per STT chunk for each STT_AUDIO_CODEC.
+
+Usage (from backend/):
+    python -m scripts.bench_audio_codecs [--wav recording.wav] [--seconds 5] [--uplink-kbps 1000]
+        [--whisper-model base]
+
+Without --wav a synthetic speech-like signal is used. With --whisper-model (needs faster-whisper)
+every codec's chunks are transcribed locally and compared with the WAV transcript.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.stt.audio_encoder import decode_audio, get_audio_encoder
+from app.stt.transcription_client import FasterWhisperTranscriptionClient
+
+RATE = 16000
+
+
+def _synthetic(seconds: float) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(RATE * seconds)) / RATE
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0).astype(np.float64)
+    voice = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((180, 360, 720, 1440), 1))
+    audio = 0.2 * envelope * voice + rng.normal(0, 0.005, len(t))
+    return (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def _load_wav(path: str) -> bytes:
+    samples, rate = decode_audio(open(path, "rb").read())
+    if rate != RATE:
+        idx = np.arange(0, len(samples), rate / RATE).astype(int)
+        samples = samples[idx[idx < len(samples)]]
+    return (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", help="16-bit recording to chunk (any rate; resampled to 16 kHz)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="chunk length")
+    parser.add_argument("--uplink-kbps", type=float, default=1000.0)
+    parser.add_argument("--whisper-model", help="faster-whisper model for the transcript parity check")
+    args = parser.parse_args()
+
+    pcm = _load_wav(args.wav) if args.wav else _synthetic(60.0)
+    step = int(RATE * args.seconds) * 2
+    chunks = [pcm[i:i + step] for i in range(0, len(pcm) - step + 1, step)]
+    whisper = FasterWhisperTranscriptionClient(args.whisper_model) if args.whisper_model else None
+    reference = None
+
+    print(f"{len(chunks)} chunks of {args.seconds:.0f}s, uplink {args.uplink_kbps:.0f} kbit/s")
+    for codec in ("wav", "flac", "opus"):
+        encoder = get_audio_encoder(codec)
+        if encoder.codec != codec:
+            print(f"  {codec:5s} unavailable (install soundfile)")
+            continue
+        t0 = time.perf_counter()
+        encoded = [encoder.encode(c, RATE) for c in chunks]
+        encode_ms = (time.perf_counter() - t0) * 1000 / len(chunks)
+        size = sum(len(e.data) for e in encoded) / len(encoded)
+        upload_ms = size * 8 / args.uplink_kbps
+        line = (
+            f"  {codec:5s} {size / 1024:7.1f} KB/chunk  ratio {encoded[0].raw_bytes * len(encoded) / sum(len(e.data) for e in encoded):4.1f}x"
+            f"  encode {encode_ms:6.1f} ms  upload ~{upload_ms:6.0f} ms"
+        )
+        if whisper is not None:
+            text = " ".join(asyncio.run(whisper.transcribe(e.data))["text"] for e in encoded)
+            if reference is None:
+                reference = text
+            line += "  transcript " + ("identical" if text == reference else "DIFFERS")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+End-to-end replay of the live path: framed bot audio → websocket_audio → STTPipeline → /live listeners.
+
+Usage (from backend/):
+    python -m scripts.bench_live_pipeline [--wav a.wav --wav b.wav] [--meetings 1,10,50,200]
+        [--seconds 60] [--speed 1] [--listeners 2] [--stub-ms 400] [--stub-jitter-ms 150]
+        [--rate-limit-every 0] [--retry-after 2] [--json report.json] [--fail-p95-ms 0]
+
+The audio WebSocket routes run in-process under uvicorn on a loopback port. Bots (FrameSender,
+exactly as the Jitsi bot frames capture blocks) and listeners run on a second event loop in their
+own thread, so their CPU is reported separately from the server's. Groq is replaced by a
+deterministic stub (seeded latency, a 429 on every Nth call) and transcript persistence by a
+counter; nothing needs Mongo or network access.
+
+Each level reports capture→caption latency measured at the listeners, server CPU per meeting,
+Whisper calls per audio minute, 429s, dropped audio/subscribers and RSS. ``STT_MIN_INTERVAL_SECONDS``
+paces calls in wall-clock time, so calls per audio minute drop when ``--speed`` is above 1.
+``--fail-p95-ms`` exits non-zero when any level's p95 exceeds it (regression gate).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import uvicorn
+import websockets
+from fastapi import FastAPI
+
+from app.audio.frame_protocol import FrameSender
+from app.core.config import settings
+from app.stt import stt_pipeline
+from app.stt.segment_writer import segment_writer
+from app.stt.stt_pipeline import STTPipeline
+from app.stt.transcription_client import BaseTranscriptionClient
+from scripts.bench_audio_codecs import _load_wav, _synthetic
+
+RATE = 16000
+
+
+class StubRateLimitError(Exception):
+    """Shaped like the Groq SDK's 429 so the scheduler reads ``retry-after`` from it."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("429 rate limit exceeded (stub)")
+        self.response = SimpleNamespace(headers={"retry-after": str(retry_after)})
+
+
+class StubTranscriptionClient(BaseTranscriptionClient):
+    """Deterministic Whisper stand-in: seeded latency, optional 429 every Nth call, unique texts."""
+
+    backend = "groq"
+
+    def __init__(self, latency_ms: float, jitter_ms: float, rate_limit_every: int, retry_after: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self._rng = random.Random(0)
+        self.calls = 0
+        self.rate_limited = 0
+
+    async def transcribe(self, audio_bytes: bytes, **kwargs):
+        self.calls += 1
+        n = self.calls
+        delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(0.0, delay) / 1000.0)
+        if self.rate_limit_every and n % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            raise StubRateLimitError(self.retry_after)
+        return {"text": f"benchmark caption number {n} from {len(audio_bytes)} bytes", "segments": None}
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(samples: List[float], q: float) -> Optional[float]:
+    return float(np.percentile(samples, q)) if samples else None
+
+
+class _Recorder:
+    """Links each broadcast text to the capture time of its audio (STTPipeline reads it right after pushing)."""
+
+    def __init__(self):
+        self.capture_ts: Dict[str, float] = {}
+        original = STTPipeline._capture_time_at
+        recorder = self
+
+        def _capture_time_at(pipeline, offset):
+            ts = original(pipeline, offset)
+            if ts is not None and pipeline._last_text:
+                recorder.capture_ts[pipeline._last_text] = ts
+            return ts
+
+        STTPipeline._capture_time_at = _capture_time_at
+
+
+async def _bot(url: str, pcm: bytes, speed: float, start_delay: float, stats: dict) -> None:
+    block = int(settings.AUDIO_CHUNK_SIZE)
+    batch = max(1, int(getattr(settings, "AUDIO_WS_BATCH_BLOCKS", 4)))
+    block_seconds = block / RATE
+    blocks = [pcm[i:i + block * 2] for i in range(0, len(pcm) - block * 2 + 1, block * 2)]
+    await asyncio.sleep(start_delay)
+    sender = FrameSender(RATE)
+    async with websockets.connect(url, max_size=None) as ws:
+        hello = json.loads(await ws.recv())
+        sender.resume(hello.get("next_seq"))
+
+        async def read_acks():
+            async for message in ws:
+                data = json.loads(message)
+                if data.get("type") == "ack":
+                    sender.ack(data["seq"])
+
+        acks = asyncio.create_task(read_acks())
+        loop = asyncio.get_running_loop()
+        t0_loop, t0_wall = loop.time(), time.time()
+        for first in range(0, len(blocks), batch):
+            group = blocks[first:first + batch]
+            # A frame leaves once its last block has been "captured".
+            due = t0_loop + (first + len(group)) * block_seconds / speed
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            stamped = [(b, t0_wall + (first + j) * block_seconds / speed) for j, b in enumerate(group)]
+            await ws.send(sender.build(stamped))
+        await ws.send(sender.heartbeat())
+        await asyncio.sleep(0.2)
+        acks.cancel()
+    stats["frames"] += sender.frames_sent
+    stats["unacked_frames"] += sender.unacked
+
+
+async def _listener(url: str, received: list, closes: list, done: asyncio.Event) -> None:
+    async with websockets.connect(url, max_size=None) as ws:
+        waiter = asyncio.create_task(done.wait())
+        try:
+            while True:
+                recv = asyncio.create_task(ws.recv())
+                finished, _ = await asyncio.wait({recv, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                if recv not in finished:
+                    recv.cancel()
+                    return
+                try:
+                    message = recv.result()
+                except websockets.ConnectionClosed as e:
+                    closes.append(e.rcvd.code if e.rcvd else None)
+                    return
+                data = json.loads(message)
+                if data.get("type") == "transcript":
+                    received.append((data["text"], time.time()))
+        finally:
+            waiter.cancel()
+
+
+async def _clients(base: str, meeting_ids: List[str], fixtures: List[bytes], args) -> dict:
+    received: list = []
+    closes: list = []
+    bot_stats = {"frames": 0, "unacked_frames": 0}
+    done = asyncio.Event()
+    listeners = [
+        asyncio.create_task(_listener(f"{base}/meeting/{mid}/live", received, closes, done))
+        for mid in meeting_ids
+        for _ in range(args.listeners)
+    ]
+    await asyncio.sleep(0.5)  # subscribed before audio starts
+    stagger = float(settings.STT_BUFFER_SECONDS) / args.speed
+    bots = [
+        _bot(
+            f"{base}/audio/{mid}?framing=1",
+            fixtures[i % len(fixtures)],
+            args.speed,
+            stagger * i / max(1, len(meeting_ids)),
+            bot_stats,
+        )
+        for i, mid in enumerate(meeting_ids)
+    ]
+    await asyncio.gather(*bots)
+    await asyncio.sleep(args.drain_seconds)  # captions for the tail still in flight
+    done.set()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    return {"received": received, "closes": closes, "bot": bot_stats}
+
+
+def _run_clients(base: str, meeting_ids: List[str], fixtures: List[bytes], args) -> dict:
+    """Client event loop in its own thread; returns its CPU time so the server's can be isolated."""
+    started = time.thread_time()
+    result = asyncio.run(_clients(base, meeting_ids, fixtures, args))
+    result["cpu_seconds"] = time.thread_time() - started
+    return result
+
+
+async def _level(n: int, base: str, fixtures: List[bytes], stub: StubTranscriptionClient, recorder: _Recorder, args) -> dict:
+    from app.api.v1.endpoints.meeting_bot_ws import ws_manager
+
+    meeting_ids = [f"bench-{n}-{i}" for i in range(n)]
+    calls_before, limited_before = stub.calls, stub.rate_limited
+    rss_before = _rss_mb()
+    peak = {"rss": rss_before}
+    stop = asyncio.Event()
+
+    async def sample_rss():
+        while not stop.is_set():
+            peak["rss"] = max(peak["rss"], _rss_mb())
+            await asyncio.sleep(0.5)
+
+    sampler = asyncio.create_task(sample_rss())
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    clients = await asyncio.to_thread(_run_clients, base, meeting_ids, fixtures, args)
+    wall = time.perf_counter() - wall0
+    server_cpu = time.process_time() - cpu0 - clients["cpu_seconds"]
+    stop.set()
+    await sampler
+
+    whisper_calls = dropped_frames = gap_blocks = buffer_dropped = 0
+    for mid in meeting_ids:
+        stats = ws_manager.get_stats(mid) or {}
+        pipeline = stats.get("pipeline") or {}
+        whisper_calls += pipeline.get("whisper_calls", 0)
+        buffer_dropped += pipeline.get("buffer_dropped_bytes", 0)
+        dropped_frames += (stats.get("audio_queue") or {}).get("dropped_frames", 0)
+        gap_blocks += (stats.get("stream") or {}).get("gap_blocks", 0)
+        await ws_manager.close_meeting(mid)
+
+    latencies = [
+        (received_at - recorder.capture_ts[text]) * 1000
+        for text, received_at in clients["received"]
+        if text in recorder.capture_ts
+    ]
+    audio_minutes = sum(len(fixtures[i % len(fixtures)]) for i in range(n)) / (RATE * 2) / 60
+    return {
+        "meetings": n,
+        "wall_seconds": round(wall, 1),
+        "audio_minutes": round(audio_minutes, 2),
+        "captions_delivered": len(clients["received"]),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": max(latencies) if latencies else None,
+        },
+        "server_cpu_seconds": round(server_cpu, 2),
+        "server_cpu_pct_per_meeting": round(100 * server_cpu / wall / n, 2),
+        "client_cpu_seconds": round(clients["cpu_seconds"], 2),
+        "whisper_calls": whisper_calls,
+        "whisper_calls_per_audio_minute": round(whisper_calls / audio_minutes, 2) if audio_minutes else None,
+        "stub_calls": stub.calls - calls_before,
+        "rate_limited": stub.rate_limited - limited_before,
+        "dropped_queue_frames": dropped_frames,
+        "stream_gap_blocks": gap_blocks,
+        "buffer_dropped_bytes": buffer_dropped,
+        "unacked_frames": clients["bot"]["unacked_frames"],
+        "listener_closes": {str(c): clients["closes"].count(c) for c in set(clients["closes"])},
+        "rss_mb": round(peak["rss"], 1),
+        "rss_growth_mb": round(peak["rss"] - rss_before, 1),
+    }
+
+
+async def _bench(args, fixtures: List[bytes]) -> List[dict]:
+    from app.api.v1.endpoints import meeting_bot_ws
+
+    stub = StubTranscriptionClient(args.stub_ms, args.stub_jitter_ms, args.rate_limit_every, args.retry_after)
+    stt_pipeline.get_transcription_client = lambda *a, **k: stub
+    written = {"segments": 0}
+
+    async def count_segments(batch):
+        written["segments"] += len(batch)
+        return True
+
+    segment_writer._insert_with_retry = count_segments
+    recorder = _Recorder()
+
+    app = FastAPI()
+    app.include_router(meeting_bot_ws.router, prefix="/api/v1/ws")
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off", ws_max_size=2 ** 24)
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base = f"ws://127.0.0.1:{port}/api/v1/ws"
+
+    reports = []
+    try:
+        for n in args.meetings:
+            report = await _level(n, base, fixtures, stub, recorder, args)
+            reports.append(report)
+            lat = report["latency_ms"]
+            fmt = lambda v: f"{v:7.0f}" if v is not None else "      -"
+            print(
+                f"{n:4d} meetings | caption p50 {fmt(lat['p50'])} p95 {fmt(lat['p95'])} p99 {fmt(lat['p99'])} ms"
+                f" | cpu {report['server_cpu_pct_per_meeting']:5.2f}%/meeting"
+                f" | {report['whisper_calls_per_audio_minute'] or 0:5.1f} calls/audio-min"
+                f" | 429s {report['rate_limited']:3d}"
+                f" | drops q={report['dropped_queue_frames']} gap={report['stream_gap_blocks']}"
+                f" buf={report['buffer_dropped_bytes']} listeners={report['listener_closes']}"
+                f" | rss {report['rss_mb']:6.0f} MB (+{report['rss_growth_mb']:.0f})",
+                flush=True,
+            )
+    finally:
+        server.should_exit = True
+        await serving
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", action="append", help="fixture recording (repeatable; resampled to 16 kHz)")
+    parser.add_argument(
+        "--meetings", default="1,10,50,200",
+        type=lambda s: [int(x) for x in s.split(",") if x.strip()],
+        help="comma-separated concurrency levels",
+    )
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per meeting (fixtures are trimmed or looped)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (1 = real time)")
+    parser.add_argument("--listeners", type=int, default=2, help="live subscribers per meeting")
+    parser.add_argument("--stub-ms", type=float, default=400.0, help="stub Whisper latency")
+    parser.add_argument("--stub-jitter-ms", type=float, default=150.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth call with a 429 (0 = never)")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="retry-after seconds on stub 429s")
+    parser.add_argument("--drain-seconds", type=float, default=3.0, help="wait for trailing captions")
+    parser.add_argument("--json", help="write the per-level reports here")
+    parser.add_argument("--fail-p95-ms", type=float, default=0.0, help="exit 1 if any level's p95 exceeds this")
+    args = parser.parse_args()
+    args.speed = max(0.1, args.speed)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("app").setLevel(logging.ERROR)  # injected 429s are expected
+    settings.GROQ_API_KEY = settings.GROQ_API_KEY or "bench-stub-key"
+    settings.STT_BACKEND = "groq"
+    settings.MEETING_AUDIO_WS_SECRET = ""
+    settings.MEETING_LIVE_WS_REQUIRE_AUTH = False
+
+    sources = [_load_wav(path) for path in args.wav] if args.wav else [_synthetic(30.0)]
+    want = int(RATE * args.seconds) * 2
+    fixtures = [(src * (want // max(1, len(src)) + 1))[:want] for src in sources]
+
+    print(
+        f"{args.seconds:.0f}s audio/meeting at {args.speed:g}x, {args.listeners} listener(s)/meeting, "
+        f"stub {args.stub_ms:.0f}±{args.stub_jitter_ms:.0f} ms"
+        + (f", 429 every {args.rate_limit_every} calls" if args.rate_limit_every else "")
+        + f", STT_SEGMENTATION={getattr(settings, 'STT_SEGMENTATION', 'fixed')}"
+    )
+    reports = asyncio.run(_bench(args, fixtures))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+    if args.fail_p95_ms > 0:
+        worst = max((r["latency_ms"]["p95"] or 0.0) for r in reports)
+        if worst > args.fail_p95_ms:
+            print(f"FAIL: caption p95 {worst:.0f} ms > {args.fail_p95_ms:.0f} ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
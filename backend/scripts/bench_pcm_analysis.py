@@ -0,0 +1,93 @@
+"""
+Microbenchmark: per-chunk CPU of the STT pre-checks, struct loop (before) vs NumPy (after).
+
+Usage (from backend/):
+    python -m scripts.bench_pcm_analysis [--seconds 5] [--rounds 20]
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.audio.signal_utils import analyze_pcm16
+
+
+def _legacy_rms(pcm: bytes) -> float:
+    n = len(pcm) // 2
+    total = 0.0
+    for i in range(0, len(pcm) - 1, 2):
+        sample = struct.unpack_from("<h", pcm, i)[0]
+        total += sample * sample
+    return (total / n) ** 0.5 if n else 0.0
+
+
+def _legacy_peak(pcm: bytes) -> int:
+    peak = 0
+    for i in range(0, len(pcm) - 1, 2):
+        sample = abs(struct.unpack_from("<h", pcm, i)[0])
+        if sample > peak:
+            peak = sample
+    return peak
+
+
+def _legacy_zcr(pcm: bytes) -> float:
+    n = len(pcm) // 2
+    crossings = 0
+    prev_sign = 0
+    for i in range(0, len(pcm) - 1, 2):
+        sample = struct.unpack_from("<h", pcm, i)[0]
+        sign = 1 if sample >= 0 else -1
+        if i > 0 and sign != prev_sign:
+            crossings += 1
+        prev_sign = sign
+    return crossings / (n - 1) if n > 1 else 0.0
+
+
+def _legacy_prechecks(pcm: bytes) -> float:
+    """The four passes STTPipeline.process_buffer used to run per chunk."""
+    rms = _legacy_rms(pcm)
+    _ = 20.0 * math.log10(max(_legacy_rms(pcm), 1.0) / 32767.0)
+    _ = _legacy_peak(pcm)
+    _ = _legacy_zcr(pcm)
+    return rms
+
+
+def _time_per_call(fn, pcm: bytes, rounds: int) -> float:
+    fn(pcm)  # warm-up
+    start = time.process_time()
+    for _ in range(rounds):
+        fn(pcm)
+    return (time.process_time() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="chunk length in seconds")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = int(args.sample_rate * args.seconds)
+    t = np.arange(n) / args.sample_rate
+    signal = 6000 * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 800, n)
+    pcm = np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+
+    before = _time_per_call(_legacy_prechecks, pcm, max(1, args.rounds // 10))
+    after = _time_per_call(lambda b: analyze_pcm16(b, spectral=False), pcm, args.rounds)
+    after_fft = _time_per_call(analyze_pcm16, pcm, args.rounds)
+
+    print(f"chunk: {args.seconds:.1f}s @ {args.sample_rate} Hz ({n} samples)")
+    print(f"  struct loop (rms x2, peak, zcr): {before * 1000:9.2f} ms/chunk")
+    print(f"  analyze_pcm16 (no spectrum):     {after * 1000:9.2f} ms/chunk  ({before / after:,.0f}x)")
+    print(f"  analyze_pcm16 (with flatness):   {after_fft * 1000:9.2f} ms/chunk  ({before / after_fft:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Recall vs latency of the transcript RAG index types against exact (float32 Flat) search.
+
+Synthetic corpus: normalized vectors drawn around topic centroids in a low-dimensional latent
+space (transcript chunks cluster by topic), queries are perturbed chunks. Each index is built
+through ``index_factory``, saved, and reloaded memory-mapped as the project cache does; searches
+run one query at a time.
+
+Usage (from backend/):
+    python -m scripts.bench_rag_index [--chunks 50000] [--dim 384] [--queries 300] [--k 8]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.transcript_rag import index_factory
+
+
+def _corpus(n: int, dim: int, queries: int, seed: int = 0):
+    """Sentence embeddings have low intrinsic dimension: topic mixtures in a 48-d latent space, projected."""
+    rng = np.random.default_rng(seed)
+    latent = 48
+    topics = rng.standard_normal((max(8, n // 200), latent)).astype(np.float32)
+    z = topics[rng.integers(0, len(topics), n)] + 0.7 * rng.standard_normal((n, latent)).astype(np.float32)
+    proj = rng.standard_normal((latent, dim)).astype(np.float32)
+    x = z @ proj
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    x += (0.05 / np.sqrt(dim)) * rng.standard_normal((n, dim)).astype(np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    # Queries: paraphrase-like neighbours of random chunks.
+    qz = z[rng.integers(0, n, queries)] + 0.3 * rng.standard_normal((queries, latent)).astype(np.float32)
+    q = qz @ proj
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return np.ascontiguousarray(x), np.ascontiguousarray(q)
+
+
+def _search_each(index, q: np.ndarray, k: int):
+    ids, times = [], []
+    for row in q:
+        t0 = time.perf_counter()
+        _, i = index.search(row[None, :], k)
+        times.append(time.perf_counter() - t0)
+        ids.append(i[0])
+    return np.stack(ids), times
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def main() -> None:
+    import faiss
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384, help="all-MiniLM-L6-v2 = 384")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=8)
+    args = parser.parse_args()
+
+    x, q = _corpus(args.chunks, args.dim, args.queries)
+    base = {**index_factory.index_params(), "index_type": "flat", "vector_dtype": "float32"}
+    exact = index_factory.build_index(x, base)
+    truth, exact_times = _search_each(exact, q, args.k)
+
+    configs = [
+        ("flat float16", {"index_type": "flat", "vector_dtype": "float16"}, [None]),
+        ("hnsw float32", {"index_type": "hnsw", "vector_dtype": "float32"}, [("ef", 32), ("ef", 64), ("ef", 128)]),
+        ("hnsw float16", {"index_type": "hnsw", "vector_dtype": "float16"}, [("ef", 32), ("ef", 64), ("ef", 128)]),
+        ("ivfpq", {"index_type": "ivfpq"}, [("nprobe", 8), ("nprobe", 16), ("nprobe", 32)]),
+    ]
+    print(f"{args.chunks} chunks x dim {args.dim}, {args.queries} single queries, recall@{args.k} vs exact float32 Flat")
+    print(f"{'index':<28}{'build s':>9}{'disk MB':>9}{'load ms':>9}{'recall':>8}{'p50 ms':>8}{'p95 ms':>8}")
+    p50, p95 = (v * 1000 for v in statistics.quantiles(exact_times, n=100)[49::45])
+    mb = exact.ntotal * args.dim * 4 / 1e6
+    print(f"{'flat float32 (exact)':<28}{'':>9}{mb:>9.1f}{'':>9}{1.0:>8.3f}{p50:>8.2f}{p95:>8.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, overrides, knobs in configs:
+            t0 = time.perf_counter()
+            built = index_factory.build_index(x, {**base, **overrides})
+            build_s = time.perf_counter() - t0
+            path = os.path.join(tmp, name.replace(" ", "_") + ".faiss")
+            faiss.write_index(built, path)
+            del built
+            t0 = time.perf_counter()
+            index = index_factory.read_index(path)
+            load_ms = (time.perf_counter() - t0) * 1000
+            mb = os.path.getsize(path) / 1e6
+            desc = index_factory.factory_string(args.chunks, args.dim, {**base, **overrides})
+            for knob in knobs:
+                label = name
+                if knob is not None:
+                    setting = "TRANSCRIPT_RAG_HNSW_EF_SEARCH" if knob[0] == "ef" else "TRANSCRIPT_RAG_IVF_NPROBE"
+                    setattr(settings, setting, knob[1])
+                    index_factory.tune(index)
+                    label = f"{name} {knob[0]}={knob[1]}"
+                found, times = _search_each(index, q, args.k)
+                p50, p95 = (v * 1000 for v in statistics.quantiles(times, n=100)[49::45])
+                print(f"{label:<28}{build_s:>9.1f}{mb:>9.1f}{load_ms:>9.1f}{_recall(found, truth):>8.3f}{p50:>8.2f}{p95:>8.2f}")
+            print(f"  ({desc})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Chunk-to-text latency of Whisper uploads against a local stub server:
+a new sync Groq client per chunk in a worker thread (before) vs the shared pooled async client (after).
+
+Usage (from backend/):
+    python -m scripts.bench_stt_client [--meetings 20] [--chunks 10] [--server-ms 40]
+
+The stub speaks plain HTTP, so the "before" numbers exclude TLS handshakes; real gains are larger.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.stt.stt_pipeline import _pcm_to_wav
+from app.stt.transcription_client import close_transcription_clients, get_transcription_client
+
+
+def _start_stub(server_ms: float) -> ThreadingHTTPServer:
+    body = json.dumps({"text": "stub transcript", "segments": []}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            time.sleep(server_ms / 1000.0)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 256
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentiles(samples):
+    q = statistics.quantiles(samples, n=100)
+    return q[49] * 1000, q[94] * 1000
+
+
+async def _run(meetings: int, chunks: int, interval: float, call) -> list:
+    latencies = []
+
+    async def meeting():
+        for _ in range(chunks):
+            t0 = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(meeting() for _ in range(meetings)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=10)
+    parser.add_argument("--server-ms", type=float, default=40.0)
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between a meeting's chunks")
+    args = parser.parse_args()
+
+    server = _start_stub(args.server_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    wav = _pcm_to_wav(bytes(16000 * 5 * 2), 16000)
+
+    def per_call_sync():
+        from groq import Groq
+
+        client = Groq(api_key="stub", base_url=base_url, max_retries=0)
+        return client.audio.transcriptions.create(
+            file=("audio.wav", wav, "audio/wav"), model="whisper-large-v3", response_format="verbose_json",
+        )
+
+    async def before():
+        await asyncio.to_thread(per_call_sync)
+
+    async def bench():
+        settings.STT_API_BASE_URL = base_url
+        client = get_transcription_client("groq", "stub")
+
+        async def after():
+            await client.transcribe(wav, model="whisper-large-v3")
+
+        b = await _run(args.meetings, args.chunks, args.interval, before)
+        a = await _run(args.meetings, args.chunks, args.interval, after)
+        await close_transcription_clients()
+        return b, a
+
+    b, a = asyncio.run(bench())
+    server.shutdown()
+    print(
+        f"{args.meetings} meetings x {args.chunks} chunks, stub latency {args.server_ms:.0f} ms, "
+        f"STT_HTTP_MAX_CONNECTIONS={settings.STT_HTTP_MAX_CONNECTIONS}"
+    )
+    print("  per-chunk Groq client + to_thread: p50=%7.1f ms  p95=%7.1f ms" % _percentiles(b))
+    print("  shared pooled async client:        p50=%7.1f ms  p95=%7.1f ms" % _percentiles(a))
+
+
+if __name__ == "__main__":
+    main()
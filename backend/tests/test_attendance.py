@@ -0,0 +1,113 @@
+"""Participant events: batched attendance writes, WebSocket control frames, bot listener / snapshot fallback."""
+import asyncio
+import importlib
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.attendance.attendance_writer as aw
+from app.api.v1.endpoints import meeting_bot_ws
+
+bm = importlib.import_module("app.bot.bot_manager")  # ``app.bot.bot_manager`` is shadowed by the instance
+
+
+class _Records:
+    def __init__(self):
+        self.updates = []
+        self.inserts = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.updates.append([r._filter["participant_id"] for r in requests])
+
+    async def insert_many(self, docs, ordered=True):
+        self.inserts.append(list(docs))
+
+
+def test_writer_batches_joins_and_leaves(monkeypatch):
+    records = _Records()
+
+    class _DB:
+        attendance_records = records
+
+    async def _get_database():
+        return _DB()
+
+    monkeypatch.setattr(aw, "get_database", _get_database)
+    t0 = datetime(2026, 1, 1, 10, 0, 0)
+
+    async def run():
+        writer = aw.AttendanceWriter(flush_size=100, flush_seconds=60)
+        writer.join("m1", "a", "Ann", at=t0)
+        writer.join("m1", "b", "Bob", at=t0)
+        writer.leave("m1", "a", at=t0 + timedelta(seconds=90))
+        writer.leave("m1", "c", at=t0 + timedelta(seconds=95))  # joined in an earlier batch
+        assert await writer.flush("m1") == 4
+        await writer.close()
+
+    asyncio.run(run())
+    # One round-trip for leaves of records already stored, one for new records.
+    assert records.updates == [["c"]]
+    assert len(records.inserts) == 1
+    docs = {d["participant_id"]: d for d in records.inserts[0]}
+    assert docs["a"]["duration_seconds"] == 90 and docs["a"]["leave_time"] == t0 + timedelta(seconds=90)
+    assert docs["b"]["leave_time"] is None
+
+
+def test_audio_websocket_routes_participant_control_frames(monkeypatch):
+    received = []
+
+    async def apply(meeting_id, events):
+        received.append((meeting_id, events))
+
+    monkeypatch.setattr(meeting_bot_ws, "apply_participant_events", apply)
+    monkeypatch.setattr(meeting_bot_ws.settings, "MEETING_AUDIO_WS_SECRET", "", raising=False)
+    app = FastAPI()
+    app.include_router(meeting_bot_ws.router, prefix="/api/v1/ws")
+    events = [{"event": "join", "participant_id": "p1", "name": "Ann"}]
+    with TestClient(app).websocket_connect("/api/v1/ws/audio/m1?framing=1") as ws:
+        assert ws.receive_json()["type"] == "hello"
+        ws.send_text('{"type": "participants", "events": [{"event": "join", "participant_id": "p1", "name": "Ann"}]}')
+        ws.send_text("not json")
+    assert received == [("m1", events)]
+
+
+class _Bot:
+    def __init__(self):
+        self.polls = [None, None, [{"event": "join", "participant_id": "p2", "name": "Bob"}]]
+        self.snapshots = 0
+        self.sent = []
+
+    async def poll_participant_events(self):
+        return self.polls.pop(0) if self.polls else []
+
+    def get_participants(self):
+        self.snapshots += 1
+        return [("p1", "Ann")]
+
+    async def send_control(self, message):
+        return False
+
+
+def test_monitor_falls_back_to_snapshots_until_listener_attaches(monkeypatch):
+    monkeypatch.setattr(bm.settings, "PARTICIPANT_EVENT_INTERVAL_SECONDS", 0.001, raising=False)
+    monkeypatch.setattr(bm.settings, "PARTICIPANT_SNAPSHOT_INTERVAL_SECONDS", 0.0, raising=False)
+    applied = []
+
+    async def apply(meeting_id, events):
+        applied.extend(events)
+
+    monkeypatch.setattr(bm, "apply_participant_events", apply)
+    bot = _Bot()
+
+    async def run():
+        bm._bots["m1"] = bot
+        task = asyncio.create_task(bm._monitor_participants("m1", bot))
+        await asyncio.sleep(0.05)
+        bm._bots.pop("m1")
+        await task
+
+    asyncio.run(run())
+    # Two snapshots before the listener attached, none after; p1 (gone by then) is closed.
+    assert bot.snapshots == 2
+    assert [(e["event"], e["participant_id"]) for e in applied] == [("join", "p1"), ("leave", "p1"), ("join", "p2")]
@@ -0,0 +1,100 @@
+"""Upload encoders: FLAC is lossless, Opus is smaller, and a local Whisper stand-in transcribes all codecs alike."""
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.stt import audio_encoder, whisper_pool
+from app.stt.audio_encoder import decode_audio, get_audio_encoder
+from app.stt.whisper_pool import LocalWhisperPool
+
+RATE = 16000
+
+
+def _speechlike_pcm() -> bytes:
+    """Tone bursts separated by pauses, with light noise (deterministic)."""
+    rng = np.random.default_rng(0)
+    parts = []
+    for freq in (300, 500, 800, 500, 1200):
+        t = np.arange(int(RATE * 0.5)) / RATE
+        parts.append(0.4 * np.sin(2 * np.pi * freq * t))
+        parts.append(np.zeros(int(RATE * 0.25)))
+    audio = np.concatenate(parts) + rng.normal(0, 0.003, sum(len(p) for p in parts))
+    return (np.clip(audio, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+class _WhisperStandIn:
+    """Emits one token per voiced 250 ms frame: its dominant frequency rounded to 100 Hz."""
+
+    def transcribe(self, audio, language="en", vad_filter=True, beam_size=1):
+        frame = RATE // 4
+        words = []
+        for start in range(0, len(audio) - frame + 1, frame):
+            x = audio[start:start + frame]
+            if np.sqrt(np.mean(x ** 2)) < 0.05:
+                continue
+            peak_hz = np.argmax(np.abs(np.fft.rfft(x))) * RATE / frame
+            words.append(f"tone{int(round(peak_hz / 100.0)) * 100}")
+        segment = SimpleNamespace(text=" ".join(words), no_speech_prob=0.0, avg_logprob=-0.1)
+        return iter([segment]), None
+
+
+def _transcribe(encoded_bytes: bytes) -> str:
+    async def run():
+        pool = LocalWhisperPool("stand-in", workers=0)
+        try:
+            return await pool.transcribe(encoded_bytes)
+        finally:
+            await pool.close()
+
+    previous = whisper_pool._model
+    whisper_pool._model = _WhisperStandIn()
+    try:
+        return asyncio.run(run())["text"]
+    finally:
+        whisper_pool._model = previous
+
+
+def test_flac_roundtrip_is_lossless_and_smaller():
+    pytest.importorskip("soundfile")
+    pcm = _speechlike_pcm()
+    flac = get_audio_encoder("flac").encode(pcm, RATE)
+    wav = get_audio_encoder("wav").encode(pcm, RATE)
+    assert flac.filename == "audio.flac" and flac.content_type == "audio/flac"
+    assert flac.compression_ratio > 1.2
+    assert len(flac.data) < len(wav.data)
+    decoded, rate = decode_audio(flac.data)
+    assert rate == RATE
+    assert np.array_equal((decoded * 32768).astype("<i2"), np.frombuffer(pcm, "<i2"))
+
+
+def test_transcription_parity_across_codecs():
+    pytest.importorskip("soundfile")
+    pcm = _speechlike_pcm()
+    reference = _transcribe(get_audio_encoder("wav").encode(pcm, RATE).data)
+    assert reference.split()[:2] == ["tone300", "tone300"]
+    for codec in ("flac", "opus"):
+        encoded = get_audio_encoder(codec).encode(pcm, RATE)
+        assert _transcribe(encoded.data) == reference, codec
+    assert get_audio_encoder("opus").encode(pcm, RATE).compression_ratio > 4
+
+
+def test_unknown_codec_falls_back_to_wav(monkeypatch):
+    monkeypatch.setattr(audio_encoder, "_encoders", {})
+    enc = get_audio_encoder("aac")
+    assert enc.codec == "wav"
+    assert enc.encode(b"\x00\x00" * 10, RATE).data[:4] == b"RIFF"
+
+
+def test_pipeline_reports_compression_ratio(monkeypatch):
+    pytest.importorskip("soundfile")
+    from app.stt.stt_pipeline import STTPipeline
+
+    monkeypatch.setattr(audio_encoder.settings, "STT_AUDIO_CODEC", "flac", raising=False)
+    pipeline = STTPipeline("m")
+    encoded = asyncio.run(pipeline._encode_chunk(memoryview(_speechlike_pcm())))
+    stats = pipeline.get_stats()["encoder"]
+    assert stats["codec"] == "flac"
+    assert stats["encoded_bytes"] == len(encoded.data)
+    assert stats["compression_ratio"] > 1.2
@@ -0,0 +1,59 @@
+"""Embedding pool: concurrent encodes (async and from worker threads) share model batches off the event loop."""
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+import app.services.transcript_rag.embeddings as embeddings
+
+
+class _Model:
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.batches.append(len(texts))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.02)  # inference time: later requests pile up meanwhile
+        return np.array([[len(t), t.count("a") + 1.0, 1.0] for t in texts], dtype=np.float64)
+
+
+def test_concurrent_requests_are_merged_into_batches(monkeypatch):
+    model = _Model()
+    monkeypatch.setattr(embeddings, "_get_sentence_model", lambda: model)
+    pool = embeddings.EmbeddingPool(workers=1, max_batch=16, batch_wait_ms=20)
+    requests = [[f"text {i} {'a' * i}", f"other {i}"] for i in range(12)]
+
+    async def run():
+        await pool.start(preload=True)
+        loop_thread = threading.current_thread().name
+        async_calls = [pool.embed(texts) for texts in requests[:10]]
+        # LangGraph-style sync callers in worker threads join the same queue.
+        thread_calls = [asyncio.to_thread(pool.embed_sync, texts) for texts in requests[10:]]
+        results = await asyncio.gather(*async_calls, *thread_calls)
+        stats = pool.get_stats()
+        await pool.close()
+        return loop_thread, results, stats
+
+    loop_thread, results, stats = asyncio.run(run())
+    batches, threads = list(model.batches), set(model.threads)
+    assert loop_thread not in threads and all(t.startswith("embedding") for t in threads)
+    # 1 warm-up batch + the 24 texts packed into batches of <= 16.
+    assert batches[0] == 1 and sum(batches[1:]) == 24
+    assert max(batches[1:]) <= 16 and len(batches) - 1 <= 4
+    for texts, rows in zip(requests, results):
+        np.testing.assert_allclose(rows, embeddings.encode_now(texts), rtol=1e-6)
+    assert all(r.dtype == np.float32 for r in results)
+    assert stats["requests"] == 12 and stats["items"] == 24 and stats["avg_batch_size"] >= 6
+    assert stats["queued_texts"] == 0 and stats["failed_batches"] == 0
+
+
+def test_embed_sync_without_a_running_pool_encodes_inline(monkeypatch):
+    model = _Model()
+    monkeypatch.setattr(embeddings, "_get_sentence_model", lambda: model)
+    pool = embeddings.EmbeddingPool()
+    rows = pool.embed_sync(["standalone script"])
+    assert rows.shape == (1, 3) and abs(float(np.linalg.norm(rows[0])) - 1.0) < 1e-5
+    assert pool.get_stats()["requests"] == 0 and model.batches == [1]
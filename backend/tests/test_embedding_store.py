@@ -0,0 +1,71 @@
+"""Chunk-embedding cache: unseen chunks only are encoded, entries survive a restart, LRU rows are evicted by size,
+a torn write is truncated away."""
+import numpy as np
+
+import app.services.transcript_rag.embedding_store as embedding_store
+import app.services.transcript_rag.embeddings as embeddings
+
+
+def _fake_encode(encoded):
+    def encode(texts):
+        encoded.extend(texts)
+        out = np.array([[len(t), t.count("a") + 1.0, t.count("e") + 1.0, 1.0] for t in texts], dtype=np.float32)
+        return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+    return encode
+
+
+def test_only_unseen_chunks_are_encoded_and_survive_restart(monkeypatch, tmp_path):
+    encoded = []
+    monkeypatch.setattr(embeddings, "encode_now", _fake_encode(encoded))
+    monkeypatch.setattr(embedding_store, "embedding_store", embedding_store.EmbeddingStore(str(tmp_path)))
+
+    first = embedding_store.embed_chunks(["alpha", "beta", "alpha", "gamma"])
+    assert encoded == ["alpha", "beta", "gamma"]  # duplicates within a call are encoded once
+    assert first.shape == (4, 4) and first.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-5)
+
+    encoded.clear()
+    second = embedding_store.embed_chunks(["gamma", "delta", "beta"])
+    assert encoded == ["delta"]
+    np.testing.assert_allclose(second[0], first[3], atol=1e-3)  # float16 storage
+
+    # A new process (fresh store, same directory) reads the index back from disk.
+    encoded.clear()
+    restarted = embedding_store.EmbeddingStore(str(tmp_path))
+    monkeypatch.setattr(embedding_store, "embedding_store", restarted)
+    embedding_store.embed_chunks(["alpha", "delta"])
+    assert encoded == [] and restarted.get_stats()["hits"] == 2
+
+
+def test_least_recently_used_rows_are_evicted_past_the_cap(tmp_path):
+    row_bytes = 2 * 4  # float16 x dim 4
+    store = embedding_store.EmbeddingStore(str(tmp_path), max_bytes=10 * row_bytes)
+    vectors = np.eye(4, dtype=np.float32)[np.arange(8) % 4]
+    store.add("m", [f"t{i}" for i in range(8)], vectors)
+    assert set(store.lookup("m", ["t0", "t1"])) == {0, 1}  # t0/t1 become most recently used
+
+    store = embedding_store.EmbeddingStore(str(tmp_path), max_bytes=10 * row_bytes)  # recency is on disk
+    store.add("m", [f"u{i}" for i in range(4)], np.eye(4, dtype=np.float32))
+    stats = store.get_stats()
+    assert stats["compactions"] == 1 and stats["bytes"] <= 10 * row_bytes
+    assert stats["entries"] == 8 and stats["evicted"] == 4
+    kept = store.lookup("m", ["t0", "t1", "t2", "t3", "u3"])
+    assert set(kept) == {0, 1, 4}  # the oldest untouched rows went first
+    np.testing.assert_allclose(kept[4], [0, 0, 0, 1])
+
+
+def test_partial_row_from_an_interrupted_write_is_truncated(tmp_path):
+    store = embedding_store.EmbeddingStore(str(tmp_path))
+    store.add("m", ["a", "b"], np.eye(4, dtype=np.float32)[:2])
+    shelf = store._shelf("m")
+    with open(shelf.vectors_path, "ab") as fh:
+        fh.write(b"\x00" * 5)  # crash mid-row
+    with open(shelf.index_path, "ab") as fh:
+        fh.write(b"\x01" * 7)  # crash mid-record
+
+    restarted = embedding_store.EmbeddingStore(str(tmp_path))
+    restarted.add("m", ["c"], np.eye(4, dtype=np.float32)[2:3])
+    found = embedding_store.EmbeddingStore(str(tmp_path)).lookup("m", ["a", "b", "c"])
+    for i in range(3):
+        np.testing.assert_allclose(found[i], np.eye(4)[i])
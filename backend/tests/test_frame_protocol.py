@@ -0,0 +1,102 @@
+"""Framed bot audio: header round-trip, server reordering/de-duplication/gaps, bot resend after reconnect."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import meeting_bot_ws as mbw
+from app.audio.frame_protocol import FrameSender, FrameSequencer, decode_frame, encode_frame
+from app.stt.stt_pipeline import STTPipeline
+
+BLOCK = b"\x01\x00" * 160  # 10 ms at 16 kHz
+
+
+def _frame(seq, count=1, ts=1000.0):
+    return decode_frame(encode_frame(seq, count, BLOCK * count, ts, 16000))
+
+
+def test_header_round_trip():
+    f = _frame(42, count=3, ts=1700000000.123456)
+    assert (f.seq, f.count, f.sample_rate) == (42, 3, 16000)
+    assert abs(f.capture_ts - 1700000000.123456) < 1e-6
+    assert bytes(f.payload) == BLOCK * 3
+
+
+def test_sequencer_reorders_drops_replays_and_skips_gaps():
+    seq = FrameSequencer(reorder_window=2, max_wait=60)
+    assert [f.seq for f in seq.push(_frame(0), now=0)] == [0]
+    assert seq.push(_frame(2), now=0) == []  # early: held
+    assert [f.seq for f in seq.push(_frame(1), now=0)] == [1, 2]
+    assert seq.push(_frame(1), now=0) == []  # replay after reconnect
+    assert seq.duplicates == 1 and seq.reordered == 1
+    # Overlapping replay: only the unseen tail is passed on, with its capture time shifted.
+    out = seq.push(_frame(2, count=3, ts=2000.0), now=0)
+    assert [(f.seq, f.count, len(f.payload)) for f in out] == [(3, 2, len(BLOCK) * 2)]
+    assert abs(out[0].capture_ts - 2000.01) < 1e-6
+    # Hole at 5 that never arrives: skipped once the reorder window overflows.
+    for s in (6, 7):
+        assert seq.push(_frame(s), now=0) == []
+    assert [f.seq for f in seq.push(_frame(8), now=0)] == [6, 7, 8]
+    assert (seq.gaps, seq.gap_blocks, seq.next_seq) == (1, 1, 9)
+
+
+def test_sender_resends_only_unacked_frames():
+    sender = FrameSender(16000, max_unacked=3)
+    frames = [sender.build([(BLOCK, 1.0), (BLOCK, 1.01)]) for _ in range(4)]
+    assert sender.evicted == 1 and sender.next_seq == 8
+    sender.ack(4)
+    assert sender.resume(6) == frames[3:]
+    assert sender.resume(None) == frames[3:]
+    restarted = FrameSender(16000)
+    assert restarted.resume(8) == [] and restarted.next_seq == 8
+
+
+def _ack_until(ws, seq):
+    acks = []
+    while not acks or acks[-1] != seq:
+        msg = ws.receive_json()
+        assert msg["type"] == "ack"
+        acks.append(msg["seq"])
+    return acks
+
+
+def test_websocket_replay_after_reconnect_is_deduplicated(monkeypatch):
+    fed = []
+
+    async def fake_process_audio(meeting_id, data, capture_ts=None):
+        fed.append((bytes(data), capture_ts))
+
+    manager = mbw.WebSocketManager()
+    monkeypatch.setattr(mbw, "ws_manager", manager)
+    monkeypatch.setattr(manager, "process_audio", fake_process_audio)
+    app = FastAPI()
+    app.include_router(mbw.router)
+    client = TestClient(app)
+    sender = FrameSender(16000)
+
+    with client.websocket_connect("/audio/m1?framing=1") as ws:
+        assert ws.receive_json() == {"type": "hello", "next_seq": None}
+        sender.resume(None)
+        for _ in range(3):
+            ws.send_bytes(sender.build([(BLOCK, 5.0)]))
+        ws.send_bytes(sender.heartbeat())
+        assert _ack_until(ws, 3)[-1] == 3
+        ws.send_bytes(sender.build([(BLOCK, 6.0)]))  # never acked before the drop
+
+    with client.websocket_connect("/audio/m1?framing=1") as ws:
+        hello = ws.receive_json()
+        assert hello == {"type": "hello", "next_seq": 4}
+        for frame in sender.resume(hello["next_seq"]):
+            ws.send_bytes(frame)
+        ws.send_bytes(sender.build([(BLOCK, 7.0)]))
+        ws.send_bytes(sender.heartbeat())
+        assert _ack_until(ws, 5)[-1] == 5
+
+    assert [ts for _, ts in fed] == [5.0, 5.0, 5.0, 6.0, 7.0]
+    assert manager.sequencer("m1").get_stats()["duplicates"] == 0
+
+
+def test_pipeline_maps_stream_offsets_to_capture_time():
+    pipeline = STTPipeline("m")
+    pipeline.process_audio(b"\x00\x00" * 16000, capture_ts=100.0)
+    pipeline.process_audio(b"\x00\x00" * 16000, capture_ts=101.5)  # 0.5 s gap before this block
+    assert pipeline._capture_time_at(16000) == 100.5
+    assert pipeline._capture_time_at(32000 + 8000) == 101.75
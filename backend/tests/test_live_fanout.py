@@ -0,0 +1,115 @@
+"""Live transcript fan-out: per-subscriber queues, one serialization, slow consumers disconnected."""
+import asyncio
+import json
+import time
+
+from app.api.v1.endpoints import meeting_bot_ws as mbw
+from app.api.v1.endpoints.meeting_bot_ws import SLOW_CONSUMER_CLOSE_CODE, LiveSubscriber, WebSocketManager
+
+
+class _FakeWS:
+    def __init__(self, delay: float = 0.0, block: bool = False, block_close: bool = False):
+        self.delay = delay
+        self.block = block
+        self.block_close = block_close
+        self.received = []
+        self.closed_with = None
+        self.got_message = asyncio.Event()
+
+    async def send_text(self, data):
+        if self.block:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(data)
+        self.got_message.set()
+
+    async def close(self, code=1000, reason=None):
+        if self.block_close:
+            await asyncio.Event().wait()
+        self.closed_with = (code, reason)
+
+
+def test_broadcast_to_500_subscribers_is_not_held_up_by_slow_ones(monkeypatch):
+    dumps_calls = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(mbw.json, "dumps", lambda *a, **k: dumps_calls.append(1) or real_dumps(*a, **k))
+
+    async def run():
+        manager = WebSocketManager()
+        fast = [_FakeWS() for _ in range(495)]
+        slow = [_FakeWS(block=True) for _ in range(5)]
+        for ws in fast + slow:
+            manager.subscribe("m", ws)
+
+        t0 = time.perf_counter()
+        await manager.broadcast_transcript("m", "hello")
+        enqueue_latency = time.perf_counter() - t0
+        await asyncio.wait_for(asyncio.gather(*(ws.got_message.wait() for ws in fast)), timeout=2.0)
+        delivery_latency = time.perf_counter() - t0
+        for ws in fast + slow:
+            manager.unsubscribe("m", ws)
+        return fast, enqueue_latency, delivery_latency
+
+    fast, enqueue_latency, delivery_latency = asyncio.run(run())
+    assert len(dumps_calls) == 1
+    assert all(ws.received == ['{"type":"transcript","text":"hello"}'] for ws in fast)
+    assert enqueue_latency < 0.5
+    assert delivery_latency < 2.0
+
+
+def test_full_queue_disconnects_slow_consumer_with_reason(monkeypatch):
+    monkeypatch.setattr(mbw.settings, "LIVE_WS_SEND_QUEUE_MAX", 2, raising=False)
+
+    async def run():
+        manager = WebSocketManager()
+        slow, fast = _FakeWS(block=True), _FakeWS()
+        manager.subscribe("m", slow)
+        manager.subscribe("m", fast)
+        for i in range(5):
+            await manager.broadcast_transcript("m", f"line {i}")
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        return manager, slow, fast
+
+    manager, slow, fast = asyncio.run(run())
+    assert slow.closed_with[0] == SLOW_CONSUMER_CLOSE_CODE
+    assert "slow consumer" in slow.closed_with[1]
+    assert len(fast.received) == 5
+    assert manager.has_subscribers("m")
+    assert slow not in manager._subscribers["m"]
+
+
+def test_send_timeout_disconnects_and_forgets_subscriber():
+    async def run():
+        manager = WebSocketManager()
+        ws = _FakeWS(delay=1.0)
+        sub = LiveSubscriber("m", ws, send_timeout=0.02, on_closed=manager._forget)
+        manager._subscribers["m"] = {ws: sub}
+        await manager.broadcast_transcript("m", "hi")
+        await asyncio.sleep(0.1)
+        await sub.wait_closed()
+        return manager, ws, sub
+
+    manager, ws, sub = asyncio.run(run())
+    assert ws.closed_with[0] == SLOW_CONSUMER_CLOSE_CODE
+    assert sub._closing.done()
+    assert not manager.has_subscribers("m")
+
+
+def test_stop_cancels_a_pending_close_frame():
+    async def run():
+        ws = _FakeWS(block=True, block_close=True)
+        sub = LiveSubscriber("m", ws, max_queue=1)
+        sub.offer("a")
+        await asyncio.sleep(0)
+        sub.offer("b")
+        sub.offer("c")  # queue full: close with a reason
+        closing = sub._closing
+        await asyncio.sleep(0.01)
+        assert closing is not None and not closing.done()
+        sub.stop()
+        await asyncio.sleep(0)
+        return closing
+
+    assert asyncio.run(run()).cancelled()
@@ -0,0 +1,139 @@
+"""LLM gateway + shared response cache: deterministic repeats cost no API call; 429s rotate keys."""
+import asyncio
+
+import httpx
+
+import app.llm.gateway as gw
+from app.llm import LLMGateway, LLMResponseCache, bypass
+
+
+class _Collection:
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+
+def _groq_upstream(calls, statuses=None, finish_reason="stop"):
+    """MockTransport answering OpenAI-style completions; ``statuses`` maps key -> forced error status."""
+    statuses = statuses or {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = request.headers["authorization"].removeprefix("Bearer ")
+        calls.append(key)
+        if key in statuses:
+            return httpx.Response(statuses[key], json={"error": {"message": "slow down"}}, headers={"retry-after": "0"})
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": f"answer {len(calls)}"}, "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 2},
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def _ask(gateway, temperature=0.1, **extra):
+    return gateway.chat_sync(
+        "groq",
+        [{"role": "user", "content": "Summarize the board"}],
+        model="llama-3.3-70b-versatile",
+        temperature=temperature,
+        max_tokens=256,
+        keys=["k1"],
+        **extra,
+    )
+
+
+def test_deterministic_repeats_are_served_from_cache(monkeypatch):
+    cache = LLMResponseCache(use_store=False)
+    monkeypatch.setattr(gw, "llm_cache", cache)
+    calls = []
+    gateway = LLMGateway(transport=_groq_upstream(calls))
+    try:
+        first = _ask(gateway)
+        again = _ask(gateway)
+        assert again.text == first.text == "answer 1"
+        assert again.cached and not first.cached and again.completion_tokens == 2
+        assert len(calls) == 1
+
+        _ask(gateway, temperature=0.7)  # sampled: never cached
+        _ask(gateway, cache=False)  # explicit opt-out
+        with bypass():
+            _ask(gateway)
+        assert len(calls) == 4
+    finally:
+        asyncio.run(gateway.close())
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1 and stats["bypassed"] == 3
+    assert stats["by_provider"]["groq"] == {"hits": 1, "misses": 1, "bypassed": 3}
+    assert gateway.get_stats()["groq"]["requests"] == 4
+
+
+def test_truncated_completions_are_not_cached(monkeypatch):
+    cache = LLMResponseCache(use_store=False)
+    monkeypatch.setattr(gw, "llm_cache", cache)
+    calls = []
+    gateway = LLMGateway(transport=_groq_upstream(calls, finish_reason="length"))
+    try:
+        first, again = _ask(gateway), _ask(gateway)
+    finally:
+        asyncio.run(gateway.close())
+    assert first.finish_reason == "length" and not again.cached and len(calls) == 2
+
+
+def test_rate_limited_key_rotates_then_retries(monkeypatch):
+    monkeypatch.setattr(gw, "llm_cache", LLMResponseCache(use_store=False))
+    monkeypatch.setattr(gw.settings, "LLM_RETRY_BASE_SECONDS", 0.0, raising=False)
+    calls = []
+    gateway = LLMGateway(transport=_groq_upstream(calls, {"primary": 429, "stale": 401}))
+
+    async def run():
+        result = await gateway.chat(
+            "groq",
+            [{"role": "user", "content": "Extract tasks"}],
+            model="llama-3.3-70b-versatile",
+            keys=["stale", "primary", "secondary"],
+        )
+        try:
+            await gateway.chat("groq", [{"role": "user", "content": "x"}], model="m", keys=["primary"])
+        except gw.LLMError as e:
+            return result, e
+        return result, None
+
+    try:
+        result, error = asyncio.run(run())
+    finally:
+        asyncio.run(gateway.close())
+    assert result.text and result.attempts == 3
+    assert calls[:3] == ["stale", "primary", "secondary"]
+    # A single rate-limited key is retried LLM_MAX_RETRIES times, then surfaces as LLMError(429).
+    assert error is not None and error.status == 429 and error.retriable
+    assert calls[3:] == ["primary"] * (1 + gw.settings.LLM_MAX_RETRIES)
+    stats = gateway.get_stats()["groq"]
+    assert stats["key_rotations"] == 2 and stats["errors"] == 1
+
+
+def test_store_outlives_the_memory_tier(monkeypatch):
+    store = _Collection()
+    first = LLMResponseCache(max_entries=1)
+    monkeypatch.setattr(first, "_collection", lambda: store)
+    keys = [LLMResponseCache.key("gemini", "gemini-2.5-flash", [n], {"temperature": 0.2}) for n in (1, 2)]
+
+    for n, key in enumerate(keys, 1):  # the second entry evicts the first from memory
+        assert first.get(key, "gemini") is None
+        first.put(key, {"text": f"plan {n}"}, "gemini", "gemini-2.5-flash")
+    assert first.get_stats()["evicted"] == 1
+
+    # A fresh process (empty LRU) still finds both in the collection.
+    second = LLMResponseCache()
+    monkeypatch.setattr(second, "_collection", lambda: store)
+    assert second.get(keys[0], "gemini") == {"text": "plan 1"}
+    assert second.get(keys[0], "gemini") == {"text": "plan 1"}
+    stats = second.get_stats()
+    assert stats["store_hits"] == 1 and stats["memory_hits"] == 1
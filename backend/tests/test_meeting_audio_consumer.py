@@ -0,0 +1,46 @@
+"""Per-meeting audio consumer: bounded queue, merged drains, single in-flight STT tick."""
+import asyncio
+
+from app.api.v1.endpoints.meeting_bot_ws import MeetingAudioConsumer
+
+
+class _FakePipeline:
+    def __init__(self):
+        self.frames = []
+        self.ticks = 0
+        self.release = asyncio.Event()
+
+    def process_audio(self, data, capture_ts=None):
+        self.frames.append(data)
+
+    async def process_buffer(self):
+        self.ticks += 1
+        await self.release.wait()
+
+
+def test_drops_oldest_when_full_and_merges_bursts():
+    async def run():
+        pipeline = _FakePipeline()
+        consumer = MeetingAudioConsumer("m", pipeline, max_frames=4)
+        for i in range(10):
+            consumer.feed(bytes([i]))
+        await asyncio.sleep(0.01)
+        stats = consumer.get_stats()
+        frames = list(pipeline.frames)
+        ticks = pipeline.ticks
+        for i in range(10, 20):
+            consumer.feed(bytes([i]))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        ticks_while_busy = pipeline.ticks
+        pipeline.release.set()
+        consumer.stop()
+        return stats, frames, ticks, ticks_while_busy
+
+    stats, frames, ticks, ticks_while_busy = asyncio.run(run())
+    assert stats["dropped_frames"] == 6
+    assert stats["received_frames"] == 10
+    assert frames == [bytes([i]) for i in range(6, 10)]
+    assert stats["merged_batches"] == 1
+    # One STT tick in flight at a time, not one task per frame.
+    assert ticks == 1 and ticks_while_busy == 1
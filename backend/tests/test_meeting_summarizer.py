@@ -0,0 +1,175 @@
+"""Map-reduce summaries: windows are cached by content, so a grown transcript re-summarizes only its tail."""
+import asyncio
+
+import app.services.meeting_summarizer as ms
+
+
+class _Store:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+
+def test_regenerating_a_grown_transcript_only_summarizes_new_windows(monkeypatch):
+    store = _Store()
+
+    class _DB:
+        summary_cache = store
+
+    async def _get_database():
+        return _DB()
+
+    mapped, reduced = [], []
+
+    async def fake_window(window):
+        mapped.append(window)
+        return {"summary": window[:20]}
+
+    async def fake_reduce(notes_text):
+        reduced.append(notes_text)
+        return {"overview": "ok", "key_points": [], "decisions": []}, ["follow up"]
+
+    monkeypatch.setattr(ms, "get_database", _get_database)
+    monkeypatch.setattr(ms, "summarize_window", fake_window)
+    monkeypatch.setattr(ms, "_reduce_notes_text", fake_reduce)
+    monkeypatch.setattr(ms.settings, "SUMMARY_WINDOW_CHARS", 2000, raising=False)
+    monkeypatch.setattr(ms, "summary_cache", ms.SummaryCache(max_entries=2))  # evicts; Mongo still holds the rest
+
+    sentences = [f"Sentence number {i} is about the payment service rollout." for i in range(200)]
+    first = " ".join(sentences[:150])
+    grown = " ".join(sentences)
+
+    async def run():
+        assert await ms.summarize_transcript(first) == ({"overview": "ok", "key_points": [], "decisions": []}, ["follow up"])
+        calls = len(mapped)
+        await ms.summarize_transcript(grown)
+        return calls
+
+    first_calls = asyncio.run(run())
+    assert first_calls == len(ms.split_windows(ms._SENTENCE_BREAK.split(first))) >= 4
+    # Only the old last window (now longer) and the new ones were mapped again.
+    assert 1 <= len(mapped) - first_calls <= 2
+    assert len(reduced) == 2
+
+    # Same transcript again: no model calls at all.
+    before = len(mapped)
+    asyncio.run(ms.summarize_transcript(grown))
+    assert len(mapped) == before and len(reduced) == 2
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda d: d[key])
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class _Segments:
+    def __init__(self):
+        self.docs = []
+
+    def find(self, query, projection=None):
+        after = (query.get("timestamp") or {}).get("$gt")
+        return _Cursor([d for d in self.docs if after is None or d["timestamp"] > after])
+
+
+class _Checkpoints:
+    def __init__(self):
+        self.saved = {}
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.saved[query["meeting_id"]] = doc
+
+
+def test_live_checkpoints_leave_only_the_tail_for_the_stop_pass(monkeypatch):
+    from datetime import datetime, timedelta
+
+    import app.services.live_summary as ls
+
+    segments, checkpoints, cache = _Segments(), _Checkpoints(), _Store()
+
+    class _DB:
+        transcript_segments = segments
+        summary_checkpoints = checkpoints
+        summary_cache = cache
+
+    async def _get_database():
+        return _DB()
+
+    mapped = []
+
+    async def fake_window(window):
+        mapped.append(window)
+        return {"summary": window[:20]}
+
+    async def fake_reduce(notes_text):
+        return {"overview": "so far", "key_points": [], "decisions": []}, []
+
+    monkeypatch.setattr(ms, "get_database", _get_database)
+    monkeypatch.setattr(ls, "get_database", _get_database)
+    monkeypatch.setattr(ms, "summarize_window", fake_window)
+    monkeypatch.setattr(ms, "_reduce_notes_text", fake_reduce)
+    monkeypatch.setattr(ms.settings, "SUMMARY_WINDOW_CHARS", 2000, raising=False)
+    monkeypatch.setattr(ms, "summary_cache", ms.SummaryCache())
+    t0 = datetime(2026, 1, 1, 10, 0, 0)
+
+    def speak(start, count):
+        for i in range(start, start + count):
+            segments.docs.append({"text": f"Topic {i}: we reviewed the deployment checklist item.", "timestamp": t0 + timedelta(seconds=i)})
+
+    async def run():
+        live = ls.LiveSummarizer(interval_seconds=3600)
+        speak(0, 100)
+        assert (await live.checkpoint("m1"))["segments"] == 100
+        speak(100, 100)
+        await live.checkpoint("m1")
+        assert await live.checkpoint("m1") is None  # nothing new said
+        speak(200, 10)
+        before = len(mapped)
+        # The stop-time pass over the whole transcript (as analyze_meeting_transcript does it).
+        await ms.summarize_transcript(ls.clean_transcription_text(ls._combine_segments(segments.docs)))
+        return before
+
+    before = asyncio.run(run())
+    assert checkpoints.saved["m1"]["summary"]["overview"] == "so far"
+    assert len(mapped) - before <= 2
+
+
+def test_summarizer_completions_bypass_the_llm_response_cache(monkeypatch):
+    """Results are cached once, in summary_cache; the gateway must not keep a second copy."""
+    import app.services.meeting_intelligence as mi
+    from app.llm import ChatResult
+
+    calls = []
+
+    class _Gateway:
+        async def chat(self, provider, messages, **kwargs):
+            calls.append(kwargs.get("cache", True))
+            return ChatResult(text='{"overview": "ok", "summary": "notes"}', provider=provider, model=kwargs["model"])
+
+    async def _get_database():
+        class _DB:
+            summary_cache = _Store()
+
+        return _DB()
+
+    monkeypatch.setattr(ms, "llm_gateway", _Gateway())
+    monkeypatch.setattr(mi, "llm_gateway", _Gateway())
+    monkeypatch.setattr(ms, "get_database", _get_database)
+    monkeypatch.setattr(ms, "summary_cache", ms.SummaryCache())
+    monkeypatch.setattr(ms.settings, "SUMMARY_WINDOW_CHARS", 2000, raising=False)
+    short = "We agreed to ship on Friday."
+    long = " ".join(f"Sentence {i} covers the billing migration plan." for i in range(200))
+    asyncio.run(ms.summarize_transcript(short))
+    asyncio.run(ms.summarize_transcript(long))
+    assert len(calls) > 3 and not any(calls)
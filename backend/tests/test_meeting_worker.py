@@ -0,0 +1,149 @@
+"""Meeting worker: claims up to capacity, honours stop / pause requests; API admission and caption publishing."""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.bot.meeting_jobs as mj
+from app.api.v1.endpoints import meetings_bot
+from app.api.v1.endpoints.meeting_bot_ws import ws_manager
+from app.bot.meeting_jobs import MeetingJobQueue, MeetingWorkerUnavailable
+from app.bot.meeting_worker import MeetingWorker
+
+
+class _Queue:
+    def __init__(self, meetings):
+        self.jobs = {
+            m: {"_id": m, "meeting_id": m, "meeting_url": f"https://meet/{m}", "status": "queued"}
+            for m in meetings
+        }
+        self.finished = []
+
+    async def claim(self, worker_id):
+        for job in self.jobs.values():
+            if job["status"] == "queued":
+                job.update(status="running", worker_id=worker_id)
+                return dict(job)
+        return None
+
+    async def assigned(self, worker_id):
+        return [dict(j) for j in self.jobs.values() if j.get("worker_id") == worker_id and j["status"] in ("running", "stopping")]
+
+    async def finish(self, job_id, status="done", error=None):
+        self.jobs[job_id]["status"] = status
+        self.finished.append((job_id, status))
+
+
+class _Bots:
+    def __init__(self):
+        self.started, self.stopped, self.paused = [], [], []
+
+    async def start_bot(self, meeting_id, meeting_url):
+        self.started.append(meeting_id)
+
+    async def stop_bot(self, meeting_id):
+        self.stopped.append(meeting_id)
+
+    async def pause_bot_audio(self, meeting_id):
+        self.paused.append(meeting_id)
+
+    async def resume_bot_audio(self, meeting_id):
+        self.paused.remove(meeting_id)
+
+
+def test_worker_claims_to_capacity_and_applies_stop_and_pause():
+    queue, bots = _Queue(["a", "b", "c"]), _Bots()
+    worker = MeetingWorker(capacity=2, worker_id="w1", queue=queue, bots=bots)
+
+    async def run():
+        await worker.tick()
+        await asyncio.sleep(0)
+        assert sorted(bots.started) == ["a", "b"] and queue.jobs["c"]["status"] == "queued"
+        queue.jobs["a"]["audio_paused"] = True
+        queue.jobs["b"]["status"] = "stopping"
+        await worker.tick()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert bots.paused == ["a"]
+    assert bots.stopped == ["b"] and ("b", "done") in queue.finished
+    # The freed slot went to the next queued meeting.
+    assert queue.jobs["c"]["status"] == "running" and "c" in bots.started
+
+
+def test_failed_start_marks_job_failed():
+    queue, bots = _Queue(["a"]), _Bots()
+
+    async def boom(meeting_id, meeting_url):
+        raise RuntimeError("chrome missing")
+
+    bots.start_bot = boom
+    worker = MeetingWorker(capacity=1, worker_id="w1", queue=queue, bots=bots)
+
+    async def run():
+        await worker.tick()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert queue.finished == [("a", "failed")]
+
+
+def test_admission_rejects_when_workers_are_full(monkeypatch):
+    class _Cursor:
+        def __init__(self, docs):
+            self.docs = docs
+
+        async def to_list(self, length=None):
+            return self.docs
+
+    class _Workers:
+        docs = []
+
+        def find(self, *args, **kwargs):
+            return _Cursor(self.docs)
+
+    class _Jobs:
+        active = 0
+
+        async def find_one(self, query):
+            return None
+
+        async def count_documents(self, query):
+            return self.active
+
+    class _DB:
+        meeting_workers = _Workers()
+        meeting_jobs = _Jobs()
+
+    async def _get_database():
+        return _DB
+
+    monkeypatch.setattr(mj, "get_database", _get_database)
+    queue = MeetingJobQueue()
+    with pytest.raises(MeetingWorkerUnavailable, match="No meeting worker"):
+        asyncio.run(queue.admit("m1"))
+    _DB.meeting_workers.docs = [{"capacity": 2}, {"capacity": 1}]
+    _DB.meeting_jobs.active = 3
+    with pytest.raises(MeetingWorkerUnavailable, match="3/3"):
+        asyncio.run(queue.admit("m1"))
+    _DB.meeting_jobs.active = 2
+    asyncio.run(queue.admit("m1"))
+
+
+def test_publish_endpoint_checks_worker_secret(monkeypatch):
+    monkeypatch.setattr(mj.settings, "MEETING_WORKER_SECRET", "s3cret", raising=False)
+    app = FastAPI()
+    app.include_router(meetings_bot.router, prefix="/api/v1/meetings")
+    sent = []
+
+    async def broadcast(meeting_id, text):
+        sent.append((meeting_id, text))
+
+    monkeypatch.setattr(ws_manager, "broadcast_transcript", broadcast)
+    client = TestClient(app)
+    url = "/api/v1/meetings/m1/live/publish"
+    assert client.post(url, json={"text": "hello"}).status_code == 403
+    resp = client.post(url, json={"text": "hello"}, headers={"X-Meeting-Worker-Secret": "s3cret"})
+    assert resp.status_code == 200
+    assert sent == [("m1", "hello")]
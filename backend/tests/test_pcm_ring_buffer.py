@@ -0,0 +1,52 @@
+"""PCMRingBuffer windows, wrap-around, push-back and overflow accounting."""
+from app.audio.pcm_ring_buffer import PCMRingBuffer
+from app.stt.stt_pipeline import _pcm_to_wav
+
+
+def _pcm(start: int, count: int) -> bytes:
+    return b"".join((i % 32768).to_bytes(2, "little") for i in range(start, start + count))
+
+
+def test_windows_overlap_and_stay_contiguous_across_wrap():
+    ring = PCMRingBuffer(capacity_bytes=40, overlap_bytes=4)
+    stream = _pcm(0, 200)
+    out = []
+    for i in range(0, len(stream), 6):
+        ring.write(stream[i:i + 6])
+        w = ring.next_window(12)
+        if w is not None:
+            assert isinstance(w, memoryview)
+            out.append(bytes(w))
+    # Each window starts 8 bytes (12 - 4 overlap) after the previous one.
+    for k, w in enumerate(out):
+        assert w == stream[k * 8:k * 8 + 12]
+    assert ring.dropped_bytes == 0
+
+
+def test_rewind_restores_tail_without_copy():
+    ring = PCMRingBuffer(capacity_bytes=64)
+    ring.write(_pcm(0, 16))
+    start = ring.read_position
+    w = ring.next_window(20)
+    end = start + len(w)
+    assert len(ring) == 12
+    assert ring.rewind_to(end - 8) == 8
+    assert bytes(ring.peek(8)) == _pcm(6, 4)
+    assert len(ring) == 20
+
+
+def test_overflow_drops_oldest_and_clamps_rewind():
+    ring = PCMRingBuffer(capacity_bytes=16)
+    ring.write(_pcm(0, 12))
+    assert len(ring) == 16
+    assert ring.dropped_bytes == 8
+    assert bytes(ring.peek(16)) == _pcm(4, 8)
+    ring.consume(16)
+    assert ring.rewind_to(0) == 16
+
+
+def test_window_feeds_wav_encoder():
+    ring = PCMRingBuffer(capacity_bytes=64)
+    ring.write(_pcm(0, 16))
+    wav = _pcm_to_wav(ring.next_window(32), 16000)
+    assert wav.endswith(_pcm(0, 16))
@@ -0,0 +1,109 @@
+"""Uploaded recordings: silence splitting, chunked background transcription, stitching and progress."""
+import asyncio
+import wave
+
+import numpy as np
+
+import app.services.recording_processing as rp
+from app.audio.silence_splitter import SilenceSplitter
+from app.services.meeting_summarizer import split_windows
+
+SR = 16000
+
+
+def _tone(seconds, amp=8000):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amp * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+
+def _silence(seconds):
+    return bytes(int(seconds * SR) * 2)
+
+
+def test_splitter_cuts_in_pauses_after_target_and_forces_at_max():
+    splitter = SilenceSplitter(SR, target_seconds=2.0, max_seconds=4.0, min_silence_ms=300)
+    audio = _tone(1.5) + _silence(0.2) + _tone(1.0) + _silence(0.6) + _tone(5.0) + _silence(0.1)
+    chunks = []
+    for i in range(0, len(audio), 3200):  # 100 ms blocks
+        chunks += splitter.feed(audio[i: i + 3200])
+    chunks.append(splitter.flush())
+    # The 0.2 s pause is too short and before the target; the first cut falls inside the 0.6 s pause.
+    assert 2.7 < chunks[0].duration_seconds < 3.3
+    # No pause in the 5 s tone: cut at the 4 s maximum.
+    assert chunks[1].duration_seconds <= 4.0 + 1e-6
+    assert sum(len(c.pcm) for c in chunks) == len(audio)
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    assert abs(chunks[1].start_seconds - chunks[0].duration_seconds) < 1e-9
+
+
+def test_split_windows_keeps_parts_whole():
+    parts = ["a" * 900, "b" * 900, "c" * 900]
+    assert split_windows(parts, window_chars=2000) == ["a" * 900 + "\n" + "b" * 900, "c" * 900]
+
+
+class _Recordings:
+    def __init__(self):
+        self.doc = {}
+        self.progress = []
+
+    async def update_one(self, query, update):
+        patch = update["$set"]
+        self.doc.update(patch)
+        if "progress" in patch:
+            self.progress.append(patch["progress"])
+
+
+def test_job_transcribes_chunks_concurrently_and_stitches_in_order(monkeypatch, tmp_path):
+    path = tmp_path / "meeting.wav"
+    pcm = b"".join(_tone(2.5) + _silence(0.6) for _ in range(4)) + _silence(3.0)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes(pcm)
+
+    recordings = _Recordings()
+
+    class _DB:
+        pass
+
+    _DB.recordings = recordings
+
+    async def _get_database():
+        return _DB
+
+    inflight = {"now": 0, "max": 0}
+
+    async def transcribe(chunk, lane):
+        inflight["now"] += 1
+        inflight["max"] = max(inflight["max"], inflight["now"])
+        # Later chunks finish first: the stitch must still follow audio order.
+        await asyncio.sleep(0.05 / (chunk.index + 1))
+        inflight["now"] -= 1
+        return f"part {chunk.index}", [{"start": 1.0, "text": f"part {chunk.index}", "no_speech_prob": 0.1}]
+
+    windows_seen = []
+
+    async def summarize(windows):
+        windows_seen.extend(windows)
+        return {"overview": "ok", "key_points": [], "decisions": []}, ["follow up"]
+
+    monkeypatch.setattr(rp, "get_database", _get_database)
+    monkeypatch.setattr(rp, "_transcribe_chunk", transcribe)
+    monkeypatch.setattr(rp, "summarize_windows", summarize)
+    monkeypatch.setattr(rp.settings, "RECORDING_CHUNK_SECONDS", 2.0, raising=False)
+    monkeypatch.setattr(rp.settings, "RECORDING_TRANSCRIBE_CONCURRENCY", 2, raising=False)
+
+    asyncio.run(rp.process_recording("0123456789abcdef01234567", str(path), "meeting.wav", path.stat().st_size))
+
+    doc = recordings.doc
+    assert doc["status"] == "completed" and doc["action_items"] == ["follow up"]
+    lines = doc["transcription"].splitlines()
+    # Four spoken chunks in audio order at their absolute offsets (+1 s segment start); the trailing silence is skipped.
+    assert [line.split("] ")[1] for line in lines] == ["part 0", "part 1", "part 2", "part 3"]
+    stamps = [line[1:9] for line in lines]
+    assert stamps[0] == "00:00:01" and stamps == sorted(stamps) and len(set(stamps)) == 4
+    assert inflight["max"] == 2
+    assert windows_seen and "part 3" in windows_seen[-1]
+    assert doc["progress"]["percent"] == 100 and doc["progress"]["chunks_total"] == doc["progress"]["chunks_done"] >= 5
+    assert not path.exists()
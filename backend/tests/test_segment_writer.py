@@ -0,0 +1,95 @@
+"""Write-behind transcript segment batching and retry."""
+import asyncio
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+import app.stt.segment_writer as sw
+
+
+class _Segments:
+    def __init__(self, fail_times=0, duplicate_on_retry=False):
+        self.batches = []
+        self.fail_times = fail_times
+        self.duplicate_on_retry = duplicate_on_retry
+
+    async def insert_many(self, docs, ordered=True):
+        if self.fail_times:
+            self.fail_times -= 1
+            if self.duplicate_on_retry:
+                self.batches.append(list(docs))
+            raise AutoReconnect("primary stepped down")
+        if self.duplicate_on_retry and self.batches:
+            raise BulkWriteError({"writeErrors": [{"code": 11000, "index": i} for i in range(len(docs))]})
+        self.batches.append(list(docs))
+
+
+def _patch_db(monkeypatch, segments):
+    class _DB:
+        transcript_segments = segments
+
+    async def _get_database():
+        return _DB()
+
+    monkeypatch.setattr(sw, "get_database", _get_database)
+
+
+def test_flushes_in_batches_by_size_and_on_demand(monkeypatch):
+    segments = _Segments()
+    _patch_db(monkeypatch, segments)
+
+    async def run():
+        writer = sw.TranscriptSegmentWriter(flush_size=3, flush_seconds=60)
+        for i in range(7):
+            writer.enqueue("m1", {"text": f"t{i}"})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        assert writer.pending_count("m1") == 1
+        await writer.flush("m1")
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    texts = [[d["text"] for d in b] for b in segments.batches]
+    assert texts == [["t0", "t1", "t2"], ["t3", "t4", "t5"], ["t6"]]
+    assert all(d["meeting_id"] == "m1" and "_id" in d for b in segments.batches for d in b)
+    assert writer.get_stats()["written"] == 7
+
+
+def test_retries_transient_errors_and_ignores_duplicates(monkeypatch):
+    segments = _Segments(fail_times=1, duplicate_on_retry=True)
+    _patch_db(monkeypatch, segments)
+    monkeypatch.setattr(sw.asyncio, "sleep", _no_sleep)
+
+    async def run():
+        writer = sw.TranscriptSegmentWriter(flush_size=100, flush_seconds=60, max_retries=2)
+        writer.enqueue("m1", {"text": "hello"})
+        written = await writer.flush("m1")
+        return writer, written
+
+    writer, written = asyncio.run(run())
+    assert written == 1
+    assert writer.pending_count() == 0
+    assert writer.failed_batches == 0
+
+
+def test_failed_batch_is_kept_for_next_flush(monkeypatch):
+    segments = _Segments(fail_times=5)
+    _patch_db(monkeypatch, segments)
+    monkeypatch.setattr(sw.asyncio, "sleep", _no_sleep)
+
+    async def run():
+        writer = sw.TranscriptSegmentWriter(flush_size=100, flush_seconds=60, max_retries=1)
+        writer.enqueue("m1", {"text": "a"})
+        assert await writer.flush("m1") == 0
+        writer.enqueue("m1", {"text": "b"})
+        segments.fail_times = 0
+        assert await writer.flush("m1") == 2
+        return writer
+
+    writer = asyncio.run(run())
+    assert [d["text"] for d in segments.batches[-1]] == ["a", "b"]
+    assert writer.failed_batches == 1
+
+
+async def _no_sleep(_seconds):
+    return None
@@ -0,0 +1,56 @@
+"""NumPy PCM metrics match the reference per-sample definitions."""
+import math
+import struct
+
+import numpy as np
+
+from app.audio.signal_utils import (
+    SILENCE_DB,
+    analyze_pcm16,
+    apply_noise_gate,
+    pcm16_peak,
+    pcm16_rms,
+    pcm16_zero_crossing_rate,
+)
+
+
+def _samples(pcm: bytes):
+    return [struct.unpack_from("<h", pcm, i)[0] for i in range(0, len(pcm) - 1, 2)]
+
+
+def test_analyze_matches_reference_loop():
+    rng = np.random.default_rng(1)
+    pcm = rng.integers(-32768, 32767, 4001, dtype=np.int16).tobytes() + b"\x01"
+    ref = _samples(pcm)
+    stats = analyze_pcm16(pcm)
+    assert stats.samples == len(ref)
+    assert math.isclose(stats.rms, math.sqrt(sum(s * s for s in ref) / len(ref)), rel_tol=1e-9)
+    assert stats.peak == max(abs(s) for s in ref)
+    signs = [s >= 0 for s in ref]
+    crossings = sum(1 for a, b in zip(signs, signs[1:]) if a != b)
+    assert math.isclose(stats.zcr, crossings / (len(ref) - 1))
+    assert pcm16_rms(pcm) == stats.rms
+    assert pcm16_peak(pcm) == stats.peak
+
+
+def test_full_scale_negative_peak_does_not_overflow():
+    pcm = np.array([-32768, 0, 10], dtype="<i2").tobytes()
+    assert pcm16_peak(pcm) == 32768
+
+
+def test_spectral_flatness_separates_noise_from_tone():
+    rng = np.random.default_rng(2)
+    n = 16000
+    noise = rng.normal(0, 3000, n).astype("<i2").tobytes()
+    tone = (8000 * np.sin(2 * np.pi * 440 * np.arange(n) / 16000)).astype("<i2").tobytes()
+    assert analyze_pcm16(noise).spectral_flatness > 0.4
+    assert analyze_pcm16(tone).spectral_flatness < 0.05
+
+
+def test_silence_and_empty_buffers():
+    assert analyze_pcm16(b"").rms_db == SILENCE_DB
+    assert analyze_pcm16(bytes(640)).spectral_flatness == 0.0
+    assert pcm16_zero_crossing_rate(b"\x01\x00") == 0.0
+    quiet = np.full(320, 5, dtype="<i2").tobytes()
+    assert apply_noise_gate(quiet, 80.0) == bytes(len(quiet))
+    assert apply_noise_gate(quiet, 1.0) == quiet
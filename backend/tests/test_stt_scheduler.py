@@ -0,0 +1,97 @@
+"""Shared STT scheduler: fairness, per-meeting order, concurrency cap, shared 429 backoff."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.stt.scheduler import KeyRateLimiter, STTScheduler, parse_reset_seconds
+
+
+def test_parse_reset_seconds_formats():
+    assert parse_reset_seconds("7.66s") == pytest.approx(7.66)
+    assert parse_reset_seconds("2m59.56s") == pytest.approx(179.56)
+    assert parse_reset_seconds("120ms") == pytest.approx(0.12)
+    assert parse_reset_seconds("3") == 3.0
+    assert parse_reset_seconds("") is None
+
+
+def test_round_robin_order_and_concurrency_cap():
+    async def run():
+        sched = STTScheduler(max_concurrency=2, requests_per_minute=0)
+        started = []
+        active = {"now": 0, "max": 0}
+
+        def call(tag):
+            async def _run():
+                started.append(tag)
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                await asyncio.sleep(0.01)
+                active["now"] -= 1
+                return tag
+            return _run
+
+        jobs = [sched.submit(m, "k", call(f"{m}{i}")) for m in ("a", "b", "c") for i in range(3)]
+        results = await asyncio.gather(*jobs)
+        return sched, started, active, results
+
+    sched, started, active, results = asyncio.run(run())
+    assert active["max"] == 2
+    assert sorted(results) == sorted(started)
+    for m in ("a", "b", "c"):
+        assert [t for t in started if t[0] == m] == [f"{m}0", f"{m}1", f"{m}2"]
+    # First round touches every meeting before any meeting gets a second call.
+    assert {t[0] for t in started[:3]} == {"a", "b", "c"}
+    assert sched.get_stats()["queued"] == 0
+
+
+def test_live_meetings_are_served_first():
+    async def run():
+        sched = STTScheduler(max_concurrency=1, requests_per_minute=0)
+        sched.set_priority_resolver(lambda mid: mid == "live")
+        order = []
+
+        def call(tag):
+            async def _run():
+                order.append(tag)
+                await asyncio.sleep(0.01)
+            return _run
+
+        first = asyncio.ensure_future(sched.submit("x", "k", call("x0")))
+        await asyncio.sleep(0)
+        rest = [sched.submit("y", "k", call("y0")), sched.submit("live", "k", call("live0"))]
+        await asyncio.gather(first, *rest)
+        return order
+
+    assert asyncio.run(run()) == ["x0", "live0", "y0"]
+
+
+def test_429_pauses_key_for_every_meeting():
+    async def run():
+        sched = STTScheduler(max_concurrency=4, requests_per_minute=0)
+        response = httpx.Response(429, headers={"retry-after": "0.2"}, request=httpx.Request("POST", "http://t"))
+
+        async def limited():
+            raise httpx.HTTPStatusError("429 Too Many Requests", request=response.request, response=response)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await sched.submit("a", "k", limited)
+        assert 0 < sched.blocked_for("k") <= 0.2
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        await sched.submit("b", "k", lambda: asyncio.sleep(0))
+        waited = loop.time() - t0
+        await sched.submit("c", "other", lambda: asyncio.sleep(0))
+        return sched, waited
+
+    sched, waited = asyncio.run(run())
+    assert waited >= 0.15
+    assert sched.get_stats()["keys"]["k"]["rate_limited"] == 1
+
+
+def test_remaining_zero_header_blocks_before_429():
+    lim = KeyRateLimiter()
+    lim.observe_headers({"x-ratelimit-remaining-requests": "5"})
+    assert lim.delay() == 0
+    lim.observe_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m"})
+    assert 59 < lim.delay() <= 60
@@ -0,0 +1,67 @@
+"""SystemAudioCapture callback: vectorized PCM16 conversion, thread-safe bounded hand-off, status counters."""
+import asyncio
+import struct
+import threading
+
+import numpy as np
+
+from app.audio.system_audio_capture import SystemAudioCapture
+
+
+def _legacy_pcm(indata) -> bytes:
+    return b"".join(struct.pack("<h", int(max(-1, min(1, x)) * 32767)) for x in indata.flatten())
+
+
+def test_callback_converts_like_legacy_loop_and_hands_off_from_thread():
+    indata = np.array([[0.0], [0.5], [-0.5], [1.7], [-3.0], [0.123456], [-0.999]], dtype=np.float32)
+
+    async def run():
+        cap = SystemAudioCapture(sample_rate=16000, channels=1, chunk_size=len(indata))
+        cap._loop = asyncio.get_running_loop()
+        cap._running = True
+        t = threading.Thread(target=cap._callback, args=(indata, len(indata), None, None))
+        t.start()
+        t.join()
+        return cap, await asyncio.wait_for(cap.get_audio_block(), timeout=1.0)
+
+    cap, (pcm, capture_ts) = asyncio.run(run())
+    assert pcm == _legacy_pcm(indata)
+    assert capture_ts > 0
+    assert cap.get_stats()["captured_blocks"] == 1
+
+
+def test_bounded_queue_drops_oldest_and_counts_status_flags(monkeypatch):
+    monkeypatch.setattr(
+        "app.audio.system_audio_capture.settings.AUDIO_CAPTURE_QUEUE_MAX_BLOCKS", 3, raising=False
+    )
+    block = np.zeros((4, 1), dtype=np.float32)
+
+    class _Status:
+        input_overflow = True
+        input_underflow = False
+
+        def __bool__(self):
+            return True
+
+        def __str__(self):
+            return "input overflow"
+
+    async def run():
+        cap = SystemAudioCapture(sample_rate=16000, channels=1, chunk_size=4)
+        cap._loop = asyncio.get_running_loop()
+        cap._running = True
+
+        def producer():
+            for i in range(5):
+                cap._callback(block + i / 10, 4, None, _Status() if i == 2 else None)
+
+        await asyncio.to_thread(producer)
+        await asyncio.sleep(0.01)
+        first, _ = await cap.get_audio_block()
+        return cap, first
+
+    cap, first = asyncio.run(run())
+    stats = cap.get_stats()
+    assert stats["dropped_blocks"] == 2
+    assert stats["input_overflows"] == 1 and stats["input_underflows"] == 0
+    assert first == (np.full(4, 0.2, dtype=np.float32) * 32767).astype("<i2").tobytes()
@@ -34,3 +34,109 @@ def test_retrieve_user_query_returns_capped_context():
     ctx, score = retrieve_context_for_user_query(idx, "mid", "gamma beta")
     assert score > 0.1
     assert "gamma" in ctx
+
+
+def test_kanban_query_set_is_encoded_once_and_searched_in_one_batch(monkeypatch):
+    pytest.importorskip("faiss")
+    import hashlib
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    import app.services.transcript_rag.core as core
+    import app.services.transcript_rag.embeddings as embeddings
+
+    encoded = []
+
+    def encode(texts):
+        encoded.append(list(texts))
+        out = np.zeros((len(texts), 16), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                out[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 16] += 1.0
+        return out / np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+
+    monkeypatch.setattr(embeddings, "encode_now", encode)
+    monkeypatch.setattr(core, "_query_vectors", {})
+    monkeypatch.setattr(core.settings, "KANBAN_RAG_MIN_SIMILARITY", 0.05, raising=False)
+    words = "done blocked waiting progress shipped review merged stuck working status".split()
+    shards = [
+        SimpleNamespace(meeting_id=f"m{i}", texts=[" ".join(words[(i + j) % 10 : (i + j) % 10 + 3]) for j in range(6)], vectors=None)
+        for i in range(3)
+    ]
+    for sh in shards:
+        sh.vectors = encode(sh.texts)
+    encoded.clear()
+    idx = TranscriptRAGIndex.from_shards(shards, {"m0": 0, "m1": 1, "m2": 2})
+
+    searches = []
+    inner = idx._index
+
+    class _Counting:
+        def search(self, q, k):
+            searches.append(q.shape)
+            return inner.search(q, k)
+
+    idx._index = _Counting()
+    queries = core.BOARD_SYNC_QUERIES
+    ctx, best = core.retrieve_context_for_kanban(idx, "m2", queries=queries)
+    again, _ = core.retrieve_context_for_kanban(idx, "m2", queries=queries)
+    assert encoded == [list(queries)]  # one model call, then cached for the process
+    assert searches == [(len(queries), 16)] * 2 and ctx == again and best > 0.05
+
+    # Same ranking as scoring each query separately.
+    scored = {}
+    for q in queries:
+        for i, sc in idx.search(q, 5):
+            if sc >= 0.05:
+                adj = sc * (1.12 if idx.chunks[i].meeting_id == "m2" else 1.0)
+                scored[i] = max(adj, scored.get(i, adj))
+    ordered, _ = idx._rank_hits(*idx.search_many(queries, 5), "m2", 1.12, 0.05)
+    assert sorted(ordered.tolist()) == sorted(scored)
+    ranked = [scored[int(i)] for i in ordered]
+    assert all(a >= b - 1e-6 for a, b in zip(ranked, ranked[1:]))
+    assert ctx == "\n\n".join(idx.chunks[int(i)].display for i in ordered)
+
+
+def test_index_factory_picks_exact_search_below_the_ann_threshold():
+    from app.services.transcript_rag.index_factory import factory_string
+
+    params = {"index_type": "auto", "ann_min_chunks": 20000, "ann_index": "hnsw", "vector_dtype": "float16", "hnsw_m": 32}
+    assert factory_string(500, 384, params) == "SQfp16"
+    assert factory_string(50000, 384, params) == "HNSW32,SQfp16"
+    assert factory_string(50000, 384, {**params, "ann_index": "ivfpq"}) == "IVF512,PQ48x8"
+    assert factory_string(5000, 384, {**params, "index_type": "ivfpq"}) == "HNSW32,SQfp16"  # too few to train PQ
+    assert factory_string(10, 8, {**params, "index_type": "flat", "vector_dtype": "float32"}) == "Flat"
+
+
+def test_saved_index_reloads_memory_mapped_with_binary_chunk_metadata(monkeypatch, tmp_path):
+    pytest.importorskip("faiss")
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    import app.services.transcript_rag.core as core
+
+    monkeypatch.setattr(core.settings, "TRANSCRIPT_RAG_INDEX_TYPE", "hnsw", raising=False)
+    rng = np.random.default_rng(0)
+    texts = {"m0": ["naïve café plan", "", "ship it"], "m1": [f"chunk {i}" for i in range(40)]}
+    shards = []
+    for mid, ts in texts.items():
+        v = rng.standard_normal((len(ts), 16)).astype(np.float32)
+        shards.append(SimpleNamespace(meeting_id=mid, texts=ts, vectors=v / np.linalg.norm(v, axis=1, keepdims=True)))
+    idx = TranscriptRAGIndex.from_shards(shards, {"m0": 3, "m1": 4})
+    target = tmp_path / "fp1"
+    idx.save_disk(str(target))
+    before = (target / "chunks.bin").stat().st_ino
+    idx.save_disk(str(target))  # a concurrent miss must not rewrite files readers have mapped
+    assert (target / "chunks.bin").stat().st_ino == before
+    assert [p.name for p in tmp_path.iterdir()] == ["fp1"]  # no temp dirs left behind
+
+    assert not (target / "chunks.json").exists()
+    loaded = TranscriptRAGIndex.load_from_disk(str(target))
+    assert loaded is not None and len(loaded.chunks) == len(idx.chunks) == 43
+    assert [c.__dict__ for c in loaded.chunks] == [c.__dict__ for c in idx.chunks]
+    assert loaded.chunks[-1].display == "=== Meeting meeting_id=m1 ordinal=4 ===\nchunk 39"
+    assert type(loaded._index).__name__ == "IndexHNSWSQ"
+    q = shards[1].vectors[:2]
+    np.testing.assert_array_equal(loaded._index.search(q, 3)[1], idx._index.search(q, 3)[1])
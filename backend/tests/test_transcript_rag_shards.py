@@ -0,0 +1,119 @@
+"""Project RAG index merged from per-meeting shards: a new meeting embeds only itself; cache hits read no segments."""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+import app.services.transcript_rag.service as service
+import app.services.transcript_rag.embeddings as embeddings
+
+
+def _fake_encode(encoded):
+    def encode(texts):
+        encoded.extend(texts)
+        out = np.zeros((len(texts), 32), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                out[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 32] += 1.0
+        return out / np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+
+    return encode
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def sort(self, key, direction=None):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for name, _ in reversed(keys):
+            self.docs.sort(key=lambda d: d[name])
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        async def gen():
+            for d in self.docs:
+                yield d
+
+        return gen()
+
+
+class _Collection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+
+        def match(doc):
+            for field, cond in query.items():
+                value = doc.get(field)
+                if isinstance(cond, dict) and "$in" in cond:
+                    if value not in cond["$in"]:
+                        return False
+                elif value != cond:
+                    return False
+            return True
+
+        return _Cursor(d for d in self.docs if match(d))
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs = [d for d in self.docs if d["_id"] != query["_id"]] + [doc]
+
+
+def test_new_meeting_embeds_only_its_own_chunks(monkeypatch, tmp_path):
+    t0 = datetime(2026, 3, 1, 9, 0)
+    meetings = _Collection()
+    segments = _Collection()
+    shard_store = _Collection()
+
+    class _DB:
+        pass
+
+    db = _DB()
+    db.meetings, db.transcript_segments, db.transcript_rag_shards = meetings, segments, shard_store
+
+    def add_meeting(i, words):
+        mid = f"m{i}"
+        meetings.docs.append({"_id": mid, "project_id": "p1", "started_at": t0 + timedelta(days=i), "ended_at": t0 + timedelta(days=i, hours=1)})
+        for j in range(3):
+            segments.docs.append({"meeting_id": mid, "timestamp": t0 + timedelta(days=i, seconds=j), "text": " ".join(f"{w}{j}" for w in words)})
+
+    encoded = []
+    monkeypatch.setattr(embeddings, "encode_now", _fake_encode(encoded))
+    monkeypatch.setattr(service.settings, "TRANSCRIPT_RAG_CACHE_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(service.settings, "EMBEDDING_CACHE_DIR", str(tmp_path / "embeddings"), raising=False)
+    monkeypatch.setattr(service.settings, "KANBAN_RAG_CHUNK_WORDS", 60, raising=False)
+    for i in range(3):
+        add_meeting(i, [f"topic{i}"] * 80)
+
+    idx, latest, ordinals = asyncio.run(service.load_project_rag_index(db, "p1"))
+    first_pass = len(encoded)
+    assert idx is not None and latest == "m2" and ordinals == {"m0": 0, "m1": 1, "m2": 2}
+    # Repeated chunk texts are encoded once (chunk-embedding cache).
+    assert first_pass == len({c.text for c in idx.chunks}) and len(shard_store.docs) == 3
+    assert len(segments.queries) == 1  # one $in read, not one query per meeting
+
+    # Unchanged project: the disk cache answers from meeting metadata alone.
+    segments.queries.clear()
+    shard_store.queries.clear()
+    cached, _, _ = asyncio.run(service.load_project_rag_index(db, "p1"))
+    assert len(cached.chunks) == len(idx.chunks)
+    assert segments.queries == [] and shard_store.queries == [] and len(encoded) == first_pass
+
+    # One more meeting: only its chunks are embedded; the others come from their shards.
+    add_meeting(3, ["rollout"] * 80)
+    grown, latest, _ = asyncio.run(service.load_project_rag_index(db, "p1"))
+    new_chunks = [c for c in grown.chunks if c.meeting_id == "m3"]
+    assert latest == "m3" and len(encoded) - first_pass == len({c.text for c in new_chunks}) > 0
+    assert segments.queries[-1] == {"meeting_id": {"$in": ["m3"]}}
+    assert grown.chunks[-1].display.startswith("=== Meeting meeting_id=m3 ordinal=3 ===")
+    assert grown._index.ntotal == len(grown.chunks)
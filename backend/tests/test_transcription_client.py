@@ -0,0 +1,29 @@
+"""Transcription clients are shared per backend and key; a client without ``transcribe`` cannot be created."""
+import asyncio
+
+import pytest
+
+from app.stt.transcription_client import (
+    BaseTranscriptionClient,
+    close_transcription_clients,
+    get_transcription_client,
+)
+
+
+def test_clients_shared_per_backend_and_key():
+    a = get_transcription_client("groq", "key-a")
+    assert get_transcription_client("GROQ", "key-a") is a
+    assert get_transcription_client("groq", "key-b") is not a
+    fw = get_transcription_client("faster_whisper")
+    assert fw is get_transcription_client("faster_whisper", "ignored")
+    asyncio.run(close_transcription_clients())
+    assert get_transcription_client("groq", "key-a") is not a
+    asyncio.run(close_transcription_clients())
+
+
+def test_client_without_transcribe_fails_at_construction():
+    class Incomplete(BaseTranscriptionClient):
+        backend = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
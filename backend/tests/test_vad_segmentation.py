@@ -0,0 +1,97 @@
+"""VAD-segmented STT: sub-window VAD, utterance cutting with padding, and fewer Whisper calls."""
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("webrtcvad")
+
+from app.audio.audio_processor import AudioProcessor
+from app.stt import stt_pipeline as sp
+
+RATE = 16000
+BLOCK = 1024 * 2  # bytes per capture block
+
+
+def _speech(seconds: float) -> bytes:
+    t = np.arange(int(RATE * seconds)) / RATE
+    sig = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 20)) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t))
+    return (sig / np.abs(sig).max() * 8000).astype("<i2").tobytes()
+
+
+def _silence(seconds: float) -> bytes:
+    return np.random.default_rng(1).normal(0, 20, int(RATE * seconds)).astype("<i2").tobytes()
+
+
+def _feed(fn, stream: bytes):
+    out = []
+    for i in range(0, len(stream), BLOCK):
+        out.extend(fn(stream[i:i + BLOCK]) or [])
+    return out
+
+
+def test_check_vad_looks_at_every_sub_window():
+    proc = AudioProcessor(sample_rate=RATE)
+    frame = bytes(640) + _speech(0.1)  # first 20 ms silent, rest speech
+    assert proc._check_vad(frame)
+    assert not AudioProcessor(sample_rate=RATE)._check_vad(bytes(640 * 3) + _speech(0.02))
+
+
+def test_utterances_are_cut_on_silence_and_padded():
+    proc = AudioProcessor(sample_rate=RATE)
+    stream = _silence(3) + _speech(2) + _silence(3) + _speech(1.5) + _silence(2) + _speech(0.2) + _silence(2)
+    segments = _feed(proc.segment_speech, stream)
+    assert len(segments) == 2  # the 200 ms blip is too short
+    first, second = segments
+    speech_start, speech_end = 3 * RATE * 2, 5 * RATE * 2
+    pad = int(0.3 * RATE) * 2
+    assert speech_start - pad <= first.start <= speech_start
+    assert speech_end <= first.end <= speech_end + pad + 640
+    assert first.pcm == stream[first.start:first.end]
+    assert 1500 <= first.speech_ms <= 2000
+    assert second.start >= 8 * RATE * 2 - pad
+    assert proc.seg_dropped_short == 1
+
+
+def test_long_monologue_is_force_cut(monkeypatch):
+    monkeypatch.setattr(sp.settings, "VAD_SEGMENT_MAX_SECONDS", 4.0, raising=False)
+    proc = AudioProcessor(sample_rate=RATE)
+    segments = _feed(proc.segment_speech, _speech(10))
+    segments.append(proc.flush_speech())
+    assert [round(len(s.pcm) / (RATE * 2)) for s in segments] == [4, 4, 2]
+    assert segments[1].start == segments[0].end
+
+
+def test_vad_mode_cuts_whisper_calls(monkeypatch):
+    calls = []
+
+    class _Client:
+        async def transcribe(self, audio, **kwargs):
+            calls.append(len(audio))
+            return {"text": f"utterance number {len(calls)}", "segments": None}
+
+    monkeypatch.setattr(sp.settings, "STT_SEGMENTATION", "vad", raising=False)
+    monkeypatch.setattr(sp.settings, "STT_BACKEND", "faster_whisper", raising=False)
+    monkeypatch.setattr(sp, "get_transcription_client", lambda *a, **k: _Client())
+    monkeypatch.setattr(sp.segment_writer, "enqueue", lambda *a, **k: None)
+    pushed = []
+
+    async def push(_mid, text):
+        pushed.append(text)
+
+    async def run():
+        pipeline = sp.STTPipeline("m-vad", push_callback=push)
+        stream = _silence(10) + _speech(3) + _silence(20) + _speech(4) + _silence(20) + _speech(2)
+        for i in range(0, len(stream), BLOCK):
+            pipeline.process_audio(stream[i:i + BLOCK])
+            await pipeline.process_buffer()
+        await pipeline.finish()
+        return pipeline.get_stats()
+
+    stats = asyncio.run(run())
+    seg = stats["segmentation"]
+    assert stats["whisper_calls"] == 3 == len(pushed)
+    assert seg["mode"] == "vad" and seg["speech_segments"] == 3
+    assert seg["fixed_cadence_calls"] >= 19
+    assert seg["call_reduction_ratio"] >= 6
+    assert seg["upload_reduction_ratio"] > 5
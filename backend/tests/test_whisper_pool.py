@@ -0,0 +1,119 @@
+"""Local Whisper pool batches chunks from different meetings into one worker call; batched decoding
+matches the single-chunk path."""
+import asyncio
+import sys
+import types
+
+import numpy as np
+
+from app.stt import whisper_pool
+from app.stt.whisper_pool import LocalWhisperPool
+
+
+def _fake_worker(monkeypatch, calls):
+    monkeypatch.setattr(whisper_pool, "_init_worker", lambda *args: calls.append("init"))
+
+    def batch(items):
+        calls.append(len(items))
+        return [{"text": audio.decode(), "segments": None} for audio, _lang in items]
+
+    monkeypatch.setattr(whisper_pool, "_transcribe_batch", batch)
+
+
+def test_requests_from_many_meetings_share_a_batch(monkeypatch):
+    calls = []
+    _fake_worker(monkeypatch, calls)
+
+    async def run():
+        pool = LocalWhisperPool("base", workers=0, max_batch=4, batch_wait_ms=50)
+        await pool.start()
+        results = await asyncio.gather(*(pool.transcribe(f"m{i}".encode()) for i in range(6)))
+        stats = pool.get_stats()
+        await pool.close()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert [r["text"] for r in results] == [f"m{i}" for i in range(6)]
+    assert calls == ["init", 4, 2]
+    assert stats["batches"] == 2 and stats["avg_batch_size"] == 3.0
+
+
+def test_failed_batch_fails_every_waiter(monkeypatch):
+    monkeypatch.setattr(whisper_pool, "_init_worker", lambda *args: None)
+
+    def boom(items):
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(whisper_pool, "_transcribe_batch", boom)
+
+    async def run():
+        pool = LocalWhisperPool("base", workers=0, max_batch=8, batch_wait_ms=20)
+        results = await asyncio.gather(
+            pool.transcribe(b"a"), pool.transcribe(b"b"), return_exceptions=True
+        )
+        stats = pool.get_stats()
+        await pool.close()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert stats["failed_batches"] == 1
+
+
+def _fake_faster_whisper(monkeypatch):
+    """faster-whisper stand-in: nonzero samples are speech, and decoding silence hallucinates like Whisper."""
+
+    def get_speech_timestamps(audio, options):
+        voiced = np.flatnonzero(np.diff(np.concatenate([[0], (audio != 0).astype(int), [0]])))
+        return [{"start": int(a), "end": int(b)} for a, b in zip(voiced[::2], voiced[1::2])]
+
+    def decode(audio):
+        if not np.any(audio):
+            return "Thank you."
+        return f"{len(audio)} samples of speech"
+
+    def segment(text, start):
+        return types.SimpleNamespace(text=text, start=start, no_speech_prob=0.1, avg_logprob=-0.2)
+
+    class WhisperModel:
+        def transcribe(self, audio, language=None, vad_filter=False, beam_size=1):
+            if vad_filter:
+                stamps = get_speech_timestamps(audio, None)
+                audio = np.concatenate([audio[t["start"]:t["end"]] for t in stamps]) if stamps else audio[:0]
+            return iter([segment(decode(audio), 0.0)] if len(audio) else []), None
+
+    class BatchedInferencePipeline:
+        def __init__(self, model):
+            self.model = model
+
+        def transcribe(self, audio, clip_timestamps=None, vad_filter=True, **kwargs):
+            assert not vad_filter and clip_timestamps
+            segments = [segment(decode(audio[c["start"]:c["end"]]), c["start"] / 16000) for c in clip_timestamps]
+            return iter(segments), None
+
+    module = types.ModuleType("faster_whisper")
+    module.BatchedInferencePipeline = BatchedInferencePipeline
+    vad = types.ModuleType("faster_whisper.vad")
+    vad.VadOptions = lambda: None
+    vad.get_speech_timestamps = get_speech_timestamps
+    module.vad = vad
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    monkeypatch.setitem(sys.modules, "faster_whisper.vad", vad)
+    monkeypatch.setattr(whisper_pool, "_model", WhisperModel())
+    monkeypatch.setattr(whisper_pool, "_batched", None)
+
+
+def test_batched_decode_matches_the_single_chunk_path(monkeypatch):
+    _fake_faster_whisper(monkeypatch)
+    speech = np.ones(8000, dtype=np.float32)
+    silence = np.zeros(16000, dtype=np.float32)
+    chunks = [
+        np.concatenate([silence, speech, silence, speech]),
+        silence,  # must stay empty instead of hallucinating
+        np.concatenate([speech[:3000], silence]),
+    ]
+
+    batched = whisper_pool._generate_batch(chunks, "en")
+    single = [whisper_pool._transcribe_one(c, "en") for c in chunks]
+    assert batched == single
+    assert [r["text"] for r in batched] == ["16000 samples of speech", "", "3000 samples of speech"]
@@ -20,7 +20,12 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs';
 import { Progress } from '@/components/ui/progress';
 import { cn } from '@/lib/utils';
 import { useAuth } from '@/context/AuthContext';
-import { uploadMeetingRecording, type MeetingRecordingApi } from '@/lib/api';
+import {
+  getMeetingRecording,
+  getMeetingRecordingStatus,
+  uploadMeetingRecording,
+  type MeetingRecordingApi,
+} from '@/lib/api';
 
 type ProcessingState = 'idle' | 'uploading' | 'transcribing' | 'analyzing' | 'extracting' | 'complete';
 
@@ -111,6 +116,7 @@ const UploadMeeting = ({ variant = 'corporate', title = 'Upload Meeting Recordin
   const [isDragging, setIsDragging] = useState(false);
   const [uploadError, setUploadError] = useState<string | null>(null);
   const [lastRecording, setLastRecording] = useState<MeetingRecordingApi | null>(null);
+  const [progressPercent, setProgressPercent] = useState<number | null>(null);
 
   const handleDragOver = useCallback((e: React.DragEvent) => {
     e.preventDefault();
@@ -130,20 +136,25 @@ const UploadMeeting = ({ variant = 'corporate', title = 'Upload Meeting Recordin
     setUploadError(null);
     setUploadedFile(file);
     setProcessingState('uploading');
-    const steps: ProcessingState[] = ['uploading', 'transcribing', 'analyzing', 'extracting'];
-    let stepIndex = 0;
-    const stepInterval = setInterval(() => {
-      stepIndex++;
-      if (stepIndex < steps.length) setProcessingState(steps[stepIndex]);
-    }, 800);
+    setProgressPercent(null);
     try {
-      const result = await uploadMeetingRecording(token, projectId, file, file.name);
-      clearInterval(stepInterval);
+      const accepted = await uploadMeetingRecording(token, projectId, file, file.name);
+      // Processing runs on the server in the background; poll its progress.
+      setProcessingState('transcribing');
+      let status = accepted.status;
+      while (status === 'processing') {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const polled = await getMeetingRecordingStatus(token, accepted.id);
+        status = polled.status;
+        if (polled.progress?.stage === 'summarizing') setProcessingState('analyzing');
+        if (typeof polled.progress?.percent === 'number') setProgressPercent(polled.progress.percent);
+        if (status === 'failed') throw new Error(polled.error || 'Processing failed');
+      }
+      const result = await getMeetingRecording(token, accepted.id);
       setProcessingState('complete');
       setLastRecording(result);
       onUploadComplete?.();
     } catch (err) {
-      clearInterval(stepInterval);
       setProcessingState('idle');
       setUploadedFile(null);
       setUploadError(err instanceof Error ? err.message : 'Upload failed');
@@ -170,6 +181,7 @@ const UploadMeeting = ({ variant = 'corporate', title = 'Upload Meeting Recordin
   }, []);
 
   const currentStep = processingSteps.find(s => s.state === processingState);
+  const shownProgress = progressPercent ?? currentStep?.progress ?? 0;
   const summary = lastRecording?.summary ?? lastRecording?.summary_dict;
   const actionItems = lastRecording?.action_items ?? [];
   const transcription = lastRecording?.transcription ?? '';
@@ -252,10 +264,10 @@ const UploadMeeting = ({ variant = 'corporate', title = 'Upload Meeting Recordin
                 <p className="text-sm text-muted-foreground">{uploadedFile?.name}</p>
               </div>
             </div>
-            <Progress value={currentStep?.progress || 0} className="h-2" />
+            <Progress value={shownProgress} className="h-2" />
             <div className="flex justify-between mt-2 text-xs text-muted-foreground">
               <span>Processing...</span>
-              <span>{currentStep?.progress}%</span>
+              <span>{shownProgress}%</span>
             </div>
           </div>
         )}
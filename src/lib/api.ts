@@ -187,6 +187,9 @@ export interface MeetingBotDetail {
     summary_text?: string;
     key_points?: string[];
     decisions?: string[];
+    /** Rolling draft from the live summary checkpoint (meeting still running). */
+    live?: boolean;
+    updated_at?: string;
     meeting_signals?: {
       confidence_score?: number;
       toxicity_score?: number;
@@ -965,6 +968,20 @@ export interface RecordingSummaryApi {
   decisions: string[];
 }
 
+export interface RecordingProgressApi {
+  stage: string;
+  percent: number | null;
+  chunks_done?: number;
+  chunks_total?: number | null;
+}
+
+export interface MeetingRecordingStatusApi {
+  id: string;
+  status: string;
+  progress?: RecordingProgressApi | null;
+  error?: string | null;
+}
+
 export interface MeetingRecordingApi {
   id: string;
   user_id: string;
@@ -972,6 +989,8 @@ export interface MeetingRecordingApi {
   title: string;
   file_name: string;
   status: string;
+  progress?: RecordingProgressApi | null;
+  error?: string | null;
   transcription: string | null;
   summary: RecordingSummaryApi | null;
   summary_dict?: RecordingSummaryApi | null;
@@ -1016,6 +1035,17 @@ export async function listMeetingRecordings(
   return res.json();
 }
 
+export async function getMeetingRecordingStatus(
+  token: string,
+  recordingId: string
+): Promise<MeetingRecordingStatusApi> {
+  const res = await fetch(`${apiBaseUrl}/api/v1/recordings/${recordingId}/status`, {
+    headers: getAuthHeaders(token),
+  });
+  if (!res.ok) throw new Error("Failed to load recording status");
+  return res.json();
+}
+
 export async function getMeetingRecording(
   token: string,
   recordingId: string
@@ -470,6 +470,11 @@ const CorporateMeetingDetails = ({ role }: CorporateMeetingDetailsProps) => {
               <CardContent>
                 {summary?.summary_text ? (
                   <div className="space-y-4">
+                    {summary.live && (
+                      <p className="text-xs text-muted-foreground italic">
+                        Draft so far; the final summary is generated when you end the meeting.
+                      </p>
+                    )}
                     <p className="text-sm leading-relaxed">{summary.summary_text}</p>
                     {summary.key_points && summary.key_points.length > 0 && (
                       <div>